@@ -1,63 +1,41 @@
-import subprocess
 import sys
-import re
 from datetime import datetime
 
-def extract_game_info(text):
-    """テキストから試合情報を抽出"""
+from scripts.mlb_complete_report_real import MLBCompleteReport
+from src.report_model import render_team_lines
+
+def format_games(slate):
+    """構造化レポートから試合ごとのテキストを作成"""
     games = []
     
-    # 試合情報のパターンを検索
-    game_pattern = r'\*\*(.*?)\s+@\s+(.*?)\*\*\s+開始時刻:\s+(\d{2}/\d{2}\s+\d{2}:\d{2})'
-    
-    # テキストを分割して各試合を処理
-    game_blocks = text.split('==================================================')
-    
-    for i in range(0, len(game_blocks)-1, 2):
-        if i+1 < len(game_blocks):
-            header = game_blocks[i]
-            content = game_blocks[i+1]
-            
-            # ヘッダーから試合情報を抽出
-            match = re.search(game_pattern, header)
-            if match:
-                away_team = match.group(1)
-                home_team = match.group(2)
-                start_time = match.group(3)
-                
-                # 完全な試合情報を構築
-                game_info = f"**{away_team} @ {home_team}**\n"
-                game_info += f"開始時刻: {start_time} (日本時間)\n"
-                game_info += "=" * 50 + "\n"
-                game_info += content.strip() + "\n"
-                game_info += "=" * 50
-                
-                games.append(game_info)
+    for game in slate.games:
+        if game.away is None or game.home is None:
+            continue
+        
+        # 完全な試合情報を構築
+        game_info = f"**{game.away.name} @ {game.home.name}**\n"
+        game_info += f"開始時刻: {game.start_label} (日本時間)\n"
+        game_info += "=" * 50 + "\n"
+        body = []
+        for _, team in game.sides():
+            body.extend(render_team_lines(team))
+        game_info += "\n".join(body).strip() + "\n"
+        game_info += "=" * 50
+        
+        games.append(game_info)
     
     return games
 
 def main():
-    print("MLB 15試合結果を収集中...")
+    print("MLB 試合データを収集中...")
     print("=" * 80)
     
-    # Discord環境変数を設定
-    import os
-    os.environ['DISCORD_WEBHOOK_URL'] = 'dummy'
-    
-    # 既存のスクリプトを実行して出力をキャプチャ
     try:
-        result = subprocess.run(
-            [sys.executable, "-m", "scripts.discord_report_with_table"],
-            capture_output=True,
-            text=True,
-            encoding='utf-8',
-            timeout=300  # 5分のタイムアウト
-        )
-        
-        output = result.stdout
+        # レポートと同じデータをテキストを経由せずに取得
+        slate = MLBCompleteReport().build_slate(sys.argv[1] if len(sys.argv) > 1 else None)
         
-        # 試合情報を抽出
-        games = extract_game_info(output)
+        # 試合情報を整形
+        games = format_games(slate)
         
         # 結果を表示
         current_time = datetime.now().strftime("%H:%M")
@@ -81,10 +59,8 @@ def main():
         
         print("\n結果は 'mlb_results_collected.txt' に保存されました。")
         
-    except subprocess.TimeoutExpired:
-        print("タイムアウト: 処理に時間がかかりすぎています。")
     except Exception as e:
         print(f"エラー: {e}")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
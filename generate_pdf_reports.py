@@ -11,23 +11,21 @@ from datetime import datetime, timedelta
 import pytz
 from pathlib import Path
 import json
-from jinja2 import Template
+from concurrent.futures import ThreadPoolExecutor
 import pdfkit  # wkhtmltopdfが必要
 from scripts.discord_report_with_table import DiscordReportWithTable
+from src import template_engine
+from src.pdf_batch import DEFAULT_WORKERS, PDFBatchRenderer
 
 class MLBPDFReporter(DiscordReportWithTable):
     def __init__(self):
         super().__init__()
-        self.template_path = Path("templates/mlb_matchup_template.html")
+        self.template_name = "mlb_matchup_template.html"
         self.output_dir = Path("reports")
         self.output_dir.mkdir(exist_ok=True)
         
     def generate_match_html(self, game_data):
         """1試合のHTMLを生成"""
-        # テンプレート読み込み
-        with open(self.template_path, 'r', encoding='utf-8') as f:
-            template_str = f.read()
-        
         # データを準備
         template_data = {
             'date': datetime.now(pytz.timezone('Asia/Tokyo')).strftime('%Y.%m.%d'),
@@ -44,13 +42,12 @@ class MLBPDFReporter(DiscordReportWithTable):
             'home_batting': game_data.get('home_team_batting', {})
         }
         
-        # HTMLを生成
-        template = Template(template_str)
-        html = template.render(**template_data)
+        # HTMLを生成（コンパイル済みテンプレートを再利用）
+        html = template_engine.render(self.template_name, **template_data)
         
         return html
     
-    def generate_all_reports(self):
+    def generate_all_reports(self, merge=False, workers=DEFAULT_WORKERS):
         """全試合のPDFレポートを生成"""
         # 明日の試合データを取得
         jst = pytz.timezone('Asia/Tokyo')
@@ -71,25 +68,25 @@ class MLBPDFReporter(DiscordReportWithTable):
         games = response['dates'][0]['games'] if response['dates'] else []
         print(f"{len(games)}試合のレポートを生成します...")
         
-        # 各試合のデータを処理
-        for i, game in enumerate(games):
-            print(f"試合 {i+1}/{len(games)}: 処理中...")
-            
-            # 試合データを収集（既存のメソッドを活用）
-            game_data = self.process_game_data(game)
-            
-            # HTMLを生成
-            html = self.generate_match_html(game_data)
-            
-            # PDFに変換
+        # 各試合のデータを並行して処理
+        def build(game):
             output_filename = f"{tomorrow_est}_{game['teams']['away']['team']['abbreviation']}_vs_{game['teams']['home']['team']['abbreviation']}.pdf"
-            output_path = self.output_dir / output_filename
-            
-            try:
-                pdfkit.from_string(html, str(output_path))
-                print(f"  ✓ PDF生成完了: {output_filename}")
-            except Exception as e:
-                print(f"  ✗ PDF生成エラー: {e}")
+            game_data = self.process_game_data(game)  # 既存のメソッドを活用
+            return output_filename, self.generate_match_html(game_data)
+        
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            pages = list(executor.map(build, games))
+        
+        # PDFに一括変換
+        merged_name = f"{tomorrow_est}_all_matchups.pdf" if merge else None
+        result = PDFBatchRenderer(workers=workers).render(pages, self.output_dir, merged_name=merged_name)
+        for output_filename in result.files:
+            print(f"  ✓ PDF生成完了: {Path(output_filename).name}")
+        if result.merged:
+            print(f"  ✓ 結合PDF生成完了: {Path(result.merged).name}")
+        for output_filename, error in result.errors:
+            print(f"  ✗ PDF生成エラー: {output_filename}: {error}")
+        print(f"PDF変換時間: {result.seconds:.1f}秒")
     
     def process_game_data(self, game):
         """既存のデータ処理を再利用"""
@@ -143,4 +140,4 @@ if __name__ == "__main__":
     
     # レポート生成
     reporter = MLBPDFReporter()
-    reporter.generate_all_reports()
\ No newline at end of file
+    reporter.generate_all_reports(merge='--merge' in sys.argv)
\ No newline at end of file
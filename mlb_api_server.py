@@ -1,24 +1,24 @@
-from flask import Flask, jsonify, request
+from flask import Flask, Response, jsonify, request
 from flask_cors import CORS
-from datetime import datetime, timedelta
-import pytz
+from dataclasses import asdict
+from datetime import datetime
+import gzip
+import hashlib
 import json
 from pathlib import Path
+import re
 import threading
 import time
-import schedule
 
 # 既存のモジュールをインポート
 import sys
-from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent))
 sys.path.insert(0, str(Path(__file__).parent / 'scripts'))
 
-# インポートの順序を調整
-from scripts.enhanced_stats_collector import EnhancedStatsCollector
-from scripts.calculate_gb_fb_stats import GBFBCalculator
-from scripts.complete_stats_formatter import CompleteStatsFormatter
-from scripts.mlb_complete_report_real import MLBCompleteReportReal
+from src.api_snapshot import RefreshingSnapshot
+from src.game_index import CacheHistory, GameIndex
+from src.slate_prefetch import SlateSnapshot
+from scripts.mlb_complete_report_real import MLBCompleteReport
 
 app = Flask(__name__)
 CORS(app)  # クロスオリジン対応
@@ -27,150 +27,160 @@ CORS(app)  # クロスオリジン対応
 CACHE_DIR = Path('api_cache')
 CACHE_DIR.mkdir(exist_ok=True)
 
+# エンティティごとの有効期限（秒）
+SLATE_TTL = 30 * 60
+TEAM_TTL = 60 * 60
+REFRESH_CHECK_INTERVAL = 60
+
+DATE_PATTERN = re.compile(r'^\d{4}-\d{2}-\d{2}$')
+
+
+def pitcher_payload(team):
+    """先発投手（未定ならNone）"""
+    if not team.pitcher_id or team.pitcher is None:
+        return None
+    pitcher = asdict(team.pitcher)
+    return {'id': team.pitcher_id, 'name': pitcher.pop('name'), 'stats': pitcher}
+
+
+def team_stats_payload(team):
+    """チーム統計（打撃・直近OPS・中継ぎ）"""
+    batting = asdict(team.batting) if team.batting else None
+    return {
+        'batting': batting,
+        'recent_ops': {'last_5': batting['recent_ops_5'], 'last_10': batting['recent_ops_10']} if batting else None,
+        'bullpen': asdict(team.bullpen) if team.bullpen else None,
+        'errors': team.errors
+    }
+
+
+def game_payload(game):
+    """APIレスポンス用の試合データ"""
+    data = {
+        'game_id': game.game_pk,
+        'game_time_jst': game.start_time_jst,
+        'game_time_formatted': game.start_label,
+        'error': game.error
+    }
+    for side, team in game.sides():
+        if team is None:
+            data[f'{side}_team'] = None
+            continue
+        data[f'{side}_team'] = {
+            'id': team.team_id,
+            'name': team.name,
+            'pitcher': pitcher_payload(team),
+            **team_stats_payload(team)
+        }
+    return data
+
+
 class MLBDataAPIServer:
+    """事前に組み立てたスナップショットから応答するAPIサーバー
+
+    スレート（明日の全試合）とチーム統計はそれぞれTTLを持ち、期限切れになると
+    バックグラウンドで再取得する。更新中のリクエストには直前のデータを返すため、
+    応答時間は上流APIの状態に左右されない。
+    """
+
     def __init__(self):
-        self.reporter = MLBCompleteReportReal()
-        self.latest_data = {}
-        self.update_data()
-    
-    def update_data(self):
-        """データを更新"""
-        try:
-            print(f"Updating MLB data at {datetime.now()}")
-            
-            # 日本時間で明日の試合を取得
-            jst = pytz.timezone('Asia/Tokyo')
-            now_jst = datetime.now(jst)
-            est = pytz.timezone('US/Eastern')
-            now_est = now_jst.astimezone(est)
-            target_date = now_est.date()
-            
-            # 試合データを取得
-            games_data = self.reporter.get_games_for_date(target_date)
-            
-            if games_data and 'dates' in games_data and games_data['dates']:
-                games = games_data['dates'][0]['games']
-                
-                # 各試合のデータを処理
-                processed_games = []
-                for game in games:
-                    game_info = self.process_game_for_api(game)
-                    processed_games.append(game_info)
-                
-                self.latest_data = {
-                    'updated_at': now_jst.isoformat(),
-                    'target_date': (now_jst + timedelta(days=1)).strftime('%Y-%m-%d'),
-                    'games_count': len(processed_games),
-                    'games': processed_games
-                }
-                
-                # キャッシュに保存
-                cache_file = CACHE_DIR / f"mlb_data_{target_date}.json"
-                with open(cache_file, 'w', encoding='utf-8') as f:
-                    json.dump(self.latest_data, f, ensure_ascii=False, indent=2)
-                
-                print(f"Data updated successfully: {len(processed_games)} games")
-            
-        except Exception as e:
-            print(f"Error updating data: {e}")
-    
-    def process_game_for_api(self, game):
-        """APIレスポンス用にゲームデータを処理"""
-        # 基本情報
-        away_team = game['teams']['away']['team']
-        home_team = game['teams']['home']['team']
-        game_date = game['gameDate']
-        
-        # 日本時間に変換
-        game_time_utc = datetime.fromisoformat(game_date.replace('Z', '+00:00'))
-        jst = pytz.timezone('Asia/Tokyo')
-        game_time_jst = game_time_utc.astimezone(jst)
-        
-        # 先発投手情報
-        away_pitcher = None
-        home_pitcher = None
-        
-        if 'probablePitcher' in game['teams']['away']:
-            pitcher = game['teams']['away']['probablePitcher']
-            away_pitcher = {
-                'id': pitcher['id'],
-                'name': pitcher['fullName'],
-                'stats': self.get_pitcher_stats(pitcher['id'])
-            }
-        
-        if 'probablePitcher' in game['teams']['home']:
-            pitcher = game['teams']['home']['probablePitcher']
-            home_pitcher = {
-                'id': pitcher['id'],
-                'name': pitcher['fullName'],
-                'stats': self.get_pitcher_stats(pitcher['id'])
-            }
-        
-        # チーム統計
-        away_stats = self.reporter.get_team_stats(away_team['id'])
-        home_stats = self.reporter.get_team_stats(home_team['id'])
-        
-        # 最近のOPS
-        away_recent = self.reporter.get_recent_team_ops(away_team['id'])
-        home_recent = self.reporter.get_recent_team_ops(home_team['id'])
-        
-        # 中継ぎ陣
-        away_bullpen = self.reporter.get_bullpen_stats(away_team['id'])
-        home_bullpen = self.reporter.get_bullpen_stats(home_team['id'])
-        
-        return {
-            'game_id': game['gamePk'],
-            'game_time_jst': game_time_jst.isoformat(),
-            'game_time_formatted': game_time_jst.strftime('%m/%d %H:%M'),
-            'away_team': {
-                'id': away_team['id'],
-                'name': away_team['name'],
-                'abbreviation': away_team.get('abbreviation', ''),
-                'pitcher': away_pitcher,
-                'batting': away_stats,
-                'recent_ops': away_recent,
-                'bullpen': away_bullpen
-            },
-            'home_team': {
-                'id': home_team['id'],
-                'name': home_team['name'],
-                'abbreviation': home_team.get('abbreviation', ''),
-                'pitcher': home_pitcher,
-                'batting': home_stats,
-                'recent_ops': home_recent,
-                'bullpen': home_bullpen
-            }
+        self.reporter = MLBCompleteReport()
+        self.snapshot = RefreshingSnapshot()
+        self.snapshot.register('slate', self.load_slate, ttl=SLATE_TTL)
+        self.snapshot.register('team', self.load_team, ttl=TEAM_TTL)
+        self.index = GameIndex()
+        self.history = CacheHistory(CACHE_DIR)
+        # 初回の取得もバックグラウンドで行う（起動をブロックしない）
+        self.snapshot.refresh('slate')
+
+    @property
+    def latest_data(self):
+        entry = self.snapshot.get('slate')
+        return entry.data if entry else {}
+
+    def load_slate(self, _key=None):
+        """明日の全試合を組み立て、試合に出るチームの統計もまとめて登録"""
+        print(f"Updating MLB data at {datetime.now()}")
+        # 毎回新しいスナップショットで取得し直す（更新は1スレッドで順に実行される）
+        self.reporter.use_snapshot(SlateSnapshot())
+        slate = self.reporter.build_slate()
+
+        games = [game_payload(game) for game in slate.games]
+        # APIの日付（target_date・履歴のファイル名・?from/?to）はすべて日本時間の日付
+        target_date = slate.japan_date.replace('/', '-')
+        data = {
+            'updated_at': datetime.now().isoformat(),
+            'target_date': target_date,
+            'mlb_date': slate.target_date,  # MLB現地（米国東部）の日付
+            'games_count': len(games),
+            'games': games
         }
-    
-    def get_pitcher_stats(self, pitcher_id):
-        """投手の統計を取得"""
-        if not pitcher_id:
-            return None
-        
-        try:
-            stats = self.reporter.enhanced_collector.get_pitcher_enhanced_stats(pitcher_id)
-            
-            # GB%/FB%が0の場合は計算
-            if stats['gb_percent'] == 0.0 and stats['fb_percent'] == 0.0:
-                gb, fb = self.reporter.gb_fb_calculator.calculate_pitcher_gb_fb(pitcher_id, limit_games=3)
-                stats['gb_percent'] = gb
-                stats['fb_percent'] = fb
-            
-            return {
-                'wins': stats['wins'],
-                'losses': stats['losses'],
-                'era': stats['era'],
-                'fip': stats['fip'],
-                'whip': stats['whip'],
-                'k_bb_percent': stats['k_bb_percent'],
-                'gb_percent': stats['gb_percent'],
-                'fb_percent': stats['fb_percent'],
-                'qs_rate': stats['qs_rate'],
-                'vs_left': stats['vs_left'],
-                'vs_right': stats['vs_right']
-            }
-        except:
-            return None
+
+        for game in slate.games:
+            for _, team in game.sides():
+                if team is not None:
+                    self.snapshot.put('team', team.team_id, ok(team_stats_payload(team)))
+
+        # 試合・チーム・投手ごとのレスポンスを更新時に1回だけシリアライズしておく
+        index = GameIndex.from_games(games)
+        self.snapshot.replace('game', {game_id: ok(game) for game_id, game in index.by_id.items()})
+        self.snapshot.replace('team_games', {team_id: ok(index.games(team_id=team_id))
+                                             for team_id in index.by_team})
+        self.snapshot.replace('pitcher_games', {pitcher_id: ok(index.games(pitcher_id=pitcher_id))
+                                                for pitcher_id in index.by_pitcher})
+        self.index = index
+
+        # キャッシュに保存
+        cache_file = CACHE_DIR / f"mlb_data_{target_date}.json"
+        with open(cache_file, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+
+        print(f"Data updated successfully: {len(games)} games")
+        return data
+
+    def load_team(self, team_id):
+        """スレートに含まれないチームの統計を取得"""
+        self.reporter.use_snapshot(SlateSnapshot())
+        return ok(team_stats_payload(self.reporter.build_team_card(team_id)))
+
+
+def ok(data):
+    return {'success': True, 'data': data}
+
+
+def accepts_gzip():
+    return 'gzip' in request.headers.get('Accept-Encoding', '').lower()
+
+
+def bytes_response(body, etag, gzip_body=None):
+    """シリアライズ済みのJSONを返す（If-None-Matchが一致すれば304、対応クライアントにはgzip）"""
+    if gzip_body is not None and accepts_gzip():
+        response = Response(gzip_body, mimetype='application/json')
+        response.headers['Content-Encoding'] = 'gzip'
+    else:
+        response = Response(body, mimetype='application/json')
+    response.headers['Vary'] = 'Accept-Encoding'
+    response.headers['Cache-Control'] = 'no-cache'
+    response.set_etag(etag)
+    return response.make_conditional(request)
+
+
+def snapshot_response(entry):
+    """スナップショットのエントリを返す（未取得なら503）"""
+    if entry is None:
+        response = jsonify({'success': False, 'error': 'Data is being prepared'})
+        response.status_code = 503
+        response.headers['Retry-After'] = '5'
+        return response
+
+    response = bytes_response(entry.body, entry.etag, entry.gzip_body)
+    response.headers['Age'] = str(int(entry.age))
+    return response
+
+
+def not_found(message):
+    return jsonify({'success': False, 'error': message}), 404
+
 
 # APIサーバーインスタンス
 api_server = MLBDataAPIServer()
@@ -179,61 +189,78 @@ api_server = MLBDataAPIServer()
 @app.route('/api/mlb/games/tomorrow', methods=['GET'])
 def get_tomorrow_games():
     """明日の試合データを取得"""
-    return jsonify(api_server.latest_data)
+    return snapshot_response(api_server.snapshot.get('slate'))
 
 @app.route('/api/mlb/games/<int:game_id>', methods=['GET'])
 def get_game_detail(game_id):
     """特定の試合の詳細を取得"""
-    for game in api_server.latest_data.get('games', []):
-        if game['game_id'] == game_id:
-            return jsonify({'success': True, 'data': game})
-    
-    return jsonify({'success': False, 'error': 'Game not found'}), 404
+    entry = api_server.snapshot.get('game', game_id)
+    if entry is None:
+        return not_found('Game not found')
+    return snapshot_response(entry)
+
+@app.route('/api/mlb/teams/<int:team_id>/games', methods=['GET'])
+def get_team_games(team_id):
+    """スレート内でチームが出場する試合を取得"""
+    entry = api_server.snapshot.get('team_games', team_id)
+    if entry is None:
+        return not_found('No games for team')
+    return snapshot_response(entry)
+
+@app.route('/api/mlb/pitchers/<int:pitcher_id>/games', methods=['GET'])
+def get_pitcher_games(pitcher_id):
+    """スレート内で投手が先発予定の試合を取得"""
+    entry = api_server.snapshot.get('pitcher_games', pitcher_id)
+    if entry is None:
+        return not_found('No games for pitcher')
+    return snapshot_response(entry)
+
+@app.route('/api/mlb/games', methods=['GET'])
+def get_games_history():
+    """api_cache/ に保存済みの試合を期間で検索（?from=YYYY-MM-DD&to=YYYY-MM-DD&team_id=&pitcher_id=）
+
+    日付はスレートの target_date と同じ日本時間の日付
+    """
+    start = request.args.get('from')
+    end = request.args.get('to')
+    for value in (start, end):
+        if value and not DATE_PATTERN.match(value):
+            return jsonify({'success': False, 'error': 'Dates must be YYYY-MM-DD'}), 400
+
+    body = api_server.history.query_body(start, end,
+                                         team_id=request.args.get('team_id', type=int),
+                                         pitcher_id=request.args.get('pitcher_id', type=int))
+    return bytes_response(body, hashlib.sha1(body).hexdigest(),
+                          gzip.compress(body, compresslevel=6) if accepts_gzip() else None)
 
 @app.route('/api/mlb/teams/<int:team_id>/stats', methods=['GET'])
 def get_team_stats(team_id):
-    """チームの統計を取得"""
-    try:
-        stats = api_server.reporter.get_team_stats(team_id)
-        recent_ops = api_server.reporter.get_recent_team_ops(team_id)
-        bullpen = api_server.reporter.get_bullpen_stats(team_id)
-        
-        return jsonify({
-            'success': True,
-            'data': {
-                'batting': stats,
-                'recent_ops': recent_ops,
-                'bullpen': bullpen
-            }
-        })
-    except Exception as e:
-        return jsonify({'success': False, 'error': str(e)}), 500
+    """チームの統計を取得（スナップショットから応答し、上流APIは呼ばない）"""
+    return snapshot_response(api_server.snapshot.get('team', team_id))
 
 @app.route('/api/mlb/status', methods=['GET'])
 def get_status():
     """APIのステータスを確認"""
     return jsonify({
         'status': 'active',
-        'version': '1.0',
+        'version': '1.1',
         'last_updated': api_server.latest_data.get('updated_at', 'Never'),
-        'games_available': len(api_server.latest_data.get('games', []))
+        'games_available': len(api_server.index),
+        'history_dates': len(api_server.history.dates()),
+        'snapshot': api_server.snapshot.status()
     })
 
-# 定期更新の設定
-def run_schedule():
-    """スケジュールを実行"""
-    schedule.every().day.at("21:00").do(api_server.update_data)
-    
+# 定期更新（期限切れのスレートをバックグラウンドで再取得）
+def run_refresh():
     while True:
-        schedule.run_pending()
-        time.sleep(60)
+        time.sleep(REFRESH_CHECK_INTERVAL)
+        api_server.snapshot.get('slate')
 
-# バックグラウンドでスケジュール実行
-schedule_thread = threading.Thread(target=run_schedule, daemon=True)
-schedule_thread.start()
+refresh_thread = threading.Thread(target=run_refresh, daemon=True)
+refresh_thread.start()
 
 if __name__ == '__main__':
     # 開発サーバーを起動
     print("Starting Flask server...")
     print("Access the API at: http://localhost:5000/api/mlb/status")
-    app.run(host='127.0.0.1', port=5000, debug=False)  # debugをFalseに変更
\ No newline at end of file
+    app.run(host='127.0.0.1', port=5000, debug=False, threaded=True)
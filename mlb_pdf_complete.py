@@ -3,13 +3,17 @@ import sys
 from datetime import datetime, timedelta
 import pytz
 import pdfkit
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-import requests
-import time
 
 # プロジェクトのルートディレクトリをパスに追加
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
+from src.asset_cache import get_asset_cache
+from src.http_session import get_shared_session
+from src.sabermetrics import StatColumns, pitching_rates
+from src.pdf_batch import DEFAULT_WORKERS, PDFBatchRenderer
+
 # 既存のdiscord_report_with_tableから必要な部分をインポート
 try:
     from src.mlb_api_client import MLBApiClient
@@ -18,7 +22,10 @@ except:
     api_client = None
 
 class MLBPDFComplete:
-    def __init__(self):
+    def __init__(self, session=None):
+        # Stats APIへのリクエストは共有Session（キャッシュ・レート制限・keep-alive）で行う
+        self.session = session or get_shared_session()
+        self.assets = get_asset_cache()
         self.wkhtmltopdf_path = r'C:\Program Files\wkhtmltopdf\bin\wkhtmltopdf.exe'
         self.config = pdfkit.configuration(wkhtmltopdf=self.wkhtmltopdf_path)
         
@@ -74,7 +81,7 @@ class MLBPDFComplete:
         """指定日の試合データを取得"""
         url = f"https://statsapi.mlb.com/api/v1/schedule?date={date}&sportId=1&hydrate=probablePitcher,person,team,stats,flags,linescore,decisions"
         try:
-            response = requests.get(url)
+            response = self.session.get(url)
             response.raise_for_status()
             return response.json()
         except Exception as e:
@@ -88,7 +95,7 @@ class MLBPDFComplete:
             
         url = f"https://statsapi.mlb.com/api/v1/people/{pitcher_id}/stats?stats=season&season=2025&group=pitching"
         try:
-            response = requests.get(url)
+            response = self.session.get(url)
             data = response.json()
             
             if 'stats' in data and data['stats']:
@@ -104,6 +111,7 @@ class MLBPDFComplete:
                                 'strikeouts': stats.get('strikeOuts', 0),
                                 'walks': stats.get('baseOnBalls', 0),
                                 'innings': stats.get('inningsPitched', '0.0'),
+                                'batters_faced': stats.get('battersFaced', 0),
                                 'k9': stats.get('strikeoutsPer9Inn', '0.0'),
                                 'bb9': stats.get('walksPer9Inn', '0.0')
                             }
@@ -113,17 +121,12 @@ class MLBPDFComplete:
         return None
     
     def calculate_k_bb_percent(self, stats):
-        """K-BB%を計算"""
+        """K-BB%を計算（(三振 - 四球) / 対戦打者）"""
         if not stats:
             return 0.0
         
-        try:
-            k9 = float(stats.get('k9', 0))
-            bb9 = float(stats.get('bb9', 0))
-            # K-BB%の簡易計算（K/9 - BB/9）
-            return round(k9 - bb9, 1)
-        except:
-            return 0.0
+        cols = StatColumns.from_stats([stats], {'k': 'strikeouts', 'bb': 'walks', 'bf': 'batters_faced'})
+        return round(float(pitching_rates(cols)['k_bb_pct'][0]), 1)
     
     def calculate_bar_widths(self, val1, val2, inverse=False):
         """バーグラフの幅を計算"""
@@ -171,10 +174,6 @@ class MLBPDFComplete:
         away_team = game_data['teams']['away']['team']['name']
         home_team = game_data['teams']['home']['team']['name']
         
-        # チーム情報を取得
-        away_info = self.team_mappings.get(away_team, {'abbr': 'UNK', 'logo_id': '120', 'color': '#000000'})
-        home_info = self.team_mappings.get(home_team, {'abbr': 'UNK', 'logo_id': '120', 'color': '#000000'})
-        
         # 日時をフォーマット
         game_date = datetime.fromisoformat(game_data['gameDate'])
         jst = pytz.timezone('Asia/Tokyo')
@@ -208,6 +207,42 @@ class MLBPDFComplete:
         away_k_bb = self.calculate_k_bb_percent(away_stats)
         home_k_bb = self.calculate_k_bb_percent(home_stats)
         
+        return self._render_matchup_html(away_team, home_team, game_date_jst,
+                                         game_data['status']['detailedState'],
+                                         away_pitcher_name, home_pitcher_name,
+                                         away_stats, home_stats, away_k_bb, home_k_bb)
+    
+    def generate_html_from_card(self, game):
+        """構造化レポートの1試合(GameCard)からHTMLを生成（APIへの再取得なし）"""
+        game_date_jst = pytz.timezone('Asia/Tokyo').localize(datetime.fromisoformat(game.start_time_jst))
+        sides = {}
+        for side, team in game.sides():
+            p = team.pitcher
+            if p:
+                sides[side] = (p.name, {'wins': p.wins, 'losses': p.losses,
+                                        'era': f"{p.era:.2f}", 'whip': f"{p.whip:.2f}"}, p.k_bb_pct)
+            else:
+                sides[side] = ("TBA", {'wins': 0, 'losses': 0, 'era': '-.--', 'whip': '-.--'}, 0.0)
+        
+        return self._render_matchup_html(game.away.name, game.home.name, game_date_jst, 'Scheduled',
+                                         sides['away'][0], sides['home'][0],
+                                         sides['away'][1], sides['home'][1],
+                                         sides['away'][2], sides['home'][2])
+    
+    def _render_matchup_html(self, away_team, home_team, game_date_jst, status,
+                             away_pitcher_name, home_pitcher_name,
+                             away_stats, home_stats, away_k_bb, home_k_bb):
+        """対戦プレビューのHTMLを描画"""
+        # チーム情報を取得
+        away_info = self.team_mappings.get(away_team, {'abbr': 'UNK', 'logo_id': '120', 'color': '#000000'})
+        home_info = self.team_mappings.get(home_team, {'abbr': 'UNK', 'logo_id': '120', 'color': '#000000'})
+        
+        # ロゴは埋め込み済みのdata URIを使う（取得できない場合のみ外部URL）
+        away_logo = self.assets.logo_data_uri(
+            away_team, fallback=f"https://www.mlbstatic.com/team-logos/{away_info['logo_id']}.svg")
+        home_logo = self.assets.logo_data_uri(
+            home_team, fallback=f"https://www.mlbstatic.com/team-logos/{home_info['logo_id']}.svg")
+        
         # バーグラフの幅を計算
         era_width_away, era_width_home = self.calculate_bar_widths(away_stats['era'], home_stats['era'], inverse=True)
         whip_width_away, whip_width_home = self.calculate_bar_widths(away_stats['whip'], home_stats['whip'], inverse=True)
@@ -512,7 +547,7 @@ class MLBPDFComplete:
         <div class="team-header">
             <div class="team-info away">
                 <div class="team-content">
-                    <img src="https://www.mlbstatic.com/team-logos/{away_info['logo_id']}.svg" 
+                    <img src="{away_logo}" 
                          alt="{away_team}" 
                          class="team-logo">
                     <div class="team-details">
@@ -527,7 +562,7 @@ class MLBPDFComplete:
                         <div class="team-name">{home_team}</div>
                         <div class="team-type">Home Team</div>
                     </div>
-                    <img src="https://www.mlbstatic.com/team-logos/{home_info['logo_id']}.svg" 
+                    <img src="{home_logo}" 
                          alt="{home_team}" 
                          class="team-logo">
                 </div>
@@ -588,7 +623,7 @@ class MLBPDFComplete:
         
         <!-- Status Box -->
         <div class="status-box">
-            <strong>試合ステータス:</strong> {game_data['status']['detailedState']}
+            <strong>試合ステータス:</strong> {status}
         </div>
         
         <!-- Bullpen & Batting Section -->
@@ -721,7 +756,7 @@ class MLBPDFComplete:
         
         return html
     
-    def generate_reports_for_today(self):
+    def generate_reports_for_today(self, merge=False, workers=DEFAULT_WORKERS):
         """今日の試合の予想PDFを生成"""
         # 日本時間で本日の日付を取得
         jst = pytz.timezone('Asia/Tokyo')
@@ -743,47 +778,25 @@ class MLBPDFComplete:
         
         # レポート保存ディレクトリ
         reports_dir = Path('reports') / target_date.strftime('%Y%m%d')
-        reports_dir.mkdir(parents=True, exist_ok=True)
-        
-        generated_files = []
-        games = games_data['dates'][0]['games']
+        games = games_data['dates'][0]['games'][:15]  # 最大15試合
         
         print(f"Found {len(games)} games scheduled for today\n")
         
-        # すべての試合を処理（最大15試合）
-        for i, game in enumerate(games[:15], 1):
+        # 全試合のHTMLを並行して生成（投手成績の取得を含む）
+        def build(game):
+            away_team_name = game['teams']['away']['team']['name']
+            home_team_name = game['teams']['home']['team']['name']
             try:
-                # チーム名とステータスを取得
-                away_team_name = game['teams']['away']['team']['name']
-                home_team_name = game['teams']['home']['team']['name']
-                game_status = game['status']['detailedState']
-                
-                print(f"Game {i}/{min(len(games), 15)}: {away_team_name} @ {home_team_name}")
-                print(f"  Status: {game_status}")
-                
-                # HTMLを生成
-                print("  Generating HTML...")
-                html = self.generate_complete_html(game)
-                
-                # ファイル名を生成
-                away_info = self.team_mappings.get(away_team_name, {'abbr': 'UNK'})
-                home_info = self.team_mappings.get(home_team_name, {'abbr': 'UNK'})
-                filename = f"{away_info['abbr']}_vs_{home_info['abbr']}_matchup.pdf"
-                filepath = reports_dir / filename
-                
-                # PDFを生成
-                print("  Converting to PDF...")
-                pdfkit.from_string(html, str(filepath), configuration=self.config, options=self.options)
-                
-                print(f"  ✓ Success: {filename}\n")
-                generated_files.append(str(filepath))
-                
-                # API制限対策
-                time.sleep(1)
-                
+                return away_team_name, home_team_name, self.generate_complete_html(game)
             except Exception as e:
-                print(f"  ✗ Error: {e}\n")
-                continue
+                print(f"  ✗ Error: {away_team_name} @ {home_team_name}: {e}")
+                return away_team_name, home_team_name, None
+        
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            built = list(executor.map(build, games))
+        
+        pages = self._name_pages([(away, home, html) for away, home, html in built if html is not None])
+        generated_files = self._render_batch(pages, reports_dir, target_date.strftime('%Y%m%d'), merge, workers)
         
         print(f"{'='*60}")
         print(f"✅ Generated {len(generated_files)} PDF reports")
@@ -796,8 +809,48 @@ class MLBPDFComplete:
             os.startfile(generated_files[0])
         
         return generated_files
+    
+    def generate_reports_for_slate(self, slate, reports_dir, merge=False, workers=DEFAULT_WORKERS):
+        """構造化レポート(SlateReport)の全試合をPDF化（試合データは再取得しない）"""
+        built = []
+        for game in slate.games:
+            if game.away is None or game.home is None:
+                continue
+            try:
+                built.append((game.away.name, game.home.name, self.generate_html_from_card(game)))
+            except Exception as e:
+                print(f"  ✗ Error: {game.away.name} @ {game.home.name}: {e}")
+        
+        pages = self._name_pages(built)
+        return self._render_batch(pages, reports_dir, slate.japan_date.replace('/', ''), merge, workers)
+    
+    def _name_pages(self, built):
+        """(away, home, html) のリストを (ファイル名, html) に変換（ダブルヘッダーの2試合目は _G2）"""
+        pages = []
+        used = set()
+        for away_team_name, home_team_name, html in built:
+            away_info = self.team_mappings.get(away_team_name, {'abbr': 'UNK'})
+            home_info = self.team_mappings.get(home_team_name, {'abbr': 'UNK'})
+            filename = f"{away_info['abbr']}_vs_{home_info['abbr']}_matchup.pdf"
+            if filename in used:
+                filename = filename.replace('.pdf', '_G2.pdf')
+            used.add(filename)
+            pages.append((filename, html))
+        return pages
+    
+    def _render_batch(self, pages, reports_dir, date_label, merge, workers):
+        """ページをまとめてPDF化し、生成したファイルのリストを返す（結合PDFは末尾）"""
+        renderer = PDFBatchRenderer(self.config, self.options, workers)
+        merged_name = f"MLB_{date_label}_all_matchups.pdf" if merge else None
+        result = renderer.render(pages, reports_dir, merged_name=merged_name)
+        
+        for filename, error in result.errors:
+            print(f"  ✗ Error: {filename}: {error}")
+        print(f"  Converted {len(result.files)} PDFs in {result.seconds:.1f}s")
+        
+        return result.files + ([result.merged] if result.merged else [])
 
 
 if __name__ == "__main__":
     generator = MLBPDFComplete()
-    pdf_files = generator.generate_reports_for_today()
\ No newline at end of file
+    pdf_files = generator.generate_reports_for_today(merge='--merge' in sys.argv)
\ No newline at end of file
@@ -6,7 +6,7 @@ NF3投手完全データ取得
 """
 
 import os
-import requests
+import sys
 from bs4 import BeautifulSoup
 from datetime import datetime
 import json
@@ -14,11 +14,16 @@ import time
 from urllib.parse import urljoin
 import re
 
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from src.http_session import get_shared_session
+
 class NF3PitcherCompleteScraper:
     def __init__(self):
         self.base_url = "https://nf3.sakura.ne.jp/"
         self.data_dir = "data/pitchers"
         self.cache_dir = "cache/npb/nf3_pitchers"
+        # サーバー負荷軽減のためのアクセス間隔はHTTP層のホスト別予算で制御する（Sessionはプロセス共通）
+        self.session = get_shared_session()
         self.ensure_directories()
         
     def ensure_directories(self):
@@ -52,7 +57,7 @@ class NF3PitcherCompleteScraper:
         print("="*60)
         
         try:
-            response = requests.get(self.base_url)
+            response = self.session.get(self.base_url)
             response.encoding = response.apparent_encoding
             soup = BeautifulSoup(response.text, 'html.parser')
             
@@ -158,7 +163,7 @@ class NF3PitcherCompleteScraper:
         # Webから取得
         try:
             print(f"  Webから取得中...")
-            response = requests.get(full_url)
+            response = self.session.get(full_url)
             response.encoding = response.apparent_encoding
             
             # キャッシュ保存
@@ -486,7 +491,6 @@ class NF3PitcherCompleteScraper:
                 self.display_pitcher_stats(pitcher_name, {'first_appearance': True})
                 success_count += 1
                 
-            time.sleep(1)  # サーバー負荷軽減
             
         # 完了
         print("="*60)
@@ -7,12 +7,24 @@ import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from src.mlb_api_client import MLBApiClient
+from src.sabermetrics import StatColumns, batting_rates, pitching_rates
+from src.stat_line import format_innings
+from src.stat_store import MAX_AGE, get_default_stat_store
 import json
 from datetime import datetime
 
+
+def _ratio(numerator, denominator):
+    """比率（分母が0なら分子がある場合inf、ない場合0）"""
+    if denominator > 0:
+        return round(float(numerator / denominator), 2)
+    return float('inf') if numerator > 0 else 0.0
+
+
 class AccurateRateCalculator:
     def __init__(self):
         self.client = MLBApiClient()
+        self.stat_store = get_default_stat_store()
     
     def get_pitcher_stats(self, player_id, season=2024):
         """投手の詳細統計を取得"""
@@ -50,120 +62,57 @@ class AccurateRateCalculator:
         """投手の各種率を計算"""
         if not stats:
             return {}
-            
-        results = {}
-        
-        # 三振率 (K%) = 三振数 / 打者数
-        batters_faced = float(stats.get('battersFaced', 0))
-        if batters_faced > 0:
-            strikeouts = float(stats.get('strikeOuts', 0))
-            results['k_rate'] = round((strikeouts / batters_faced) * 100, 1)
-            results['k_per_9'] = round((strikeouts / float(stats.get('inningsPitched', 1))) * 9, 1)
-        else:
-            results['k_rate'] = 0.0
-            results['k_per_9'] = 0.0
-        
-        # 四球率 (BB%) = 四球数 / 打者数
-        if batters_faced > 0:
-            walks = float(stats.get('baseOnBalls', 0))
-            results['bb_rate'] = round((walks / batters_faced) * 100, 1)
-            results['bb_per_9'] = round((walks / float(stats.get('inningsPitched', 1))) * 9, 1)
-        else:
-            results['bb_rate'] = 0.0
-            results['bb_per_9'] = 0.0
-        
-        # K/BB比率
-        walks = float(stats.get('baseOnBalls', 0))
-        if walks > 0:
-            results['k_bb_ratio'] = round(float(stats.get('strikeOuts', 0)) / walks, 2)
-        else:
-            results['k_bb_ratio'] = float('inf') if stats.get('strikeOuts', 0) > 0 else 0.0
-        
-        # ゴロ率・フライ率
-        ground_outs = float(stats.get('groundOuts', 0))
-        air_outs = float(stats.get('airOuts', 0))
-        total_batted_balls = ground_outs + air_outs
-        
-        if total_batted_balls > 0:
-            results['ground_ball_rate'] = round((ground_outs / total_batted_balls) * 100, 1)
-            results['fly_ball_rate'] = round((air_outs / total_batted_balls) * 100, 1)
-            results['gb_fb_ratio'] = round(ground_outs / air_outs, 2) if air_outs > 0 else float('inf')
-        else:
-            results['ground_ball_rate'] = 0.0
-            results['fly_ball_rate'] = 0.0
-            results['gb_fb_ratio'] = 0.0
-        
-        # WHIP
-        innings = float(stats.get('inningsPitched', 0))
-        if innings > 0:
-            hits = float(stats.get('hits', 0))
-            walks = float(stats.get('baseOnBalls', 0))
-            results['whip'] = round((hits + walks) / innings, 2)
-        else:
-            results['whip'] = 0.0
-        
-        return results
+        return self._pitcher_results(StatColumns.pitching([stats]))[0]
     
     def calculate_batter_rates(self, stats):
         """打者の各種率を計算"""
         if not stats:
             return {}
-            
-        results = {}
-        
-        # 三振率 (K%) = 三振数 / 打席数
-        plate_appearances = float(stats.get('plateAppearances', 0))
-        if plate_appearances > 0:
-            strikeouts = float(stats.get('strikeOuts', 0))
-            results['k_rate'] = round((strikeouts / plate_appearances) * 100, 1)
-        else:
-            results['k_rate'] = 0.0
-        
-        # 四球率 (BB%) = 四球数 / 打席数
-        if plate_appearances > 0:
-            walks = float(stats.get('baseOnBalls', 0))
-            results['bb_rate'] = round((walks / plate_appearances) * 100, 1)
-        else:
-            results['bb_rate'] = 0.0
-        
-        # BB/K比率
-        strikeouts = float(stats.get('strikeOuts', 0))
-        if strikeouts > 0:
-            results['bb_k_ratio'] = round(float(stats.get('baseOnBalls', 0)) / strikeouts, 2)
-        else:
-            results['bb_k_ratio'] = float('inf') if stats.get('baseOnBalls', 0) > 0 else 0.0
-        
-        # ゴロ率・フライ率（打者の場合）
-        ground_outs = float(stats.get('groundOuts', 0))
-        air_outs = float(stats.get('airOuts', 0))
-        total_outs = ground_outs + air_outs
-        
-        if total_outs > 0:
-            results['ground_out_rate'] = round((ground_outs / total_outs) * 100, 1)
-            results['air_out_rate'] = round((air_outs / total_outs) * 100, 1)
-        else:
-            results['ground_out_rate'] = 0.0
-            results['air_out_rate'] = 0.0
-        
-        # ISO (Isolated Power) = SLG - AVG
-        avg = float(stats.get('avg', 0))
-        slg = float(stats.get('slg', 0))
-        results['iso'] = round(slg - avg, 3)
-        
-        # BABIP
-        hits = float(stats.get('hits', 0))
-        home_runs = float(stats.get('homeRuns', 0))
-        at_bats = float(stats.get('atBats', 0))
-        strikeouts = float(stats.get('strikeOuts', 0))
-        sac_flies = float(stats.get('sacFlies', 0))
-        
-        babip_denominator = at_bats - strikeouts - home_runs + sac_flies
-        if babip_denominator > 0:
-            results['babip'] = round((hits - home_runs) / babip_denominator, 3)
-        else:
-            results['babip'] = 0.0
-        
-        return results
+        return self._batter_results(StatColumns.batting([stats]))[0]
+    
+    def _pitcher_results(self, cols):
+        """全行の投手の率（表示用に丸めた辞書のリスト）"""
+        rates = pitching_rates(cols)
+        k, bb, go, ao = cols['k'], cols['bb'], cols['go'], cols['ao']
+        return [{
+            # 三振率 (K%) = 三振数 / 打者数
+            'k_rate': round(float(rates['k_pct'][i]), 1),
+            'k_per_9': round(float(rates['k9'][i]), 1),
+            # 四球率 (BB%) = 四球数 / 打者数
+            'bb_rate': round(float(rates['bb_pct'][i]), 1),
+            'bb_per_9': round(float(rates['bb9'][i]), 1),
+            'k_bb_ratio': _ratio(k[i], bb[i]),
+            # ゴロ率・フライ率
+            'ground_ball_rate': round(float(rates['gb_pct'][i]), 1),
+            'fly_ball_rate': round(float(rates['fb_pct'][i]), 1),
+            'gb_fb_ratio': _ratio(go[i], ao[i]) if go[i] + ao[i] > 0 else 0.0,
+            'whip': round(float(rates['whip'][i]), 2),
+        } for i in range(len(cols))]
+    
+    def _batter_results(self, cols):
+        """全行の打者の率（表示用に丸めた辞書のリスト）"""
+        rates = batting_rates(cols)
+        return [{
+            # 三振率・四球率 = 三振数・四球数 / 打席数
+            'k_rate': round(float(rates['k_pct'][i]), 1),
+            'bb_rate': round(float(rates['bb_pct'][i]), 1),
+            'bb_k_ratio': _ratio(cols['bb'][i], cols['k'][i]),
+            'ground_out_rate': round(float(rates['go_pct'][i]), 1),
+            'air_out_rate': round(float(rates['ao_pct'][i]), 1),
+            # ISO (Isolated Power) = SLG - AVG
+            'iso': round(float(rates['iso'][i]), 3),
+            'babip': round(float(rates['babip'][i]), 3),
+        } for i in range(len(cols))]
+    
+    def _season_columns(self, season, group, player_ids):
+        """シーズン成績の列をストアから読む（ない選手・古い行だけAPIからまとめて取得して保存）"""
+        max_age = MAX_AGE if season >= datetime.now().year else None
+        missing = self.stat_store.missing(season, group, player_ids, max_age=max_age)
+        if missing:
+            print(f"{len(missing)}人の成績（{group}）をAPIから取得中...")
+            stats = self.client.get_players_stats_by_season(missing, season, group)
+            self.stat_store.write_season(season, group, stats)
+        return self.stat_store.season_columns(season, group, player_ids)
     
     def analyze_team_accurate_rates(self, team_id, season=2024):
         """チーム全体の正確な率を分析"""
@@ -178,48 +127,48 @@ class AccurateRateCalculator:
         print(f"\nチーム{team_id}の正確な率分析を開始...")
         print("（データ取得に時間がかかる場合があります）\n")
         
-        player_count = 0
+        pitcher_rows = []
+        batter_rows = []
         for player in roster['roster']:
             player_id = player['person']['id']
             player_name = player['person']['fullName']
             position = player.get('position', {}).get('abbreviation', 'N/A')
             
             if position == 'P':
-                # 投手の統計
-                print(f"投手 {player_name} のデータ取得中...")
-                stats = self.get_pitcher_stats(player_id, season=season)
-                if stats and float(stats.get('inningsPitched', 0)) > 0:
-                    rates = self.calculate_pitcher_rates(stats)
-                    pitchers.append({
-                        'player_id': player_id,
-                        'name': player_name,
-                        'innings': stats.get('inningsPitched', 0),
-                        'era': stats.get('era', 0),
-                        **rates
-                    })
-                    print(f"  → K%={rates['k_rate']}%, GB%={rates['ground_ball_rate']}%, WHIP={rates['whip']}")
+                pitcher_rows.append((player_id, player_name))
             else:
-                # 野手の統計
-                print(f"野手 {player_name} ({position}) のデータ取得中...")
-                stats = self.get_batter_stats(player_id, season=season)
-                if stats and int(stats.get('plateAppearances', 0)) > 0:
-                    rates = self.calculate_batter_rates(stats)
-                    batters.append({
-                        'player_id': player_id,
-                        'name': player_name,
-                        'position': position,
-                        'pa': stats.get('plateAppearances', 0),
-                        'avg': stats.get('avg', 0),
-                        'ops': stats.get('ops', 0),
-                        **rates
-                    })
-                    print(f"  → K%={rates['k_rate']}%, BB%={rates['bb_rate']}%, ISO={rates['iso']}")
-            
-            player_count += 1
-            # API制限対策
-            if player_count % 5 == 0:
-                import time
-                time.sleep(1)
+                batter_rows.append((player_id, player_name, position))
+        
+        # 全選手のシーズン成績を列指向ストアから読み、まとめて率を計算
+        pitcher_cols = self._season_columns(season, 'pitching', [row[0] for row in pitcher_rows])
+        era = pitching_rates(pitcher_cols)['era']
+        for i, ((player_id, player_name), rates) in enumerate(
+                zip(pitcher_rows, self._pitcher_results(pitcher_cols))):
+            if pitcher_cols['outs'][i] > 0:
+                pitchers.append({
+                    'player_id': player_id,
+                    'name': player_name,
+                    'innings': format_innings(int(pitcher_cols['outs'][i])),
+                    'era': f"{era[i]:.2f}",
+                    **rates
+                })
+                print(f"  {player_name}: K%={rates['k_rate']}%, GB%={rates['ground_ball_rate']}%, WHIP={rates['whip']}")
+        
+        batter_cols = self._season_columns(season, 'hitting', [row[0] for row in batter_rows])
+        batting = batting_rates(batter_cols)
+        for i, ((player_id, player_name, position), rates) in enumerate(
+                zip(batter_rows, self._batter_results(batter_cols))):
+            if batting['pa'][i] > 0:
+                batters.append({
+                    'player_id': player_id,
+                    'name': player_name,
+                    'position': position,
+                    'pa': int(batting['pa'][i]),
+                    'avg': f"{batting['avg'][i]:.3f}".lstrip('0'),
+                    'ops': f"{batting['ops'][i]:.3f}".lstrip('0'),
+                    **rates
+                })
+                print(f"  {player_name} ({position}): K%={rates['k_rate']}%, BB%={rates['bb_rate']}%, ISO={rates['iso']}")
         
         # データ保存
         output_dir = 'data/processed/accurate_rates'
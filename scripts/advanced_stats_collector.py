@@ -7,6 +7,9 @@ import os
 from datetime import datetime, timedelta
 from typing import Dict, List, Any, Optional
 from src.mlb_api_client import MLBApiClient
+from src.season_constants import season_constants
+from src.stat_line import PitchingLine, parse_outs
+from src.stat_store import get_default_stat_store
 import time
 
 
@@ -15,19 +18,16 @@ class AdvancedStatsCollector:
         self.client = MLBApiClient()
         self.base_path = "data/raw"
         self.processed_path = "data/processed"
+        # 取得したシーズン成績・ゲームログはチーム単位でまとめて列指向ストアに書き込む
+        self.stat_store = get_default_stat_store()
+        self._pending_season = {}
+        self._pending_game_logs = {}
         
-    def calculate_fip(self, stats: Dict) -> float:
+    def calculate_fip(self, stats: Dict, season: int = 2025) -> float:
         """FIP (Fielding Independent Pitching) を計算"""
         try:
-            hr = stats.get('homeRuns', 0)
-            bb = stats.get('baseOnBalls', 0)
-            hbp = stats.get('hitByPitch', 0)
-            k = stats.get('strikeOuts', 0)
-            ip = float(stats.get('inningsPitched', 1))
-            
-            # FIP定数は通常3.2程度
-            fip_constant = 3.2
-            fip = ((13 * hr) + (3 * (bb + hbp)) - (2 * k)) / ip + fip_constant
+            # 投球回はアウト数で扱い、FIP定数はリーグ合計から求めたシーズンの値
+            fip = PitchingLine.from_stat(stats).rates(season_constants(season))['fip']
             return round(fip, 3)
         except:
             return 0.0
@@ -59,10 +59,10 @@ class AdvancedStatsCollector:
         for game in game_logs:
             if game.get('isStarter', False):
                 starts += 1
-                innings = float(game.get('inningsPitched', 0))
+                outs = parse_outs(game.get('inningsPitched'))
                 earned_runs = game.get('earnedRuns', 0)
                 
-                if innings >= 6.0 and earned_runs <= 3:
+                if outs >= 18 and earned_runs <= 3:
                     quality_starts += 1
                     
         return round(quality_starts / starts, 3) if starts > 0 else 0.0
@@ -92,11 +92,12 @@ class AdvancedStatsCollector:
         # 基本統計の処理
         if season_stats and season_stats.get('stats'):
             stat_data = season_stats['stats'][0].get('splits', [{}])[0].get('stat', {})
+            self._pending_season[pitcher_id] = stat_data
             
             result.update({
                 'era': stat_data.get('era', '0.00'),
                 'whip': stat_data.get('whip', '0.00'),
-                'fip': self.calculate_fip(stat_data),
+                'fip': self.calculate_fip(stat_data, season),
                 'strikeouts': stat_data.get('strikeOuts', 0),
                 'innings': stat_data.get('inningsPitched', '0.0'),
                 'gamesStarted': stat_data.get('gamesStarted', 0)
@@ -109,6 +110,7 @@ class AdvancedStatsCollector:
         # QS率の計算
         if game_log and game_log.get('stats'):
             game_logs_data = game_log['stats'][0].get('splits', [])
+            self._pending_game_logs[pitcher_id] = game_logs_data
             result['qsRate'] = self.calculate_qs_rate([g.get('stat', {}) for g in game_logs_data])
             
         # 左右別被打率
@@ -151,6 +153,8 @@ class AdvancedStatsCollector:
                 else:
                     relievers.append(pitcher_stats)
                     
+        self.flush_stat_store(season)
+        
         # 中継ぎ陣の総合成績を計算
         bullpen_stats = self.calculate_bullpen_aggregate(relievers)
         
@@ -161,6 +165,15 @@ class AdvancedStatsCollector:
             'bullpenAggregate': bullpen_stats
         }
         
+    def flush_stat_store(self, season: int):
+        """取得済みのシーズン成績・ゲームログを列指向ストアに保存"""
+        if self._pending_season:
+            self.stat_store.write_season(season, 'pitching', self._pending_season)
+        if self._pending_game_logs:
+            self.stat_store.write_game_logs(season, 'pitching', self._pending_game_logs)
+        self._pending_season = {}
+        self._pending_game_logs = {}
+        
     def calculate_bullpen_aggregate(self, relievers: List[Dict]) -> Dict:
         """中継ぎ陣の総合成績を計算"""
         if not relievers:
@@ -7,6 +7,11 @@ import requests
 from typing import Dict, Optional
 import json
 from pathlib import Path
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.stat_line import parse_innings
 
 class AdvancedStatsCollectorPhase1:
     """Phase 1の新規統計を収集"""
@@ -59,7 +64,7 @@ class AdvancedStatsCollectorPhase1:
                 
                 # SwStr%の推定（詳細データがない場合）
                 # 簡易的にK%から推定: SwStr% ≈ K% * 0.4
-                innings_pitched = float(stat.get('inningsPitched', '0'))
+                innings_pitched = parse_innings(stat.get('inningsPitched'))
                 if innings_pitched > 0:
                     k_per_9 = (strikeouts / innings_pitched) * 9
                     k_percent = k_per_9 / 38.0  # 大まかな変換
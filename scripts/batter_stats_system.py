@@ -25,13 +25,20 @@ class BatterStatsSystem:
         self.jst = pytz.timezone('Asia/Tokyo')
         self.est = pytz.timezone('US/Eastern')
         
-    def get_batter_stats(self, batter_id, season):
-        """打者の統計を取得"""
+    def get_batter_stats(self, batter_id, season, season_stat=None, window=None):
+        """打者の統計を取得
+        
+        season_statにまとめて取得済みのシーズン統計、windowにゲームログの累積和
+        （MLBApiClient.get_recent_form）を渡せる。複数の打者を続けて処理する場合は
+        全員分のwindowを1回作って渡す
+        """
         try:
+            if window is None:
+                window = self.client.get_recent_form([batter_id], season, "hitting")
             stats = {
-                'current': self._get_season_stats(batter_id, season),
-                'recent_5': self._get_recent_ops(batter_id, season, 5),
-                'recent_10': self._get_recent_ops(batter_id, season, 10),
+                'current': self._get_season_stats(batter_id, season, season_stat),
+                'recent_5': self._get_recent_ops(window, batter_id, 5),
+                'recent_10': self._get_recent_ops(window, batter_id, 10),
                 'vs_left_right': self._get_vs_lr_stats_batter(batter_id, season)
             }
             return stats
@@ -39,21 +46,14 @@ class BatterStatsSystem:
             print(f"    エラー: {str(e)}")
             return None
             
-    def _get_season_stats(self, batter_id, season):
+    def _get_season_stats(self, batter_id, season, stats=None):
         """シーズン統計を取得"""
         try:
-            response = self.client._make_request(
-                f"people/{batter_id}/stats?stats=season&season={season}&group=hitting"
-            )
+            if stats is None:
+                stats = self.client.get_players_stats_by_season([batter_id], season, "hitting")[batter_id]
             
-            if not response or not response.get('stats'):
-                return None
-                
-            season_stats = response['stats'][0].get('splits', [])
-            if not season_stats:
+            if not stats:
                 return None
-                
-            stats = season_stats[0]['stat']
             
             return {
                 'games': stats.get('gamesPlayed', 0),
@@ -73,57 +73,13 @@ class BatterStatsSystem:
         except:
             return None
             
-    def _get_recent_ops(self, batter_id, season, games_count):
-        """最近N試合のOPSを計算"""
+    def _get_recent_ops(self, window, batter_id, games_count):
+        """最近N試合のOPS（ゲームログの累積和の差から求める）"""
         try:
-            game_logs = self.client._make_request(
-                f"people/{batter_id}/stats?stats=gameLog&season={season}&group=hitting"
-            )
-            
-            if not game_logs or not game_logs.get('stats'):
-                return 'N/A'
-                
-            games = game_logs['stats'][0].get('splits', [])[:games_count]
-            
-            if not games:
-                return 'N/A'
-                
-            total_ab = 0
-            total_h = 0
-            total_bb = 0
-            total_hbp = 0
-            total_sf = 0
-            total_tb = 0
-            
-            for game in games:
-                stat = game['stat']
-                ab = stat.get('atBats', 0)
-                h = stat.get('hits', 0)
-                bb = stat.get('baseOnBalls', 0)
-                hbp = stat.get('hitByPitch', 0)
-                sf = stat.get('sacFlies', 0)
-                
-                # 塁打数計算
-                singles = h - stat.get('doubles', 0) - stat.get('triples', 0) - stat.get('homeRuns', 0)
-                tb = singles + (2 * stat.get('doubles', 0)) + (3 * stat.get('triples', 0)) + (4 * stat.get('homeRuns', 0))
-                
-                total_ab += ab
-                total_h += h
-                total_bb += bb
-                total_hbp += hbp
-                total_sf += sf
-                total_tb += tb
-                
-            # OPS計算
-            pa = total_ab + total_bb + total_hbp + total_sf
-            if pa > 0 and total_ab > 0:
-                obp = (total_h + total_bb + total_hbp) / pa
-                slg = total_tb / total_ab
-                ops = obp + slg
-                return f"{ops:.3f}"
-            else:
-                return 'N/A'
-                
+            rates = window.rate(batter_id, games_count)
+            if rates['games'] > 0 and rates['pa'] > 0:
+                return f"{rates['ops']:.3f}"
+            return 'N/A'
         except:
             return 'N/A'
             
@@ -138,17 +94,24 @@ class BatterStatsSystem:
         except:
             return {'vs_left': 'N/A', 'vs_right': 'N/A'}
             
-    def format_lineup_report(self, team_name, lineup):
-        """打線レポートのフォーマット"""
+    def format_lineup_report(self, team_name, lineup, window=None):
+        """打線レポートのフォーマット（windowにスレート全体のゲームログの累積和を渡せる）"""
         report = f"**{team_name} - 予想打線**\n\n"
         
+        # 打線全員のシーズン統計を1リクエストで取得
+        batter_ids = [b['id'] for b in lineup[:9] if b and b.get('id')]
+        season_stats = self.client.get_players_stats_by_season(batter_ids, 2025, "hitting")
+        # 直近N試合は打線全員のゲームログの累積和から求める（保存済みでない打者の分だけ取得）
+        if window is None:
+            window = self.client.get_recent_form(batter_ids, 2025, "hitting")
+        
         for i, batter in enumerate(lineup[:9]):  # 1-9番打者
             if batter and batter.get('id'):
                 batter_id = batter['id']
                 batter_name = batter.get('fullName', 'Unknown')
                 position = batter.get('position', '')
                 
-                stats = self.get_batter_stats(batter_id, 2025)
+                stats = self.get_batter_stats(batter_id, 2025, season_stats.get(batter_id), window)
                 
                 if stats and stats['current']:
                     current = stats['current']
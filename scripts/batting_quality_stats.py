@@ -5,36 +5,26 @@ wOBA計算とBarrel%/Hard-Hit%の取得（Baseball Savant統合版）
 """
 
 import os
-import json
 import logging
-from datetime import datetime, timedelta
 import sys
 
 # savant_statcast_fetcherをインポート
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from scripts.savant_statcast_fetcher import SavantStatcastFetcher
+from src.sabermetrics import StatColumns, woba as calculate_woba
+from src.season_constants import season_constants
 
 class BattingQualityStats:
     """チーム打撃品質統計クラス"""
     
     def __init__(self):
         self.logger = logging.getLogger(__name__)
-        self.cache_dir = "cache/batting_quality"
-        os.makedirs(self.cache_dir, exist_ok=True)
         
-        # Savantデータフェッチャーを初期化
+        # Savantデータフェッチャーを初期化（キャッシュはフェッチャー側で保持）
         self.savant_fetcher = SavantStatcastFetcher()
         
-        # 2025年のwOBA係数（FanGraphs）
-        self.woba_weights = {
-            'bb': 0.696,
-            'hbp': 0.720,
-            '1b': 0.883,
-            '2b': 1.244,
-            '3b': 1.569,
-            'hr': 2.007
-        }
-        self.woba_scale = 1.157
+        # wOBA係数はリーグ合計から求めたシーズン定数（src/season_constants.py）を使う
+        self.season = 2025
         self.league_wobacon = 0.370
     
     def get_team_quality_stats(self, team_id):
@@ -48,18 +38,6 @@ class BattingQualityStats:
             dict: Barrel%, Hard-Hit%を含む辞書
         """
         try:
-            # キャッシュチェック
-            cache_file = os.path.join(self.cache_dir, f"team_{team_id}_quality.json")
-            
-            if os.path.exists(cache_file):
-                with open(cache_file, 'r', encoding='utf-8') as f:
-                    cache_data = json.load(f)
-                
-                cache_time = datetime.fromisoformat(cache_data['timestamp'])
-                if datetime.now() - cache_time < timedelta(hours=6):
-                    self.logger.info(f"Using cached quality stats for team {team_id}")
-                    return cache_data['data']
-            
             # Savantデータを取得
             statcast_data = self.savant_fetcher.get_team_statcast_data(team_id)
             
@@ -69,16 +47,6 @@ class BattingQualityStats:
                 'data_source': statcast_data['source']
             }
             
-            # キャッシュに保存
-            cache_data = {
-                'team_id': team_id,
-                'data': result,
-                'timestamp': datetime.now().isoformat()
-            }
-            
-            with open(cache_file, 'w', encoding='utf-8') as f:
-                json.dump(cache_data, f, ensure_ascii=False, indent=2)
-            
             return result
             
         except Exception as e:
@@ -119,34 +87,10 @@ class BattingQualityStats:
             dict: wOBAとxwOBAを含む辞書
         """
         try:
-            # 必要な統計を取得（文字列を数値に変換）
-            bb = self._safe_int(team_stats.get('baseOnBalls', 0))
-            hbp = self._safe_int(team_stats.get('hitByPitch', 0))
-            hits = self._safe_int(team_stats.get('hits', 0))
-            doubles = self._safe_int(team_stats.get('doubles', 0))
-            triples = self._safe_int(team_stats.get('triples', 0))
-            hr = self._safe_int(team_stats.get('homeRuns', 0))
-            ab = self._safe_int(team_stats.get('atBats', 0))
-            sf = self._safe_int(team_stats.get('sacFlies', 0))
-            ibb = self._safe_int(team_stats.get('intentionalWalks', 0))
-            
-            # シングルヒットを計算
-            singles = hits - doubles - triples - hr
-            
-            # wOBAを計算
-            numerator = (
-                self.woba_weights['bb'] * bb +
-                self.woba_weights['hbp'] * hbp +
-                self.woba_weights['1b'] * singles +
-                self.woba_weights['2b'] * doubles +
-                self.woba_weights['3b'] * triples +
-                self.woba_weights['hr'] * hr
-            )
-            
-            denominator = ab + bb - ibb + sf + hbp
-            
-            if denominator > 0:
-                woba = numerator / denominator
+            # 文字列の統計も数値の列に変換してエンジンで計算
+            cols = StatColumns.batting([team_stats])
+            if (cols['ab'] + cols['bb'] + cols['sf'] + cols['hbp'])[0] > 0:
+                woba = float(calculate_woba(cols, season_constants(self.season).woba_weights)[0])
             else:
                 woba = 0.300  # デフォルト値
             
@@ -3,7 +3,7 @@
 # -*- coding: utf-8 -*-
 """
 MLB Cached Stats System - キャッシュ機能付き
-Play-by-playデータをキャッシュして効率化
+Play-by-playデータを打席結果ストアに永続化して効率化
 
 実行: python -m scripts.cached_stats_system
 """
@@ -15,8 +15,9 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from datetime import datetime, timedelta
 import pytz
 from src.mlb_api_client import MLBApiClient
+from src.season_constants import season_constants
+from src.stat_line import PitchingLine, parse_outs
 from src.discord_client import DiscordClient
-import time
 import traceback
 
 class CachedStatsSystem:
@@ -25,34 +26,24 @@ class CachedStatsSystem:
         self.discord_client = DiscordClient()
         self.jst = pytz.timezone('Asia/Tokyo')
         self.est = pytz.timezone('US/Eastern')
-        # Play-by-playキャッシュを初期化
-        self.pbp_cache = {}
         
-    def _get_pbp_with_cache(self, game_pk):
-        """キャッシュ付きでPlay-by-playデータを取得"""
-        if game_pk in self.pbp_cache:
-            print(f"        キャッシュから取得: {game_pk}")
-            return self.pbp_cache[game_pk]
+    @property
+    def pbp_store(self):
+        """Play-by-playの打席結果ストア（cache/pbp_store.sqlite3、初回アクセス時に開く）"""
+        return self.client.pbp_store
         
-        print(f"        APIから取得: {game_pk}")
-        pbp = self.client._make_request(f"game/{game_pk}/playByPlay")
+    def get_pitcher_stats(self, pitcher_id, season, window=None):
+        """投手の全統計を取得（エラーハンドリング付き）
         
-        if pbp:
-            self.pbp_cache[game_pk] = pbp
-            
-        # API制限対策 - Play-by-play取得後は必ず2秒待機
-        time.sleep(2)
-        
-        return pbp
-        
-    def get_pitcher_stats(self, pitcher_id, season):
-        """投手の全統計を取得（エラーハンドリング付き）"""
+        windowにスレート全体の投手のゲームログの累積和（MLBApiClient.get_recent_form）を渡せる
+        """
         try:
             stats = {
                 'current': self._get_season_stats(pitcher_id, season),
                 'previous': self._get_season_stats(pitcher_id, season - 1),
                 'vs_left_right': self._get_vs_lr_stats(pitcher_id, season),
-                'recent_games': self._get_recent_games(pitcher_id, season)
+                'recent_games': self._get_recent_games(pitcher_id, season),
+                'recent_form': self._get_recent_form(pitcher_id, season, 5, window)
             }
             return stats
         except Exception as e:
@@ -61,7 +52,8 @@ class CachedStatsSystem:
                 'current': None,
                 'previous': None,
                 'vs_left_right': {'vs_left': 'N/A', 'vs_right': 'N/A'},
-                'recent_games': []
+                'recent_games': [],
+                'recent_form': None
             }
         
     def _get_season_stats(self, pitcher_id, season):
@@ -80,22 +72,9 @@ class CachedStatsSystem:
                 
             stats = season_stats[0]['stat']
             
-            # FIP計算
-            hr = stats.get('homeRuns', 0)
-            bb = stats.get('baseOnBalls', 0)
-            hbp = stats.get('hitByPitch', 0)
-            k = stats.get('strikeOuts', 0)
-            ip = float(stats.get('inningsPitched', '0'))
-            
-            if ip > 0:
-                fip = ((13 * hr) + (3 * (bb + hbp)) - (2 * k)) / ip + 3.2
-            else:
-                fip = 0
-                
-            # K%, BB%計算
-            batters_faced = stats.get('battersFaced', 0)
-            k_pct = (k / batters_faced * 100) if batters_faced > 0 else 0
-            bb_pct = (bb / batters_faced * 100) if batters_faced > 0 else 0
+            # FIP・K%・BB%（投球回はアウト数で扱い、FIP定数はシーズン定数）
+            rates = PitchingLine.from_stat(stats).rates(season_constants(season))
+            fip, k_pct, bb_pct = rates['fip'], rates['k_pct'], rates['bb_pct']
             
             # QS率計算（Game Logから）
             qs_rate = self._calculate_qs_rate(pitcher_id, season)
@@ -141,7 +120,7 @@ class CachedStatsSystem:
                 return 'N/A'
                 
             qs_count = sum(1 for g in starts 
-                          if float(g['stat'].get('inningsPitched', '0')) >= 6.0 
+                          if parse_outs(g['stat'].get('inningsPitched')) >= 18 
                           and g['stat'].get('earnedRuns', 0) <= 3)
             
             return f"{(qs_count / len(starts) * 100):.1f}%"
@@ -169,7 +148,7 @@ class CachedStatsSystem:
                 so = stat.get('strikeOuts', 0)
                 
                 # 三振を除いたアウト数
-                field_outs = float(stat.get('inningsPitched', '0')) * 3 - so
+                field_outs = parse_outs(stat.get('inningsPitched')) - so
                 
                 if field_outs > 0:
                     total_gb += gb
@@ -187,58 +166,15 @@ class CachedStatsSystem:
             return {'gb_pct': 'N/A', 'fb_pct': 'N/A'}
         
     def _get_vs_lr_stats(self, pitcher_id, season):
-        """対左右成績を取得（キャッシュ機能付き）"""
+        """対左右成績を取得（打席結果ストアから集計、未取り込みの試合のみPlay-by-playを取得）"""
         try:
             print(f"      対左右成績を取得中...")
-            game_logs = self.client._make_request(
-                f"people/{pitcher_id}/stats?stats=gameLog&season={season}&group=pitching"
-            )
-            
-            if not game_logs or not game_logs.get('stats'):
+            splits = self.client.get_platoon_splits(pitcher_id=pitcher_id, season=season, games=10)
+            if splits is None:
                 return {'vs_left': 'N/A', 'vs_right': 'N/A'}
-                
-            vs_left = {'pa': 0, 'ab': 0, 'h': 0}
-            vs_right = {'pa': 0, 'ab': 0, 'h': 0}
-            
-            # 最新10試合を維持（データの精度を保つ）
-            games = game_logs['stats'][0].get('splits', [])[:10]
+            vs_left = splits['vs_left']
+            vs_right = splits['vs_right']
             
-            for i, game in enumerate(games):
-                game_pk = game.get('game', {}).get('gamePk')
-                if not game_pk:
-                    continue
-                    
-                print(f"      試合 {i+1}/10 のPlay-by-play取得中...")
-                    
-                try:
-                    # キャッシュ機能を使用
-                    pbp = self._get_pbp_with_cache(game_pk)
-                    
-                    if pbp and 'allPlays' in pbp:
-                        for play in pbp['allPlays']:
-                            matchup = play.get('matchup', {})
-                            if matchup.get('pitcher', {}).get('id') != pitcher_id:
-                                continue
-                                
-                            batter_side = matchup.get('batSide', {}).get('code')
-                            event = play.get('result', {}).get('event', '')
-                            
-                            if not event:
-                                continue
-                                
-                            stats = vs_left if batter_side == 'L' else vs_right
-                            stats['pa'] += 1
-                            
-                            if event in ['Single', 'Double', 'Triple', 'Home Run']:
-                                stats['ab'] += 1
-                                stats['h'] += 1
-                            elif event in ['Strikeout', 'Groundout', 'Flyout', 'Lineout', 
-                                           'Pop Out', 'Grounded Into DP', 'Forceout']:
-                                stats['ab'] += 1
-                except Exception as e:
-                    print(f"        警告: 試合 {game_pk} の処理でエラー: {str(e)}")
-                    continue
-                        
             # 被打率計算
             left_avg = vs_left['h'] / vs_left['ab'] if vs_left['ab'] > 0 else 0
             right_avg = vs_right['h'] / vs_right['ab'] if vs_right['ab'] > 0 else 0
@@ -256,14 +192,9 @@ class CachedStatsSystem:
     def _get_recent_games(self, pitcher_id, season):
         """最近の試合成績を取得（エラーハンドリング付き）"""
         try:
-            game_logs = self.client._make_request(
-                f"people/{pitcher_id}/stats?stats=gameLog&season={season}&group=pitching"
-            )
-            
-            if not game_logs or not game_logs.get('stats'):
-                return []
-                
-            games = game_logs['stats'][0].get('splits', [])[:5]  # 最新5試合
+            # 表示用のゲームログ（新しい順）。直近N試合の集計は _get_recent_form が保存済みのログから行う
+            game_logs = self.client.get_player_game_logs([pitcher_id], season, 'pitching', store=False)
+            games = game_logs.get(pitcher_id, [])[:5]  # 最新5試合
             
             recent = []
             for game in games:
@@ -285,12 +216,31 @@ class CachedStatsSystem:
         except:
             return []
         
+    def _get_recent_form(self, pitcher_id, season, games, window=None):
+        """直近N試合のERA・FIP・K%（ゲームログの累積和の差から求める）"""
+        try:
+            if window is None:
+                # 保存済みでなければこの投手のゲームログを取得・保存する
+                window = self.client.get_recent_form([pitcher_id], season, 'pitching')
+            rates = window.rate(pitcher_id, games, constants=season_constants(season))
+            if rates['games'] == 0 or rates['ip'] == 0:
+                return None
+            return {
+                'games': int(rates['games']),
+                'era': f"{rates['era']:.2f}",
+                'fip': f"{rates['fip']:.2f}",
+                'k_pct': f"{rates['k_pct']:.1f}%"
+            }
+        except:
+            return None
+        
     def format_pitcher_report(self, pitcher_name, stats):
         """投手レポートのフォーマット"""
         current = stats['current']
         previous = stats['previous']
         vs_lr = stats['vs_left_right']
         recent = stats['recent_games']
+        form = stats.get('recent_form')
         
         report = f"**{pitcher_name} - 詳細統計**\n\n"
         
@@ -313,6 +263,8 @@ class CachedStatsSystem:
         # 最近の試合
         if recent:
             report += "**最近5試合**\n"
+            if form:
+                report += f"ERA: {form['era']} | FIP: {form['fip']} | K%: {form['k_pct']}\n"
             for i, game in enumerate(recent[:3]):  # 3試合のみ表示
                 report += f"{game['date']}: vs {game['opponent']} - "
                 report += f"{game['ip']}回 {game['er']}失点 {game['k']}K {game['bb']}BB\n"
@@ -368,7 +320,7 @@ class CachedStatsSystem:
         """キャッシュ機能付きレポートを実行"""
         print("MLB Cached Stats System - キャッシュ機能付き")
         print("="*50)
-        print(f"キャッシュサイズ: {len(self.pbp_cache)} 試合")
+        print(f"キャッシュサイズ: {self.pbp_store.game_count()} 試合")
         
         games = self.get_tomorrow_games()
         if not games:
@@ -377,6 +329,11 @@ class CachedStatsSystem:
             
         print(f"\n明日は{len(games)}試合あります。全試合を処理します...\n")
         
+        # 全試合の先発投手のゲームログをまとめて保存し、累積和を1回だけ作る
+        pitcher_ids = [game['teams'][side]['pitcher']['id'] for game in games for side in ('away', 'home')
+                       if (game['teams'][side].get('pitcher') or {}).get('id')]
+        window = self.client.get_recent_form(pitcher_ids, 2025, 'pitching')
+        
         success_count = 0
         error_count = 0
         
@@ -397,7 +354,7 @@ class CachedStatsSystem:
                         pitcher_id = pitcher['id']
                         
                         print(f"  {pitcher_name}の統計を取得中...")
-                        stats = self.get_pitcher_stats(pitcher_id, 2025)
+                        stats = self.get_pitcher_stats(pitcher_id, 2025, window)
                         
                         report += self.format_pitcher_report(pitcher_name, stats)
                         report += "\n" + "="*50 + "\n\n"
@@ -407,20 +364,16 @@ class CachedStatsSystem:
                 # 結果を表示
                 print(report[:300] + "...")  # 最初の300文字を表示
                 print(f"  ✓ 試合 {i+1} 完了")
-                print(f"  キャッシュサイズ: {len(self.pbp_cache)} 試合")
+                print(f"  キャッシュサイズ: {self.pbp_store.game_count()} 試合")
                 success_count += 1
                 
             except Exception as e:
                 print(f"  ✗ 試合 {i+1} エラー: {str(e)}")
                 error_count += 1
                 traceback.print_exc()
-                
-            # API制限対策
-            print("  待機中...")
-            time.sleep(1)  # Play-by-playは個別に2秒待機するので、ここは1秒で十分
             
         print(f"\n処理完了: 成功 {success_count}試合, エラー {error_count}試合")
-        print(f"最終キャッシュサイズ: {len(self.pbp_cache)} 試合")
+        print(f"最終キャッシュサイズ: {self.pbp_store.game_count()} 試合")
 
 if __name__ == "__main__":
     system = CachedStatsSystem()
@@ -1,14 +1,18 @@
-import requests
-import time
+import os
+import sys
 from typing import Dict, Tuple
 from datetime import datetime, timedelta
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.http_session import get_shared_session
+
 class GBFBCalculator:
     """Play-by-playデータからGB%とFB%を計算"""
     
     def __init__(self):
         self.base_url = "https://statsapi.mlb.com/api/v1"
-        self.session = requests.Session()
+        # プロセス共通のSession（キャッシュ・レート制限・keep-alive共有）
+        self.session = get_shared_session()
     
     def calculate_pitcher_gb_fb(self, pitcher_id: int, limit_games: int = 5) -> Tuple[float, float]:
         """投手の最近の試合からGB%とFB%を計算"""
@@ -29,8 +33,6 @@ class GBFBCalculator:
                 total_ground_balls += gb
                 total_fly_balls += fb
                 total_balls_in_play += bip
-                
-                time.sleep(0.5)  # API制限対策
             
             if total_balls_in_play == 0:
                 return 0.0, 0.0
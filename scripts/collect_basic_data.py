@@ -6,6 +6,7 @@ import json
 import os
 from datetime import datetime
 from src.mlb_api_client import MLBApiClient
+from src.stat_store import GROUPS, get_default_stat_store
 import time
 
 
@@ -13,6 +14,7 @@ class DataCollector:
     def __init__(self):
         self.client = MLBApiClient()
         self.base_path = "data/raw"
+        self.stat_store = get_default_stat_store()
         
     def save_json(self, data, filepath):
         """JSONファイルとして保存"""
@@ -115,6 +117,31 @@ class DataCollector:
             print(f"❌ エラー: {e}")
             return []
             
+    def collect_team_stats(self, team_id, season=2025):
+        """チーム全選手のシーズン成績（投球・打撃）を取得
+        
+        Returns:
+            dict: {group: {player_id: シーズン統計}}
+        """
+        stats = {}
+        for group in GROUPS:
+            roster = self.client.get_team_roster_with_stats(team_id, season, group)
+            stats[group] = {player['person']['id']: player.get('season_stats', {})
+                            for player in roster if player.get('person', {}).get('id')}
+        return stats
+        
+    def save_season_stats(self, stats_by_team, season=2025):
+        """収集したシーズン成績を列指向ストアにまとめて保存"""
+        for group in GROUPS:
+            stats = {}
+            team_ids = {}
+            for team_id, team_stats in stats_by_team.items():
+                for player_id, stat in team_stats[group].items():
+                    stats[player_id] = stat
+                    team_ids[player_id] = team_id
+            count = self.stat_store.write_season(season, group, stats, team_ids)
+            print(f"✅ 保存完了: {self.stat_store.root}/{season}_{group}_season.npy ({count}人)")
+        
     def collect_all_data(self, season=2025):
         """全データを収集するメイン関数"""
         print(f"\n{'='*50}")
@@ -128,6 +155,7 @@ class DataCollector:
         print(f"\n📋 各チームのロースター情報を収集します")
         print("（デモのため最初の5チームのみ）")
         
+        stats_by_team = {}
         for i, team in enumerate(teams[:5]):  # 最初の5チームのみ
             print(f"\n[{i+1}/5]", end="")
             self.collect_team_roster(
@@ -135,6 +163,10 @@ class DataCollector:
                 team['name'], 
                 season
             )
+            stats_by_team[team['id']] = self.collect_team_stats(team['id'], season)
+            
+        # 3. 選手のシーズン成績をストアに保存（選手ごとのファイルは作らない）
+        self.save_season_stats(stats_by_team, season)
             
         print(f"\n{'='*50}")
         print(f"✨ データ収集完了！")
@@ -151,6 +183,7 @@ def main():
     print("\n💡 ヒント:")
     print("- data/raw/teams/ フォルダにチーム情報が保存されています")
     print("- data/raw/players/ フォルダに選手情報が保存されています")
+    print("- cache/stat_store/ に選手のシーズン成績が保存されています")
     print("- 全チームのデータを収集するには、teams[:5]をteamsに変更してください")
     
 
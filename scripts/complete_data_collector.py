@@ -69,27 +69,27 @@ class CompleteDataCollector:
         
     def _get_game_team_stats(self, game_pk: int, team_id: int, is_home: bool) -> Dict:
         """特定試合のチーム打撃統計を取得"""
-        boxscore = self.client._make_request(f"game/{game_pk}/boxscore")
+        lines = self.client.get_game_batting_lines(game_pk)
         
-        if not boxscore:
+        if not lines:
             return {}
             
         try:
             team_type = 'home' if is_home else 'away'
-            team_stats = boxscore['teams'][team_type]['teamStats']['batting']
+            line = lines[team_type]
             
             # OPS計算 (OBP + SLG)
-            obp = float(team_stats.get('obp', 0))
-            slg = float(team_stats.get('slg', 0))
+            obp = float(line.obp)
+            slg = float(line.slg)
             ops = obp + slg
             
             return {
-                'avg': team_stats.get('avg', '.000'),
-                'obp': team_stats.get('obp', '.000'),
-                'slg': team_stats.get('slg', '.000'),
+                'avg': line.avg,
+                'obp': line.obp,
+                'slg': line.slg,
                 'ops': f"{ops:.3f}",
-                'hits': team_stats.get('hits', 0),
-                'runs': team_stats.get('runs', 0)
+                'hits': line.hits,
+                'runs': line.runs
             }
         except:
             return {}
@@ -8,9 +8,15 @@ MLBレポートをHTMLに変換するスクリプト（1ページ最適配置版
 
 import re
 import os
+import sys
 from pathlib import Path
 from datetime import datetime
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src import template_engine
+from src.asset_cache import get_asset_cache
+from src.report_model import SlateReport, format_stat
+
 # チーム名とロゴのマッピング（既存のまま）
 TEAM_LOGOS = {
     'Blue Jays': 'https://a.espncdn.com/i/teamlogos/mlb/500/tor.png',
@@ -76,8 +82,9 @@ TEAM_LOGOS = {
 }
 
 def get_team_logo(team_name):
-    """チーム名からロゴURLを取得"""
-    return TEAM_LOGOS.get(team_name, 'https://a.espncdn.com/i/teamlogos/mlb/500/mlb.png')
+    """チーム名からロゴを取得（キャッシュ済みのdata URI、なければ外部URL）"""
+    fallback = TEAM_LOGOS.get(team_name, 'https://a.espncdn.com/i/teamlogos/mlb/500/mlb.png')
+    return get_asset_cache().logo_data_uri(team_name, fallback=fallback)
 
 def parse_report(file_path):
     """レポートをパースして試合データを抽出"""
@@ -121,6 +128,118 @@ def parse_report(file_path):
     
     return games
 
+def games_from_slate(slate):
+    """構造化レポート(SlateReport)から試合データを生成（parse_reportと同じ形式）"""
+    games = []
+    for game in slate.games:
+        if game.away is None or game.home is None:
+            continue
+        games.append({
+            'away_team': game.away.name,
+            'home_team': game.home.name,
+            'start_time': game.start_label,
+            'away_data': team_data_from_card(game.away),
+            'home_data': team_data_from_card(game.home)
+        })
+    return games
+
+def team_data_from_card(team):
+    """TeamCardをparse_team_dataと同じ形式の辞書に変換"""
+    data = {
+        'team': team.name,
+        'pitcher': {},
+        'bullpen': {},
+        'batting': {},
+        'stats': {}
+    }
+    
+    p = team.pitcher
+    if p:
+        data['pitcher'] = {
+            'name': p.name,
+            'hand': p.hand_label,
+            'wins': str(p.wins),
+            'losses': str(p.losses),
+            'era': f"{p.era:.2f}",
+            'fip': f"{p.fip:.2f}",
+            'xfip': f"{p.xfip:.2f}",
+            'whip': f"{p.whip:.2f}",
+            'k_bb': f"{p.k_bb_pct:.1f}",
+            'gb': f"{p.gb_pct:.1f}",
+            'fb': f"{p.fb_pct:.1f}",
+            'qs': f"{p.qs_rate:.1f}",
+            'swstr': f"{p.swstr_pct:.1f}",
+            'babip': f"{p.babip:.3f}",
+            'vs_left_avg': f"{p.vs_left_avg:.3f}",
+            'vs_left_ops': f"{p.vs_left_ops:.3f}",
+            'vs_right_avg': f"{p.vs_right_avg:.3f}",
+            'vs_right_ops': f"{p.vs_right_ops:.3f}"
+        }
+        data['stats']['sp_name'] = p.name
+        data['stats']['sp_xfip'] = p.xfip
+    elif not team.pitcher_id:
+        data['pitcher'] = {'name': '未定', 'hand': '', 'wins': '0', 'losses': '0'}
+        data['stats']['sp_name'] = '未定'
+    
+    bp = team.bullpen
+    if bp:
+        data['bullpen'] = {
+            'count': str(bp.count),
+            'era': format_stat(bp.era),
+            'fip': format_stat(bp.fip),
+            'xfip': format_stat(bp.xfip),
+            'whip': format_stat(bp.whip),
+            'k_bb': format_stat(bp.k_bb_pct, '.1f')
+        }
+        if bp.fip is not None:
+            data['stats']['bp_fip'] = bp.fip
+        if bp.closer:
+            data['bullpen']['closer'] = bp.closer.name
+            data['bullpen']['closer_fip'] = f"{bp.closer.fip:.2f}"
+        if bp.setup_men:
+            data['bullpen']['setup'] = ', '.join(f"{s.name} (FIP: {s.fip:.2f})" for s in bp.setup_men)
+        if bp.fatigue_note:
+            data['bullpen']['fatigue'] = bp.fatigue_note
+    
+    b = team.batting
+    if b:
+        data['batting'] = {
+            'barrel': f"{b.barrel_pct:.1f}",
+            'hardhit': f"{b.hard_hit_pct:.1f}",
+            'ops_5': f"{b.recent_ops_5:.3f}",
+            'ops_10': f"{b.recent_ops_10:.3f}"
+        }
+        data['stats']['bat_ops_10g'] = b.recent_ops_10
+        if b.has_season:
+            data['batting'].update({
+                'avg': f"{b.avg:.3f}",
+                'ops': f"{b.ops:.3f}",
+                'runs': str(b.runs),
+                'hr': str(b.home_runs),
+                'woba': f"{b.woba:.3f}",
+                'xwoba': f"{b.xwoba:.3f}",
+                'vs_left_avg': f"{b.vs_left_avg:.3f}",
+                'vs_left_ops': f"{b.vs_left_ops:.3f}",
+                'vs_right_avg': f"{b.vs_right_avg:.3f}",
+                'vs_right_ops': f"{b.vs_right_ops:.3f}"
+            })
+    
+    data['stats'].setdefault('sp_xfip', 99)
+    data['stats'].setdefault('bp_fip', 99)
+    data['stats'].setdefault('bat_ops_10g', 0)
+    
+    return data
+
+def load_games(input_file):
+    """入力ファイルから試合データを取得（構造化データがあればテキストを再パースしない）"""
+    input_path = Path(input_file)
+    if input_path.suffix in ('.json', '.msgpack'):
+        return games_from_slate(SlateReport.load(input_path))
+    model_path = input_path.with_suffix('.json')
+    if model_path.exists():
+        return games_from_slate(SlateReport.load(model_path))
+    return parse_report(input_file)
+
 def parse_team_data(content, team_name, is_away):
     """チームデータをパース（既存のまま）"""
     data = {
@@ -330,127 +449,59 @@ def generate_summary(away_data, home_data):
     else:
         return conclusion
 
-def create_game_page(game_data):
-    """1試合分のHTMLページを生成（空白最適化版）"""
-    away_team = game_data['away_team']
-    home_team = game_data['home_team']
+PITCHER_FIELDS = ('era', 'fip', 'xfip', 'whip', 'k_bb', 'qs', 'gb', 'swstr', 'babip', 'vs_left_ops', 'vs_right_ops')
+BULLPEN_FIELDS = ('era', 'fip', 'xfip', 'closer', 'closer_fip', 'fatigue')
+BATTING_FIELDS = ('avg', 'ops', 'woba', 'xwoba', 'ops_10')
+
+def _team_page_context(team_data, opponent_pitcher, ops_10, opponent_ops_10):
+    """片方のチームのページ描画用データ（欠損値は表示用の既定値で埋める）"""
+    pitcher = team_data.get('pitcher', {})
+    opponent_hand = opponent_pitcher.get('hand')
+    return {
+        'team': team_data['team'],
+        'logo': get_team_logo(team_data['team']),
+        'tbd': pitcher.get('name') == '未定' or not pitcher.get('name'),
+        'pitcher': {**dict.fromkeys(PITCHER_FIELDS, '---'), 'name': '未定', 'hand': '',
+                    'wins': '0', 'losses': '0', **pitcher},
+        'bullpen': {**dict.fromkeys(BULLPEN_FIELDS, '---'), 'count': '?', **team_data.get('bullpen', {})},
+        'batting': {**dict.fromkeys(BATTING_FIELDS, '---'), **team_data.get('batting', {})},
+        'vs_type': "vs RHP" if opponent_hand == '右' else "vs LHP" if opponent_hand == '左' else "攻撃",
+        'ops_class': "text-red-600 font-bold" if ops_10 > opponent_ops_10 else "text-blue-600"
+    }
+
+def game_page_context(game_data):
+    """1試合分のページ描画用データを作成"""
     away_data = game_data['away_data']
     home_data = game_data['home_data']
-    start_time = game_data.get('start_time', '未定')
-    
-    def get_hand_badge(hand):
-        if hand == '右':
-            return '<span class="handedness-rhp">右</span>'
-        elif hand == '左':
-            return '<span class="handedness-lhp">左</span>'
-        else:
-            return ''
-    
-    away_pitcher = away_data.get('pitcher', {})
-    home_pitcher = home_data.get('pitcher', {})
-    
-    away_pitcher_html = ''
-    home_pitcher_html = ''
-    
-    if away_pitcher.get('name') == '未定' or not away_pitcher.get('name'):
-        away_pitcher_html = '<div class="no-sp mt-2">先発投手 未定</div>'
-    else:
-        away_pitcher_html = f'''
-            <p class="text-lg font-bold">{away_pitcher.get('name', '未定')} {get_hand_badge(away_pitcher.get('hand', ''))}</p>
-            <p class="text-gray-600 data-font">{away_pitcher.get('wins', '0')}勝{away_pitcher.get('losses', '0')}敗</p>
-        '''
-    
-    if home_pitcher.get('name') == '未定' or not home_pitcher.get('name'):
-        home_pitcher_html = '<div class="no-sp mt-2">先発投手 未定</div>'
-    else:
-        home_pitcher_html = f'''
-            <p class="text-lg font-bold">{home_pitcher.get('name', '未定')} {get_hand_badge(home_pitcher.get('hand', ''))}</p>
-            <p class="text-gray-600 data-font">{home_pitcher.get('wins', '0')}勝{home_pitcher.get('losses', '0')}敗</p>
-        '''
-    
-    summary = generate_summary(away_data, home_data)
-    
-    away_vs_type = "vs RHP" if home_pitcher.get('hand') == '右' else "vs LHP" if home_pitcher.get('hand') == '左' else "攻撃"
-    home_vs_type = "vs RHP" if away_pitcher.get('hand') == '右' else "vs LHP" if away_pitcher.get('hand') == '左' else "攻撃"
     
     away_ops_10 = float(away_data.get('batting', {}).get('ops_10', '0') or '0')
     home_ops_10 = float(home_data.get('batting', {}).get('ops_10', '0') or '0')
     
-    away_ops_class = "text-red-600 font-bold" if away_ops_10 > home_ops_10 else "text-blue-600"
-    home_ops_class = "text-red-600 font-bold" if home_ops_10 > away_ops_10 else "text-blue-600"
-    
-    html = f'''
-    <div class="game-page">
-        <header class="flex justify-between items-center pb-3 border-b-2 border-gray-400">
-            <div class="team-info text-center w-1/3">
-                <img src="{get_team_logo(away_team)}" alt="{away_team} Logo" class="w-14 h-14 mx-auto mb-2">
-                <h1 class="text-2xl font-black">{away_team}</h1>
-                {away_pitcher_html}
-            </div>
-            <div class="game-time text-center w-1/3">
-                <p class="text-sm text-gray-500 mb-1">日本時間</p>
-                <p class="text-4xl font-bold">{start_time}</p>
-                <p class="text-base font-bold mt-1">試合開始</p>
-            </div>
-            <div class="team-info text-center w-1/3">
-                <img src="{get_team_logo(home_team)}" alt="{home_team} Logo" class="w-14 h-14 mx-auto mb-2">
-                <h1 class="text-2xl font-black">{home_team}</h1>
-                {home_pitcher_html}
-            </div>
-        </header>
-        <main class="flex-grow mt-4 grid grid-cols-2 gap-6">
-            <div class="team-stats">
-                <section class="mb-4">
-                    <h2 class="section-title">先発投手: {away_pitcher.get('name', '未定')}</h2>
-                    <div class="stat-item"><span class="label">ERA/FIP/xFIP</span><span class="value data-font">{away_pitcher.get('era', '---')}/{away_pitcher.get('fip', '---')}/{away_pitcher.get('xfip', '---')}</span></div>
-                    <div class="stat-item"><span class="label">WHIP/K-BB%</span><span class="value data-font">{away_pitcher.get('whip', '---')}/{away_pitcher.get('k_bb', '---')}%</span></div>
-                    <div class="stat-item"><span class="label">QS率/GB%</span><span class="value data-font">{away_pitcher.get('qs', '---')}%/{away_pitcher.get('gb', '---')}%</span></div>
-                    <div class="stat-item"><span class="label">SwStr%/BABIP</span><span class="value data-font">{away_pitcher.get('swstr', '---')}%/{away_pitcher.get('babip', '---')}</span></div>
-                    <div class="stat-item"><span class="label">対左/右 OPS</span><span class="value data-font">{away_pitcher.get('vs_left_ops', '---')}/{away_pitcher.get('vs_right_ops', '---')}</span></div>
-                </section>
-                <section class="mb-4">
-                    <h2 class="section-title">中継ぎ陣 ({away_data.get('bullpen', {}).get('count', '?')}名)</h2>
-                    <div class="stat-item"><span class="label">ERA/FIP/xFIP</span><span class="value data-font">{away_data.get('bullpen', {}).get('era', '---')}/{away_data.get('bullpen', {}).get('fip', '---')}/{away_data.get('bullpen', {}).get('xfip', '---')}</span></div>
-                    <div class="stat-item"><span class="label">CL FIP</span><span class="value data-font">{away_data.get('bullpen', {}).get('closer_fip', '---')} ({away_data.get('bullpen', {}).get('closer', '---')})</span></div>
-                    <div class="stat-item"><span class="label">疲労度</span><span class="value">{away_data.get('bullpen', {}).get('fatigue', '---')}</span></div>
-                </section>
-                <section>
-                    <h2 class="section-title">攻撃 ({away_vs_type})</h2>
-                    <div class="stat-item"><span class="label">AVG/OPS</span><span class="value data-font">{away_data.get('batting', {}).get('avg', '---')}/{away_data.get('batting', {}).get('ops', '---')}</span></div>
-                    <div class="stat-item"><span class="label">wOBA/xwOBA</span><span class="value data-font">{away_data.get('batting', {}).get('woba', '---')}/{away_data.get('batting', {}).get('xwoba', '---')}</span></div>
-                    <div class="stat-item"><span class="label">過去10試合 OPS</span><span class="value data-font {away_ops_class}">{away_data.get('batting', {}).get('ops_10', '---')}</span></div>
-                </section>
-            </div>
-            <div class="team-stats">
-                <section class="mb-4">
-                    <h2 class="section-title">先発投手: {home_pitcher.get('name', '未定')}</h2>
-                    <div class="stat-item"><span class="label">ERA/FIP/xFIP</span><span class="value data-font">{home_pitcher.get('era', '---')}/{home_pitcher.get('fip', '---')}/{home_pitcher.get('xfip', '---')}</span></div>
-                    <div class="stat-item"><span class="label">WHIP/K-BB%</span><span class="value data-font">{home_pitcher.get('whip', '---')}/{home_pitcher.get('k_bb', '---')}%</span></div>
-                    <div class="stat-item"><span class="label">QS率/GB%</span><span class="value data-font">{home_pitcher.get('qs', '---')}%/{home_pitcher.get('gb', '---')}%</span></div>
-                    <div class="stat-item"><span class="label">SwStr%/BABIP</span><span class="value data-font">{home_pitcher.get('swstr', '---')}%/{home_pitcher.get('babip', '---')}</span></div>
-                    <div class="stat-item"><span class="label">対左/右 OPS</span><span class="value data-font">{home_pitcher.get('vs_left_ops', '---')}/{home_pitcher.get('vs_right_ops', '---')}</span></div>
-                </section>
-                <section class="mb-4">
-                    <h2 class="section-title">中継ぎ陣 ({home_data.get('bullpen', {}).get('count', '?')}名)</h2>
-                    <div class="stat-item"><span class="label">ERA/FIP/xFIP</span><span class="value data-font">{home_data.get('bullpen', {}).get('era', '---')}/{home_data.get('bullpen', {}).get('fip', '---')}/{home_data.get('bullpen', {}).get('xfip', '---')}</span></div>
-                    <div class="stat-item"><span class="label">CL FIP</span><span class="value data-font">{home_data.get('bullpen', {}).get('closer_fip', '---')} ({home_data.get('bullpen', {}).get('closer', '---')})</span></div>
-                    <div class="stat-item"><span class="label">疲労度</span><span class="value">{home_data.get('bullpen', {}).get('fatigue', '---')}</span></div>
-                </section>
-                <section>
-                    <h2 class="section-title">攻撃 ({home_vs_type})</h2>
-                    <div class="stat-item"><span class="label">AVG/OPS</span><span class="value data-font">{home_data.get('batting', {}).get('avg', '---')}/{home_data.get('batting', {}).get('ops', '---')}</span></div>
-                    <div class="stat-item"><span class="label">wOBA/xwOBA</span><span class="value data-font">{home_data.get('batting', {}).get('woba', '---')}/{home_data.get('batting', {}).get('xwoba', '---')}</span></div>
-                    <div class="stat-item"><span class="label">過去10試合 OPS</span><span class="value data-font {home_ops_class}">{home_data.get('batting', {}).get('ops_10', '---')}</span></div>
-                </section>
-            </div>
-        </main>
-        <footer class="mt-auto pt-3 border-t-3 border-black">
-            <h3 class="text-xl font-bold mb-2">総括</h3>
-            <p class="text-base leading-relaxed">{summary}</p>
-        </footer>
-    </div>
-    '''
-    return html
+    return {
+        'start_time': game_data.get('start_time', '未定'),
+        'away': _team_page_context(away_data, home_data.get('pitcher', {}), away_ops_10, home_ops_10),
+        'home': _team_page_context(home_data, away_data.get('pitcher', {}), home_ops_10, away_ops_10),
+        'summary': generate_summary(away_data, home_data)
+    }
+
+def create_game_page(game_data):
+    """1試合分のHTMLページを生成（空白最適化版）"""
+    return template_engine.render('report_game_page.html.j2', page=game_page_context(game_data))
+
+def render_html(games, japan_time=None):
+    """試合データのリストからHTML文書全体を生成"""
+    return template_engine.render('report_slate.html.j2', **_slate_context(games, japan_time))
+
+def write_html(games, output_file, japan_time=None):
+    """HTML文書をファイルへストリーム出力"""
+    return template_engine.render_to_file('report_slate.html.j2', output_file, **_slate_context(games, japan_time))
+
+def _slate_context(games, japan_time):
+    return {
+        'japan_time': japan_time or datetime.now().strftime('%Y/%m/%d'),
+        # ページは描画しながら1試合ずつ作成する
+        'pages': (game_page_context(game) for game in games)
+    }
 
 def convert_to_html(input_file, output_file=None):
     """メイン変換処理"""
@@ -460,7 +511,7 @@ def convert_to_html(input_file, output_file=None):
         output_dir.mkdir(parents=True, exist_ok=True)
         output_file = output_dir / f"{base_name}.html"
     
-    games = parse_report(input_file)
+    games = load_games(input_file)
     
     print(f"見つかった試合数: {len(games)}")
     
@@ -468,207 +519,7 @@ def convert_to_html(input_file, output_file=None):
         print("エラー: 試合データが見つかりませんでした")
         return
     
-    date_match = re.search(r'(\d+月\d+日)', str(input_file))
-    date_str = date_match.group(1) if date_match else datetime.now().strftime('%m月%d日')
-    
-    japan_time = datetime.now().strftime('%Y/%m/%d')
-    
-    # HTML生成（空白最適化版）
-    html_content = f'''<!DOCTYPE html>
-<html lang="ja">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>MLB試合予想レポート - 日本時間 {japan_time} の試合</title>
-    <script src="https://cdn.tailwindcss.com"></script>
-    <link rel="preconnect" href="https://fonts.googleapis.com">
-    <link rel="preconnect" href="https://fonts.gstatic.com" crossorigin>
-    <link href="https://fonts.googleapis.com/css2?family=Noto+Sans+JP:wght@400;700;900&family=Roboto+Mono:wght@400;700&display=swap" rel="stylesheet">
-    <style>
-        body {{
-            font-family: 'Noto Sans JP', sans-serif;
-            background-color: #f3f4f6;
-            margin: 0;
-            padding: 0;
-        }}
-        .game-page {{
-            width: 210mm;
-            height: 297mm;
-            padding: 12mm 10mm;
-            margin: 0 auto;
-            background-color: white;
-            box-shadow: 0 0 10px rgba(0,0,0,0.1);
-            display: flex;
-            flex-direction: column;
-            box-sizing: border-box;
-        }}
-        .data-font {{
-            font-family: 'Roboto Mono', monospace;
-            font-size: 0.9rem;
-        }}
-        header {{
-            flex-shrink: 0;
-            padding-bottom: 1rem;
-            margin-bottom: 1rem;
-        }}
-        main {{
-            flex: 1;
-            display: grid;
-            grid-template-columns: 1fr 1fr;
-            gap: 1.5rem;
-            align-content: start;
-        }}
-        .team-stats {{
-            display: grid;
-            grid-template-rows: auto auto auto;
-            align-content: start;
-        }}
-        .team-stats section {{
-            min-height: 165px;
-            display: flex;
-            flex-direction: column;
-        }}
-        .team-stats section:first-child {{
-            min-height: 200px;
-        }}
-        .team-stats section:nth-child(2) {{
-            min-height: 120px;
-        }}
-        .team-stats section:last-child {{
-            min-height: 120px;
-        }}
-        footer {{
-            flex-shrink: 0;
-            padding-top: 1rem;
-            margin-top: auto;
-        }}
-        .team-info h1 {{
-            font-size: 1.75rem !important;
-            margin: 0.5rem 0;
-        }}
-        .team-info p {{
-            font-size: 1rem !important;
-            margin: 0.25rem 0;
-        }}
-        .game-time p {{
-            margin: 0.25rem 0;
-        }}
-        .game-time .text-4xl {{
-            font-size: 2.25rem !important;
-        }}
-        .section-title {{
-            font-size: 1.1rem;
-            font-weight: 700;
-            color: #1e3a8a;
-            border-bottom: 2px solid #93c5fd;
-            padding-bottom: 0.25rem;
-            margin-bottom: 0.75rem;
-            display: block;
-            width: 100%;
-        }}
-        .stat-item {{
-            display: flex;
-            justify-content: space-between;
-            align-items: center;
-            padding: 0.4rem 0;
-            border-bottom: 1px solid #e5e7eb;
-            font-size: 0.9rem;
-            line-height: 1.4;
-        }}
-        .stat-item .label {{
-            color: #4b5563;
-            font-size: 0.85rem;
-        }}
-        .stat-item .value {{
-            font-weight: 700;
-            color: #111827;
-            font-size: 0.85rem;
-        }}
-        .team-stats section {{
-            margin-bottom: 1.5rem !important;
-            min-height: 165px;
-            display: flex;
-            flex-direction: column;
-        }}
-        .team-stats section:first-child {{
-            min-height: 200px;
-        }}
-        .team-stats section:nth-child(2) {{
-            min-height: 120px;
-        }}
-        .team-stats section:last-child {{
-            min-height: 120px;
-            margin-bottom: 0 !important;
-        }}
-        .handedness-rhp {{
-            background-color: #ef4444;
-            color: white;
-            padding: 0.1rem 0.4rem;
-            border-radius: 9999px;
-            font-size: 0.75rem;
-            font-weight: 700;
-            display: inline-block;
-        }}
-        .handedness-lhp {{
-            background-color: #3b82f6;
-            color: white;
-            padding: 0.1rem 0.4rem;
-            border-radius: 9999px;
-            font-size: 0.75rem;
-            font-weight: 700;
-            display: inline-block;
-        }}
-        .no-sp {{
-            display: flex;
-            justify-content: center;
-            align-items: center;
-            height: 60px;
-            background-color: #f9fafb;
-            color: #6b7280;
-            font-weight: 700;
-            font-size: 0.9rem;
-            border-radius: 0.375rem;
-            margin-top: 0.75rem;
-        }}
-        footer h3 {{
-            font-size: 1.25rem !important;
-            margin-bottom: 0.5rem !important;
-        }}
-        footer p {{
-            font-size: 1rem !important;
-            line-height: 1.6 !important;
-            margin: 0 !important;
-        }}
-        @media print {{
-            body {{
-                margin: 0;
-                padding: 0;
-                background: white;
-            }}
-            .game-page {{
-                margin: 0;
-                padding: 10mm;
-                box-shadow: none;
-                page-break-after: always;
-                page-break-inside: avoid;
-                height: 297mm;
-                width: 210mm;
-            }}
-        }}
-    </style>
-</head>
-<body class="bg-gray-200">
-'''
-    
-    for game in games:
-        html_content += create_game_page(game)
-    
-    html_content += '''
-</body>
-</html>'''
-    
-    with open(output_file, 'w', encoding='utf-8') as f:
-        f.write(html_content)
+    write_html(games, output_file)
     
     print(f"✅ HTMLファイルを生成しました: {output_file}")
     print(f"   サイズ: {Path(output_file).stat().st_size / 1024:.1f} KB")
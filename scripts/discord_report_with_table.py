@@ -15,13 +15,12 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from datetime import datetime, timedelta
 import pytz
 from src.mlb_api_client import MLBApiClient
+from src.season_constants import season_constants
+from src.stat_line import PitchingLine
 from src.discord_client import DiscordClient
-import time
-import matplotlib.pyplot as plt
-import matplotlib.patches as patches
-from matplotlib.font_manager import FontProperties
-import requests
-from dotenv import load_dotenv
+from src.discord_publisher import DiscordMessage
+from src.report_model import format_stat
+from src.table_renderer import render_table_png, render_tables
 
 class DiscordReportWithTable:
     def __init__(self):
@@ -29,7 +28,6 @@ class DiscordReportWithTable:
         self.discord_client = DiscordClient()
         self.jst = pytz.timezone('Asia/Tokyo')
         self.est = pytz.timezone('US/Eastern')
-        self.pbp_cache = {}
         
     def get_complete_pitcher_stats(self, pitcher_id, pitcher_name, season):
         """投手の完全統計を取得"""
@@ -47,19 +45,9 @@ class DiscordReportWithTable:
                 
             stats = season_stats[0]['stat']
             
-            # FIP計算
-            hr = stats.get('homeRuns', 0)
-            bb = stats.get('baseOnBalls', 0)
-            hbp = stats.get('hitByPitch', 0)
-            k = stats.get('strikeOuts', 0)
-            ip = float(stats.get('inningsPitched', '0'))
-            
-            fip = ((13 * hr) + (3 * (bb + hbp)) - (2 * k)) / ip + 3.2 if ip > 0 else 0
-            
-            # K%, BB%計算
-            batters_faced = stats.get('battersFaced', 0)
-            k_pct = (k / batters_faced * 100) if batters_faced > 0 else 0
-            bb_pct = (bb / batters_faced * 100) if batters_faced > 0 else 0
+            # FIP・K%・BB%（投球回はアウト数で扱い、FIP定数はシーズン定数）
+            rates = PitchingLine.from_stat(stats).rates(season_constants(season))
+            fip, k_pct, bb_pct = rates['fip'], rates['k_pct'], rates['bb_pct']
             
             # QS率計算（省略）
             qs_rate = 'N/A'
@@ -169,33 +157,21 @@ class DiscordReportWithTable:
             total_hr = 0
             
             for game_info in completed_games[:games_count]:
-                boxscore = self.client._make_request(f"game/{game_info['gamePk']}/boxscore")
+                lines = self.client.get_game_batting_lines(game_info['gamePk'])
                 
-                if boxscore and 'teams' in boxscore:
-                    # 自チームのデータを取得
-                    side = 'home' if game_info['is_home'] else 'away'
-                    team_data = boxscore['teams'][side]
+                # 自チームのデータを取得
+                side = 'home' if game_info['is_home'] else 'away'
+                if side in lines:
+                    line = lines[side]
                     
-                    if 'teamStats' in team_data and 'batting' in team_data['teamStats']:
-                        batting = team_data['teamStats']['batting']
-                        
-                        ab = batting.get('atBats', 0)
-                        h = batting.get('hits', 0)
-                        bb = batting.get('baseOnBalls', 0)
-                        hbp = batting.get('hitByPitch', 0)
-                        sf = batting.get('sacFlies', 0)
-                        doubles = batting.get('doubles', 0)
-                        triples = batting.get('triples', 0)
-                        hr = batting.get('homeRuns', 0)
-                        
-                        total_ab += ab
-                        total_h += h
-                        total_bb += bb
-                        total_hbp += hbp
-                        total_sf += sf
-                        total_2b += doubles
-                        total_3b += triples
-                        total_hr += hr
+                    total_ab += line.at_bats
+                    total_h += line.hits
+                    total_bb += line.base_on_balls
+                    total_hbp += line.hit_by_pitch
+                    total_sf += line.sac_flies
+                    total_2b += line.doubles
+                    total_3b += line.triples
+                    total_hr += line.home_runs
                         
             # OPS計算
             if total_ab > 0:
@@ -226,15 +202,8 @@ class DiscordReportWithTable:
             if not roster or not roster.get('roster'):
                 return None
                 
+            bullpen_line = PitchingLine()
             bullpen_stats = {
-                'total_ip': 0,
-                'total_er': 0,
-                'total_h': 0,
-                'total_bb': 0,
-                'total_hbp': 0,
-                'total_hr': 0,
-                'total_so': 0,
-                'total_batters': 0,
                 'saves': 0,
                 'blown_saves': 0,
                 'closer_name': None
@@ -265,15 +234,8 @@ class DiscordReportWithTable:
                 if stats.get('gamesStarted', 0) == 0 and stats.get('gamesPlayed', 0) > 0:
                     relievers_count += 1
                     
-                    ip = float(stats.get('inningsPitched', '0'))
-                    bullpen_stats['total_ip'] += ip
-                    bullpen_stats['total_er'] += stats.get('earnedRuns', 0)
-                    bullpen_stats['total_h'] += stats.get('hits', 0)
-                    bullpen_stats['total_bb'] += stats.get('baseOnBalls', 0)
-                    bullpen_stats['total_hbp'] += stats.get('hitByPitch', 0)
-                    bullpen_stats['total_hr'] += stats.get('homeRuns', 0)
-                    bullpen_stats['total_so'] += stats.get('strikeOuts', 0)
-                    bullpen_stats['total_batters'] += stats.get('battersFaced', 0)
+                    # 投球回はアウト数の整数で合算
+                    bullpen_line += PitchingLine.from_stat(stats)
                     
                     saves = stats.get('saves', 0)
                     blown_saves = stats.get('blownSaves', 0)
@@ -283,18 +245,14 @@ class DiscordReportWithTable:
                     if saves >= 10:
                         bullpen_stats['closer_name'] = pitcher_name
                         
-            if bullpen_stats['total_ip'] > 0:
-                era = (bullpen_stats['total_er'] * 9) / bullpen_stats['total_ip']
-                whip = (bullpen_stats['total_bb'] + bullpen_stats['total_h']) / bullpen_stats['total_ip']
-                fip = ((13 * bullpen_stats['total_hr']) + 
-                       (3 * (bullpen_stats['total_bb'] + bullpen_stats['total_hbp'])) - 
-                       (2 * bullpen_stats['total_so'])) / bullpen_stats['total_ip'] + 3.2
+            if bullpen_line.outs > 0:
+                rates = bullpen_line.rates(season_constants(season))
                 
                 return {
                     'relievers_count': relievers_count,
-                    'era': f"{era:.2f}",
-                    'fip': f"{fip:.2f}",
-                    'whip': f"{whip:.2f}",
+                    'era': f"{rates['era']:.2f}",
+                    'fip': f"{rates['fip']:.2f}",
+                    'whip': f"{rates['whip']:.2f}",
                     'saves': bullpen_stats['saves'],
                     'blown_saves': bullpen_stats['blown_saves'],
                     'closer': bullpen_stats['closer_name']
@@ -307,124 +265,12 @@ class DiscordReportWithTable:
             
     def create_game_table(self, game_data, filename):
         """試合データの表を画像として作成"""
-        # 日本語フォント対応
-        plt.rcParams['font.family'] = ['DejaVu Sans', 'Hiragino Sans', 'Yu Gothic', 'Meiryo', 'Takao', 'IPAexGothic', 'IPAPGothic', 'VL PGothic', 'Noto Sans CJK JP']
-        
-        fig, ax = plt.subplots(figsize=(14, 12))
-        ax.axis('off')
-        
-        # タイトル
-        game_time = datetime.fromisoformat(game_data['gameDate'].replace('Z', '+00:00'))
-        jst_time = game_time.astimezone(self.jst)
-        title = f"{game_data['away_team']} @ {game_data['home_team']}"
-        subtitle = f"{jst_time.strftime('%Y/%m/%d %H:%M')} JST"
-        
-        fig.text(0.5, 0.95, title, ha='center', fontsize=20, weight='bold')
-        fig.text(0.5, 0.91, subtitle, ha='center', fontsize=14)
-        
-        # データ準備
-        headers = ['', game_data['away_team'], game_data['home_team']]
-        
-        # 先発投手データ
-        away_p = game_data.get('away_pitcher', {})
-        home_p = game_data.get('home_pitcher', {})
-        
-        pitcher_rows = [
-            ['Starting Pitcher', 
-             f"{away_p.get('name', 'TBD')} ({away_p.get('wins', 0)}-{away_p.get('losses', 0)})" if away_p else 'TBD',
-             f"{home_p.get('name', 'TBD')} ({home_p.get('wins', 0)}-{home_p.get('losses', 0)})" if home_p else 'TBD'],
-            ['ERA', 
-             str(away_p.get('era', 'N/A')) if away_p else 'N/A', 
-             str(home_p.get('era', 'N/A')) if home_p else 'N/A'],
-            ['FIP', 
-             str(away_p.get('fip', 'N/A')) if away_p else 'N/A', 
-             str(home_p.get('fip', 'N/A')) if home_p else 'N/A'],
-            ['WHIP', 
-             str(away_p.get('whip', 'N/A')) if away_p else 'N/A', 
-             str(home_p.get('whip', 'N/A')) if home_p else 'N/A'],
-            ['K-BB%', 
-             str(away_p.get('k_bb', 'N/A')) if away_p else 'N/A', 
-             str(home_p.get('k_bb', 'N/A')) if home_p else 'N/A'],
-        ]
-        
-        # 中継ぎ陣データ
-        away_bp = game_data.get('away_bullpen', {})
-        home_bp = game_data.get('home_bullpen', {})
-        
-        bullpen_rows = [
-            ['Bullpen', '', ''],
-            ['ERA', 
-             str(away_bp.get('era', 'N/A')) if away_bp else 'N/A', 
-             str(home_bp.get('era', 'N/A')) if home_bp else 'N/A'],
-            ['FIP', 
-             str(away_bp.get('fip', 'N/A')) if away_bp else 'N/A', 
-             str(home_bp.get('fip', 'N/A')) if home_bp else 'N/A'],
-            ['WHIP', 
-             str(away_bp.get('whip', 'N/A')) if away_bp else 'N/A', 
-             str(home_bp.get('whip', 'N/A')) if home_bp else 'N/A'],
-            ['Closer', 
-             str(away_bp.get('closer', 'N/A')) if away_bp and away_bp.get('closer') else 'N/A',
-             str(home_bp.get('closer', 'N/A')) if home_bp and home_bp.get('closer') else 'N/A'],
-        ]
-        
-        # チーム打撃データ
-        away_b = game_data.get('away_team_batting', {})
-        home_b = game_data.get('home_team_batting', {})
-        
-        batting_rows = [
-            ['Team Batting', '', ''],
-            ['AVG', 
-             str(away_b.get('avg', 'N/A')) if away_b else 'N/A', 
-             str(home_b.get('avg', 'N/A')) if home_b else 'N/A'],
-            ['OPS', 
-             str(away_b.get('ops', 'N/A')) if away_b else 'N/A', 
-             str(home_b.get('ops', 'N/A')) if home_b else 'N/A'],
-            ['Runs', 
-             str(away_b.get('runs', 0)) if away_b else '0', 
-             str(home_b.get('runs', 0)) if home_b else '0'],
-            ['HR', 
-             str(away_b.get('hr', 0)) if away_b else '0', 
-             str(home_b.get('hr', 0)) if home_b else '0'],
-            ['Last 5 OPS', 
-             str(away_b.get('recent_5_ops', 'N/A')) if away_b else 'N/A', 
-             str(home_b.get('recent_5_ops', 'N/A')) if home_b else 'N/A'],
-            ['Last 10 OPS', 
-             str(away_b.get('recent_10_ops', 'N/A')) if away_b else 'N/A', 
-             str(home_b.get('recent_10_ops', 'N/A')) if home_b else 'N/A'],
-        ]
-        
-        # 全データを結合
-        all_rows = pitcher_rows + [['']*3] + bullpen_rows + [['']*3] + batting_rows
-        
-        # テーブル作成
-        table = ax.table(cellText=all_rows, colLabels=headers,
-                        cellLoc='center', loc='center',
-                        colWidths=[0.25, 0.375, 0.375])
-        
-        table.auto_set_font_size(False)
-        table.set_fontsize(11)
-        table.scale(1, 2.2)
-        
-        # スタイル設定
-        for i in range(len(headers)):
-            table[(0, i)].set_facecolor('#2E5090')
-            table[(0, i)].set_text_props(weight='bold', color='white')
-            
-        # セクションヘッダーのスタイル
-        section_rows = [1, 7, 13]  # Starting Pitcher, Bullpen, Team Batting
-        for row in section_rows:
-            if row <= len(all_rows):
-                for col in range(3):
-                    table[(row, col)].set_facecolor('#E8E8E8')
-                    table[(row, col)].set_text_props(weight='bold')
-        
-        # 枠線を太くする
-        for key, cell in table.get_celld().items():
-            cell.set_linewidth(1.5)
+        with open(filename, 'wb') as f:
+            f.write(render_table_png(game_data))
         
-        plt.tight_layout()
-        plt.savefig(filename, dpi=150, bbox_inches='tight', facecolor='white', edgecolor='none')
-        plt.close()
+    def create_game_tables(self, games_data, workers=None):
+        """複数試合の表画像をプロセスプールで並行作成（PNGのバイト列のリスト）"""
+        return render_tables(games_data, workers)
         
     def format_game_message(self, game_data):
         """1試合のメッセージを作成（順番変更版）"""
@@ -495,32 +341,79 @@ class DiscordReportWithTable:
         
         return message
         
-    def send_with_image(self, text, image_path):
-        """テキストと画像をDiscordに送信"""
-        load_dotenv()
-        webhook_url = os.getenv('DISCORD_WEBHOOK_URL')
+    def game_data_from_card(self, game):
+        """構造化レポートの1試合(GameCard)をcreate_game_table/format_game_message用の辞書に変換"""
+        game_data = {
+            'gamePk': game.game_pk,
+            'gameDate': f"{game.start_time_jst}:00+09:00",
+            'away_team': game.away.name,
+            'home_team': game.home.name,
+            'away_team_id': game.away.team_id,
+            'home_team_id': game.home.team_id,
+        }
+        for side, team in game.sides():
+            p = team.pitcher
+            if p:
+                game_data[f'{side}_pitcher'] = {
+                    'name': p.name,
+                    'wins': p.wins,
+                    'losses': p.losses,
+                    'era': f"{p.era:.2f}",
+                    'fip': f"{p.fip:.2f}",
+                    'whip': f"{p.whip:.2f}",
+                    'k_bb': f"{p.k_bb_pct:.1f}%"
+                }
+            bp = team.bullpen
+            if bp:
+                game_data[f'{side}_bullpen'] = {
+                    'relievers_count': bp.count,
+                    'era': format_stat(bp.era),
+                    'fip': format_stat(bp.fip),
+                    'whip': format_stat(bp.whip),
+                    'closer': bp.closer.name if bp.closer else None
+                }
+            b = team.batting
+            if b and b.has_season:
+                game_data[f'{side}_team_batting'] = {
+                    'avg': f"{b.avg:.3f}",
+                    'ops': f"{b.ops:.3f}",
+                    'runs': b.runs,
+                    'hr': b.home_runs,
+                    'recent_5_ops': f"{b.recent_ops_5:.3f}",
+                    'recent_10_ops': f"{b.recent_ops_10:.3f}"
+                }
+        return game_data
+        
+    def render_slate(self, slate, workers=None):
+        """構造化レポートから試合ごとの(メッセージ, 表画像PNG)を作成（送信はしない）"""
+        games_data = [self.game_data_from_card(game) for game in slate.games
+                      if game.away is not None and game.home is not None]
+        images = self.create_game_tables(games_data, workers)
+        return [(self.format_game_message(game_data), image)
+                for game_data, image in zip(games_data, images)]
+        
+    def send_with_image(self, text, image, filename='table.png'):
+        """テキストと画像をDiscordに送信（imageはPNGのバイト列または画像ファイルのパス）"""
+        self.publish_games([(text, image)], filenames=[filename])
+        
+    def publish_games(self, rendered, header=None, filenames=None):
+        """(メッセージ, 画像)のリストを上限までまとめて送信（レート制限ヘッダーに従い、固定の待機はしない）"""
+        messages = [DiscordMessage(header)] if header else []
+        for i, (text, image) in enumerate(rendered):
+            filename = filenames[i] if filenames else f"game_{i+1:02d}.png"
+            if not isinstance(image, bytes):
+                filename = os.path.basename(image)
+                with open(image, 'rb') as f:
+                    image = f.read()
+            messages.append(DiscordMessage(text, files=[(filename, image)]))
+        
+        result = self.discord_client.send_messages(messages)
+        if result.ok:
+            print(f"  ✓ {result.messages}件を{result.requests}リクエストで送信 ({result.seconds:.1f}s)")
+        else:
+            print(f"  ✗ 送信失敗: {len(result.failed)}/{result.requests}リクエスト")
+        return result
         
-        if not webhook_url:
-            print("Discord Webhook URLが設定されていません")
-            return
-            
-        try:
-            with open(image_path, 'rb') as f:
-                files = {'file': (os.path.basename(image_path), f, 'image/png')}
-                data = {'content': text}
-                
-                response = requests.post(webhook_url, files=files, data=data)
-                
-                if response.status_code == 200:
-                    print("  ✓ 画像付きメッセージ送信成功")
-                else:
-                    print(f"  ✗ 送信失敗: {response.status_code}")
-                    
-        except Exception as e:
-            print(f"  ✗ 画像送信エラー: {str(e)}")
-            # 画像なしでテキストのみ送信
-            self.discord_client.send_text_message(text)
-            
     def run_discord_report(self):
         """Discord配信を実行"""
         print("MLB Discord Report with Table - 表付きレポート")
@@ -561,19 +454,13 @@ class DiscordReportWithTable:
                 
         print(f"\n{len(games_data)}試合を検出。処理を開始します...\n")
         
-        # 画像用ディレクトリ作成
-        img_dir = "temp_images"
-        if not os.path.exists(img_dir):
-            os.makedirs(img_dir)
-            
-        # ヘッダーメッセージ
+        # ヘッダーメッセージ（試合ごとのメッセージとまとめて送信）
         header = f"**MLB 明日の試合予定 ({tomorrow_est})**\n"
         header += f"全{len(games_data)}試合の詳細情報\n"
         header += "="*50
-        self.discord_client.send_text_message(header)
-        time.sleep(2)
         
-        # 各試合を処理（テスト用に3試合まで）
+        # 各試合の統計を取得（テスト用に3試合まで）
+        ready = []
         for i, game in enumerate(games_data[:3]):
             print(f"試合 {i+1}/{min(3, len(games_data))}: {game['away_team']} @ {game['home_team']}")
             
@@ -600,30 +487,21 @@ class DiscordReportWithTable:
                 game['away_bullpen'] = self.get_team_bullpen_stats(game['away_team_id'], 2025)
                 game['home_bullpen'] = self.get_team_bullpen_stats(game['home_team_id'], 2025)
                 
-                # テーブル画像作成
-                print("  表画像を作成中...")
-                image_filename = f"{img_dir}/game_{i+1:02d}.png"
-                self.create_game_table(game, image_filename)
-                
-                # メッセージ作成
-                message = self.format_game_message(game)
+                ready.append(game)
                 
-                # Discord送信（画像付き）
-                self.send_with_image(message, image_filename)
-                
-                print(f"  ✓ 試合 {i+1} 配信完了")
-                
-                # 画像ファイル削除
-                if os.path.exists(image_filename):
-                    os.remove(image_filename)
-                    
             except Exception as e:
                 print(f"  ✗ 試合 {i+1} エラー: {str(e)}")
                 import traceback
                 traceback.print_exc()
-                
-            time.sleep(3)  # Discord制限対策
-            
+        
+        # テーブル画像を全試合分まとめて作成（メモリ上のPNG）
+        print("表画像を作成中...")
+        images = self.create_game_tables(ready)
+        
+        # Discord送信（画像付き）
+        self.publish_games([(self.format_game_message(game), image) for game, image in zip(ready, images)],
+                           header=header)
+        
         print(f"\n処理完了！")
 
 if __name__ == "__main__":
@@ -5,7 +5,7 @@ import os
 import json
 from datetime import datetime, timedelta
 from pathlib import Path
-from discord_webhook import DiscordWebhook, DiscordEmbed
+from src.discord_publisher import DiscordMessage, DiscordPublisher
 from src.mlb_api_client import MLBApiClient
 from dotenv import load_dotenv
 
@@ -17,6 +17,7 @@ class DiscordStatsPublisher:
         self.webhook_url = os.getenv('DISCORD_WEBHOOK_URL')
         if not self.webhook_url:
             raise ValueError("DISCORD_WEBHOOK_URLが設定されていません")
+        self.publisher = DiscordPublisher(self.webhook_url)
     
     def load_team_data(self, team_id):
         """チームの全データを読み込む"""
@@ -152,13 +153,12 @@ class DiscordStatsPublisher:
         """1試合分の統計をDiscordに送信"""
         message = self.format_game_message(game, away_data, home_data)
         
-        webhook = DiscordWebhook(url=self.webhook_url, content=message)
-        response = webhook.execute()
+        result = self.publisher.publish_sync([DiscordMessage(message)])
         
-        if response.status_code == 200:
+        if result.ok:
             print(f"✅ 送信成功: {game['teams']['away']['team']['name']} vs {game['teams']['home']['team']['name']}")
         else:
-            print(f"❌ 送信失敗: {response.status_code}")
+            print(f"❌ 送信失敗: {result.failed[0][1]}")
     
     def publish_all_games(self):
         """全試合の統計を配信"""
@@ -185,10 +185,9 @@ class DiscordStatsPublisher:
         
         # ヘッダーメッセージ
         header = f"# 📅 **MLB {date_str} 全試合統計**\n総試合数: {len(game_list)}\n\n"
-        webhook = DiscordWebhook(url=self.webhook_url, content=header)
-        webhook.execute()
+        messages = [DiscordMessage(header)]
         
-        # 各試合を配信
+        # 各試合のメッセージを作成
         for i, game in enumerate(game_list, 1):
             print(f"[{i}/{len(game_list)}] 処理中...")
             
@@ -204,12 +203,14 @@ class DiscordStatsPublisher:
                 print(f"  ⚠️ データ不足のためスキップ")
                 continue
             
-            # 統計を送信
-            self.send_game_stats(game, away_data, home_data)
-            
-            # レート制限対策（1秒待機）
-            import time
-            time.sleep(1)
+            messages.append(DiscordMessage(self.format_game_message(game, away_data, home_data)))
+        
+        # まとめて配信（Webhookの上限まで1リクエストに詰め、レート制限ヘッダーに従って送信）
+        result = self.publisher.publish_sync(messages)
+        print(f"\n{result.messages}件を{result.requests}リクエストで送信しました ({result.seconds:.1f}秒)")
+        if not result.ok:
+            print(f"❌ 送信失敗: {len(result.failed)}リクエスト")
+            return
         
         print("\n✅ 全試合の配信が完了しました！")
 
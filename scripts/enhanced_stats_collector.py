@@ -3,25 +3,21 @@ import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from src.mlb_api_client import MLBApiClient
-import json
+from src.season_constants import season_constants
+from src.stat_line import PitchingLine
 from datetime import datetime
+import logging
 import math
 
+logger = logging.getLogger(__name__)
+
 class EnhancedStatsCollector:
     def __init__(self):
+        # APIレスポンスはMLBApiClientのHTTPキャッシュ層でキャッシュされる
         self.client = MLBApiClient()
-        self.cache_dir = "cache/advanced_stats"
-        os.makedirs(self.cache_dir, exist_ok=True)
 
     def get_pitcher_enhanced_stats(self, pitcher_id):
         """投手の高度な統計を取得（MLB API seasonAdvanced対応版）"""
-        cache_file = f"{self.cache_dir}/pitcher_{pitcher_id}_2025.json"
-
-        # キャッシュチェック
-        if os.path.exists(cache_file):
-            with open(cache_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
-
         try:
             # 基本情報取得
             player_info = self.client.get_player_info(pitcher_id)
@@ -30,7 +26,7 @@ class EnhancedStatsCollector:
             season_stats = self.client.get_player_stats_by_season(pitcher_id, 2025)
 
             if not season_stats:
-                print(f"No 2025 stats found for pitcher {pitcher_id}")
+                logger.debug(f"No 2025 stats found for pitcher {pitcher_id}")
                 return self._get_default_stats()
 
             # statsデータの安全な取得
@@ -40,15 +36,10 @@ class EnhancedStatsCollector:
             else:
                 stats = {}
 
-            # 基本統計
-            innings_pitched_str = stats.get('inningsPitched', '0.0') or '0.0'
-            if '.' in str(innings_pitched_str):
-                parts = str(innings_pitched_str).split('.')
-                innings = float(parts[0])
-                outs = float(parts[1]) if len(parts) > 1 else 0
-                innings_pitched = innings + (outs / 3.0)
-            else:
-                innings_pitched = float(innings_pitched_str)
+            # 基本統計（投球回はアウト数で扱い、率はまとめて計算）
+            line = PitchingLine.from_stat(stats)
+            innings_pitched = line.innings
+            rates = line.rates(season_constants(2025))
 
             # ===== MLB API seasonAdvanced から GB%/FB%/SwStr%/BABIP/QS を取得 =====
             advanced_stats = self._get_advanced_stats(pitcher_id, 2025)
@@ -73,16 +64,8 @@ class EnhancedStatsCollector:
                 if 'note' in splits_data:
                     splits_note = splits_data['note']
 
-            # FIP計算（既存のまま）
-            hr = int(stats.get('homeRuns', 0) or 0)
-            bb = int(stats.get('baseOnBalls', 0) or 0)
-            hbp = int(stats.get('hitByPitch', 0) or 0)
-            k = int(stats.get('strikeOuts', 0) or 0)
-
-            if innings_pitched > 0:
-                fip = ((13 * hr) + (3 * (bb + hbp)) - (2 * k)) / innings_pitched + 3.10
-            else:
-                fip = 0.00
+            # FIP（FIP定数はシーズン定数から）
+            fip = rates['fip']
 
             # xFIPをMLB APIから直接取得
             xfip = None
@@ -104,7 +87,7 @@ class EnhancedStatsCollector:
                                 xfip = saber_stats.get('xfip')
                                 break
             except Exception as e:
-                print(f"xFIP取得エラー: {e}")
+                logger.debug(f"xFIP取得エラー: {e}")
 
             if xfip is not None:
                 xfip_value = float(xfip)
@@ -113,13 +96,7 @@ class EnhancedStatsCollector:
                 xfip_value = fip
 
             # K-BB%計算
-            batters_faced = int(stats.get('battersFaced', 0) or 0)
-            if batters_faced > 0:
-                k_rate = k / batters_faced
-                bb_rate = bb / batters_faced
-                k_bb_percent = (k_rate - bb_rate) * 100
-            else:
-                k_bb_percent = 0.0
+            k_bb_percent = rates['k_bb_pct']
 
             # QS率計算 - MLB API から直接取得したデータを使用
             games_started = int(stats.get('gamesStarted', 0) or 0)
@@ -173,14 +150,10 @@ class EnhancedStatsCollector:
                 'splits_note': splits_note
             }
 
-            # キャッシュに保存
-            with open(cache_file, 'w', encoding='utf-8') as f:
-                json.dump(result, f, ensure_ascii=True)
-
             return result
 
         except Exception as e:
-            print(f"Error getting enhanced stats for pitcher {pitcher_id}: {e}")
+            logger.warning(f"Error getting enhanced stats for pitcher {pitcher_id}: {e}")
             return self._get_default_stats()
 
     def _get_advanced_stats(self, pitcher_id, season):
@@ -258,7 +231,7 @@ class EnhancedStatsCollector:
                                 }
 
         except Exception as e:
-            print(f"Advanced stats取得エラー: {e}")
+            logger.debug(f"Advanced stats取得エラー: {e}")
 
         return {
             'gb_percent': '0.0',
@@ -7,6 +7,8 @@ import os
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Tuple
 from src.mlb_api_client import MLBApiClient
+from src.season_constants import season_constants
+from src.stat_line import PitchingLine, parse_innings, parse_outs
 import time
 
 
@@ -79,7 +81,7 @@ class EnhancedStatsSystem:
         stat_line = season_stats['stats'][0]['splits'][0]['stat']
         
         # 基本データ
-        innings = float(stat_line.get('inningsPitched', 0))
+        innings = parse_innings(stat_line.get('inningsPitched'))
         batters_faced = stat_line.get('battersFaced', 0)
         strikeouts = stat_line.get('strikeOuts', 0)
         walks = stat_line.get('baseOnBalls', 0)
@@ -129,13 +131,8 @@ class EnhancedStatsSystem:
     def _calculate_fip(self, stats: Dict) -> float:
         """FIP計算"""
         try:
-            hr = stats.get('homeRuns', 0)
-            bb = stats.get('baseOnBalls', 0)
-            hbp = stats.get('hitByPitch', 0)
-            k = stats.get('strikeOuts', 0)
-            ip = float(stats.get('inningsPitched', 1))
-            
-            fip = ((13 * hr) + (3 * (bb + hbp)) - (2 * k)) / ip + 3.2
+            # 投球回はアウト数で扱い、FIP定数はシーズン定数
+            fip = PitchingLine.from_stat(stats).rates(season_constants())['fip']
             return round(fip, 2)
         except:
             return 0.0
@@ -149,10 +146,10 @@ class EnhancedStatsSystem:
             stat = game.get('stat', {})
             if game.get('isStarter', False):
                 starts += 1
-                innings = float(stat.get('inningsPitched', 0))
+                outs = parse_outs(stat.get('inningsPitched'))
                 earned_runs = stat.get('earnedRuns', 0)
                 
-                if innings >= 6.0 and earned_runs <= 3:
+                if outs >= 18 and earned_runs <= 3:
                     quality_starts += 1
                     
         return round((quality_starts / starts * 100), 1) if starts > 0 else 0.0
@@ -4,31 +4,39 @@
 MLBの全投手情報を一括取得
 """
 
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
 import json
-import requests
 from pathlib import Path
 from datetime import datetime
-import time
+from src.mlb_api_client import MLBApiClient
+from src.stat_store import get_default_stat_store
 
 def fetch_all_mlb_pitchers():
     """2024-2025シーズンの全投手を取得"""
     cache_dir = Path("cache/pitcher_info")
     cache_dir.mkdir(parents=True, exist_ok=True)
     
+    client = MLBApiClient()
+    
     # 全チームを取得
     print("MLBの全チーム情報を取得中...")
-    teams_url = "https://statsapi.mlb.com/api/v1/teams?sportId=1"
-    teams_response = requests.get(teams_url)
+    teams_data = client._make_request("teams", params={'sportId': 1})
     
-    if teams_response.status_code != 200:
+    if not teams_data:
         print("チーム情報の取得に失敗")
         return
     
-    teams = teams_response.json()['teams']
+    teams = teams_data['teams']
     print(f"チーム数: {len(teams)}")
     print("=" * 60)
     
     all_pitchers = []
+    # シーズン投球成績は列指向ストアにまとめて保存する（選手ごとのJSONは作らない）
+    season_stats_by_id = {}
+    team_ids = {}
     
     for i, team in enumerate(teams, 1):
         team_id = team['id']
@@ -36,63 +44,40 @@ def fetch_all_mlb_pitchers():
         print(f"\n[{i}/{len(teams)}] {team_name}")
         print("-" * 40)
         
-        # チームのロースターを取得
-        roster_url = f"https://statsapi.mlb.com/api/v1/teams/{team_id}/roster?rosterType=active"
-        
+        # チームのロースターを選手詳細（利き腕）とシーズン投球成績付きで1回で取得
         try:
-            roster_response = requests.get(roster_url)
+            roster = client.get_team_roster_with_stats(team_id, 2025, "pitching")
             
-            if roster_response.status_code == 200:
-                roster = roster_response.json().get('roster', [])
+            if roster:
                 team_pitchers = []
                 
                 for player in roster:
                     # 投手のみ
                     if player['position']['abbreviation'] in ['P', 'SP', 'RP', 'CP']:
-                        player_id = player['person']['id']
-                        player_name = player['person']['fullName']
+                        person = player['person']
+                        player_id = person['id']
+                        player_name = person['fullName']
+                        pitch_hand = person.get('pitchHand', {}).get('code', 'R')
+                        season_stats = player.get('season_stats', {})
                         
-                        # キャッシュチェック
-                        cache_file = cache_dir / f"{player_id}.json"
-                        if cache_file.exists():
-                            with open(cache_file, 'r', encoding='utf-8') as f:
-                                cache_data = json.load(f)
-                                hand = cache_data.get('hand', 'R')
-                                hand_text = "左" if hand == 'L' else "右"
-                                print(f"  ✓ {player_name} ({hand_text}) - キャッシュ済み")
-                                all_pitchers.append(cache_data)
-                                team_pitchers.append(cache_data)
-                                continue
+                        cache_data = {
+                            'pitcher_id': player_id,
+                            'name': player_name,
+                            'team': team_name,
+                            'team_id': team_id,
+                            'hand': pitch_hand,
+                            'position': player['position']['abbreviation'],
+                            'games_played': season_stats.get('gamesPlayed', 0),
+                            'games_started': season_stats.get('gamesStarted', 0),
+                            'updated': datetime.now().isoformat()
+                        }
                         
-                        # 詳細情報を取得
-                        detail_url = f"https://statsapi.mlb.com/api/v1/people/{player_id}"
-                        detail_response = requests.get(detail_url)
-                        
-                        if detail_response.status_code == 200:
-                            player_data = detail_response.json()['people'][0]
-                            pitch_hand = player_data.get('pitchHand', {}).get('code', 'R')
-                            
-                            cache_data = {
-                                'pitcher_id': player_id,
-                                'name': player_data['fullName'],
-                                'team': team_name,
-                                'team_id': team_id,
-                                'hand': pitch_hand,
-                                'position': player['position']['abbreviation'],
-                                'updated': datetime.now().isoformat()
-                            }
-                            
-                            # キャッシュ保存
-                            with open(cache_file, 'w', encoding='utf-8') as f:
-                                json.dump(cache_data, f, ensure_ascii=False, indent=2)
-                            
-                            all_pitchers.append(cache_data)
-                            team_pitchers.append(cache_data)
-                            hand_text = "左" if pitch_hand == 'L' else "右"
-                            print(f"  + {player_name} ({hand_text}) - 新規取得")
-                            
-                            # API制限対策
-                            time.sleep(0.1)
+                        season_stats_by_id[player_id] = season_stats
+                        team_ids[player_id] = team_id
+                        all_pitchers.append(cache_data)
+                        team_pitchers.append(cache_data)
+                        hand_text = "左" if pitch_hand == 'L' else "右"
+                        print(f"  + {player_name} ({hand_text})")
                 
                 # チーム統計
                 team_left = sum(1 for p in team_pitchers if p['hand'] == 'L')
@@ -119,8 +104,11 @@ def fetch_all_mlb_pitchers():
     with open(master_file, 'w', encoding='utf-8') as f:
         json.dump(all_pitchers, f, ensure_ascii=False, indent=2)
     
+    store = get_default_stat_store()
+    store.write_season(2025, 'pitching', season_stats_by_id, team_ids)
+    
     print(f"\nマスターファイル保存: {master_file}")
-    print(f"個別キャッシュ: {cache_dir}/*.json")
+    print(f"シーズン成績: {store.root}/2025_pitching_season.npy ({len(season_stats_by_id)}人)")
     
     # チーム別左投手ランキング
     print(f"\n" + "=" * 60)
@@ -145,7 +133,7 @@ if __name__ == "__main__":
     print("MLB全投手情報取得スクリプト")
     print("=" * 60)
     print("約400人の投手情報を取得します。")
-    print("所要時間: 約5-10分")
+    print("所要時間: 約30秒（1チーム1リクエスト）")
     print()
     
     fetch_all_mlb_pitchers()
\ No newline at end of file
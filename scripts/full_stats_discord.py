@@ -15,6 +15,8 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from datetime import datetime, timedelta
 import pytz
 from src.mlb_api_client import MLBApiClient
+from src.season_constants import season_constants
+from src.stat_line import PitchingLine, parse_outs
 from src.discord_client import DiscordClient
 import time
 
@@ -43,19 +45,9 @@ class FullStatsDiscord:
                 
             stats = season_stats[0]['stat']
             
-            # FIP計算
-            hr = stats.get('homeRuns', 0)
-            bb = stats.get('baseOnBalls', 0)
-            hbp = stats.get('hitByPitch', 0)
-            k = stats.get('strikeOuts', 0)
-            ip = float(stats.get('inningsPitched', '0'))
-            
-            fip = ((13 * hr) + (3 * (bb + hbp)) - (2 * k)) / ip + 3.2 if ip > 0 else 0
-            
-            # K%, BB%計算
-            batters_faced = stats.get('battersFaced', 0)
-            k_pct = (k / batters_faced * 100) if batters_faced > 0 else 0
-            bb_pct = (bb / batters_faced * 100) if batters_faced > 0 else 0
+            # FIP・K%・BB%（投球回はアウト数で扱い、FIP定数はシーズン定数）
+            rates = PitchingLine.from_stat(stats).rates(season_constants(season))
+            fip, k_pct, bb_pct = rates['fip'], rates['k_pct'], rates['bb_pct']
             
             # QS率計算
             qs_rate = self._calculate_qs_rate(pitcher_id, season)
@@ -125,7 +117,7 @@ class FullStatsDiscord:
                 return 'N/A'
                 
             qs_count = sum(1 for g in starts 
-                          if float(g['stat'].get('inningsPitched', '0')) >= 6.0 
+                          if parse_outs(g['stat'].get('inningsPitched')) >= 18 
                           and g['stat'].get('earnedRuns', 0) <= 3)
             
             return f"{(qs_count / len(starts) * 100):.1f}%"
@@ -152,7 +144,7 @@ class FullStatsDiscord:
                 ao = stat.get('airOuts', 0)
                 so = stat.get('strikeOuts', 0)
                 
-                field_outs = float(stat.get('inningsPitched', '0')) * 3 - so
+                field_outs = parse_outs(stat.get('inningsPitched')) - so
                 
                 if field_outs > 0:
                     total_gb += gb
@@ -1,8 +1,10 @@
 # scripts/json_from_report.py
 # -*- coding: utf-8 -*-
 """
-Create models/mlb_daily_YYYYMMDD.json by parsing an already-generated TXT report
-(e.g., daily_reports/MLB2025-08-25.txt). This is a *pass-through* extractor:
+Create models/mlb_daily_YYYYMMDD.json from an already-generated report.
+If the structured slate saved next to the TXT report (same name, .json) or given
+via --model exists, it is used directly; otherwise the TXT report is parsed.
+This is a *pass-through* extractor:
 - No recalculation
 - If a value isn't present in the report, we omit the field (do not insert nulls)
 - Multiple games supported per report
@@ -11,9 +13,12 @@ Usage:
         --report "daily_reports\MLB2025-08-25.txt" ^
         --out "models\mlb_daily_from_report_20250825.json"
 """
-import argparse, json, os, re
+import argparse, json, os, re, sys
 from datetime import datetime, timezone, timedelta
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.report_model import SlateReport
+
 JST = timezone(timedelta(hours=9))
 
 def to_float_safe(s: str):
@@ -243,34 +248,114 @@ def parse_report(text: str, date_str: str):
 
     return games
 
+def games_from_slate(slate, date_str: str):
+    """Build the same per-game dicts as parse_report() straight from a SlateReport."""
+    season = datetime.fromisoformat(date_str + "T00:00:00").year
+    games = []
+    for game in slate.games:
+        if game.away is None or game.home is None:
+            continue
+        hm = game.start_time_jst[11:16]
+        current = {
+            "league": "MLB",
+            "season": season,
+            "status": "NS",
+            "start_time_local": iso_local(date_str, hm) if hm else None,
+            "start_time_utc": iso_utc(date_str, hm) if hm else None,
+            "venue": None,
+            "matchup": {"away_team": game.away.name, "home_team": game.home.name},
+            "starters": {"away": {}, "home": {}},
+            "bullpens": {"away": {}, "home": {}},
+            "batting": {"away": {}, "home": {}},
+        }
+        for side, team in game.sides():
+            p = team.pitcher
+            if p:
+                current["starters"][side] = {
+                    "name": p.name,
+                    "hand": p.hand or 'TBD',
+                    "probable": True,
+                    "season": {
+                        "w": p.wins, "l": p.losses,
+                        "era": p.era, "fip": p.fip, "xfip": p.xfip, "whip": p.whip,
+                        "kbb_pct": p.k_bb_pct, "gb_pct": p.gb_pct, "fb_pct": p.fb_pct,
+                        "qs_pct": p.qs_rate, "swstr_pct": p.swstr_pct, "babip": p.babip,
+                    },
+                    "splits": {
+                        "vs_lhp": {"avg": p.vs_left_avg, "ops": p.vs_left_ops},
+                        "vs_rhp": {"avg": p.vs_right_avg, "ops": p.vs_right_ops},
+                    },
+                }
+            bp = team.bullpen
+            if bp:
+                bullpen = {"count": bp.count, "era": bp.era, "fip": bp.fip, "xfip": bp.xfip,
+                           "whip": bp.whip, "kbb_pct": bp.k_bb_pct}
+                if bp.closer:
+                    bullpen["cl"] = f"{bp.closer.name} (FIP: {bp.closer.fip:.2f})"
+                if bp.setup_men:
+                    bullpen["su"] = ', '.join(f"{s.name} (FIP: {s.fip:.2f})" for s in bp.setup_men)
+                if bp.fatigue_note:
+                    bullpen["fatigue_note"] = bp.fatigue_note
+                current["bullpens"][side] = bullpen
+            b = team.batting
+            if b:
+                batting = current["batting"][side]
+                season_line = {"barrel_pct": b.barrel_pct, "hardhit_pct": b.hard_hit_pct}
+                if b.has_season:
+                    season_line.update({"avg": b.avg, "ops": b.ops, "runs": b.runs, "hr": b.home_runs,
+                                        "woba": b.woba, "xwoba": b.xwoba})
+                    batting["vs_hand"] = {
+                        "vs_lhp": {"avg": b.vs_left_avg, "ops": b.vs_left_ops},
+                        "vs_rhp": {"avg": b.vs_right_avg, "ops": b.vs_right_ops},
+                    }
+                batting["season"] = season_line
+                batting["last_5_games"] = {"ops": b.recent_ops_5}
+                batting["last_10_games"] = {"ops": b.recent_ops_10}
+        games.append(current)
+    return games
+
+def build_output(games, date_str: str, source_path, strategy: str):
+    """Wrap per-game dicts in the models/*.json document layout."""
+    return {
+        "generated_at": datetime.now(JST).isoformat(),
+        "date": date_str,
+        "timezone": "Asia/Tokyo",
+        "games_count": len(games),
+        "source_meta": {
+            "report_path": str(source_path),
+            "strategy": strategy
+        },
+        "games": games
+    }
+
 def main():
     ap = argparse.ArgumentParser()
     ap.add_argument("--date", required=True, help="YYYY-MM-DD (JST)")
     ap.add_argument("--report", default=None, help="Path to TXT report")
+    ap.add_argument("--model", default=None, help="Path to structured slate (.json/.msgpack); default: next to the report")
     ap.add_argument("--out", default=None, help="Output JSON path (default: models/mlb_daily_from_report_YYYYMMDD.json)")
     args = ap.parse_args()
 
     date_str = args.date
     report_path = args.report or guess_report_path(date_str)
-    if not report_path or not os.path.exists(report_path):
-        raise SystemExit(f"[error] report not found. Try --report. looked for: {report_path}")
+    model_path = args.model
+    if not model_path and report_path:
+        model_path = os.path.splitext(report_path)[0] + ".json"
 
-    with open(report_path, "r", encoding="utf-8") as f:
-        text = f.read()
+    if model_path and os.path.exists(model_path):
+        games = games_from_slate(SlateReport.load(model_path), date_str)
+        source_path, strategy = model_path, "pass-through-from-model"
+    else:
+        if not report_path or not os.path.exists(report_path):
+            raise SystemExit(f"[error] report not found. Try --report. looked for: {report_path}")
 
-    games = parse_report(text, date_str)
+        with open(report_path, "r", encoding="utf-8") as f:
+            text = f.read()
 
-    out = {
-        "generated_at": datetime.now(JST).isoformat(),
-        "date": date_str,
-        "timezone": "Asia/Tokyo",
-        "games_count": len(games),
-        "source_meta": {
-            "report_path": report_path,
-            "strategy": "pass-through-from-report"
-        },
-        "games": games
-    }
+        games = parse_report(text, date_str)
+        source_path, strategy = report_path, "pass-through-from-report"
+
+    out = build_output(games, date_str, source_path, strategy)
 
     os.makedirs("models", exist_ok=True)
     default_out = os.path.join("models", f"mlb_daily_from_report_{date_str.replace('-','')}.json")
@@ -71,7 +71,7 @@ def main():
             # 中継ぎ
             bullpen = analyze_bullpen(api_client, team_id, season)
             print(f"**中継ぎ陣** ({bullpen['count']}名):")
-            print(f"ERA: {bullpen['era']} | FIP: {bullpen['fip']} | xFIP: {bullpen['xfip']} | WHIP: {bullpen['whip']} | K-BB%: {bullpen['k_bb_percent']} | WAR: {bullpen['war']}")
+            print(f"ERA: {bullpen['era']:.2f} | FIP: {bullpen['fip']:.2f} | xFIP: {bullpen['xfip']:.2f} | WHIP: {bullpen['whip']:.2f} | K-BB%: {bullpen['k_bb_percent']:.1f}% | WAR: {bullpen['war']:.1f}")
 
             # チーム打撃
             hitting = api_client.get_team_stats(team_id, season)
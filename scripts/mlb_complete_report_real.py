@@ -13,11 +13,18 @@ import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 import logging
-import json
 from pathlib import Path
 from src.mlb_api_client import MLBApiClient
+from src.http_cache import get_default_cache
+from src.http_metrics import get_default_metrics
+from src.http_session import connection_stats
+from src.report_model import (BattingLine, BullpenLine, GameCard, PitcherLine, RelieverLine,
+                              SlateReport, TeamCard, render_text)
+from src.slate_prefetch import (CLIENT_SNAPSHOT_METHODS, SlatePlan, SlatePrefetcher,
+                                SlateSnapshot, SnapshotProxy)
 from scripts.enhanced_stats_collector import EnhancedStatsCollector
 from scripts.bullpen_enhanced_stats import BullpenEnhancedStats
 from scripts.batting_quality_stats import BattingQualityStats
@@ -42,26 +49,48 @@ class DataReliabilityChecker:
     
     def __init__(self):
         self.cache_dir = Path("cache")
+        self.http_cache = get_default_cache()
         self.now = datetime.now()
     
+    def _latest_updates(self):
+        """データ種別ごとの(最終更新時刻, 件数)を取得"""
+        updates = {}
+        for policy, (stored_at, count) in self.http_cache.policy_freshness().items():
+            updates[policy] = (datetime.fromtimestamp(stored_at), count)
+        
+        # StatcastはSavantフェッチャーの集計ファイルも確認
+        statcast_path = self.cache_dir / "statcast_data"
+        files = list(statcast_path.glob("*.json")) if statcast_path.exists() else []
+        if files:
+            latest = datetime.fromtimestamp(max(f.stat().st_mtime for f in files))
+            if 'statcast' in updates:
+                cached_time, cached_count = updates['statcast']
+                updates['statcast'] = (max(latest, cached_time), cached_count + len(files))
+            else:
+                updates['statcast'] = (latest, len(files))
+        
+        return updates
+    
     def display_simple_reliability(self):
         """シンプルな信頼性表示（1行版）"""
+        print(self.simple_reliability_line())
+        print("-" * 60)
+    
+    def simple_reliability_line(self):
+        """シンプルな信頼性表示の1行を返す"""
         # 重要なデータの鮮度チェック
         fresh_count = 0
         total_count = 0
         
-        important_dirs = ["batting_quality", "bullpen_stats", "recent_ops", "statcast_data"]
+        important_policies = ["team_stats", "player_stats", "game_feed", "statcast"]
+        updates = self._latest_updates()
         
-        for dir_name in important_dirs:
+        for policy in important_policies:
             total_count += 1
-            cache_path = self.cache_dir / dir_name
-            if cache_path.exists():
-                files = list(cache_path.glob("*.json"))
-                if files:
-                    latest = max(files, key=lambda f: f.stat().st_mtime)
-                    age = self.now - datetime.fromtimestamp(latest.stat().st_mtime)
-                    if age.days == 0:  # 今日更新されていれば
-                        fresh_count += 1
+            if policy in updates:
+                age = self.now - updates[policy][0]
+                if age.days == 0:  # 今日更新されていれば
+                    fresh_count += 1
         
         reliability_pct = (fresh_count / total_count * 100) if total_count > 0 else 0
         
@@ -72,8 +101,7 @@ class DataReliabilityChecker:
         else:
             status = "[低] データ信頼性: 要確認"
         
-        print(f"{status} ({fresh_count}/{total_count}データが本日更新) | {self.now.strftime('%H:%M')}時点")
-        print("-" * 60)
+        return f"{status} ({fresh_count}/{total_count}データが本日更新) | {self.now.strftime('%H:%M')}時点"
     
     def display_detailed_reliability(self):
         """詳細な信頼性表示"""
@@ -86,37 +114,35 @@ class DataReliabilityChecker:
             "Statcast": [],
         }
         
-        # 各キャッシュディレクトリをチェック
+        # HTTPキャッシュのポリシーごとにチェック
         cache_info = {
-            "advanced_stats": ("MLB API", "投手統計"),
-            "batting_quality": ("MLB API", "打撃統計"),
-            "bullpen_stats": ("MLB API", "ブルペン"),
-            "recent_ops": ("MLB API", "直近成績"),
-            "splits_data": ("MLB API", "対左右"),
-            "statcast_data": ("Statcast", "Barrel%/Hard-Hit%"),
-            "pitcher_info": ("MLB API", "投手情報")  # 追加
+            "player_stats": ("MLB API", "投手統計"),
+            "team_stats": ("MLB API", "打撃統計"),
+            "roster": ("MLB API", "ブルペン"),
+            "game_feed": ("MLB API", "直近成績"),
+            "splits": ("MLB API", "対左右"),
+            "statcast": ("Statcast", "Barrel%/Hard-Hit%"),
+            "player_info": ("MLB API", "投手情報")
         }
+        updates = self._latest_updates()
         
-        for dir_name, (source, desc) in cache_info.items():
-            cache_path = self.cache_dir / dir_name
-            if cache_path.exists():
-                files = list(cache_path.glob("*.json"))
-                if files:
-                    latest = max(files, key=lambda f: f.stat().st_mtime)
-                    update_time = datetime.fromtimestamp(latest.stat().st_mtime)
-                    age = self.now - update_time
-                    
-                    if age.total_seconds() < 3600:  # 1時間以内
-                        status = "[新]"
-                    elif age.days == 0:  # 今日
-                        status = "[今日]"
-                    else:
-                        status = "[古]"
-                    
-                    time_str = update_time.strftime("%H:%M")
-                    file_count = len(files)
-                    
-                    data_status[source].append(f"{status} {desc} ({time_str}更新, {file_count}ファイル)")
+        for policy, (source, desc) in cache_info.items():
+            if policy not in updates:
+                continue
+            
+            update_time, entry_count = updates[policy]
+            age = self.now - update_time
+            
+            if age.total_seconds() < 3600:  # 1時間以内
+                status = "[新]"
+            elif age.days == 0:  # 今日
+                status = "[今日]"
+            else:
+                status = "[古]"
+            
+            time_str = update_time.strftime("%H:%M")
+            
+            data_status[source].append(f"{status} {desc} ({time_str}更新, {entry_count}件)")
         
         # 表示
         for source, items in data_status.items():
@@ -130,66 +156,60 @@ class DataReliabilityChecker:
 class MLBCompleteReport:
     """完全版MLBレポート生成クラス（データ信頼性表示付き、利き腕表示対応）"""
     
-    def __init__(self):
-        self.client = MLBApiClient()
+    def __init__(self, snapshot=None, workers=1):
+        self.api_client = MLBApiClient()
+        self.workers = max(1, workers)
         self.stats_collector = EnhancedStatsCollector()
         self.bullpen_stats = BullpenEnhancedStats()
         self.batting_quality = BattingQualityStats()
         self.reliability_checker = DataReliabilityChecker()
         self.logger = logging.getLogger(__name__)
-        
-        # 投手情報キャッシュディレクトリを作成
-        Path("cache/pitcher_info").mkdir(parents=True, exist_ok=True)
-    
-    def _get_pitcher_hand(self, pitcher_id):
-        """投手の利き腕を取得（キャッシュ付き）"""
-        try:
-            # キャッシュを確認
-            cache_file = Path(f"cache/pitcher_info/{pitcher_id}.json")
-            
-            # キャッシュが存在し、24時間以内なら使用
-            if cache_file.exists():
-                cache_age = datetime.now() - datetime.fromtimestamp(cache_file.stat().st_mtime)
-                if cache_age.total_seconds() < 86400:  # 24時間
-                    with open(cache_file, 'r', encoding='utf-8') as f:
-                        cache_data = json.load(f)
-                        return cache_data.get('hand', '')
-            
-            # APIから取得
-            player_info = self.client.get_player_info(pitcher_id)
-            
-            hand = ''
-            if player_info and 'pitchHand' in player_info:
-                pitch_hand = player_info.get('pitchHand', {})
-                code = pitch_hand.get('code', '')
-                
-                # 日本語表記に変換
-                if code == 'R':
-                    hand = '右'
-                elif code == 'L':
-                    hand = '左'
-                elif code == 'S':
-                    hand = '両'
-            
-            # キャッシュに保存
-            if player_info:
-                cache_data = {
-                    'pitcher_id': pitcher_id,
-                    'name': player_info.get('fullName', ''),
-                    'hand': hand,
-                    'updated': datetime.now().isoformat()
-                }
-                with open(cache_file, 'w', encoding='utf-8') as f:
-                    json.dump(cache_data, f, ensure_ascii=False, indent=2)
-            
-            return hand
-            
-        except Exception as e:
-            self.logger.error(f"Error getting pitcher hand: {str(e)}")
-            return ''
+        self.use_snapshot(snapshot or SlateSnapshot())
+
+    def use_snapshot(self, snapshot):
+        """取得結果をsnapshotと共有する（他のレンダラーと同じスナップショットを渡せる）"""
+        self.snapshot = snapshot
+        # 全コレクターでAPIクライアント（HTTPキャッシュ・コネクション）とスナップショットを共有
+        self.client = SnapshotProxy(self.api_client, snapshot, 'client', CLIENT_SNAPSHOT_METHODS)
+        self.stats_collector.client = self.client
+        self.bullpen_stats.api_client = self.client
+        self._pitcher_stats = SnapshotProxy(self.stats_collector, snapshot, 'pitcher',
+                                            ('get_pitcher_enhanced_stats',))
+        self._bullpen = SnapshotProxy(self.bullpen_stats, snapshot, 'bullpen',
+                                      ('get_enhanced_bullpen_stats',))
+        self._batting_quality = SnapshotProxy(self.batting_quality, snapshot, 'batting_quality',
+                                              ('get_team_quality_stats',))
+
+    def prefetch_slate(self, schedule):
+        """スケジュールに必要なデータを重複なく並行取得してスナップショットに格納
+
+        各表示メソッドと同じ引数で呼び出すことで、表示時はスナップショットから読み出される。
+        """
+        plan = SlatePlan.from_schedule(schedule, season=2025)
+        tasks = []
+        for pitcher_id in plan.pitcher_ids:
+            tasks.append((self.client.get_player_info, (pitcher_id,)))
+            tasks.append((self._pitcher_stats.get_pitcher_enhanced_stats, (pitcher_id,)))
+        for team_id in plan.team_ids:
+            tasks.append((self._bullpen.get_enhanced_bullpen_stats, (team_id,)))
+            tasks.append((self.client.get_team_stats, (team_id, plan.season)))
+            tasks.append((self._batting_quality.get_team_quality_stats, (team_id,)))
+            tasks.append((self.client.calculate_team_recent_ops_windows, (team_id, (5, 10))))
+            tasks.append((self.client.get_team_splits_vs_pitchers, (team_id, plan.season)))
+
+        self.logger.info(f"Slate plan: {len(plan.game_pks)} games, {len(plan.team_ids)} teams, "
+                         f"{len(plan.pitcher_ids)} pitchers, {len(tasks)} calls")
+        SlatePrefetcher().prefetch(self.api_client, tasks)
+        return plan
     
     def generate_report(self, target_date=None):
-        """指定日のレポートを生成"""
+        """指定日のレポートを生成してテキストで出力（構造化モデルを返す）"""
+        slate = self.build_slate(target_date)
+        print(render_text(slate), end='')
+        return slate
+    
+    def build_slate(self, target_date=None):
+        """指定日の全試合データをSlateReportとして組み立てる（出力はしない）"""
         if target_date is None:
             # 日本時間で明日の日付を計算
             japan_tomorrow = datetime.now() + timedelta(days=1)
@@ -203,80 +223,77 @@ class MLBCompleteReport:
         
         self.logger.info(f"Generating report for date: {target_date}")
         
-        print(f"\n{'='*60}")
-        print(f"MLB試合予想レポート - 日本時間 {japan_tomorrow.strftime('%Y/%m/%d')} の試合")
-        print(f"{'='*60}")
-        
-        # データ信頼性を表示
-        self.reliability_checker.display_simple_reliability()
+        slate = SlateReport(
+            target_date=target_date,
+            japan_date=japan_tomorrow.strftime('%Y/%m/%d'),
+            generated_at=datetime.now().isoformat(timespec='seconds'),
+            reliability=self.reliability_checker.simple_reliability_line(),
+        )
         
         # スケジュール取得
         schedule = self.client.get_schedule(target_date)
         if not schedule:
-            print("スケジュールを取得できませんでした。")
-            return
+            slate.message = "スケジュールを取得できませんでした。"
+            return slate
         
         games = []
         for date_info in schedule.get('dates', []):
             games.extend(date_info.get('games', []))
         
         if not games:
-            print(f"{target_date}に試合はありません。")
-            return
+            slate.message = f"{target_date}に試合はありません。"
+            return slate
+        
+        # 全試合分のデータをまとめて先読み（組み立てはスナップショットから行う）
+        self.prefetch_slate(schedule)
         
-        for game in games:
-            self._process_game(game)
+        # 試合ごとの組み立ては独立しているので並行処理し、結果はスケジュール順に並べる
+        if self.workers > 1 and len(games) > 1:
+            with ThreadPoolExecutor(max_workers=self.workers) as executor:
+                slate.games = list(executor.map(self._build_game, games))
+        else:
+            slate.games = [self._build_game(game) for game in games]
+        
+        # コネクション再利用状況（keep-aliveが効いているかの確認用）
+        for host, stats in connection_stats(self.api_client.session).items():
+            self.logger.info(f"Connections {host}: {stats['requests']} requests, "
+                             f"{stats['connections']} opened, {stats['reused']} reused")
+        return slate
     
-    def _process_game(self, game):
-        """各試合の処理"""
+    def _build_game(self, game):
+        """各試合のデータを組み立て"""
         try:
-            # 基本情報
-            away_team = game['teams']['away']['team']
-            home_team = game['teams']['home']['team']
             game_time_utc = datetime.fromisoformat(game['gameDate'].replace('Z', '+00:00'))
             game_time_jst = game_time_utc + timedelta(hours=9)
-            
-            print(f"{'='*60}")
-            print(f"{away_team['name']} @ {home_team['name']}")
-            print(f"開始時刻: {game_time_jst.strftime('%m/%d %H:%M')} (日本時間)")
-            print(f"{'='*50}")
-            
-            # 先発投手情報
-            away_pitcher_id = game['teams']['away'].get('probablePitcher', {}).get('id')
-            home_pitcher_id = game['teams']['home'].get('probablePitcher', {}).get('id')
-            
-            # Away Team
-            print(f"\n【{away_team['name']}】")
-            if away_pitcher_id:
-                self._display_pitcher_stats(away_pitcher_id)
-            else:
-                print("先発: 未定")
-            
-            # ブルペン統計
-            self._display_bullpen_stats(away_team['id'])
-            
-            # チーム打撃統計（改善版）
-            self._display_team_batting_stats(away_team['id'])
-            
-            # Home Team
-            print(f"\n【{home_team['name']}】")
-            if home_pitcher_id:
-                self._display_pitcher_stats(home_pitcher_id)
-            else:
-                print("先発: 未定")
-            
-            # ブルペン統計
-            self._display_bullpen_stats(home_team['id'])
-            
-            # チーム打撃統計（改善版）
-            self._display_team_batting_stats(home_team['id'])
-            
-            print("\n" + "="*60)
+            card = GameCard(game_pk=game.get('gamePk'),
+                            start_time_jst=game_time_jst.replace(tzinfo=None).isoformat(timespec='minutes'))
+            
+            for side in ('away', 'home'):
+                team = game['teams'][side]['team']
+                # 先発投手情報
+                pitcher_id = game['teams'][side].get('probablePitcher', {}).get('id')
+                team_card = TeamCard(team_id=team['id'], name=team['name'], pitcher_id=pitcher_id)
+                if pitcher_id:
+                    self._build_pitcher(team_card)
+                # ブルペン統計
+                self._build_bullpen(team_card)
+                # チーム打撃統計（改善版）
+                self._build_team_batting(team_card)
+                setattr(card, side, team_card)
+            
+            return card
             
         except Exception as e:
             self.logger.error(f"Error processing game: {str(e)}")
-            print(f"エラーが発生しました: {str(e)}")
+            return GameCard(game_pk=game.get('gamePk'), error=str(e))
     
+    def build_team_card(self, team_id, name=''):
+        """1チーム分（中継ぎ・打撃）のTeamCardを組み立てる（先発投手は含まない）"""
+        team_card = TeamCard(team_id=team_id, name=name)
+        self._build_bullpen(team_card)
+        self._build_team_batting(team_card)
+        return team_card
+
     def _safe_float(self, value, default=0.0):
         """文字列や数値を安全にfloatに変換"""
         try:
@@ -309,175 +326,128 @@ class MLBCompleteReport:
         except:
             return name
     
-    def _display_pitcher_stats(self, pitcher_id):
-        """投手統計を表示（利き腕付き）"""
+    def _build_pitcher(self, team_card):
+        """先発投手の成績を組み立て（利き腕付き）"""
+        pitcher_id = team_card.pitcher_id
         try:
             # 基本情報
             player_info = self.client.get_player_info(pitcher_id)
             if not player_info:
-                print("投手情報を取得できませんでした")
+                team_card.errors['pitcher'] = "投手情報を取得できませんでした"
                 return
             
-            # 利き腕を取得
-            pitch_hand = self._get_pitcher_hand(pitcher_id)
-            
             # 強化統計を取得
-            enhanced_stats = self.stats_collector.get_pitcher_enhanced_stats(pitcher_id)
-            
-            # 基本情報表示（利き腕を追加）
-            pitcher_name = player_info['fullName']
-            wins = enhanced_stats['wins']
-            losses = enhanced_stats['losses']
-            
-            # 利き腕付きで表示
-            if pitch_hand:
-                print(f"先発: {pitcher_name} ({pitch_hand}) ({wins}勝{losses}敗)")
-            else:
-                print(f"先発: {pitcher_name} ({wins}勝{losses}敗)")
-            
-            # 統計表示 - 文字列を数値に変換
-            era = self._safe_float(enhanced_stats.get('era', '0.00'))
-            fip = self._safe_float(enhanced_stats.get('fip', '0.00'))
-            xfip = self._safe_float(enhanced_stats.get('xfip', '0.00'))
-            whip = self._safe_float(enhanced_stats.get('whip', '0.00'))
-            
-            # パーセンテージ値の処理
-            k_bb_percent_str = enhanced_stats.get('k_bb_percent', '0.0')
-            k_bb_percent = self._safe_float(k_bb_percent_str)
-            gb_pct = self._safe_float(enhanced_stats.get('gb_percent', '0'))
-            fb_pct = self._safe_float(enhanced_stats.get('fb_percent', '0'))
-            qs_rate = self._safe_float(enhanced_stats.get('qs_rate', '0'))
-            swstr_pct = self._safe_float(enhanced_stats.get('swstr_percent', '0'))
-            babip = self._safe_float(enhanced_stats.get('babip', '0'))
-            
-            print(f"ERA: {era:.2f} | FIP: {fip:.2f} | "
-                  f"xFIP: {xfip:.2f} | WHIP: {whip:.2f} | "
-                  f"K-BB%: {k_bb_percent:.1f}% | "
-                  f"GB%: {gb_pct:.1f}% | FB%: {fb_pct:.1f}% | "
-                  f"QS率: {qs_rate:.1f}%")
-            
-            print(f"SwStr%: {swstr_pct:.1f}% | BABIP: {babip:.3f}")
-            
-            # 対左右成績 - 文字列を数値に変換
-            vs_left_avg = self._safe_float(enhanced_stats['vs_left'].get('avg', '.250'))
-            vs_left_ops = self._safe_float(enhanced_stats['vs_left'].get('ops', '.700'))
-            vs_right_avg = self._safe_float(enhanced_stats['vs_right'].get('avg', '.250'))
-            vs_right_ops = self._safe_float(enhanced_stats['vs_right'].get('ops', '.700'))
-            
-            print(f"対左: {vs_left_avg:.3f} (OPS {vs_left_ops:.3f}) | "
-                  f"対右: {vs_right_avg:.3f} (OPS {vs_right_ops:.3f})")
+            enhanced_stats = self._pitcher_stats.get_pitcher_enhanced_stats(pitcher_id)
+            
+            # 文字列・%表記の値はすべて数値に変換
+            f = self._safe_float
+            team_card.pitcher = PitcherLine(
+                player_id=pitcher_id,
+                name=player_info['fullName'],
+                hand=player_info.get('pitchHand', {}).get('code', ''),
+                wins=enhanced_stats['wins'],
+                losses=enhanced_stats['losses'],
+                era=f(enhanced_stats.get('era', '0.00')),
+                fip=f(enhanced_stats.get('fip', '0.00')),
+                xfip=f(enhanced_stats.get('xfip', '0.00')),
+                whip=f(enhanced_stats.get('whip', '0.00')),
+                k_bb_pct=f(enhanced_stats.get('k_bb_percent', '0.0')),
+                gb_pct=f(enhanced_stats.get('gb_percent', '0')),
+                fb_pct=f(enhanced_stats.get('fb_percent', '0')),
+                qs_rate=f(enhanced_stats.get('qs_rate', '0')),
+                swstr_pct=f(enhanced_stats.get('swstr_percent', '0')),
+                babip=f(enhanced_stats.get('babip', '0')),
+                vs_left_avg=f(enhanced_stats['vs_left'].get('avg', '.250')),
+                vs_left_ops=f(enhanced_stats['vs_left'].get('ops', '.700')),
+                vs_right_avg=f(enhanced_stats['vs_right'].get('avg', '.250')),
+                vs_right_ops=f(enhanced_stats['vs_right'].get('ops', '.700')),
+            )
             
         except Exception as e:
             self.logger.error(f"Error displaying pitcher stats: {str(e)}")
-            print(f"投手統計の表示エラー: {str(e)}")
+            team_card.errors['pitcher'] = f"投手統計の表示エラー: {str(e)}"
     
-    def _display_bullpen_stats(self, team_id):
-        """ブルペン統計を表示（エンコーディングエラー対策済み）"""
+    def _build_bullpen(self, team_card):
+        """ブルペン統計を組み立て（エンコーディングエラー対策済み）"""
         try:
-            bullpen_data = self.bullpen_stats.get_enhanced_bullpen_stats(team_id)
-            
-            # active_relieversの数を使用
-            reliever_count = len(bullpen_data.get('active_relievers', []))
-            
-            print(f"\n中継ぎ陣 ({reliever_count}名):")
-            print(f"ERA: {bullpen_data['era']} | FIP: {bullpen_data['fip']} | "
-                  f"xFIP: {bullpen_data['xfip']} | WHIP: {bullpen_data['whip']} | "
-                  f"K-BB%: {bullpen_data['k_bb_percent']}%")
+            bullpen_data = self._bullpen.get_enhanced_bullpen_stats(team_card.team_id)
             
             # 主要リリーバー（名前を安全に処理）
+            closer = None
             if bullpen_data.get('closer'):
-                fip_value = self._safe_float(bullpen_data['closer']['fip'])
-                closer_name = self._safe_name(bullpen_data['closer']['name'])
-                print(f"CL: {closer_name} (FIP: {fip_value:.2f})")
-            
-            if bullpen_data.get('setup_men'):
-                setup_names = []
-                for p in bullpen_data['setup_men']:
-                    fip_value = self._safe_float(p['fip'])
-                    safe_name = self._safe_name(p['name'])
-                    setup_names.append(f"{safe_name} (FIP: {fip_value:.2f})")
-                print(f"SU: {', '.join(setup_names)}")
-            
-            # 疲労度
-            if bullpen_data.get('fatigued_count', 0) > 0:
-                print(f"疲労度: 主力{bullpen_data['fatigued_count']}名が連投中")
+                closer = RelieverLine(name=self._safe_name(bullpen_data['closer']['name']),
+                                      fip=self._safe_float(bullpen_data['closer']['fip']))
+            setup_men = [RelieverLine(name=self._safe_name(p['name']), fip=self._safe_float(p['fip']))
+                         for p in bullpen_data.get('setup_men') or []]
+            
+            team_card.bullpen = BullpenLine(
+                # active_relieversの数を使用
+                count=len(bullpen_data.get('active_relievers', [])),
+                # 取得できない指標（'N/A'など）はNoneのまま表示側で 'N/A' にする
+                era=self._safe_float(bullpen_data.get('era'), None),
+                fip=self._safe_float(bullpen_data.get('fip'), None),
+                xfip=self._safe_float(bullpen_data.get('xfip'), None),
+                whip=self._safe_float(bullpen_data.get('whip'), None),
+                k_bb_pct=self._safe_float(bullpen_data.get('k_bb_percent'), None),
+                closer=closer,
+                setup_men=setup_men,
+                fatigued_count=bullpen_data.get('fatigued_count', 0),
+            )
             
         except Exception as e:
             self.logger.error(f"Error displaying bullpen stats: {str(e)}")
-            print(f"ブルペン統計の表示エラー: {str(e)}")
+            team_card.errors['bullpen'] = f"ブルペン統計の表示エラー: {str(e)}"
     
-    def _display_team_batting_stats(self, team_id):
-        """チーム打撃統計を表示（改善版）"""
+    def _build_team_batting(self, team_card):
+        """チーム打撃統計を組み立て（改善版）"""
+        team_id = team_card.team_id
         try:
             # 必ず2025年のデータを使用
             team_stats = self.client.get_team_stats(team_id, 2025)
             
             # 打撃品質統計（シーズン統計に関係なく取得）
-            # ログ出力を抑制するため、標準エラー出力を一時的に無効化
-            import sys
-            import io
-            old_stderr = sys.stderr
-            sys.stderr = io.StringIO()
-            try:
-                quality_stats = self.batting_quality.get_team_quality_stats(team_id)
-            finally:
-                sys.stderr = old_stderr
-            
-            print(f"\nチーム打撃:")
-            
-            if not team_stats:
-                # シーズン統計がない場合でも表示できるものを表示
-                print("シーズン統計: データなし")
+            quality_stats = self._batting_quality.get_team_quality_stats(team_id)
+            
+            # 過去5/10試合のOPS（1回の集計で両方を取得）
+            recent_ops = self.client.calculate_team_recent_ops_windows(team_id, (5, 10))
+            
+            # シーズン統計がなくてもBarrel%/Hard-Hit%と過去試合のOPSは表示できる
+            batting = BattingLine(
+                barrel_pct=quality_stats['barrel_pct'],
+                hard_hit_pct=quality_stats['hard_hit_pct'],
+                recent_ops_5=recent_ops[5],
+                recent_ops_10=recent_ops[10],
+            )
+            
+            if team_stats:
+                # 過去試合のOPSを追加（スナップショットの値は書き換えない）
+                team_stats = dict(team_stats)
+                team_stats['recent_ops_5'] = recent_ops[5]
+                team_stats['recent_ops_10'] = recent_ops[10]
                 
-                # Barrel%とHard-Hit%は表示可能
-                print(f"Barrel%: {quality_stats['barrel_pct']:.1f}% | Hard-Hit%: {quality_stats['hard_hit_pct']:.1f}%")
+                # wOBA計算
+                woba_data = self.batting_quality.calculate_woba(team_stats)
                 
-                # 過去試合のOPSは取得可能
-                recent_ops_5 = self.client.calculate_team_recent_ops_with_cache(team_id, 5)
-                recent_ops_10 = self.client.calculate_team_recent_ops_with_cache(team_id, 10)
-                print(f"過去5試合OPS: {recent_ops_5:.3f} | 過去10試合OPS: {recent_ops_10:.3f}")
-                return
-            
-            # シーズン統計がある場合の通常処理
-            # 過去試合のOPSを追加
-            team_stats['recent_ops_5'] = self.client.calculate_team_recent_ops_with_cache(team_id, 5)
-            team_stats['recent_ops_10'] = self.client.calculate_team_recent_ops_with_cache(team_id, 10)
-            
-            # wOBA計算
-            woba_data = self.batting_quality.calculate_woba(team_stats)
-            
-            # 対左右投手成績（2025年）
-            splits = self.client.get_team_splits_vs_pitchers(team_id, 2025)
-            
-            # 文字列を数値に変換
-            avg = self._safe_float(team_stats.get('avg', 0))
-            ops = self._safe_float(team_stats.get('ops', 0))
-            runs = int(self._safe_float(team_stats.get('runs', 0)))
-            home_runs = int(self._safe_float(team_stats.get('homeRuns', 0)))
-            
-            print(f"AVG: {avg:.3f} | OPS: {ops:.3f} | "
-                  f"得点: {runs} | 本塁打: {home_runs}")
-            
-            print(f"wOBA: {woba_data['woba']:.3f} | xwOBA: {woba_data['xwoba']:.3f}")
-            
-            print(f"Barrel%: {quality_stats['barrel_pct']:.1f}% | Hard-Hit%: {quality_stats['hard_hit_pct']:.1f}%")
-            
-            # 対左右成績 - 文字列を数値に変換
-            vs_left_avg = self._safe_float(splits['vs_left']['avg'])
-            vs_left_ops = self._safe_float(splits['vs_left']['ops'])
-            vs_right_avg = self._safe_float(splits['vs_right']['avg'])
-            vs_right_ops = self._safe_float(splits['vs_right']['ops'])
-            
-            print(f"対左投手: {vs_left_avg:.3f} (OPS {vs_left_ops:.3f}) | "
-                  f"対右投手: {vs_right_avg:.3f} (OPS {vs_right_ops:.3f})")
-            
-            # 過去の試合OPS（実データ）
-            print(f"過去5試合OPS: {team_stats.get('recent_ops_5', 0.700):.3f} | "
-                  f"過去10試合OPS: {team_stats.get('recent_ops_10', 0.700):.3f}")
+                # 対左右投手成績（2025年）
+                splits = self.client.get_team_splits_vs_pitchers(team_id, 2025)
+                
+                # 文字列を数値に変換
+                batting.avg = self._safe_float(team_stats.get('avg', 0))
+                batting.ops = self._safe_float(team_stats.get('ops', 0))
+                batting.runs = int(self._safe_float(team_stats.get('runs', 0)))
+                batting.home_runs = int(self._safe_float(team_stats.get('homeRuns', 0)))
+                batting.woba = woba_data['woba']
+                batting.xwoba = woba_data['xwoba']
+                batting.vs_left_avg = self._safe_float(splits['vs_left']['avg'])
+                batting.vs_left_ops = self._safe_float(splits['vs_left']['ops'])
+                batting.vs_right_avg = self._safe_float(splits['vs_right']['avg'])
+                batting.vs_right_ops = self._safe_float(splits['vs_right']['ops'])
+            
+            team_card.batting = batting
             
         except Exception as e:
             self.logger.error(f"Error displaying team batting stats: {str(e)}")
-            print(f"チーム打撃統計の表示エラー: {str(e)}")
+            team_card.errors['batting'] = f"チーム打撃統計の表示エラー: {str(e)}"
 
 def main():
     """メイン関数（自動ファイル保存機能付き）"""
@@ -490,6 +460,12 @@ def main():
                        help='データ信頼性の詳細チェック')
     parser.add_argument('--console', action='store_true',
                        help='コンソールにも出力（デバッグ用）')
+    parser.add_argument('--metrics-json', type=str,
+                       help='APIリクエスト計測結果をJSONで保存するファイル名')
+    parser.add_argument('--workers', type=int, default=4,
+                       help='試合データを並行して組み立てるスレッド数（1で逐次処理）')
+    parser.add_argument('--model', type=str,
+                       help='構造化データの保存先（.json/.msgpack、指定しない場合はレポートと同名の.json）')
     args = parser.parse_args()
     
     # データチェックモード
@@ -528,11 +504,11 @@ def main():
         sys.stdout = string_buffer
         
         # レポート生成
-        report = MLBCompleteReport()
+        report = MLBCompleteReport(workers=args.workers)
         if args.date:
-            report.generate_report(args.date)
+            slate = report.generate_report(args.date)
         else:
-            report.generate_report()
+            slate = report.generate_report()
         
         # 出力を取得
         output_content = string_buffer.getvalue()
@@ -551,11 +527,11 @@ def main():
             sys.stdout = f
             
             # レポート生成
-            report = MLBCompleteReport()
+            report = MLBCompleteReport(workers=args.workers)
             if args.date:
-                report.generate_report(args.date)
+                slate = report.generate_report(args.date)
             else:
-                report.generate_report()
+                slate = report.generate_report()
             
             sys.stdout = original_stdout
     
@@ -566,11 +542,21 @@ def main():
     print(f"   サイズ: {file_size:.1f} KB")
     print(f"   時刻: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     
+    # 構造化データを保存（HTML/JSON変換やDiscord配信はテキストを再パースせずこれを読む）
+    model_file = slate.save(args.model or Path(output_file).with_suffix('.json'))
+    print(f"   データ: {model_file}")
+    
+    # APIリクエストの計測結果（エンドポイント別の回数・キャッシュ・レイテンシ）
+    metrics = get_default_metrics()
+    print(f"\n📊 APIリクエスト計測:")
+    print(metrics.format_table())
+    if args.metrics_json:
+        metrics.dump_json(args.metrics_json)
+        print(f"   計測結果: {args.metrics_json}")
+    
     # HTML変換の提案
-    if output_file.endswith('.txt'):
-        html_file = output_file.replace('.txt', '.html')
-        print(f"\n💡 HTML変換するには:")
-        print(f"   python scripts/convert_to_html.py \"{output_file}\"")
+    print(f"\n💡 HTML変換するには:")
+    print(f"   python scripts/convert_to_html.py \"{model_file}\"")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
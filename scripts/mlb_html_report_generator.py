@@ -6,11 +6,17 @@ MLB HTMLレポート生成システム
 """
 
 import os
+import sys
 import json
 import re
 from datetime import datetime, timedelta
 from pathlib import Path
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src import template_engine
+from src.asset_cache import get_asset_cache
+from src.report_model import SlateReport, format_stat
+
 # MLBチーム情報（ロゴURL用）
 TEAM_INFO = {
     # American League
@@ -87,6 +93,84 @@ class MLBHTMLReportGenerator:
             
         return games
     
+    def games_from_slate(self, slate):
+        """
+        構造化レポート(SlateReport)から直接試合データを生成（テキストの再パース不要）
+        """
+        games = []
+        for game in slate.games:
+            if game.away is None or game.home is None:
+                continue
+            games.append({
+                'away_team': game.away.name,
+                'home_team': game.home.name,
+                'game_time': game.start_label or "00:00",
+                'away_pitcher': self._pitcher_from_card(game.away),
+                'home_pitcher': self._pitcher_from_card(game.home),
+                'away_bullpen': self._bullpen_from_card(game.away),
+                'home_bullpen': self._bullpen_from_card(game.home),
+                'away_batting': self._batting_from_card(game.away),
+                'home_batting': self._batting_from_card(game.home),
+                'summary': self._generate_summary('')
+            })
+        return games
+    
+    @staticmethod
+    def _rate(value):
+        """打率・OPS系の値を'.812'形式に整形"""
+        text = f"{value or 0:.3f}"
+        return text[1:] if text.startswith('0') else text
+    
+    def _pitcher_from_card(self, team):
+        """TeamCardから投手情報を生成"""
+        p = team.pitcher
+        if p is None:
+            return self._extract_pitcher_info('', '')
+        return {
+            'name': p.name,
+            'record': f"{p.wins}勝{p.losses}敗",
+            'hand': p.hand or 'R',
+            'era': f"{p.era:.2f}",
+            'fip': f"{p.fip:.2f}",
+            'xfip': f"{p.xfip:.2f}",
+            'whip': f"{p.whip:.2f}",
+            'k_bb': f"{p.k_bb_pct:.1f}%",
+            'qs_rate': f"{p.qs_rate:.1f}%",
+            'gb_rate': f"{p.gb_pct:.1f}%",
+            'swstr': f"{p.swstr_pct:.1f}%",
+            'babip': f"{p.babip:.3f}",
+            'vs_left': self._rate(p.vs_left_ops),
+            'vs_right': self._rate(p.vs_right_ops)
+        }
+    
+    def _bullpen_from_card(self, team):
+        """TeamCardからブルペン情報を生成"""
+        bp = team.bullpen
+        if bp is None:
+            return self._extract_bullpen_info('', '')
+        return {
+            'count': str(bp.count),
+            'era': format_stat(bp.era),
+            'fip': format_stat(bp.fip),
+            'xfip': format_stat(bp.xfip),
+            'whip': format_stat(bp.whip),
+            'k_bb': f"{format_stat(bp.k_bb_pct, '.1f')}%",
+            'fatigue': bp.fatigue_note or 'なし'
+        }
+    
+    def _batting_from_card(self, team):
+        """TeamCardから打撃情報を生成"""
+        b = team.batting
+        if b is None:
+            return self._extract_batting_info('', '')
+        return {
+            'avg': self._rate(b.avg),
+            'ops': self._rate(b.ops),
+            'woba': self._rate(b.woba),
+            'xwoba': self._rate(b.xwoba),
+            'ops_10games': self._rate(b.recent_ops_10)
+        }
+    
     def _extract_game_time(self, block):
         """試合時間を抽出"""
         time_match = re.search(r'(\d{2}/\d{2}\s+\d{2}:\d{2})', block)
@@ -151,273 +235,32 @@ class MLBHTMLReportGenerator:
         """
         if games_data:
             self.games_data = games_data
-            
-        html_content = self._get_html_header()
-        
-        for game in self.games_data:
-            html_content += self._generate_game_page(game)
-            
-        html_content += self._get_html_footer()
         
-        return html_content
+        return template_engine.render('html_report.html.j2', **self._template_context())
     
-    def _get_html_header(self):
-        """HTMLヘッダー"""
-        return """<!DOCTYPE html>
-<html lang="ja">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>MLB試合予想レポート - 日本時間 {date} の試合</title>
-    <script src="https://cdn.tailwindcss.com"></script>
-    <link rel="preconnect" href="https://fonts.googleapis.com">
-    <link rel="preconnect" href="https://fonts.gstatic.com" crossorigin>
-    <link href="https://fonts.googleapis.com/css2?family=Noto+Sans+JP:wght@400;700;900&family=Roboto+Mono:wght@400;700&display=swap" rel="stylesheet">
-    <style>
-        body {{
-            font-family: 'Noto Sans JP', sans-serif;
-            background-color: #f3f4f6;
-        }}
-        .game-page {{
-            width: 210mm;
-            min-height: 297mm;
-            padding: 15mm;
-            margin: 10mm auto;
-            background-color: white;
-            box-shadow: 0 0 10px rgba(0,0,0,0.1);
-            display: flex;
-            flex-direction: column;
-            page-break-after: always;
-        }}
-        .data-font {{
-            font-family: 'Roboto Mono', monospace;
-        }}
-        .section-title {{
-            font-size: 1.25rem;
-            font-weight: 700;
-            color: #1e3a8a;
-            border-bottom: 2px solid #93c5fd;
-            padding-bottom: 0.25rem;
-            margin-bottom: 1rem;
-        }}
-        .stat-item {{
-            display: flex;
-            justify-content: space-between;
-            align-items: center;
-            padding: 0.5rem 0;
-            border-bottom: 1px solid #e5e7eb;
-            font-size: 0.9rem;
-        }}
-        .stat-item .label {{
-            color: #4b5563;
-        }}
-        .stat-item .value {{
-            font-weight: 700;
-            color: #111827;
-        }}
-        .handedness-rhp {{
-            background-color: #ef4444;
-            color: white;
-            padding: 0.125rem 0.5rem;
-            border-radius: 9999px;
-            font-size: 0.75rem;
-            font-weight: 700;
-        }}
-        .handedness-lhp {{
-            background-color: #3b82f6;
-            color: white;
-            padding: 0.125rem 0.5rem;
-            border-radius: 9999px;
-            font-size: 0.75rem;
-            font-weight: 700;
-        }}
-        @media print {{
-            .game-page {{
-                margin: 0;
-                box-shadow: none;
-            }}
-        }}
-    </style>
-</head>
-<body class="bg-gray-200">
-""".format(date=self.report_date.strftime('%Y/%m/%d'))
-    
-    def _generate_game_page(self, game):
-        """1試合分のページを生成"""
-        away_team_abbr = TEAM_INFO.get(game['away_team'], {}).get('abbr', 'mlb')
-        home_team_abbr = TEAM_INFO.get(game['home_team'], {}).get('abbr', 'mlb')
-        
-        # ESPNのロゴURLを使用（MLB公式APIに変更可能）
-        away_logo = f"https://a.espncdn.com/i/teamlogos/mlb/500/{away_team_abbr}.png"
-        home_logo = f"https://a.espncdn.com/i/teamlogos/mlb/500/{home_team_abbr}.png"
-        
-        return f"""
-    <div class="game-page">
-        <header class="flex justify-between items-center pb-4 border-b-2 border-gray-300">
-            <div class="team-info text-center w-1/3">
-                <img src="{away_logo}" alt="{game['away_team']} Logo" class="w-12 h-12 mx-auto mb-2">
-                <h1 class="text-3xl font-black">{game['away_team']}</h1>
-                <p class="text-lg font-bold">{game['away_pitcher']['name']} 
-                    <span class="handedness-{'lhp' if game['away_pitcher']['hand'] == 'L' else 'rhp'}">
-                        {'左' if game['away_pitcher']['hand'] == 'L' else '右'}
-                    </span>
-                </p>
-                <p class="text-gray-600 data-font">{game['away_pitcher']['record']}</p>
-            </div>
-            <div class="game-time text-center w-1/3">
-                <p class="text-sm text-gray-500">日本時間</p>
-                <p class="text-4xl font-bold">{game['game_time']}</p>
-                <p class="text-lg font-bold">試合開始</p>
-            </div>
-            <div class="team-info text-center w-1/3">
-                <img src="{home_logo}" alt="{game['home_team']} Logo" class="w-12 h-12 mx-auto mb-2">
-                <h1 class="text-3xl font-black">{game['home_team']}</h1>
-                <p class="text-lg font-bold">{game['home_pitcher']['name']}
-                    <span class="handedness-{'lhp' if game['home_pitcher']['hand'] == 'L' else 'rhp'}">
-                        {'左' if game['home_pitcher']['hand'] == 'L' else '右'}
-                    </span>
-                </p>
-                <p class="text-gray-600 data-font">{game['home_pitcher']['record']}</p>
-            </div>
-        </header>
-        
-        <main class="flex-grow mt-6 grid grid-cols-2 gap-8">
-            <!-- Away Team Stats -->
-            <div class="team-stats">
-                <section class="mb-6">
-                    <h2 class="section-title">先発投手: {game['away_pitcher']['name']}</h2>
-                    <div class="stat-item">
-                        <span class="label">ERA/FIP/xFIP</span>
-                        <span class="value data-font">{game['away_pitcher']['era']}/{game['away_pitcher']['fip']}/{game['away_pitcher']['xfip']}</span>
-                    </div>
-                    <div class="stat-item">
-                        <span class="label">WHIP/K-BB%</span>
-                        <span class="value data-font">{game['away_pitcher']['whip']}/{game['away_pitcher']['k_bb']}</span>
-                    </div>
-                    <div class="stat-item">
-                        <span class="label">QS率/GB%</span>
-                        <span class="value data-font">{game['away_pitcher']['qs_rate']}/{game['away_pitcher']['gb_rate']}</span>
-                    </div>
-                    <div class="stat-item">
-                        <span class="label">SwStr%/BABIP</span>
-                        <span class="value data-font">{game['away_pitcher']['swstr']}/{game['away_pitcher']['babip']}</span>
-                    </div>
-                    <div class="stat-item">
-                        <span class="label">対左/右 OPS</span>
-                        <span class="value data-font">{game['away_pitcher']['vs_left']}/{game['away_pitcher']['vs_right']}</span>
-                    </div>
-                </section>
-                
-                <section class="mb-6">
-                    <h2 class="section-title">中継ぎ陣 ({game['away_bullpen']['count']}名)</h2>
-                    <div class="stat-item">
-                        <span class="label">ERA/FIP/xFIP</span>
-                        <span class="value data-font">{game['away_bullpen']['era']}/{game['away_bullpen']['fip']}/{game['away_bullpen']['xfip']}</span>
-                    </div>
-                    <div class="stat-item">
-                        <span class="label">WHIP/K-BB%</span>
-                        <span class="value data-font">{game['away_bullpen']['whip']}/{game['away_bullpen']['k_bb']}</span>
-                    </div>
-                    <div class="stat-item">
-                        <span class="label">疲労度</span>
-                        <span class="value">{game['away_bullpen']['fatigue']}</span>
-                    </div>
-                </section>
-                
-                <section>
-                    <h2 class="section-title">攻撃 (vs {'RHP' if game['home_pitcher']['hand'] == 'R' else 'LHP'})</h2>
-                    <div class="stat-item">
-                        <span class="label">AVG/OPS</span>
-                        <span class="value data-font">{game['away_batting']['avg']}/{game['away_batting']['ops']}</span>
-                    </div>
-                    <div class="stat-item">
-                        <span class="label">wOBA/xwOBA</span>
-                        <span class="value data-font">{game['away_batting']['woba']}/{game['away_batting']['xwoba']}</span>
-                    </div>
-                    <div class="stat-item">
-                        <span class="label">過去10試合 OPS</span>
-                        <span class="value data-font text-{'red' if float(game['away_batting']['ops_10games'][1:]) > .800 else 'blue'}-600 font-bold">
-                            {game['away_batting']['ops_10games']}
-                        </span>
-                    </div>
-                </section>
-            </div>
-            
-            <!-- Home Team Stats -->
-            <div class="team-stats">
-                <section class="mb-6">
-                    <h2 class="section-title">先発投手: {game['home_pitcher']['name']}</h2>
-                    <div class="stat-item">
-                        <span class="label">ERA/FIP/xFIP</span>
-                        <span class="value data-font">{game['home_pitcher']['era']}/{game['home_pitcher']['fip']}/{game['home_pitcher']['xfip']}</span>
-                    </div>
-                    <div class="stat-item">
-                        <span class="label">WHIP/K-BB%</span>
-                        <span class="value data-font">{game['home_pitcher']['whip']}/{game['home_pitcher']['k_bb']}</span>
-                    </div>
-                    <div class="stat-item">
-                        <span class="label">QS率/GB%</span>
-                        <span class="value data-font">{game['home_pitcher']['qs_rate']}/{game['home_pitcher']['gb_rate']}</span>
-                    </div>
-                    <div class="stat-item">
-                        <span class="label">SwStr%/BABIP</span>
-                        <span class="value data-font">{game['home_pitcher']['swstr']}/{game['home_pitcher']['babip']}</span>
-                    </div>
-                    <div class="stat-item">
-                        <span class="label">対左/右 OPS</span>
-                        <span class="value data-font">{game['home_pitcher']['vs_left']}/{game['home_pitcher']['vs_right']}</span>
-                    </div>
-                </section>
-                
-                <section class="mb-6">
-                    <h2 class="section-title">中継ぎ陣 ({game['home_bullpen']['count']}名)</h2>
-                    <div class="stat-item">
-                        <span class="label">ERA/FIP/xFIP</span>
-                        <span class="value data-font">{game['home_bullpen']['era']}/{game['home_bullpen']['fip']}/{game['home_bullpen']['xfip']}</span>
-                    </div>
-                    <div class="stat-item">
-                        <span class="label">WHIP/K-BB%</span>
-                        <span class="value data-font">{game['home_bullpen']['whip']}/{game['home_bullpen']['k_bb']}</span>
-                    </div>
-                    <div class="stat-item">
-                        <span class="label">疲労度</span>
-                        <span class="value">{game['home_bullpen']['fatigue']}</span>
-                    </div>
-                </section>
-                
-                <section>
-                    <h2 class="section-title">攻撃 (vs {'RHP' if game['away_pitcher']['hand'] == 'R' else 'LHP'})</h2>
-                    <div class="stat-item">
-                        <span class="label">AVG/OPS</span>
-                        <span class="value data-font">{game['home_batting']['avg']}/{game['home_batting']['ops']}</span>
-                    </div>
-                    <div class="stat-item">
-                        <span class="label">wOBA/xwOBA</span>
-                        <span class="value data-font">{game['home_batting']['woba']}/{game['home_batting']['xwoba']}</span>
-                    </div>
-                    <div class="stat-item">
-                        <span class="label">過去10試合 OPS</span>
-                        <span class="value data-font text-{'red' if float(game['home_batting']['ops_10games'][1:]) > .800 else 'blue'}-600 font-bold">
-                            {game['home_batting']['ops_10games']}
-                        </span>
-                    </div>
-                </section>
-            </div>
-        </main>
+    def write_html(self, output_path, games_data=None):
+        """
+        HTMLレポートをファイルへストリーム出力
+        """
+        if games_data:
+            self.games_data = games_data
         
-        <footer class="mt-auto pt-4 border-t-4 border-black">
-            <h3 class="text-xl font-bold mb-2">総括</h3>
-            <p class="text-base leading-relaxed">{game['summary']}</p>
-        </footer>
-    </div>
-"""
+        template_engine.render_to_file('html_report.html.j2', output_path, **self._template_context())
+        print(f"✅ HTMLレポートを保存しました: {output_path}")
     
-    def _get_html_footer(self):
-        """HTMLフッター"""
-        return """
-</body>
-</html>
-"""
+    def _template_context(self):
+        return {
+            'date': self.report_date.strftime('%Y/%m/%d'),
+            'games': self.games_data,
+            'logo_url': self._logo_url
+        }
+    
+    @staticmethod
+    def _logo_url(team_name):
+        """キャッシュ済みロゴのdata URI（取得できない場合はESPNのロゴURL）"""
+        team_abbr = TEAM_INFO.get(team_name, {}).get('abbr', 'mlb')
+        fallback = f"https://a.espncdn.com/i/teamlogos/mlb/500/{team_abbr}.png"
+        return get_asset_cache().logo_data_uri(team_name, fallback=fallback)
     
     def save_html(self, html_content, output_path):
         """HTMLファイルを保存"""
@@ -510,12 +353,13 @@ def main():
         }
     ]
     
-    # HTML生成
-    html_content = generator.generate_html(test_games)
+    # 構造化レポート(.json/.msgpack)が指定されていればそれを使う
+    if len(sys.argv) > 1:
+        test_games = generator.games_from_slate(SlateReport.load(sys.argv[1]))
     
-    # 保存
+    # HTML生成・保存
     output_path = f"daily_reports/html/mlb_report_{datetime.now().strftime('%Y%m%d')}.html"
-    generator.save_html(html_content, output_path)
+    generator.write_html(output_path, test_games)
     
     print("\n📊 レポート生成完了！")
     print(f"ブラウザで確認: start {output_path}")
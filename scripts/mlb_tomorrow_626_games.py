@@ -93,7 +93,7 @@ class MLBTodayReporter:
             
             # 投手統計行1
             output += f"ERA: {pitcher_stats.get('era', '0.00')} | "
-            output += f"FIP: {pitcher_stats.get('fip', '0.00')} | "
+            output += f"FIP: {pitcher_stats.get('fip', 0.0):.2f} | "
             output += f"xFIP: {pitcher_stats.get('xfip', '0.00')} | "
             output += f"WHIP: {pitcher_stats.get('whip', '0.00')} | "
             output += f"K-BB%: {pitcher_stats.get('k_bb_percent', '0.0%')} | "
@@ -120,20 +120,20 @@ class MLBTodayReporter:
         active_count = len(bullpen_data.get('active_relievers', []))
         
         output += f"**中継ぎ陣** ({active_count}名):\n"
-        output += f"ERA: {bullpen_data.get('era', '0.00')} | "
-        output += f"FIP: {bullpen_data.get('fip', '0.00')} | "
-        output += f"xFIP: {bullpen_data.get('xfip', '0.00')} | "
-        output += f"WHIP: {bullpen_data.get('whip', '0.00')} | "
-        output += f"K-BB%: {bullpen_data.get('k_bb_percent', '0.0')}% | "
+        output += f"ERA: {bullpen_data.get('era', 0.0):.2f} | "
+        output += f"FIP: {bullpen_data.get('fip', 0.0):.2f} | "
+        output += f"xFIP: {bullpen_data.get('xfip', 0.0):.2f} | "
+        output += f"WHIP: {bullpen_data.get('whip', 0.0):.2f} | "
+        output += f"K-BB%: {bullpen_data.get('k_bb_percent', 0.0):.1f}% | "
         output += f"WAR: {bullpen_data.get('war', '0.0')}\n"
         
         # クローザーとセットアッパー
         if bullpen_data.get('closer'):
             closer = bullpen_data['closer']
-            output += f"CL: {closer['name']} (FIP: {closer.get('fip', '0.00')})\n"
+            output += f"CL: {closer['name']} (FIP: {closer.get('fip', 0.0):.2f})\n"
         
         if bullpen_data.get('setup_men'):
-            setup_names = [f"{s['name']} (FIP: {s.get('fip', '0.00')})" for s in bullpen_data['setup_men'][:2]]
+            setup_names = [f"{s['name']} (FIP: {s.get('fip', 0.0):.2f})" for s in bullpen_data['setup_men'][:2]]
             output += f"SU: {', '.join(setup_names)}\n"
         
         # 疲労度
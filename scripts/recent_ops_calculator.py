@@ -7,6 +7,8 @@ import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from src.mlb_api_client import MLBApiClient
+from src.rolling_window import RollingWindow
+from src.sabermetrics import BATTING_FIELDS
 from datetime import datetime, timedelta
 import json
 
@@ -54,48 +56,12 @@ class RecentOPSCalculator:
         return game_logs
     
     def calculate_ops_from_logs(self, game_logs):
-        """ゲームログからOPSを計算"""
-        total_stats = {
-            'atBats': 0,
-            'hits': 0,
-            'doubles': 0,
-            'triples': 0,
-            'homeRuns': 0,
-            'baseOnBalls': 0,
-            'hitByPitch': 0,
-            'sacFlies': 0
-        }
-        
-        # 各試合の統計を合計
-        for log in game_logs:
-            stats = log['stats']
-            for key in total_stats:
-                if key in stats:
-                    total_stats[key] += int(stats[key])
-        
-        # 計算用の値
-        ab = total_stats['atBats']
-        h = total_stats['hits']
-        bb = total_stats['baseOnBalls']
-        hbp = total_stats['hitByPitch']
-        sf = total_stats['sacFlies']
-        
-        # OBP（出塁率）計算
-        obp_denominator = ab + bb + hbp + sf
-        obp = (h + bb + hbp) / obp_denominator if obp_denominator > 0 else 0
-        
-        # SLG（長打率）計算
-        if ab > 0:
-            singles = h - total_stats['doubles'] - total_stats['triples'] - total_stats['homeRuns']
-            tb = singles + (2 * total_stats['doubles']) + (3 * total_stats['triples']) + (4 * total_stats['homeRuns'])
-            slg = tb / ab
-        else:
-            slg = 0
-        
-        # OPS計算
-        ops = obp + slg
-        
-        return round(obp, 3), round(slg, 3), round(ops, 3)
+        """ゲームログからOPSを計算（渡した全試合の合計）"""
+        window = RollingWindow.from_records(
+            'hitting', ({'player_id': 0, 'date': log['date'], **log['stats']} for log in game_logs),
+            'player_id', BATTING_FIELDS)
+        rates = window.rate(0, len(game_logs))
+        return round(rates['obp'], 3), round(rates['slg'], 3), round(rates['ops'], 3)
     
     def analyze_team_recent_ops(self, team_id, games=5, season=2024):
         """チーム全体の直近OPSを分析"""
@@ -110,43 +76,35 @@ class RecentOPSCalculator:
         print(f"\nチーム{team_id}の直近{games}試合OPS分析を開始...")
         print("（データ取得に時間がかかる場合があります）")
         
-        player_count = 0
+        batters = []
         for player in roster['roster']:
-            player_id = player['person']['id']
-            player_name = player['person']['fullName']
             position = player.get('position', {}).get('abbreviation', 'N/A')
             
             # 投手は除外
-            if position == 'P':
-                continue
-            
-            # ゲームログ取得
-            print(f"  {player_name} のデータ取得中...")
-            game_logs = self.get_player_game_logs(player_id, season=season)
-            
-            # 直近N試合のログを取得
-            recent_logs = game_logs[:games] if len(game_logs) >= games else game_logs
-            
-            if len(recent_logs) > 0:
-                obp, slg, ops = self.calculate_ops_from_logs(recent_logs)
+            if position != 'P':
+                batters.append((player['person']['id'], player['person']['fullName'], position))
+        
+        # 全打者のゲームログを取得して累積和を作り、直近N試合の率をまとめて求める
+        batter_ids = [batter[0] for batter in batters]
+        window = self.client.get_recent_form(batter_ids, season, 'hitting')
+        rates = window.rates(batter_ids, games)
+        
+        for i, (player_id, player_name, position) in enumerate(batters):
+            recent_games = int(rates['games'][i])
+            if recent_games > 0:
+                obp, slg, ops = (round(float(rates[name][i]), 3) for name in ('obp', 'slg', 'ops'))
                 
                 results.append({
                     'player_id': player_id,
                     'name': player_name,
                     'position': position,
-                    'games': len(recent_logs),
+                    'games': recent_games,
                     'obp': obp,
                     'slg': slg,
                     'ops': ops
                 })
                 
-                print(f"    → OPS={ops} (OBP={obp}, SLG={slg}) - {len(recent_logs)}試合")
-                player_count += 1
-                
-                # API制限対策（5人ごとに少し待機）
-                if player_count % 5 == 0:
-                    import time
-                    time.sleep(1)
+                print(f"  {player_name} → OPS={ops} (OBP={obp}, SLG={slg}) - {recent_games}試合")
         
         # OPSでソート
         results.sort(key=lambda x: x['ops'], reverse=True)
@@ -5,10 +5,12 @@
 使い方:
   python scripts\render_report.py --date 2025-08-25 --template templates\mlb_daily.txt.j2 --out daily_reports\MLB2025-08-25.txt
 """
-import argparse, json
+import argparse, json, os, sys
 from pathlib import Path
 from datetime import datetime
-from jinja2 import Environment, FileSystemLoader, StrictUndefined, select_autoescape
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src import template_engine
 
 def parse_args():
     p = argparse.ArgumentParser()
@@ -29,17 +31,8 @@ def main():
     data = json.loads(model_path.read_text(encoding="utf-8"))
 
     tpl_path = Path(args.template)
-    env = Environment(
-        loader=FileSystemLoader(str(tpl_path.parent)),
-        undefined=StrictUndefined,
-        autoescape=select_autoescape(enabled_extensions=("html",))
-    )
-    template = env.get_template(tpl_path.name)
-    rendered = template.render(model=data)
-
-    out = Path(args.out)
-    out.parent.mkdir(parents=True, exist_ok=True)
-    out.write_text(rendered, encoding="utf-8")
+    out = template_engine.render_to_file(tpl_path.name, args.out, template_dir=tpl_path.parent,
+                                         strict=True, model=data)
     print(f"[render_report] ✅ written: {out.resolve()}")
 
 if __name__ == "__main__":
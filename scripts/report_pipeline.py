@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+MLBレポート一括生成パイプライン
+- データ収集は1回だけ（MLBCompleteReport.build_slate）
+- 同じスナップショット(SlateReport)から指定フォーマットを並行して描画
+- フォーマットごとの描画時間を表示
+
+使い方:
+  python scripts/report_pipeline.py --formats text,html,json
+  python scripts/report_pipeline.py --date 2025-08-20 --formats all --send-discord
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+
+from src.report_model import render_text
+
+FORMATS = ('text', 'html', 'json', 'pdf', 'discord')
+WEEKDAYS_JP = ['月', '火', '水', '木', '金', '土', '日']
+
+
+def report_basename(slate):
+    """レポートのファイル名（例：MLB08月21日(木)レポート）"""
+    japan_date = datetime.strptime(slate.japan_date, '%Y/%m/%d')
+    return f"MLB{japan_date.strftime('%m月%d日')}({WEEKDAYS_JP[japan_date.weekday()]})レポート"
+
+
+def render_text_file(slate, out_dir, options):
+    path = out_dir / f"{report_basename(slate)}.txt"
+    path.write_text(render_text(slate), encoding='utf-8')
+    return [path]
+
+
+def render_html_file(slate, out_dir, options):
+    from scripts.convert_to_html import games_from_slate, render_html
+    path = out_dir / 'html' / f"{report_basename(slate)}.html"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(render_html(games_from_slate(slate), slate.japan_date), encoding='utf-8')
+    return [path]
+
+
+def render_json_file(slate, out_dir, options):
+    from scripts.json_from_report import build_output, games_from_slate
+    date_str = slate.japan_date.replace('/', '-')
+    path = out_dir / 'json' / f"mlb_daily_from_report_{date_str.replace('-', '')}.json"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    out = build_output(games_from_slate(slate, date_str), date_str, options['model_path'], 'pass-through-from-model')
+    path.write_text(json.dumps(out, ensure_ascii=False, indent=2), encoding='utf-8')
+    return [path]
+
+
+def render_pdf_files(slate, out_dir, options):
+    from mlb_pdf_complete import MLBPDFComplete
+    reports_dir = out_dir / 'pdf' / slate.japan_date.replace('/', '')
+    files = MLBPDFComplete().generate_reports_for_slate(slate, reports_dir, merge=options['pdf_merge'])
+    return [Path(p) for p in files]
+
+
+def render_discord(slate, out_dir, options):
+    from scripts.discord_report_with_table import DiscordReportWithTable
+    system = DiscordReportWithTable()
+    rendered = system.render_slate(slate)
+    img_dir = out_dir / 'discord'
+    img_dir.mkdir(parents=True, exist_ok=True)
+    paths = []
+    for i, (_, image) in enumerate(rendered, 1):
+        path = img_dir / f"game_{i:02d}.png"
+        path.write_bytes(image)
+        paths.append(path)
+    if options['send_discord']:
+        system.publish_games(rendered, filenames=[path.name for path in paths])
+    return paths
+
+
+RENDERERS = {
+    'text': render_text_file,
+    'html': render_html_file,
+    'json': render_json_file,
+    'pdf': render_pdf_files,
+    'discord': render_discord,
+}
+
+
+def _timed(func, *args):
+    """(結果, 経過秒, 例外)を返す"""
+    start = time.perf_counter()
+    try:
+        return func(*args), time.perf_counter() - start, None
+    except Exception as e:
+        return None, time.perf_counter() - start, e
+
+
+def run_pipeline(slate, formats, out_dir, render_workers=None, model_path=None, send_discord=False,
+                 pdf_merge=False):
+    """1つのスナップショットから複数フォーマットを並行描画する
+
+    Returns:
+        dict: フォーマット名 -> (出力ファイルのリスト, 描画秒数, 例外またはNone)
+    """
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    options = {'model_path': model_path, 'send_discord': send_discord, 'pdf_merge': pdf_merge}
+
+    if 'html' in formats or 'pdf' in formats:
+        # ロゴは描画前に1回だけ読み込み、各ページにはdata URIとして埋め込む
+        from src.asset_cache import get_asset_cache
+        get_asset_cache().prefetch_logos()
+
+    with ThreadPoolExecutor(max_workers=render_workers or len(formats)) as executor:
+        futures = {fmt: executor.submit(_timed, RENDERERS[fmt], slate, out_dir, options)
+                   for fmt in formats}
+        return {fmt: future.result() for fmt, future in futures.items()}
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description='MLBレポートを1回のデータ収集で複数フォーマットに出力')
+    parser.add_argument('--date', type=str, help='対象日付 (YYYY-MM-DD形式、MLB現地日付)')
+    parser.add_argument('--formats', type=str, default='text,html,json',
+                        help=f"出力フォーマット（カンマ区切り: {','.join(FORMATS)} / all）")
+    parser.add_argument('--out-dir', type=str, default='daily_reports', help='出力ディレクトリ（html・json・pdf・discordはその下のサブディレクトリ）')
+    parser.add_argument('--workers', type=int, default=4, help='データ収集のスレッド数')
+    parser.add_argument('--render-workers', type=int, help='描画のスレッド数（省略時はフォーマット数）')
+    parser.add_argument('--model', type=str,
+                        help='構造化データを読み込むファイル（指定時はデータ収集を行わない）')
+    parser.add_argument('--send-discord', action='store_true', help='discord形式をWebhookへ送信')
+    parser.add_argument('--pdf-merge', action='store_true', help='pdf形式で全試合を結合したPDFも出力')
+    args = parser.parse_args()
+
+    formats = FORMATS if args.formats == 'all' else tuple(f.strip() for f in args.formats.split(',') if f.strip())
+    unknown = [f for f in formats if f not in RENDERERS]
+    if unknown:
+        parser.error(f"未対応のフォーマット: {', '.join(unknown)}")
+
+    # データ収集（1回のみ）
+    start = time.perf_counter()
+    if args.model:
+        from src.report_model import SlateReport
+        slate = SlateReport.load(args.model)
+        model_path = Path(args.model)
+    else:
+        from scripts.mlb_complete_report_real import MLBCompleteReport
+        slate = MLBCompleteReport(workers=args.workers).build_slate(args.date)
+        model_path = slate.save(Path(args.out_dir) / f"{report_basename(slate)}.json")
+    collect_seconds = time.perf_counter() - start
+    print(f"データ収集: {len(slate.games)}試合 ({collect_seconds:.2f}s) -> {model_path}")
+
+    results = run_pipeline(slate, formats, args.out_dir, args.render_workers, model_path, args.send_discord,
+                           args.pdf_merge)
+
+    print(f"\n{'フォーマット':<10} {'時間':>8}  出力")
+    print("-" * 60)
+    failed = False
+    for fmt in formats:
+        paths, seconds, error = results[fmt]
+        if error is not None:
+            failed = True
+            print(f"{fmt:<10} {seconds:>7.2f}s  ✗ {error}")
+        else:
+            print(f"{fmt:<10} {seconds:>7.2f}s  {len(paths)}件 {paths[0] if paths else ''}")
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -8,7 +8,7 @@ from datetime import datetime, timedelta
 from typing import Dict, List
 import pandas as pd
 import matplotlib.pyplot as plt
-from discord_webhook import DiscordWebhook, DiscordEmbed
+from src.discord_publisher import DiscordMessage, DiscordPublisher
 from scripts.daily_prediction import DailyPredictionSystem
 from scripts.visualize_matchup import MatchupVisualizer
 
@@ -158,56 +158,56 @@ class ReportPublisher:
             print("⚠️  Discord Webhook URLが設定されていません")
             return
             
-        webhook = DiscordWebhook(url=self.webhook_url)
+        timestamp = datetime.utcnow().isoformat()
         
-        # メイン埋め込み
-        embed = DiscordEmbed(
-            title=f"⚾ MLB予想レポート - {date_str}",
-            description=f"明日の試合予想（{len(predictions)}試合）",
-            color='03b2f8'
-        )
-        
-        # タイムスタンプ
-        embed.set_timestamp()
-        
-        # 各試合の予想を追加
-        for pred in predictions[:5]:  # 最初の5試合のみ（Discordの制限）
+        # 各試合の予想（1つの埋め込みは25フィールドまでなので分割し、まとめて送信する）
+        fields = []
+        for pred in predictions:
             winner = pred['away_team'] if pred['prediction'] == 'away' else pred['home_team']
             confidence = '🟢' if pred['confidence'] >= 3 else '🟡' if pred['confidence'] >= 2 else '🔴'
             
-            embed.add_embed_field(
-                name=f"{pred['away_team']} @ {pred['home_team']}",
-                value=f"予想: **{winner}** {confidence}\n先発: {pred['away_starter']} vs {pred['home_starter']}",
-                inline=False
-            )
+            fields.append({
+                'name': f"{pred['away_team']} @ {pred['home_team']}",
+                'value': f"予想: **{winner}** {confidence}\n先発: {pred['away_starter']} vs {pred['home_starter']}",
+                'inline': False
+            })
             
         # 統計情報
         home_wins = sum(1 for p in predictions if p['prediction'] == 'home')
         away_wins = sum(1 for p in predictions if p['prediction'] == 'away')
         high_confidence = sum(1 for p in predictions if p['confidence'] >= 3)
         
-        embed.add_embed_field(
-            name="📊 予想統計",
-            value=f"ホーム勝利: {home_wins}\nアウェイ勝利: {away_wins}\n高信頼度: {high_confidence}",
-            inline=True
-        )
-        
-        webhook.add_embed(embed)
+        fields.append({
+            'name': "📊 予想統計",
+            'value': f"ホーム勝利: {home_wins}\nアウェイ勝利: {away_wins}\n高信頼度: {high_confidence}",
+            'inline': True
+        })
+        
+        embeds = []
+        for i in range(0, len(fields), 25):
+            embed = {'color': 0x03b2f8, 'timestamp': timestamp, 'fields': fields[i:i + 25]}
+            if i == 0:
+                # メイン埋め込み
+                embed['title'] = f"⚾ MLB予想レポート - {date_str}"
+                embed['description'] = f"明日の試合予想（{len(predictions)}試合）"
+            embeds.append(embed)
         
         # グラフがある場合は添付
-        if graph_paths:
-            for path in graph_paths[:3]:  # 最初の3つまで
-                if os.path.exists(path):
-                    with open(path, "rb") as f:
-                        webhook.add_file(file=f.read(), filename=os.path.basename(path))
-                        
-        # 送信
-        response = webhook.execute()
-        
-        if response.status_code == 200:
+        files = []
+        for path in (graph_paths or [])[:3]:  # 最初の3つまで
+            if os.path.exists(path):
+                with open(path, "rb") as f:
+                    files.append((os.path.basename(path), f.read()))
+        
+        # 送信（上限を超える分は自動的に複数リクエストに分かれる）
+        messages = [DiscordMessage(embeds=[embed]) for embed in embeds]
+        messages[-1].files = files
+        result = DiscordPublisher(self.webhook_url).publish_sync(messages)
+        
+        if result.ok:
             print("✅ Discord配信成功！")
         else:
-            print(f"❌ Discord配信失敗: {response.status_code}")
+            print(f"❌ Discord配信失敗: {result.failed[0][1]}")
             
     def create_summary_graph(self, predictions: List[Dict]) -> str:
         """予想サマリーのグラフを作成"""
@@ -12,13 +12,15 @@ from pathlib import Path
 import base64
 from io import BytesIO
 import matplotlib.pyplot as plt
-import matplotlib.font_manager as fm
 import seaborn as sns
-from jinja2 import Template
 import pandas as pd
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src import template_engine
+from src.asset_cache import japanese_font_families
 
-# 日本語フォント設定
-plt.rcParams['font.sans-serif'] = ['DejaVu Sans']
+# 日本語フォント設定（インストール済みフォントの解決結果はプロセス内でキャッシュ）
+plt.rcParams['font.sans-serif'] = ['DejaVu Sans', *japanese_font_families()]
 plt.rcParams['axes.unicode_minus'] = False
 sns.set_style("whitegrid")
 
@@ -187,320 +189,12 @@ class MLBReportVisualizer:
         self.charts['standings'] = self.create_team_standings_chart(self.report_data.get('team_stats', {}))
         self.charts['players'] = self.create_player_stats_chart(self.report_data.get('player_stats', {}))
         
-        # HTMLテンプレート
-        html_template = Template('''
-<!DOCTYPE html>
-<html lang="ja">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>MLB Daily Report - {{ date }}</title>
-    <style>
-        * {
-            margin: 0;
-            padding: 0;
-            box-sizing: border-box;
-        }
-        
-        body {
-            font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            min-height: 100vh;
-            padding: 20px;
-        }
-        
-        .container {
-            max-width: 1400px;
-            margin: 0 auto;
-            background: white;
-            border-radius: 20px;
-            box-shadow: 0 20px 60px rgba(0,0,0,0.3);
-            overflow: hidden;
-        }
-        
-        .header {
-            background: linear-gradient(135deg, #1e3c72 0%, #2a5298 100%);
-            color: white;
-            padding: 40px;
-            text-align: center;
-        }
-        
-        .header h1 {
-            font-size: 3em;
-            margin-bottom: 10px;
-            text-shadow: 2px 2px 4px rgba(0,0,0,0.3);
-        }
-        
-        .header .date {
-            font-size: 1.2em;
-            opacity: 0.9;
-        }
-        
-        .content {
-            padding: 40px;
-        }
-        
-        .section {
-            margin-bottom: 40px;
-            animation: fadeIn 0.8s ease-in;
-        }
-        
-        @keyframes fadeIn {
-            from { opacity: 0; transform: translateY(20px); }
-            to { opacity: 1; transform: translateY(0); }
-        }
-        
-        .section-title {
-            font-size: 2em;
-            color: #1e3c72;
-            margin-bottom: 20px;
-            padding-bottom: 10px;
-            border-bottom: 3px solid #667eea;
-        }
-        
-        .games-grid {
-            display: grid;
-            grid-template-columns: repeat(auto-fit, minmax(350px, 1fr));
-            gap: 20px;
-            margin-bottom: 30px;
-        }
-        
-        .game-card {
-            background: linear-gradient(135deg, #f5f7fa 0%, #c3cfe2 100%);
-            border-radius: 15px;
-            padding: 20px;
-            box-shadow: 0 5px 15px rgba(0,0,0,0.1);
-            transition: transform 0.3s ease, box-shadow 0.3s ease;
-        }
-        
-        .game-card:hover {
-            transform: translateY(-5px);
-            box-shadow: 0 10px 25px rgba(0,0,0,0.2);
-        }
-        
-        .game-teams {
-            display: flex;
-            justify-content: space-between;
-            align-items: center;
-            margin-bottom: 15px;
-        }
-        
-        .team-name {
-            font-size: 1.3em;
-            font-weight: bold;
-            color: #2a5298;
-        }
-        
-        .score {
-            font-size: 2em;
-            font-weight: bold;
-            color: #1e3c72;
-        }
-        
-        .game-status {
-            text-align: center;
-            color: #666;
-            font-size: 0.9em;
-            margin-top: 10px;
-        }
-        
-        .stats-table {
-            width: 100%;
-            border-collapse: collapse;
-            margin-top: 20px;
-            box-shadow: 0 5px 15px rgba(0,0,0,0.1);
-            border-radius: 10px;
-            overflow: hidden;
-        }
-        
-        .stats-table th {
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            color: white;
-            padding: 15px;
-            text-align: left;
-            font-weight: 600;
-        }
-        
-        .stats-table td {
-            padding: 12px 15px;
-            border-bottom: 1px solid #e0e0e0;
-        }
-        
-        .stats-table tr:hover {
-            background-color: #f5f7fa;
-        }
-        
-        .stats-table tr:last-child td {
-            border-bottom: none;
-        }
-        
-        .chart-container {
-            margin: 30px 0;
-            text-align: center;
-        }
-        
-        .chart-container img {
-            max-width: 100%;
-            height: auto;
-            border-radius: 10px;
-            box-shadow: 0 5px 20px rgba(0,0,0,0.1);
-        }
-        
-        .highlight {
-            background: linear-gradient(135deg, #ffd89b 0%, #19547b 100%);
-            color: white;
-            padding: 2px 8px;
-            border-radius: 4px;
-            font-weight: bold;
-        }
-        
-        .footer {
-            background: #2a5298;
-            color: white;
-            text-align: center;
-            padding: 20px;
-            font-size: 0.9em;
-        }
-        
-        @media (max-width: 768px) {
-            .header h1 {
-                font-size: 2em;
-            }
-            
-            .games-grid {
-                grid-template-columns: 1fr;
-            }
-            
-            .content {
-                padding: 20px;
-            }
-        }
-    </style>
-</head>
-<body>
-    <div class="container">
-        <div class="header">
-            <h1>⚾ MLB Daily Report</h1>
-            <div class="date">{{ date }}</div>
-        </div>
-        
-        <div class="content">
-            <!-- 試合結果セクション -->
-            <div class="section">
-                <h2 class="section-title">🏟️ Today's Games</h2>
-                <div class="games-grid">
-                    {% for game in games %}
-                    <div class="game-card">
-                        <div class="game-teams">
-                            <div>
-                                <div class="team-name">{{ game.away_team }}</div>
-                                <div class="score">{{ game.away_score }}</div>
-                            </div>
-                            <div style="font-size: 1.5em; color: #999;">@</div>
-                            <div>
-                                <div class="team-name">{{ game.home_team }}</div>
-                                <div class="score">{{ game.home_score }}</div>
-                            </div>
-                        </div>
-                        <div class="game-status">
-                            {{ game.status }}
-                            {% if game.winning_pitcher %}
-                            <br>W: {{ game.winning_pitcher }} | L: {{ game.losing_pitcher }}
-                            {% if game.save_pitcher %}| S: {{ game.save_pitcher }}{% endif %}
-                            {% endif %}
-                        </div>
-                    </div>
-                    {% endfor %}
-                </div>
-            </div>
-            
-            <!-- 順位表チャート -->
-            <div class="section">
-                <h2 class="section-title">📊 Standings</h2>
-                <div class="chart-container">
-                    <img src="{{ charts.standings }}" alt="Team Standings">
-                </div>
-            </div>
-            
-            <!-- 選手成績チャート -->
-            <div class="section">
-                <h2 class="section-title">⭐ Player Statistics</h2>
-                <div class="chart-container">
-                    <img src="{{ charts.players }}" alt="Player Statistics">
-                </div>
-            </div>
-            
-            <!-- 打者成績テーブル -->
-            <div class="section">
-                <h2 class="section-title">🏏 Top Batters</h2>
-                <table class="stats-table">
-                    <thead>
-                        <tr>
-                            <th>Player</th>
-                            <th>Team</th>
-                            <th>AVG</th>
-                            <th>HR</th>
-                            <th>RBI</th>
-                            <th>OPS</th>
-                            <th>WAR</th>
-                        </tr>
-                    </thead>
-                    <tbody>
-                        {% for batter in player_stats.batters[:10] %}
-                        <tr>
-                            <td><strong>{{ batter.name }}</strong></td>
-                            <td>{{ batter.team }}</td>
-                            <td>{{ "%.3f"|format(batter.avg) }}</td>
-                            <td>{{ batter.hr }}</td>
-                            <td>{{ batter.rbi }}</td>
-                            <td>{{ "%.3f"|format(batter.ops) }}</td>
-                            <td>{{ "%.1f"|format(batter.war) }}</td>
-                        </tr>
-                        {% endfor %}
-                    </tbody>
-                </table>
-            </div>
-            
-            <!-- 投手成績テーブル -->
-            <div class="section">
-                <h2 class="section-title">🎯 Top Pitchers</h2>
-                <table class="stats-table">
-                    <thead>
-                        <tr>
-                            <th>Player</th>
-                            <th>Team</th>
-                            <th>W-L</th>
-                            <th>ERA</th>
-                            <th>SO</th>
-                            <th>WHIP</th>
-                        </tr>
-                    </thead>
-                    <tbody>
-                        {% for pitcher in player_stats.pitchers[:10] %}
-                        <tr>
-                            <td><strong>{{ pitcher.name }}</strong></td>
-                            <td>{{ pitcher.team }}</td>
-                            <td>{{ pitcher.w }}-{{ pitcher.l }}</td>
-                            <td>{{ "%.2f"|format(pitcher.era) }}</td>
-                            <td>{{ pitcher.so }}</td>
-                            <td>{{ "%.2f"|format(pitcher.whip) }}</td>
-                        </tr>
-                        {% endfor %}
-                    </tbody>
-                </table>
-            </div>
-        </div>
-        
-        <div class="footer">
-            <p>Generated on {{ datetime.now().strftime("%Y-%m-%d %H:%M:%S") }} | MLB Report Automation System</p>
-        </div>
-    </div>
-</body>
-</html>
-        ''')
+        # ファイル保存（templates/visualizer_report.html.j2 をストリーム出力）
+        if output_path is None:
+            output_path = f"daily_reports/mlb_report_{datetime.now().strftime('%Y%m%d')}.html"
         
-        # HTMLレンダリング
-        html_content = html_template.render(
+        template_engine.render_to_file(
+            'visualizer_report.html.j2', output_path,
             date=self.report_data.get('date', datetime.now().strftime('%Y-%m-%d')),
             games=self.report_data.get('games', []),
             team_stats=self.report_data.get('team_stats', {}),
@@ -509,14 +203,6 @@ class MLBReportVisualizer:
             datetime=datetime
         )
         
-        # ファイル保存
-        if output_path is None:
-            output_path = f"daily_reports/mlb_report_{datetime.now().strftime('%Y%m%d')}.html"
-        
-        os.makedirs(os.path.dirname(output_path), exist_ok=True)
-        with open(output_path, 'w', encoding='utf-8') as f:
-            f.write(html_content)
-        
         print(f"✅ HTMLレポートを生成しました: {output_path}")
         return output_path
     
@@ -3,7 +3,7 @@ Baseball Savant Statcast データ取得モジュール
 全チームのBarrel%とHard-Hit%を取得
 """
 
-import requests
+import sys
 import pandas as pd
 from datetime import datetime, timedelta
 import json
@@ -11,6 +11,9 @@ import os
 import logging
 from io import StringIO
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.http_session import get_shared_session
+
 class SavantStatcastFetcher:
     """Baseball SavantからStatcastデータを取得するクラス"""
     
@@ -19,6 +22,12 @@ class SavantStatcastFetcher:
         self.cache_dir = "cache/statcast_data"
         os.makedirs(self.cache_dir, exist_ok=True)
         
+        # プロセス共通のSession（keep-aliveコネクションを全コレクターで共有）
+        self.session = get_shared_session()
+        
+        # 全チームキャッシュファイルの読み込み結果（ファイル更新時刻, データ）
+        self._loaded_cache = (None, None)
+        
         # チームIDとチーム略称のマッピング
         self.team_mapping = {
             108: 'LAA', 109: 'ARI', 110: 'BAL', 111: 'BOS', 112: 'CHC',
@@ -84,7 +93,7 @@ class SavantStatcastFetcher:
         }
         
         try:
-            response = requests.get(url, params=params, timeout=60)
+            response = self.session.get(url, params=params, timeout=60)
             response.raise_for_status()
             
             # CSVデータをDataFrameに読み込む
@@ -160,7 +169,7 @@ class SavantStatcastFetcher:
                     'min_results': '0'
                 }
                 
-                response = requests.get(url, params=params, timeout=30)
+                response = self.session.get(url, params=params, timeout=30)
                 
                 if response.status_code == 200:
                     df = pd.read_csv(StringIO(response.text))
@@ -238,13 +247,16 @@ class SavantStatcastFetcher:
     
     def get_team_statcast_data(self, team_id):
         """特定チームのStatcastデータを取得"""
-        # まずキャッシュファイルを確認
+        # まずキャッシュファイルを確認（同一プロセス内では一度だけ読み込む）
         cache_file = os.path.join(self.cache_dir, f"all_teams_statcast_2025.json")
         
         if os.path.exists(cache_file):
             try:
-                with open(cache_file, 'r', encoding='utf-8') as f:
-                    cache_data = json.load(f)
+                mtime = os.path.getmtime(cache_file)
+                if self._loaded_cache[0] != mtime:
+                    with open(cache_file, 'r', encoding='utf-8') as f:
+                        self._loaded_cache = (mtime, json.load(f))
+                cache_data = self._loaded_cache[1]
                 
                 # team_idが文字列か数値か両方チェック
                 if str(team_id) in cache_data['data']:
@@ -1,7 +1,7 @@
 """
 Baseball SaventからチームStatcastデータを取得（改善版）
 """
-import requests
+import sys
 import json
 from typing import Dict, Any, Optional
 from datetime import datetime
@@ -10,16 +10,20 @@ import logging
 import re
 from bs4 import BeautifulSoup
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.http_session import get_shared_session
+
 logger = logging.getLogger(__name__)
 
 class StatcastTeamFetcher:
     """チーム単位のStatcastデータを取得"""
     
     def __init__(self):
-        self.session = requests.Session()
-        self.session.headers.update({
+        # プロセス共通のSessionを使い、このフェッチャー固有のヘッダーはリクエストごとに付ける
+        self.session = get_shared_session()
+        self.headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        })
+        }
         
     def get_team_statcast_from_web(self, season: int = 2025) -> Dict[str, Dict[str, Any]]:
         """Webページから直接スクレイピング"""
@@ -28,7 +32,7 @@ class StatcastTeamFetcher:
             url = f"https://baseballsavant.mlb.com/league?season={season}"
             print(f"Fetching from web page: {url}")
             
-            response = self.session.get(url)
+            response = self.session.get(url, headers=self.headers)
             print(f"Response status: {response.status_code}")
             
             if response.status_code == 200:
@@ -14,8 +14,9 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from datetime import datetime, timedelta
 import pytz
 from src.mlb_api_client import MLBApiClient
+from src.season_constants import season_constants
+from src.stat_line import PitchingLine, parse_outs
 from src.discord_client import DiscordClient
-import time
 
 class TomorrowStatsSystem:
     def __init__(self):
@@ -49,22 +50,9 @@ class TomorrowStatsSystem:
             
         stats = season_stats[0]['stat']
         
-        # FIP計算
-        hr = stats.get('homeRuns', 0)
-        bb = stats.get('baseOnBalls', 0)
-        hbp = stats.get('hitByPitch', 0)
-        k = stats.get('strikeOuts', 0)
-        ip = float(stats.get('inningsPitched', '0'))
-        
-        if ip > 0:
-            fip = ((13 * hr) + (3 * (bb + hbp)) - (2 * k)) / ip + 3.2
-        else:
-            fip = 0
-            
-        # K%, BB%計算
-        batters_faced = stats.get('battersFaced', 0)
-        k_pct = (k / batters_faced * 100) if batters_faced > 0 else 0
-        bb_pct = (bb / batters_faced * 100) if batters_faced > 0 else 0
+        # FIP・K%・BB%（投球回はアウト数で扱い、FIP定数はシーズン定数）
+        rates = PitchingLine.from_stat(stats).rates(season_constants(season))
+        fip, k_pct, bb_pct = rates['fip'], rates['k_pct'], rates['bb_pct']
         
         # QS率計算（Game Logから）
         qs_rate = self._calculate_qs_rate(pitcher_id, season)
@@ -106,7 +94,7 @@ class TomorrowStatsSystem:
             return 'N/A'
             
         qs_count = sum(1 for g in starts 
-                      if float(g['stat'].get('inningsPitched', '0')) >= 6.0 
+                      if parse_outs(g['stat'].get('inningsPitched')) >= 18 
                       and g['stat'].get('earnedRuns', 0) <= 3)
         
         return f"{(qs_count / len(starts) * 100):.1f}%"
@@ -131,7 +119,7 @@ class TomorrowStatsSystem:
             so = stat.get('strikeOuts', 0)
             
             # 三振を除いたアウト数
-            field_outs = float(stat.get('inningsPitched', '0')) * 3 - so
+            field_outs = parse_outs(stat.get('inningsPitched')) - so
             
             if field_outs > 0:
                 total_gb += gb
@@ -147,48 +135,13 @@ class TomorrowStatsSystem:
         return {'gb_pct': gb_pct, 'fb_pct': fb_pct}
         
     def _get_vs_lr_stats(self, pitcher_id, season):
-        """対左右成績を取得（Play-by-playから）"""
-        game_logs = self.client._make_request(
-            f"people/{pitcher_id}/stats?stats=gameLog&season={season}&group=pitching"
-        )
-        
-        if not game_logs or not game_logs.get('stats'):
+        """対左右成績を取得（打席結果ストアから集計）"""
+        splits = self.client.get_platoon_splits(pitcher_id=pitcher_id, season=season, games=10)
+        if splits is None:
             return {'vs_left': 'N/A', 'vs_right': 'N/A'}
-            
-        vs_left = {'pa': 0, 'ab': 0, 'h': 0}
-        vs_right = {'pa': 0, 'ab': 0, 'h': 0}
-        
-        games = game_logs['stats'][0].get('splits', [])[:10]  # 最新10試合
+        vs_left = splits['vs_left']
+        vs_right = splits['vs_right']
         
-        for game in games:
-            game_pk = game.get('game', {}).get('gamePk')
-            if not game_pk:
-                continue
-                
-            pbp = self.client._make_request(f"game/{game_pk}/playByPlay")
-            
-            if pbp and 'allPlays' in pbp:
-                for play in pbp['allPlays']:
-                    matchup = play.get('matchup', {})
-                    if matchup.get('pitcher', {}).get('id') != pitcher_id:
-                        continue
-                        
-                    batter_side = matchup.get('batSide', {}).get('code')
-                    event = play.get('result', {}).get('event', '')
-                    
-                    if not event:
-                        continue
-                        
-                    stats = vs_left if batter_side == 'L' else vs_right
-                    stats['pa'] += 1
-                    
-                    if event in ['Single', 'Double', 'Triple', 'Home Run']:
-                        stats['ab'] += 1
-                        stats['h'] += 1
-                    elif event in ['Strikeout', 'Groundout', 'Flyout', 'Lineout', 
-                                   'Pop Out', 'Grounded Into DP', 'Forceout']:
-                        stats['ab'] += 1
-                        
         # 被打率計算
         left_avg = vs_left['h'] / vs_left['ab'] if vs_left['ab'] > 0 else 0
         right_avg = vs_right['h'] / vs_right['ab'] if vs_right['ab'] > 0 else 0
@@ -339,9 +292,6 @@ class TomorrowStatsSystem:
             # self.discord_client.send_text_message(report)
             print(report[:500] + "...")  # 最初の500文字を表示
             
-            # API制限対策
-            time.sleep(2)
-            
         print(f"\n全{len(games)}試合の処理が完了しました！")
 
 if __name__ == "__main__":
@@ -3,31 +3,17 @@ wOBA (Weighted On-Base Average) 計算クラス
 FanGraphsの係数を使用して正確に計算
 """
 
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src import sabermetrics
+from src.season_constants import get_constants_table
+
 class WOBACalculator:
-    def __init__(self):
-        # 年度別の係数（FanGraphs Guts!より）
-        self.coefficients = {
-            2025: {
-                'wBB': 0.694,
-                'wHBP': 0.725,
-                'w1B': 0.888,
-                'w2B': 1.263,
-                'w3B': 1.600,
-                'wHR': 2.064,
-                'wOBAScale': 1.250,
-                'cFIP': 3.079
-            },
-            2024: {
-                'wBB': 0.689,
-                'wHBP': 0.720,
-                'w1B': 0.884,
-                'w2B': 1.257,
-                'w3B': 1.593,
-                'wHR': 2.058,
-                'wOBAScale': 1.247,
-                'cFIP': 3.134
-            }
-        }
+    def __init__(self, constants_table=None):
+        # 年度別の係数はリーグ合計から求めたシーズン定数（src/season_constants.py）を使う
+        self.constants_table = constants_table or get_constants_table()
     
     def calculate_woba(self, stats, season=2025):
         """
@@ -40,38 +26,13 @@ class WOBACalculator:
         Returns:
             float: wOBA値
         """
-        # 係数を取得（なければ2025年を使用）
-        coef = self.coefficients.get(season, self.coefficients[2025])
-        
-        # 必要な統計を取得
-        bb = int(stats.get('baseOnBalls', 0))
-        hbp = int(stats.get('hitByPitch', 0))
-        h = int(stats.get('hits', 0))
-        doubles = int(stats.get('doubles', 0))
-        triples = int(stats.get('triples', 0))
-        hr = int(stats.get('homeRuns', 0))
-        ab = int(stats.get('atBats', 0))
-        sf = int(stats.get('sacFlies', 0))
-        ibb = int(stats.get('intentionalWalks', 0))
-        
-        # 単打を計算
-        singles = h - doubles - triples - hr
-        
-        # wOBA計算
-        numerator = (coef['wBB'] * (bb - ibb) + 
-                    coef['wHBP'] * hbp + 
-                    coef['w1B'] * singles + 
-                    coef['w2B'] * doubles + 
-                    coef['w3B'] * triples + 
-                    coef['wHR'] * hr)
-        
-        denominator = ab + bb - ibb + sf + hbp
-        
-        if denominator > 0:
-            woba = numerator / denominator
-            return round(woba, 3)
-        else:
-            return 0.000
+        weights = self.constants_table.get(season).woba_weights
+        return round(float(sabermetrics.woba(sabermetrics.StatColumns.batting([stats]), weights)[0]), 3)
+
+    def calculate_woba_many(self, stat_lines, season=2025):
+        """複数の選手・チームのwOBAをまとめて計算（丸めないfloatの配列）"""
+        return sabermetrics.woba(sabermetrics.StatColumns.batting(stat_lines),
+                                self.constants_table.get(season).woba_weights)
     
     def calculate_team_woba(self, team_stats, season=2025):
         """チーム全体のwOBAを計算"""
@@ -79,8 +40,7 @@ class WOBACalculator:
     
     def get_woba_scale(self, season=2025):
         """wOBAScaleを取得（OPSとの変換用）"""
-        coef = self.coefficients.get(season, self.coefficients[2025])
-        return coef['wOBAScale']
+        return self.constants_table.get(season).woba_scale
     
     def estimate_xwoba(self, woba):
         """
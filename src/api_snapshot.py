@@ -0,0 +1,148 @@
+"""
+APIサーバー用スナップショット
+エンティティ（スレート・チームなど）ごとのTTLを持つメモリ上のスナップショットを保持し、
+期限切れのエントリはバックグラウンドで更新するモジュール
+読み出し側はロックを取らず、更新中も直前のエントリをそのまま返す
+"""
+
+import gzip
+import hashlib
+import json
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+DEFAULT_TTL = 600
+
+
+@dataclass(frozen=True)
+class SnapshotEntry:
+    """1エンティティ分のデータとシリアライズ済みのJSON"""
+    data: Any
+    body: bytes
+    etag: str
+    updated_at: float  # time.time()
+    expires_at: float  # time.monotonic()
+    gzip_body: bytes = b''  # bodyをgzip圧縮したもの（Accept-Encoding: gzip 用）
+
+    @property
+    def fresh(self):
+        return time.monotonic() < self.expires_at
+
+    @property
+    def age(self):
+        return max(0.0, time.time() - self.updated_at)
+
+
+def serialize(data) -> Tuple[bytes, str]:
+    """JSONのバイト列とETag（内容のハッシュ、引用符なし）を返す"""
+    body = json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    return body, hashlib.sha1(body).hexdigest()
+
+
+class RefreshingSnapshot:
+    """種別ごとのTTLとローダーを持つスナップショット
+
+    get()は常にメモリ上のエントリを即座に返し、期限切れ・未取得ならローダーを
+    バックグラウンドで実行する（同じキーの更新は同時に1つだけ）。
+    ローダーは put() で関連する他のエンティティもまとめて登録できる。
+    """
+
+    def __init__(self, default_ttl=DEFAULT_TTL, workers=1):
+        self.default_ttl = default_ttl
+        self._loaders: Dict[str, Tuple[Callable, float]] = {}
+        self._entries: Dict[Tuple[str, Hashable], SnapshotEntry] = {}
+        self._inflight = set()
+        self._errors: Dict[Tuple[str, Hashable], str] = {}
+        self._lock = threading.Lock()
+        # 上流への負荷を抑えるため、更新は少数のスレッドで順に実行する
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='snapshot-refresh')
+        self.logger = logging.getLogger(__name__)
+
+    def register(self, kind, loader, ttl=None):
+        """kindのローダー（loader(key) -> JSONに変換できる値）とTTLを登録"""
+        self._loaders[kind] = (loader, self.default_ttl if ttl is None else ttl)
+
+    def ttl_for(self, kind):
+        return self._loaders.get(kind, (None, self.default_ttl))[1]
+
+    def get(self, kind, key=None) -> Optional[SnapshotEntry]:
+        """エントリを返す（期限切れでも返し、更新はバックグラウンドで行う）"""
+        entry = self._entries.get((kind, key))
+        if (entry is None or not entry.fresh) and kind in self._loaders:
+            self.refresh(kind, key)
+        return entry
+
+    def put(self, kind, key, data, ttl=None) -> SnapshotEntry:
+        """データをシリアライズして登録（内容が同じならETagは変わらない）"""
+        entry = self._make_entry(kind, data, ttl)
+        with self._lock:
+            self._entries[(kind, key)] = entry
+        return entry
+
+    def replace(self, kind, items, ttl=None):
+        """kindのエントリを items（key -> データ）でまとめて置き換える（なくなったキーは削除）"""
+        entries = {(kind, key): self._make_entry(kind, data, ttl) for key, data in items.items()}
+        with self._lock:
+            kept = {k: v for k, v in self._entries.items() if k[0] != kind}
+            kept.update(entries)
+            # 読み出し側はロックを取らないため、辞書ごと差し替える
+            self._entries = kept
+
+    def keys(self, kind):
+        return [key for (entry_kind, key) in list(self._entries) if entry_kind == kind]
+
+    def _make_entry(self, kind, data, ttl):
+        body, etag = serialize(data)
+        ttl = self.ttl_for(kind) if ttl is None else ttl
+        return SnapshotEntry(data, body, etag, time.time(), time.monotonic() + ttl,
+                             gzip.compress(body, compresslevel=6))
+
+    def refresh(self, kind, key=None, wait=False):
+        """ローダーをバックグラウンドで実行（wait=Trueなら完了まで待つ）"""
+        with self._lock:
+            if (kind, key) in self._inflight:
+                return None
+            self._inflight.add((kind, key))
+        future = self._executor.submit(self._load, kind, key)
+        return future.result() if wait else future
+
+    def _load(self, kind, key):
+        loader, _ = self._loaders[kind]
+        start = time.perf_counter()
+        try:
+            data = loader(key)
+            entry = self.put(kind, key, data)
+            self._errors.pop((kind, key), None)
+            self.logger.info(f"Refreshed {kind}:{key} in {time.perf_counter() - start:.2f}s")
+            return entry
+        except Exception as e:
+            # 失敗した場合は直前のエントリを返し続ける
+            self._errors[(kind, key)] = str(e)
+            self.logger.error(f"Refresh failed {kind}:{key}: {e}")
+            return None
+        finally:
+            with self._lock:
+                self._inflight.discard((kind, key))
+
+    def status(self):
+        """種別ごとのエントリ数・最終更新・エラー"""
+        summary: Dict[str, Dict[str, Any]] = {}
+
+        def info(kind):
+            return summary.setdefault(kind, {'entries': 0, 'stale': 0, 'max_age': 0.0, 'errors': {}})
+
+        for (kind, key), entry in list(self._entries.items()):
+            kind_info = info(kind)
+            kind_info['entries'] += 1
+            kind_info['stale'] += 0 if entry.fresh else 1
+            kind_info['max_age'] = round(max(kind_info['max_age'], entry.age), 1)
+        for (kind, key), error in list(self._errors.items()):
+            info(kind)['errors'][str(key)] = error
+        return summary
+
+    def close(self):
+        self._executor.shutdown(wait=False)
@@ -0,0 +1,203 @@
+"""
+レポート用アセットキャッシュ
+全30球団のロゴを1回だけダウンロード・正規化してディスクに保存し、
+HTML/PDFにそのまま埋め込めるdata URIとして提供するモジュール
+あわせて日本語フォントの解決結果もプロセス内でキャッシュする
+"""
+
+import base64
+import hashlib
+import json
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Optional
+
+DEFAULT_ASSET_DIR = "cache/assets"
+LOGO_URL = "https://www.mlbstatic.com/team-logos/{team_id}.svg"
+
+# 略称 -> MLBチームID
+TEAM_IDS: Dict[str, int] = {
+    "NYY": 147, "BOS": 111, "TB": 139, "BAL": 110, "TOR": 141,
+    "CWS": 145, "CLE": 114, "DET": 116, "KC": 118, "MIN": 142,
+    "HOU": 117, "TEX": 140, "LAA": 108, "OAK": 133, "SEA": 136,
+    "ATL": 144, "MIA": 146, "NYM": 121, "PHI": 143, "WSH": 120,
+    "CHC": 112, "CIN": 113, "MIL": 158, "PIT": 134, "STL": 138,
+    "ARI": 109, "COL": 115, "LAD": 119, "SD": 135, "SF": 137,
+}
+
+# 正式名称 -> 略称
+TEAM_ABBRS: Dict[str, str] = {
+    "New York Yankees": "NYY", "Boston Red Sox": "BOS", "Tampa Bay Rays": "TB",
+    "Baltimore Orioles": "BAL", "Toronto Blue Jays": "TOR", "Chicago White Sox": "CWS",
+    "Cleveland Guardians": "CLE", "Detroit Tigers": "DET", "Kansas City Royals": "KC",
+    "Minnesota Twins": "MIN", "Houston Astros": "HOU", "Texas Rangers": "TEX",
+    "Los Angeles Angels": "LAA", "Oakland Athletics": "OAK", "Athletics": "OAK",
+    "Seattle Mariners": "SEA", "Atlanta Braves": "ATL", "Miami Marlins": "MIA",
+    "New York Mets": "NYM", "Philadelphia Phillies": "PHI", "Washington Nationals": "WSH",
+    "Chicago Cubs": "CHC", "Cincinnati Reds": "CIN", "Milwaukee Brewers": "MIL",
+    "Pittsburgh Pirates": "PIT", "St. Louis Cardinals": "STL", "Arizona Diamondbacks": "ARI",
+    "Colorado Rockies": "COL", "Los Angeles Dodgers": "LAD", "San Diego Padres": "SD",
+    "San Francisco Giants": "SF",
+}
+
+# 日本語表示に使うフォント候補（先頭から順に、インストール済みのものを使う）
+JAPANESE_FONT_FAMILIES = (
+    'Hiragino Sans', 'Yu Gothic', 'Meiryo', 'Takao', 'IPAexGothic', 'IPAPGothic',
+    'VL PGothic', 'Noto Sans CJK JP',
+)
+
+
+def team_abbr(team) -> Optional[str]:
+    """略称・正式名称・愛称（'Red Sox' など）のいずれかから略称を返す"""
+    if team in TEAM_IDS:
+        return team
+    if team in TEAM_ABBRS:
+        return TEAM_ABBRS[team]
+    for name, abbr in TEAM_ABBRS.items():
+        if name.endswith(f" {team}"):
+            return abbr
+    return None
+
+
+def normalize_svg(data: bytes) -> bytes:
+    """XML宣言・コメント・タグ間の空白を除去してサイズを揃える"""
+    text = data.decode('utf-8')
+    text = re.sub(r'<\?xml[^>]*\?>', '', text)
+    text = re.sub(r'<!--.*?-->', '', text, flags=re.S)
+    text = re.sub(r'>\s+<', '><', text)
+    return text.strip().encode('utf-8')
+
+
+class AssetCache:
+    """ロゴ（SVG）のディスク・メモリキャッシュ
+
+    ダウンロードしたロゴは asset_dir/logos/{略称}.svg に正規化して保存し、
+    asset_dir/manifest.json に各ファイルのSHA-256を記録する。
+    """
+
+    def __init__(self, asset_dir=DEFAULT_ASSET_DIR, session=None):
+        self.asset_dir = Path(asset_dir)
+        self.logo_dir = self.asset_dir / "logos"
+        self._session = session
+        self._logos: Dict[str, bytes] = {}
+        self._data_uris: Dict[str, str] = {}
+        self._missing = set()  # 取得に失敗した略称（同じプロセスでは再試行しない）
+        self._lock = threading.Lock()
+
+    @property
+    def session(self):
+        if self._session is None:
+            from src.http_session import get_shared_session
+            self._session = get_shared_session()
+        return self._session
+
+    def logo_bytes(self, team) -> Optional[bytes]:
+        """正規化済みSVGを返す（メモリ -> ディスク -> ダウンロードの順に探す）"""
+        abbr = team_abbr(team)
+        if abbr is None:
+            return None
+        with self._lock:
+            if abbr in self._logos:
+                return self._logos[abbr]
+            if abbr in self._missing:
+                return None
+
+        path = self.logo_dir / f"{abbr}.svg"
+        if path.exists():
+            data = path.read_bytes()
+        else:
+            data = self._download(abbr)
+            if data is None:
+                with self._lock:
+                    self._missing.add(abbr)
+                return None
+            self.logo_dir.mkdir(parents=True, exist_ok=True)
+            path.write_bytes(data)
+
+        with self._lock:
+            self._logos[abbr] = data
+            self._data_uris.pop(abbr, None)
+        return data
+
+    def logo_data_uri(self, team, fallback=None) -> Optional[str]:
+        """HTMLのsrcにそのまま使えるdata URI（取得できなければfallbackを返す）"""
+        abbr = team_abbr(team)
+        with self._lock:
+            if abbr in self._data_uris:
+                return self._data_uris[abbr]
+        data = self.logo_bytes(team)
+        if data is None:
+            return fallback
+        uri = "data:image/svg+xml;base64," + base64.b64encode(data).decode('ascii')
+        with self._lock:
+            self._data_uris[abbr] = uri
+        return uri
+
+    def prefetch_logos(self, workers=8):
+        """全30球団のロゴを並行して取得し、マニフェストを書き出す"""
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            list(executor.map(self.logo_bytes, TEAM_IDS))
+        self.write_manifest()
+        return self.manifest()
+
+    def manifest(self) -> Dict[str, str]:
+        """読み込み済みロゴの {略称: SHA-256}"""
+        with self._lock:
+            return {abbr: hashlib.sha256(data).hexdigest() for abbr, data in sorted(self._logos.items())}
+
+    def content_hash(self) -> str:
+        """読み込み済みアセット全体のハッシュ（出力物のキャッシュキー・バージョン表示用）"""
+        digest = hashlib.sha256()
+        for abbr, sha in self.manifest().items():
+            digest.update(f"{abbr}:{sha}\n".encode('ascii'))
+        return digest.hexdigest()[:16]
+
+    def write_manifest(self):
+        self.asset_dir.mkdir(parents=True, exist_ok=True)
+        path = self.asset_dir / "manifest.json"
+        path.write_text(json.dumps({'content_hash': self.content_hash(), 'logos': self.manifest()},
+                                   indent=2), encoding='utf-8')
+        return path
+
+    def _download(self, abbr) -> Optional[bytes]:
+        try:
+            response = self.session.get(LOGO_URL.format(team_id=TEAM_IDS[abbr]), timeout=10)
+            if response.status_code != 200:
+                return None
+            return normalize_svg(response.content)
+        except Exception:
+            return None
+
+
+_shared_cache: Optional[AssetCache] = None
+_shared_lock = threading.Lock()
+
+
+def get_asset_cache() -> AssetCache:
+    """プロセス共通のAssetCacheを取得"""
+    global _shared_cache
+    with _shared_lock:
+        if _shared_cache is None:
+            _shared_cache = AssetCache()
+        return _shared_cache
+
+
+@lru_cache(maxsize=None)
+def japanese_font_families(candidates=JAPANESE_FONT_FAMILIES):
+    """インストール済みの日本語フォント名（見つからなければ空タプル）"""
+    from matplotlib import font_manager
+
+    installed = {font.name for font in font_manager.fontManager.ttflist}
+    return tuple(name for name in candidates if name in installed)
+
+
+@lru_cache(maxsize=None)
+def japanese_font_properties(size=None):
+    """日本語フォントのFontProperties（同じsizeなら同じオブジェクトを返す）"""
+    from matplotlib.font_manager import FontProperties
+
+    families = japanese_font_families() or ('DejaVu Sans',)
+    return FontProperties(family=list(families), size=size)
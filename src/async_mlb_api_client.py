@@ -0,0 +1,160 @@
+"""
+MLB Stats API 非同期クライアント
+MLBApiClientと同じメソッド構成で、スレート全体のリクエストを並行して発行するモジュール
+"""
+
+import asyncio
+import functools
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Awaitable, List, Optional
+
+from src.http_session import get_session_factory
+from src.mlb_api_client import MLBApiClient
+from src.rate_limiter import HostRateLimiter, get_default_limiter
+
+
+class AsyncMLBApiClient:
+    """MLB Stats APIの非同期クライアントクラス
+
+    各メソッドはMLBApiClientの同名メソッドをスレッドプール上で実行する。
+    同時実行数はmax_concurrencyで制限し、ホストごとの発行ペースはHTTP層の共通レート制限
+    （src/rate_limiter.py）に従う。requests_per_secondを指定した場合は全ホスト共通でその値に制限する。
+    """
+
+    def __init__(self, max_concurrency=8, requests_per_second=None, client=None):
+        self.max_concurrency = max_concurrency
+        if requests_per_second is None:
+            self.rate_limiter = get_default_limiter()
+        else:
+            self.rate_limiter = HostRateLimiter(
+                budgets={}, default_budget=(requests_per_second, max(1, int(requests_per_second)))
+            )
+        self.client = client or MLBApiClient()
+
+        # 共有Sessionのプールで足りる場合はそのまま使い、keep-aliveコネクションを共有する
+        factory = get_session_factory()
+        self._owns_session = (requests_per_second is not None or
+                              max_concurrency > factory.pool_size_for('statsapi.mlb.com'))
+        if self._owns_session:
+            self.client.session = factory.create(getattr(self.client.session, 'cache', None),
+                                                 self.rate_limiter, max_concurrency)
+        self.logger = logging.getLogger(__name__)
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrency,
+                                            thread_name_prefix='mlb-api')
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self.close()
+
+    def close(self):
+        """スレッドプールと専用セッションを解放（共有Sessionは閉じない）"""
+        self._executor.shutdown(wait=False)
+        if self._owns_session:
+            self.client.session.close()
+
+    async def _run(self, func, *args, **kwargs):
+        """同期メソッドを同時実行数の範囲内でスレッドプール上で実行"""
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async with self._semaphore:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(
+                self._executor, functools.partial(func, *args, **kwargs)
+            )
+
+    async def run(self, func, *args, **kwargs):
+        """任意の同期処理を同じ同時実行数・レート制限の範囲内で実行"""
+        return await self._run(func, *args, **kwargs)
+
+    async def gather(self, *aws: Awaitable) -> List[Any]:
+        """複数のリクエストをまとめて並行実行（順序は引数順）"""
+        return list(await asyncio.gather(*aws))
+
+    async def get_schedule(self, date=None):
+        """指定日の試合スケジュールを取得"""
+        return await self._run(self.client.get_schedule, date)
+
+    async def get_game_details(self, game_pk):
+        """試合の詳細情報を取得"""
+        return await self._run(self.client.get_game_details, game_pk)
+
+    async def get_game_batting_lines(self, game_pk):
+        """試合の両チーム打撃ラインを取得"""
+        return await self._run(self.client.get_game_batting_lines, game_pk)
+
+    async def get_platoon_splits(self, pitcher_id=None, batter_id=None, season=2025, games=10):
+        """投手または打者の直近N試合の対左右成績を集計"""
+        return await self._run(self.client.get_platoon_splits, pitcher_id, batter_id, season, games)
+
+    async def get_player_info(self, player_id):
+        """選手の基本情報を取得（利き腕情報を含む）"""
+        return await self._run(self.client.get_player_info, player_id)
+
+    async def get_player_stats_by_season(self, player_id, season=2025, stat_group="pitching"):
+        """選手のシーズン統計を取得"""
+        return await self._run(self.client.get_player_stats_by_season,
+                               player_id, season, stat_group)
+
+    async def get_players_stats_by_season(self, player_ids, season=2025, stat_group="pitching"):
+        """複数選手のシーズン統計をまとめて取得"""
+        return await self._run(self.client.get_players_stats_by_season,
+                               player_ids, season, stat_group)
+
+    async def get_player_splits(self, player_id, season=2025, stat_group="pitching"):
+        """選手の対左右成績を取得"""
+        return await self._run(self.client.get_player_splits, player_id, season, stat_group)
+
+    async def get_team_roster(self, team_id):
+        """チームのロースターを取得"""
+        return await self._run(self.client.get_team_roster, team_id)
+
+    async def get_team_roster_with_stats(self, team_id, season=2025, stat_group="pitching"):
+        """チームのロースターを全選手のシーズン統計付きで取得"""
+        return await self._run(self.client.get_team_roster_with_stats, team_id, season, stat_group)
+
+    async def get_team_stats(self, team_id, season=2025):
+        """チームの統計を取得"""
+        return await self._run(self.client.get_team_stats, team_id, season)
+
+    async def get_team_splits_vs_pitchers(self, team_id, season=2025):
+        """チームの対左右投手成績を取得"""
+        return await self._run(self.client.get_team_splits_vs_pitchers, team_id, season)
+
+    async def calculate_team_recent_ops(self, team_id, games=5):
+        """チームの過去N試合のOPSを計算"""
+        return await self._run(self.client.calculate_team_recent_ops, team_id, games)
+
+    async def calculate_team_recent_ops_windows(self, team_id, windows=(5, 10)):
+        """チームの過去N試合のOPSを複数のNについて一度に計算"""
+        return await self._run(self.client.calculate_team_recent_ops_windows, team_id, windows)
+
+    async def calculate_team_recent_ops_with_cache(self, team_id, games=5):
+        """キャッシュ機能付きの過去N試合OPS計算"""
+        return await self._run(self.client.calculate_team_recent_ops_with_cache, team_id, games)
+
+    async def get_team_batting_stats(self, team_id, season=2025):
+        """チームの打撃統計を取得（過去の試合OPSも含む）"""
+        return await self._run(self.client.get_team_batting_stats, team_id, season)
+
+
+# テスト用
+if __name__ == "__main__":
+    async def _main():
+        async with AsyncMLBApiClient() as client:
+            schedule = await client.get_schedule()
+            games = [g for d in (schedule or {}).get('dates', []) for g in d.get('games', [])]
+            team_ids = sorted({g['teams'][side]['team']['id'] for g in games for side in ('away', 'home')})
+
+            start = time.monotonic()
+            stats = await client.gather(*(client.get_team_stats(t) for t in team_ids))
+            print(f"{len(team_ids)} teams fetched in {time.monotonic() - start:.2f}s")
+            for team_id, team_stats in zip(team_ids, stats):
+                print(f"Team {team_id}: OPS {team_stats.get('ops', '-')}")
+
+    asyncio.run(_main())
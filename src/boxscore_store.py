@@ -0,0 +1,146 @@
+"""
+試合別チーム打撃成績ストア
+終了した試合のチーム打撃ラインを一度だけ取り込み、直近N試合の集計をローカルで行うモジュール
+"""
+
+import logging
+import os
+import sqlite3
+import threading
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Set
+
+DEFAULT_STORE_PATH = "cache/boxscore_store.sqlite3"
+
+# 保存するチーム打撃項目（boxscoreのteamStats.battingのキー → カラム名）
+BATTING_FIELDS = {
+    'atBats': 'at_bats',
+    'hits': 'hits',
+    'doubles': 'doubles',
+    'triples': 'triples',
+    'homeRuns': 'home_runs',
+    'baseOnBalls': 'base_on_balls',
+    'hitByPitch': 'hit_by_pitch',
+    'sacFlies': 'sac_flies',
+}
+
+
+@dataclass(frozen=True)
+class TeamBattingLine:
+    """1試合分のチーム打撃ライン"""
+    team_id: int
+    side: str
+    runs: int = 0
+    at_bats: int = 0
+    hits: int = 0
+    doubles: int = 0
+    triples: int = 0
+    home_runs: int = 0
+    base_on_balls: int = 0
+    hit_by_pitch: int = 0
+    sac_flies: int = 0
+    avg: str = '.000'
+    obp: str = '.000'
+    slg: str = '.000'
+
+    @classmethod
+    def from_batting(cls, team_id, side, batting):
+        """boxscoreのteamStats.battingから生成"""
+        counts = {col: int(batting.get(key, 0) or 0) for key, col in BATTING_FIELDS.items()}
+        return cls(
+            team_id=team_id,
+            side=side,
+            runs=int(batting.get('runs', 0) or 0),
+            avg=batting.get('avg', '.000'),
+            obp=batting.get('obp', '.000'),
+            slg=batting.get('slg', '.000'),
+            **counts
+        )
+
+
+class BoxscoreStore:
+    """終了試合のチーム打撃ラインを追記専用で保存するクラス"""
+
+    def __init__(self, path=DEFAULT_STORE_PATH):
+        self.path = path
+        self.logger = logging.getLogger(__name__)
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        columns = ", ".join(f"{col} INTEGER NOT NULL DEFAULT 0" for col in BATTING_FIELDS.values())
+        self._conn.execute(f"""
+            CREATE TABLE IF NOT EXISTS team_batting_lines (
+                game_pk INTEGER NOT NULL,
+                team_id INTEGER NOT NULL,
+                game_date TEXT NOT NULL,
+                {columns},
+                PRIMARY KEY (game_pk, team_id)
+            )
+        """)
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_team_batting_recent "
+            "ON team_batting_lines(team_id, game_date DESC)"
+        )
+        self._conn.commit()
+
+    def missing_games(self, game_pks: Iterable[int]) -> Set[int]:
+        """まだ取り込んでいない試合IDを返す"""
+        game_pks = list(game_pks)
+        if not game_pks:
+            return set()
+
+        placeholders = ",".join("?" * len(game_pks))
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT DISTINCT game_pk FROM team_batting_lines WHERE game_pk IN ({placeholders})",
+                game_pks
+            ).fetchall()
+        return set(game_pks) - {row[0] for row in rows}
+
+    def add_game(self, game_pk, game_date, team_lines: Iterable[TeamBattingLine]):
+        """1試合分のチーム打撃ラインを追加（既存の行は変更しない）
+
+        Args:
+            game_pk: 試合ID
+            game_date: 試合開始日時（ISO形式、並び順に使用）
+            team_lines: 両チームのTeamBattingLine
+        """
+        columns = list(BATTING_FIELDS.values())
+        sql = (f"INSERT OR IGNORE INTO team_batting_lines (game_pk, team_id, game_date, {', '.join(columns)}) "
+               f"VALUES (?, ?, ?, {', '.join('?' * len(columns))})")
+        rows = []
+        for line in team_lines:
+            rows.append([game_pk, line.team_id, game_date] +
+                        [getattr(line, col) for col in columns])
+
+        with self._lock:
+            self._conn.executemany(sql, rows)
+            self._conn.commit()
+
+    def recent_lines(self, team_id, limit, since='') -> List[Dict]:
+        """チームの直近N試合の打撃ラインを新しい順に返す（sinceより前の試合は除外）"""
+        columns = list(BATTING_FIELDS.values())
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT game_pk, game_date, {', '.join(columns)} FROM team_batting_lines "
+                "WHERE team_id = ? AND game_date >= ? ORDER BY game_date DESC, game_pk DESC LIMIT ?",
+                (team_id, since, limit)
+            ).fetchall()
+        return [dict(zip(['game_pk', 'game_date'] + columns, row)) for row in rows]
+
+
+_default_store = None
+_default_store_lock = threading.Lock()
+
+
+def get_default_store():
+    """プロセス共通のストアを取得"""
+    global _default_store
+    with _default_store_lock:
+        if _default_store is None:
+            _default_store = BoxscoreStore()
+        return _default_store
@@ -3,13 +3,14 @@
 Discord Webhook Client
 """
 import os
-from discord_webhook import DiscordWebhook
 from dotenv import load_dotenv
+from src.discord_publisher import DiscordMessage, DiscordPublisher, PublishResult
 
 class DiscordClient:
     def __init__(self):
         load_dotenv()
         self.webhook_url = os.getenv('DISCORD_WEBHOOK_URL')
+        self.publisher = DiscordPublisher(self.webhook_url) if self.webhook_url else None
         
     def send_text_message(self, content: str):
         """Send text message to Discord"""
@@ -19,11 +20,20 @@ class DiscordClient:
             print(content)
             return
             
-        try:
-            webhook = DiscordWebhook(url=self.webhook_url, content=content)
-            response = webhook.execute()
+        # 429の場合はRetry-Afterに従って再送する
+        result = self.send_messages([DiscordMessage(content)])
+        if result.ok:
             print("Message sent to Discord successfully")
-        except Exception as e:
-            print(f"Failed to send Discord message: {e}")
+        else:
+            print(f"Failed to send Discord message: {result.failed[0][1]}")
             print("Message content:")
-            print(content)
\ No newline at end of file
+            print(content)
+            
+    def send_messages(self, messages) -> PublishResult:
+        """複数のメッセージを上限までまとめて送信（レート制限ヘッダーに従い、固定の待機はしない）"""
+        if not self.publisher:
+            print("Discord webhook URL not found in .env file")
+            for message in messages:
+                print(message.content)
+            return PublishResult(messages=len(messages))
+        return self.publisher.publish_sync(messages)
\ No newline at end of file
@@ -0,0 +1,241 @@
+"""
+Discord Webhook一括配信
+複数のメッセージをWebhookの上限（本文2000文字・埋め込み10件・添付10件）まで1リクエストにまとめ、
+X-RateLimit-* / Retry-After ヘッダーに従って非同期キューから順番に送信するモジュール
+"""
+
+import asyncio
+import functools
+import json
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+import requests
+
+from src.rate_limiter import parse_retry_after
+
+
+@dataclass(frozen=True)
+class WebhookLimits:
+    """1リクエストあたりの上限"""
+    content_chars: int = 2000
+    embeds: int = 10
+    embed_chars: int = 6000
+    files: int = 10
+    file_bytes: int = 25 * 1024 * 1024
+
+
+@dataclass
+class DiscordMessage:
+    """送信するメッセージ（filesは (ファイル名, バイト列) のリスト）"""
+    content: str = ''
+    embeds: List[Dict[str, Any]] = field(default_factory=list)
+    files: List[Tuple[str, bytes]] = field(default_factory=list)
+
+
+@dataclass
+class PublishResult:
+    """配信結果"""
+    messages: int = 0
+    requests: int = 0
+    sent: int = 0
+    failed: List[Tuple[int, str]] = field(default_factory=list)  # (リクエスト番号, エラー)
+    rate_limited: int = 0
+    seconds: float = 0.0
+
+    @property
+    def ok(self):
+        return not self.failed
+
+
+def _embed_chars(embed):
+    """埋め込みの文字数（Discordが6000文字の上限で数える項目の合計）"""
+    total = len(embed.get('title', '')) + len(embed.get('description', ''))
+    total += len(embed.get('footer', {}).get('text', '')) + len(embed.get('author', {}).get('name', ''))
+    for f in embed.get('fields', []):
+        total += len(f.get('name', '')) + len(f.get('value', ''))
+    return total
+
+
+def pack_messages(messages, limits=WebhookLimits()):
+    """順番を保ったまま、上限に収まる範囲で隣り合うメッセージを1つにまとめる"""
+    packed: List[DiscordMessage] = []
+    current: Optional[DiscordMessage] = None
+
+    for message in messages:
+        if current is not None:
+            content = f"{current.content}\n\n{message.content}" if current.content and message.content \
+                else current.content or message.content
+            embeds = current.embeds + message.embeds
+            files = current.files + message.files
+            if (len(content) <= limits.content_chars
+                    and len(embeds) <= limits.embeds
+                    and sum(_embed_chars(e) for e in embeds) <= limits.embed_chars
+                    and len(files) <= limits.files
+                    and sum(len(data) for _, data in files) <= limits.file_bytes):
+                current = DiscordMessage(content, embeds, files)
+                continue
+            packed.append(current)
+        current = DiscordMessage(message.content, list(message.embeds), list(message.files))
+
+    if current is not None:
+        packed.append(current)
+    return packed
+
+
+class WebhookRateLimit:
+    """レスポンスヘッダーから求めた次の送信可能時刻"""
+
+    def __init__(self):
+        self.bucket = None
+        self.remaining = None
+        self._reset_at = 0.0
+
+    def wait_time(self) -> float:
+        if self.remaining is None or self.remaining > 0:
+            return 0.0
+        return max(0.0, self._reset_at - time.monotonic())
+
+    def update(self, response):
+        headers = response.headers
+        self.bucket = headers.get('X-RateLimit-Bucket', self.bucket)
+        remaining = headers.get('X-RateLimit-Remaining')
+        reset_after = headers.get('X-RateLimit-Reset-After')
+        try:
+            self.remaining = None if remaining is None else int(remaining)
+        except ValueError:
+            self.remaining = None
+        if reset_after is not None:
+            try:
+                self._reset_at = time.monotonic() + float(reset_after)
+            except ValueError:
+                pass
+
+    def block_for(self, seconds):
+        self.remaining = 0
+        self._reset_at = max(self._reset_at, time.monotonic() + seconds)
+
+
+class DiscordPublisher:
+    """Webhookへの配信キュー
+
+    リクエストは1本のワーカーが投入順に送信する（同じWebhookは1つのバケットを共有するため）。
+    送信前にX-RateLimit-Remainingが0ならリセットまで待ち、429はRetry-After（本文のretry_after）
+    だけ待って再送する。固定のsleepは入れない。
+    """
+
+    def __init__(self, webhook_url, session=None, limits=WebhookLimits(), max_retries=5, timeout=30):
+        self.webhook_url = webhook_url
+        self.limits = limits
+        self.max_retries = max_retries
+        self.timeout = timeout
+        self.rate_limit = WebhookRateLimit()
+        self.logger = logging.getLogger(__name__)
+        self._session = session
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._result = PublishResult()
+
+    @property
+    def session(self):
+        if self._session is None:
+            # 429は自前で処理するため、レート制限付きの共有Sessionではなく素のSessionを使う
+            from src.http_session import get_session_factory
+            self._session = get_session_factory().configure(requests.Session())
+        return self._session
+
+    async def start(self):
+        if self._worker is None:
+            self._queue = asyncio.Queue()
+            self._result = PublishResult()
+            self._worker = asyncio.create_task(self._run())
+
+    async def submit(self, message):
+        """1リクエスト分（pack済み）のメッセージをキューに追加"""
+        await self.start()
+        await self._queue.put(message)
+
+    async def close(self):
+        """キューが空になるまで待ってワーカーを止め、結果を返す"""
+        if self._worker is None:
+            return self._result
+        await self._queue.join()
+        self._worker.cancel()
+        try:
+            await self._worker
+        except asyncio.CancelledError:
+            pass
+        self._worker = None
+        return self._result
+
+    async def publish(self, messages):
+        """メッセージをまとめて配信し、すべて送信し終えるまで待つ"""
+        start = time.perf_counter()
+        messages = list(messages)
+        packed = pack_messages(messages, self.limits)
+        await self.start()
+        for message in packed:
+            await self._queue.put(message)
+        result = await self.close()
+        result.messages = len(messages)
+        result.seconds = time.perf_counter() - start
+        return result
+
+    def publish_sync(self, messages):
+        """同期コードから呼ぶ場合のpublish"""
+        return asyncio.run(self.publish(messages))
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            message = await self._queue.get()
+            self._result.requests += 1
+            number = self._result.requests
+            try:
+                await self._send(loop, message)
+                self._result.sent += 1
+            except Exception as e:
+                self.logger.warning(f"Discord request {number} failed: {e}")
+                self._result.failed.append((number, str(e)))
+            finally:
+                self._queue.task_done()
+
+    async def _send(self, loop, message):
+        for attempt in range(self.max_retries + 1):
+            wait = self.rate_limit.wait_time()
+            if wait > 0:
+                await asyncio.sleep(wait)
+
+            response = await loop.run_in_executor(None, functools.partial(self._post, message))
+            self.rate_limit.update(response)
+            if response.status_code != 429:
+                response.raise_for_status()
+                return response
+
+            self._result.rate_limited += 1
+            retry_after = self._retry_after(response)
+            self.logger.warning(f"Discord 429, retrying in {retry_after:.2f}s "
+                                f"({attempt + 1}/{self.max_retries})")
+            self.rate_limit.block_for(retry_after)
+        raise RuntimeError(f"rate limited {self.max_retries + 1} times")
+
+    @staticmethod
+    def _retry_after(response):
+        try:
+            return float(response.json()['retry_after'])
+        except (ValueError, KeyError, TypeError):
+            retry_after = parse_retry_after(response)
+            return 1.0 if retry_after is None else retry_after
+
+    def _post(self, message):
+        payload = {'content': message.content}
+        if message.embeds:
+            payload['embeds'] = message.embeds
+        if not message.files:
+            return self.session.post(self.webhook_url, json=payload, timeout=self.timeout)
+
+        files = {f'files[{i}]': (filename, data) for i, (filename, data) in enumerate(message.files)}
+        return self.session.post(self.webhook_url, data={'payload_json': json.dumps(payload)},
+                                 files=files, timeout=self.timeout)
@@ -0,0 +1,156 @@
+"""
+試合インデックス
+APIレスポンス用の試合データ（mlb_api_serverのgame_payload形式）を game_id・team_id・pitcher_id の
+辞書で引けるようにし、各試合のJSONを1回だけシリアライズして保持するモジュール
+api_cache/ に保存された過去のスレートも日付ごとに同じインデックスで検索できる
+"""
+
+import bisect
+import json
+import re
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+HISTORY_PATTERN = re.compile(r'^mlb_data_(\d{4}-\d{2}-\d{2})\.json$')
+
+
+def _encode(data) -> bytes:
+    return json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def _pitcher_id(team):
+    pitcher = (team or {}).get('pitcher') or {}
+    return pitcher.get('id')
+
+
+@dataclass
+class GameIndex:
+    """1スレート分の試合インデックス（game_idの並びは元の試合順）"""
+    by_id: Dict[int, dict] = field(default_factory=dict)
+    bodies: Dict[int, bytes] = field(default_factory=dict)
+    by_team: Dict[int, List[int]] = field(default_factory=dict)
+    by_pitcher: Dict[int, List[int]] = field(default_factory=dict)
+
+    @classmethod
+    def from_games(cls, games):
+        index = cls()
+        for game in games:
+            game_id = game.get('game_id')
+            if game_id is None:
+                continue
+            index.by_id[game_id] = game
+            index.bodies[game_id] = _encode(game)
+            for side in ('away_team', 'home_team'):
+                team = game.get(side)
+                if not team:
+                    continue
+                index.by_team.setdefault(team['id'], []).append(game_id)
+                pitcher_id = _pitcher_id(team)
+                if pitcher_id:
+                    index.by_pitcher.setdefault(pitcher_id, []).append(game_id)
+        return index
+
+    def __len__(self):
+        return len(self.by_id)
+
+    def game_ids(self, team_id=None, pitcher_id=None):
+        """条件に合う試合のgame_id（条件なしなら全試合）"""
+        if team_id is None and pitcher_id is None:
+            return list(self.by_id)
+        ids = None
+        if team_id is not None:
+            ids = self.by_team.get(team_id, [])
+        if pitcher_id is not None:
+            pitcher_ids = self.by_pitcher.get(pitcher_id, [])
+            if ids is None:
+                ids = pitcher_ids
+            else:
+                pitcher_set = set(pitcher_ids)
+                ids = [g for g in ids if g in pitcher_set]
+        return list(ids)
+
+    def games(self, team_id=None, pitcher_id=None):
+        return [self.by_id[game_id] for game_id in self.game_ids(team_id, pitcher_id)]
+
+    def games_body(self, team_id=None, pitcher_id=None) -> bytes:
+        """条件に合う試合のJSON配列（シリアライズ済みのバイト列を連結）"""
+        return b'[' + b','.join(self.bodies[g] for g in self.game_ids(team_id, pitcher_id)) + b']'
+
+
+class CacheHistory:
+    """api_cache/ の mlb_data_{YYYY-MM-DD}.json を日付で検索する
+
+    ファイル名の日付は保存したスレートの target_date（日本時間の日付）。
+
+    ディレクトリの一覧は更新時刻が変わったときだけ読み直し、各ファイルは
+    更新時刻をキーにGameIndexとしてキャッシュする。
+    """
+
+    def __init__(self, cache_dir):
+        self.cache_dir = Path(cache_dir)
+        self._dates: List[str] = []
+        self._paths: Dict[str, Path] = {}
+        self._dir_mtime = None
+        self._indexes: Dict[str, Tuple[float, GameIndex]] = {}
+        self._lock = threading.Lock()
+
+    def _scan(self):
+        try:
+            mtime = self.cache_dir.stat().st_mtime
+        except FileNotFoundError:
+            self._dates, self._paths, self._dir_mtime = [], {}, None
+            return
+        if mtime == self._dir_mtime:
+            return
+        paths = {}
+        for path in self.cache_dir.iterdir():
+            match = HISTORY_PATTERN.match(path.name)
+            if match:
+                paths[match.group(1)] = path
+        self._paths = paths
+        self._dates = sorted(paths)
+        self._dir_mtime = mtime
+
+    def dates(self, start=None, end=None):
+        """保存済みの日付（start〜endを含む範囲、YYYY-MM-DD）"""
+        with self._lock:
+            self._scan()
+            dates = self._dates
+        lo = bisect.bisect_left(dates, start) if start else 0
+        hi = bisect.bisect_right(dates, end) if end else len(dates)
+        return dates[lo:hi]
+
+    def index_for(self, date) -> Optional[GameIndex]:
+        path = self._paths.get(date)
+        if path is None:
+            return None
+        try:
+            mtime = path.stat().st_mtime
+        except FileNotFoundError:
+            return None
+        cached = self._indexes.get(date)
+        if cached and cached[0] == mtime:
+            return cached[1]
+        with open(path, 'r', encoding='utf-8') as f:
+            index = GameIndex.from_games(json.load(f).get('games', []))
+        self._indexes[date] = (mtime, index)
+        return index
+
+    def query_body(self, start=None, end=None, team_id=None, pitcher_id=None) -> bytes:
+        """期間内の試合を日付ごとにまとめたJSON"""
+        parts = []
+        total = 0
+        for date in self.dates(start, end):
+            index = self.index_for(date)
+            if index is None:
+                continue
+            ids = index.game_ids(team_id, pitcher_id)
+            if not ids:
+                continue
+            total += len(ids)
+            parts.append(b'{"date":' + _encode(date) + b',"games":'
+                         + index.games_body(team_id, pitcher_id) + b'}')
+        header = _encode({'success': True, 'from': start, 'to': end, 'games_count': total})
+        return header[:-1] + b',"dates":[' + b','.join(parts) + b']}'
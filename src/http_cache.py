@@ -0,0 +1,281 @@
+"""
+HTTPレスポンスキャッシュ
+URL+パラメータをキーにしたSQLiteベースの共通キャッシュ層
+エンドポイントごとのTTLとETag/Last-Modifiedによる再検証に対応
+"""
+
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+import zlib
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import requests
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+from src.http_metrics import get_default_metrics
+from src.rate_limiter import RateLimitedSession
+
+DEFAULT_CACHE_PATH = "cache/http_cache.sqlite3"
+
+# (ポリシー名, URLパターン, TTL秒) - 上から順に評価し最初に一致したものを使用
+DEFAULT_TTL_POLICIES: List[Tuple[str, str, int]] = [
+    ('schedule', r'/api/v1/schedule\?', 10 * 60),
+    ('live_feed', r'/api/v1(\.1)?/game/\d+/feed/live', 60),
+    ('game_feed', r'/api/v1(\.1)?/game/\d+/', 6 * 3600),
+    ('splits', r'/stats\?.*stats=statSplits', 24 * 3600),
+    ('player_info', r'/api/v1/people/\d+(\?|$)', 24 * 3600),
+    ('player_stats', r'/api/v1/people(/\d+/stats)?\?', 6 * 3600),
+    ('roster', r'/api/v1/teams/\d+/roster', 6 * 3600),
+    ('team_stats', r'/api/v1/teams/\d+/stats', 6 * 3600),
+    ('statcast', r'baseballsavant\.mlb\.com', 24 * 3600),
+]
+DEFAULT_TTL = 3600
+
+# 試合終了後は内容が変わらないため、終了した試合のレスポンスは右側のポリシーで保存
+FINAL_POLICIES = {'live_feed': 'game_feed'}
+
+# 保持期間を過ぎたエントリは起動時に削除
+MAX_ENTRY_AGE = 30 * 86400
+
+
+def normalize_url(url):
+    """クエリパラメータを並べ替えて正規化したURLを返す"""
+    parts = urlsplit(url)
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return urlunsplit((parts.scheme, parts.netloc.lower(), parts.path, query, ''))
+
+
+def is_final_game(content) -> bool:
+    """ライブフィードの本文が終了した試合のものか（gameData.status.abstractGameState）"""
+    try:
+        status = json.loads(content).get('gameData', {}).get('status', {})
+    except (ValueError, AttributeError):
+        return False
+    return status.get('abstractGameState') == 'Final'
+
+
+class HTTPResponseCache:
+    """SQLiteに圧縮したレスポンス本文を保存するキャッシュクラス"""
+
+    def __init__(self, path=DEFAULT_CACHE_PATH, policies=None, default_ttl=DEFAULT_TTL):
+        self.path = path
+        self.default_ttl = default_ttl
+        self.policies = [(name, re.compile(pattern), ttl)
+                         for name, pattern, ttl in (policies or DEFAULT_TTL_POLICIES)]
+        self._ttls = {name: ttl for name, _, ttl in self.policies}
+        self.logger = logging.getLogger(__name__)
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS responses (
+                url TEXT PRIMARY KEY,
+                policy TEXT NOT NULL,
+                status INTEGER NOT NULL,
+                content_type TEXT,
+                etag TEXT,
+                last_modified TEXT,
+                body BLOB NOT NULL,
+                stored_at REAL NOT NULL,
+                expires_at REAL NOT NULL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_responses_policy ON responses(policy, stored_at)")
+        self._conn.execute("DELETE FROM responses WHERE stored_at < ?", (time.time() - MAX_ENTRY_AGE,))
+        self._conn.commit()
+
+    def policy_for(self, url):
+        """URLに対応する(ポリシー名, TTL秒)を返す"""
+        for name, pattern, ttl in self.policies:
+            if pattern.search(url):
+                return name, ttl
+        return 'default', self.default_ttl
+
+    def policy_for_response(self, url, content):
+        """レスポンス本文も見て(ポリシー名, TTL秒)を決める（終了した試合のライブフィードは長く保持）"""
+        name, ttl = self.policy_for(url)
+        final_policy = FINAL_POLICIES.get(name)
+        if final_policy in self._ttls and is_final_game(content):
+            return final_policy, self._ttls[final_policy]
+        return name, ttl
+
+    def get(self, url) -> Optional[Dict]:
+        """キャッシュエントリを取得（期限切れも含む）"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT status, content_type, etag, last_modified, body, stored_at, expires_at "
+                "FROM responses WHERE url = ?", (url,)
+            ).fetchone()
+
+        if row is None:
+            return None
+
+        status, content_type, etag, last_modified, body, stored_at, expires_at = row
+        return {
+            'status': status,
+            'content_type': content_type,
+            'etag': etag,
+            'last_modified': last_modified,
+            'content': zlib.decompress(body),
+            'stored_at': stored_at,
+            'fresh': time.time() < expires_at,
+        }
+
+    def store(self, url, response):
+        """レスポンスを保存"""
+        policy, ttl = self.policy_for_response(url, response.content)
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses "
+                "(url, policy, status, content_type, etag, last_modified, body, stored_at, expires_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (url, policy, response.status_code,
+                 response.headers.get('Content-Type'),
+                 response.headers.get('ETag'),
+                 response.headers.get('Last-Modified'),
+                 zlib.compress(response.content),
+                 now, now + ttl)
+            )
+            self._conn.commit()
+
+    def touch(self, url):
+        """304で再検証できたエントリの有効期限を延長（保存時に決めたポリシーのTTLで）"""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute("SELECT policy FROM responses WHERE url = ?", (url,)).fetchone()
+            ttl = self._ttls.get(row[0]) if row else None
+            if ttl is None:
+                ttl = self.policy_for(url)[1]
+            self._conn.execute(
+                "UPDATE responses SET stored_at = ?, expires_at = ? WHERE url = ?",
+                (now, now + ttl, url)
+            )
+            self._conn.commit()
+
+    def policy_freshness(self) -> Dict[str, Tuple[float, int]]:
+        """ポリシーごとの(最終更新時刻, エントリ数)を返す"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT policy, MAX(stored_at), COUNT(*) FROM responses GROUP BY policy"
+            ).fetchall()
+        return {policy: (latest, count) for policy, latest, count in rows}
+
+    def clear(self, policy=None):
+        """キャッシュを削除（ポリシー指定時はそのポリシーのみ）"""
+        with self._lock:
+            if policy:
+                self._conn.execute("DELETE FROM responses WHERE policy = ?", (policy,))
+            else:
+                self._conn.execute("DELETE FROM responses")
+            self._conn.commit()
+
+
+_default_cache = None
+_default_cache_lock = threading.Lock()
+
+
+def get_default_cache():
+    """プロセス共通のキャッシュを取得"""
+    global _default_cache
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = HTTPResponseCache()
+        return _default_cache
+
+
+class CachedSession(RateLimitedSession):
+    """GETレスポンスをHTTPResponseCache経由で返すSession
+
+    キャッシュに無いリクエストはRateLimitedSessionのレート制限・再試行を経て送信する。
+    すべてのリクエストの所要時間・転送量・キャッシュヒットをRequestMetricsに記録する。
+    """
+
+    def __init__(self, cache=None, limiter=None, retry_policy=None, metrics=None):
+        super().__init__(limiter, retry_policy)
+        self.cache = cache if cache is not None else get_default_cache()
+        self.metrics = metrics if metrics is not None else get_default_metrics()
+
+    def send(self, request, **kwargs):
+        start = time.monotonic()
+        try:
+            response = self._send_cached(request, **kwargs)
+        except Exception:
+            self.metrics.record(request.url, time.monotonic() - start, error=True)
+            raise
+
+        if kwargs.get('stream'):
+            nbytes = int(response.headers.get('Content-Length') or 0)
+        else:
+            nbytes = len(response.content or b'')
+        self.metrics.record(request.url, time.monotonic() - start, nbytes,
+                            getattr(response, 'from_cache', None),
+                            response.status_code >= 400)
+        return response
+
+    def _send_cached(self, request, **kwargs):
+        """キャッシュを確認し、必要な場合のみネットワークへ送信"""
+        if request.method != 'GET' or self.cache is None:
+            return self._send_uncached(request, **kwargs)
+
+        url = normalize_url(request.url)
+        entry = self.cache.get(url)
+
+        if entry and entry['fresh']:
+            return self._build_response(request, entry)
+
+        if entry:
+            # 期限切れでも検証子があれば条件付きリクエストで再検証
+            if entry['etag']:
+                request.headers['If-None-Match'] = entry['etag']
+            if entry['last_modified']:
+                request.headers['If-Modified-Since'] = entry['last_modified']
+
+        response = self._send_uncached(request, **kwargs)
+
+        if response.status_code == 304 and entry:
+            self.cache.touch(url)
+            return self._build_response(request, entry)
+
+        if response.status_code == 200:
+            try:
+                self.cache.store(url, response)
+            except Exception as e:
+                logging.getLogger(__name__).warning(f"Cache write error: {e}")
+
+        response.from_cache = False
+        return response
+
+    def _send_uncached(self, request, **kwargs):
+        """実際にネットワークへ送信"""
+        return super().send(request, **kwargs)
+
+    def _build_response(self, request, entry):
+        """キャッシュエントリからResponseを組み立てる"""
+        response = requests.Response()
+        response.status_code = entry['status']
+        response._content = entry['content']
+        response.headers = CaseInsensitiveDict()
+        if entry['content_type']:
+            response.headers['Content-Type'] = entry['content_type']
+        if entry['etag']:
+            response.headers['ETag'] = entry['etag']
+        if entry['last_modified']:
+            response.headers['Last-Modified'] = entry['last_modified']
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.url = request.url
+        response.request = request
+        response.reason = 'OK'
+        response.from_cache = True
+        return response
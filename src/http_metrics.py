@@ -0,0 +1,132 @@
+"""
+HTTPリクエスト計測
+エンドポイントごとの呼び出し回数・転送量・キャッシュヒット率・レイテンシ分布を集計するモジュール
+"""
+
+import json
+import math
+import re
+import threading
+from dataclasses import dataclass, field
+from typing import Dict, List
+from urllib.parse import urlsplit
+
+# パス中の数値IDをまとめてエンドポイント単位で集計する
+_ID_SEGMENT = re.compile(r'/\d+(?=/|$)')
+
+
+def endpoint_name(url):
+    """URLをエンドポイント名に変換（例: statsapi.mlb.com/api/v1/people/{id}/stats）"""
+    parts = urlsplit(url)
+    return f"{parts.hostname or ''}{_ID_SEGMENT.sub('/{id}', parts.path)}"
+
+
+def percentile(sorted_values, pct):
+    """ソート済みの値から最近傍順位法でパーセンタイルを求める"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+@dataclass
+class EndpointStats:
+    """1エンドポイント分の計測値"""
+    calls: int = 0
+    errors: int = 0
+    bytes: int = 0
+    cache_hits: int = 0
+    cache_misses: int = 0
+    latencies: List[float] = field(default_factory=list)
+
+    def summary(self):
+        latencies = sorted(self.latencies)
+        return {
+            'calls': self.calls,
+            'errors': self.errors,
+            'bytes': self.bytes,
+            'cache_hits': self.cache_hits,
+            'cache_misses': self.cache_misses,
+            'total_seconds': round(sum(latencies), 3),
+            'p50_ms': round(percentile(latencies, 50) * 1000, 1),
+            'p95_ms': round(percentile(latencies, 95) * 1000, 1),
+            'p99_ms': round(percentile(latencies, 99) * 1000, 1),
+        }
+
+
+class RequestMetrics:
+    """エンドポイント別のリクエスト計測（スレッドセーフ）"""
+
+    def __init__(self):
+        self._stats: Dict[str, EndpointStats] = {}
+        self._lock = threading.Lock()
+
+    def record(self, url, elapsed, nbytes=0, from_cache=None, error=False):
+        """1リクエスト分を記録
+
+        Args:
+            url: リクエストURL
+            elapsed: 所要時間（秒、キャッシュ読み出し・再試行の待機を含む）
+            nbytes: レスポンス本文のバイト数
+            from_cache: キャッシュから返した場合True、ネットワークから取得した場合False、
+                        キャッシュ対象外の場合None
+            error: 例外または4xx/5xxで終わった場合True
+        """
+        name = endpoint_name(url)
+        with self._lock:
+            stats = self._stats.setdefault(name, EndpointStats())
+            stats.calls += 1
+            stats.bytes += nbytes
+            stats.latencies.append(elapsed)
+            if error:
+                stats.errors += 1
+            if from_cache is True:
+                stats.cache_hits += 1
+            elif from_cache is False:
+                stats.cache_misses += 1
+
+    def reset(self):
+        with self._lock:
+            self._stats.clear()
+
+    def summary(self) -> Dict[str, Dict]:
+        """エンドポイントごとの集計（合計所要時間の長い順）"""
+        with self._lock:
+            rows = {name: stats.summary() for name, stats in self._stats.items()}
+        return dict(sorted(rows.items(), key=lambda item: item[1]['total_seconds'], reverse=True))
+
+    def format_table(self):
+        """集計結果を表形式の文字列にする"""
+        rows = self.summary()
+        if not rows:
+            return "HTTPリクエストはありませんでした"
+
+        width = max(len('Endpoint'), max(len(name) for name in rows))
+        header = (f"{'Endpoint':<{width}} {'Calls':>6} {'Hit':>6} {'Miss':>6} {'Err':>5} {'KB':>9} "
+                  f"{'p50ms':>8} {'p95ms':>8} {'p99ms':>8} {'Total s':>8}")
+        lines = [header, "-" * len(header)]
+        for name, row in rows.items():
+            lines.append(
+                f"{name:<{width}} {row['calls']:>6} {row['cache_hits']:>6} {row['cache_misses']:>6} "
+                f"{row['errors']:>5} {row['bytes'] / 1024:>9.1f} {row['p50_ms']:>8.1f} {row['p95_ms']:>8.1f} "
+                f"{row['p99_ms']:>8.1f} {row['total_seconds']:>8.2f}"
+            )
+        return "\n".join(lines)
+
+    def dump_json(self, path):
+        """集計結果をJSONファイルに書き出す"""
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.summary(), f, ensure_ascii=False, indent=2)
+
+
+_default_metrics = None
+_default_metrics_lock = threading.Lock()
+
+
+def get_default_metrics():
+    """プロセス共通の計測を取得"""
+    global _default_metrics
+    with _default_metrics_lock:
+        if _default_metrics is None:
+            _default_metrics = RequestMetrics()
+        return _default_metrics
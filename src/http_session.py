@@ -0,0 +1,112 @@
+"""
+共有HTTPセッション
+プロセス全体で1つのSessionとホスト別のコネクションプールを共有し、
+keep-aliveでTLSハンドシェイクを使い回すためのセッションファクトリ
+"""
+
+import threading
+from typing import Dict, Optional
+
+from requests.adapters import HTTPAdapter
+from urllib3.util.request import ACCEPT_ENCODING
+
+from src.http_cache import CachedSession
+
+# ホストごとのコネクションプールサイズ（同時に保持するkeep-aliveコネクション数）
+DEFAULT_POOL_SIZES: Dict[str, int] = {
+    'statsapi.mlb.com': 16,
+    'baseballsavant.mlb.com': 4,
+    'nf3.sakura.ne.jp': 2,
+    'discord.com': 2,
+}
+DEFAULT_POOL_SIZE = 4
+
+
+class SessionFactory:
+    """ホスト別プール・keep-alive・圧縮転送を設定したSessionを生成するクラス"""
+
+    def __init__(self, pool_sizes=None, default_pool_size=DEFAULT_POOL_SIZE):
+        self.pool_sizes = dict(DEFAULT_POOL_SIZES if pool_sizes is None else pool_sizes)
+        self.default_pool_size = default_pool_size
+        self._shared: Optional[CachedSession] = None
+        self._lock = threading.Lock()
+
+    def pool_size_for(self, host) -> int:
+        return self.pool_sizes.get(host, self.default_pool_size)
+
+    def configure(self, session, min_pool_size=0):
+        """Sessionにホスト別のアダプターと共通ヘッダーを設定する
+
+        Args:
+            session: 設定するSession
+            min_pool_size: 全ホストのプールサイズの下限（並行実行数に合わせる場合に指定）
+        """
+        # urllib3が展開できる形式（brotli/zstdはライブラリがあれば）をすべて受け付ける
+        session.headers['Accept-Encoding'] = ACCEPT_ENCODING.replace(',', ', ')
+        session.headers['Connection'] = 'keep-alive'
+
+        default_size = max(self.default_pool_size, min_pool_size)
+        default_adapter = HTTPAdapter(pool_connections=len(self.pool_sizes) + 4,
+                                      pool_maxsize=default_size)
+        session.mount('https://', default_adapter)
+        session.mount('http://', default_adapter)
+
+        # requestsは最長一致のプレフィックスのアダプターを使う
+        for host, size in self.pool_sizes.items():
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max(size, min_pool_size))
+            session.mount(f'https://{host}/', adapter)
+            session.mount(f'http://{host}/', adapter)
+        return session
+
+    def create(self, cache=None, limiter=None, min_pool_size=0) -> CachedSession:
+        """設定済みの新しいSessionを生成"""
+        return self.configure(CachedSession(cache, limiter), min_pool_size)
+
+    def shared(self) -> CachedSession:
+        """プロセス共通のSessionを取得"""
+        with self._lock:
+            if self._shared is None:
+                self._shared = self.create()
+            return self._shared
+
+
+def connection_stats(session) -> Dict[str, Dict[str, int]]:
+    """Sessionのホスト別コネクション再利用状況
+
+    Returns:
+        dict: {ホスト: {'requests': 送信数, 'connections': 新規接続数, 'reused': 再利用数}}
+    """
+    stats: Dict[str, Dict[str, int]] = {}
+    adapters = {id(adapter): adapter for adapter in session.adapters.values()}
+
+    for adapter in adapters.values():
+        pools = adapter.poolmanager.pools
+        for key in list(pools.keys()):
+            pool = pools.get(key)
+            if pool is None:
+                continue
+            entry = stats.setdefault(pool.host, {'requests': 0, 'connections': 0, 'reused': 0})
+            entry['requests'] += pool.num_requests
+            entry['connections'] += pool.num_connections
+
+    for entry in stats.values():
+        entry['reused'] = max(0, entry['requests'] - entry['connections'])
+    return stats
+
+
+_default_factory = None
+_default_factory_lock = threading.Lock()
+
+
+def get_session_factory():
+    """プロセス共通のセッションファクトリを取得"""
+    global _default_factory
+    with _default_factory_lock:
+        if _default_factory is None:
+            _default_factory = SessionFactory()
+        return _default_factory
+
+
+def get_shared_session():
+    """プロセス共通のSessionを取得（全コレクターで同じコネクションプールを使う）"""
+    return get_session_factory().shared()
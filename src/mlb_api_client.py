@@ -6,20 +6,71 @@ MLB公式APIを使用してデータを取得するモジュール
 import requests
 from datetime import datetime, timedelta
 import logging
-import json
-import os
-import time
 from typing import Dict, List, Optional, Tuple, Any
 
+from src.http_session import get_shared_session
+from src.boxscore_store import TeamBattingLine, get_default_store
+from src.pbp_store import PlateAppearance, get_default_store as get_default_pbp_store
+from src.rolling_window import RollingWindow, game_log_window
+from src.stat_store import MAX_AGE as STAT_STORE_MAX_AGE, get_default_stat_store
+
+# boxscoreからチーム打撃ラインを作るのに必要なキーのみを返させるためのfields=指定
+BOXSCORE_BATTING_FIELDS = ",".join([
+    'teams', 'home', 'away', 'team', 'id', 'teamStats', 'batting',
+    'runs', 'atBats', 'hits', 'doubles', 'triples', 'homeRuns',
+    'baseOnBalls', 'hitByPitch', 'sacFlies', 'avg', 'obp', 'slg',
+])
+
+# playByPlayから打席結果を作るのに必要なキーのみを返させるためのfields=指定
+PLAY_BY_PLAY_FIELDS = ",".join([
+    'allPlays', 'result', 'event', 'eventType', 'about', 'atBatIndex',
+    'matchup', 'batter', 'pitcher', 'id', 'batSide', 'pitchHand', 'code',
+])
+
+# boxscoreストアの列 -> 直近N試合の集計（src/rolling_window.py）の列
+TEAM_WINDOW_COLUMNS = {
+    'ab': 'at_bats', 'h': 'hits', 'doubles': 'doubles', 'triples': 'triples', 'hr': 'home_runs',
+    'bb': 'base_on_balls', 'hbp': 'hit_by_pitch', 'sf': 'sac_flies',
+}
+
+# people?personIds= で一度に問い合わせる選手数
+PEOPLE_BATCH_SIZE = 100
+
 class MLBApiClient:
     """MLB Stats APIのクライアントクラス"""
     
-    def __init__(self):
+    def __init__(self, session=None):
         self.base_url = "https://statsapi.mlb.com"
-        self.session = requests.Session()
+        # レスポンスはHTTPキャッシュ層（src/http_cache.py）でURL単位にキャッシュされる
+        # Sessionはプロセス共通のもの（src/http_session.py）を使いコネクションを共有する
+        self.session = session or get_shared_session()
+        # 選手のシーズン成績・ゲームログ（直近N試合の集計用）
+        self.stat_store = get_default_stat_store()
         self.logger = logging.getLogger(__name__)
-        self.cache_dir = "cache/splits_data"
-        os.makedirs(self.cache_dir, exist_ok=True)
+    
+    @property
+    def boxscore_store(self):
+        """終了試合のチーム打撃ライン（直近OPS計算用、初回アクセス時にSQLiteを開く）"""
+        return get_default_store()
+    
+    @property
+    def pbp_store(self):
+        """終了試合の打席結果（対左右成績の集計用、初回アクセス時にSQLiteを開く）"""
+        return get_default_pbp_store()
+    
+    def _make_request(self, endpoint, params=None):
+        """/api/v1/ 以下のエンドポイントを取得してJSONを返す（失敗時はNone）"""
+        try:
+            response = self.session.get(
+                f"{self.base_url}/api/v1/{endpoint}",
+                params=params,
+                timeout=30
+            )
+            response.raise_for_status()
+            return response.json()
+        except Exception as e:
+            self.logger.error(f"API Error for endpoint {endpoint}: {str(e)}")
+            return None
     
     def get_schedule(self, date=None):
         """指定日の試合スケジュールを取得"""
@@ -55,6 +106,92 @@ class MLBApiClient:
             self.logger.error(f"Error fetching game details: {str(e)}")
             return None
     
+    def get_game_batting_lines(self, game_pk) -> Dict[str, TeamBattingLine]:
+        """試合の両チーム打撃ラインを軽量なboxscoreエンドポイントから取得
+        
+        フルのlive feedではなく /boxscore を fields= で必要なキーだけに絞って取得する
+        
+        Returns:
+            dict: {'home': TeamBattingLine, 'away': TeamBattingLine}（取得失敗時は空）
+        """
+        data = self._make_request(
+            f"game/{game_pk}/boxscore",
+            params={'fields': BOXSCORE_BATTING_FIELDS}
+        )
+        if not data:
+            return {}
+        
+        lines = {}
+        for side in ['home', 'away']:
+            team_data = data.get('teams', {}).get(side, {})
+            team_id = team_data.get('team', {}).get('id')
+            if team_id:
+                batting = team_data.get('teamStats', {}).get('batting', {})
+                lines[side] = TeamBattingLine.from_batting(team_id, side, batting)
+        
+        return lines
+    
+    def get_game_plate_appearances(self, game_pk) -> List[PlateAppearance]:
+        """試合の全打席結果をplayByPlayから取得（fields=で必要なキーのみ）"""
+        data = self._make_request(
+            f"game/{game_pk}/playByPlay",
+            params={'fields': PLAY_BY_PLAY_FIELDS}
+        )
+        if not data:
+            return []
+        
+        plate_appearances = []
+        for play in data.get('allPlays', []):
+            pa = PlateAppearance.from_play(play)
+            if pa:
+                plate_appearances.append(pa)
+        return plate_appearances
+    
+    def get_platoon_splits(self, pitcher_id=None, batter_id=None, season=2025, games=10):
+        """投手または打者の直近N試合の対左右成績を打席結果ストアから集計
+        
+        ゲームログの試合のうち未取り込みの終了試合だけplayByPlayを取得し、
+        以降は索引からの集計のみで求める。
+        
+        Returns:
+            dict: {'vs_left': {'pa', 'ab', 'h'}, 'vs_right': {'pa', 'ab', 'h'}}
+                  （ゲームログを取得できなかった場合はNone）
+        """
+        player_id = pitcher_id if pitcher_id is not None else batter_id
+        group = 'pitching' if pitcher_id is not None else 'hitting'
+        game_logs = self._make_request(
+            f"people/{player_id}/stats?stats=gameLog&season={season}&group={group}"
+        )
+        if not game_logs or not game_logs.get('stats'):
+            return None
+        
+        # gameLogは古い順なので、新しい順に並べてから直近N試合を取る
+        splits = sorted(game_logs['stats'][0].get('splits', []),
+                        key=lambda s: s.get('date', ''), reverse=True)[:games]
+        
+        game_dates = {}
+        for split in splits:
+            game_pk = split.get('game', {}).get('gamePk')
+            if game_pk:
+                game_dates[game_pk] = split.get('date', '')
+        
+        # 当日の試合は進行中の可能性があるため取り込まない
+        today = datetime.now().strftime('%Y-%m-%d')
+        for game_pk in self.pbp_store.missing_games(game_dates):
+            if game_dates[game_pk] and game_dates[game_pk] < today:
+                self._ingest_play_by_play(game_pk, game_dates[game_pk])
+        
+        return self.pbp_store.platoon_counts(pitcher_id=pitcher_id, batter_id=batter_id,
+                                             game_pks=game_dates)
+    
+    def _ingest_play_by_play(self, game_pk, game_date):
+        """終了した試合の打席結果をストアに取り込む"""
+        plate_appearances = self.get_game_plate_appearances(game_pk)
+        if plate_appearances:
+            self.pbp_store.add_game(game_pk, game_date, plate_appearances)
+        else:
+            self.logger.warning(f"Failed to fetch play-by-play for game {game_pk}")
+    
     def get_player_info(self, player_id):
         """選手の基本情報を取得（利き腕情報を含む）"""
         try:
@@ -109,95 +246,111 @@ class MLBApiClient:
             data = response.json()
             
             # 統計データを探す
-            stats_list = data.get('stats', [])
-            for stat_item in stats_list:
-                if stat_item.get('type', {}).get('displayName') == 'season':
-                    splits = stat_item.get('splits', [])
-                    if splits:
-                        return splits[0].get('stat', {})
-            
-            return {}
+            return self._extract_season_stat(data.get('stats', []))
         except Exception as e:
             self.logger.error(f"Error fetching player stats: {str(e)}")
             return {}
     
+    def _extract_season_stat(self, stats_list):
+        """stats配列からシーズン統計を取り出す"""
+        for stat_item in stats_list:
+            if stat_item.get('type', {}).get('displayName') == 'season':
+                splits = stat_item.get('splits', [])
+                if splits:
+                    return splits[0].get('stat', {})
+        
+        return {}
+    
+    def _season_stats_hydrate(self, season, stat_group):
+        """シーズン統計をhydrateするためのパラメータ文字列"""
+        return f"stats(group=[{stat_group}],type=[season],season={season},gameType=[R])"
+    
+    def get_players_stats_by_season(self, player_ids, season=2025, stat_group="pitching"):
+        """複数選手のシーズン統計をpeople?personIds=でまとめて取得
+        
+        Returns:
+            dict: {player_id: シーズン統計}（統計がない選手は空の辞書）
+        """
+        player_ids = list(dict.fromkeys(pid for pid in player_ids if pid))
+        result = {}
+        
+        for i in range(0, len(player_ids), PEOPLE_BATCH_SIZE):
+            chunk = player_ids[i:i + PEOPLE_BATCH_SIZE]
+            data = self._make_request(
+                "people",
+                params={
+                    'personIds': ','.join(str(pid) for pid in chunk),
+                    'hydrate': self._season_stats_hydrate(season, stat_group)
+                }
+            )
+            
+            for person in (data or {}).get('people', []):
+                result[person.get('id')] = self._extract_season_stat(person.get('stats', []))
+        
+        for pid in player_ids:
+            result.setdefault(pid, {})
+        
+        return result
+    
+    def get_player_game_logs(self, player_ids, season=2025, stat_group="hitting", store=True):
+        """複数選手のゲームログを取得し、列指向ストアにまとめて保存（store=Falseなら保存しない）
+        
+        Returns:
+            dict: {player_id: gameLogのsplits（新しい順）}
+        """
+        logs = {}
+        for player_id in dict.fromkeys(pid for pid in player_ids if pid):
+            data = self._make_request(
+                f"people/{player_id}/stats?stats=gameLog&season={season}&group={stat_group}"
+            )
+            if not data:
+                continue
+            splits = data['stats'][0].get('splits', []) if data.get('stats') else []
+            logs[player_id] = sorted(splits, key=lambda s: s.get('date', ''), reverse=True)
+        
+        if logs and store:
+            self.stat_store.write_game_logs(season, stat_group, logs)
+        return logs
+    
+    def get_recent_form(self, player_ids, season=2025, stat_group="hitting",
+                        max_age=STAT_STORE_MAX_AGE) -> RollingWindow:
+        """直近N試合の成績を引ける累積和を返す（ゲームログは保存済みでない選手の分だけ取得・保存）
+        
+        window.rate(player_id, 5) で直近5試合のOPS（投手ならERA・FIP・K%）が求まる。
+        累積和はリーグ全体のゲームログから作るので、スレートの選手をまとめて1回呼び、
+        返ったwindowを使い回す。
+        """
+        missing = self.stat_store.missing_game_logs(season, stat_group, player_ids, max_age)
+        if missing:
+            self.get_player_game_logs(missing, season, stat_group)
+        return game_log_window(season, stat_group, self.stat_store)
+    
     def get_player_splits(self, player_id, season=2025, stat_group="pitching"):
-        """選手の対左右成績を取得（改善版）"""
-        # キャッシュチェック
-        cache_file = os.path.join(self.cache_dir, f"player_{player_id}_{season}_splits.json")
-        
-        if os.path.exists(cache_file):
-            try:
-                with open(cache_file, 'r', encoding='utf-8') as f:
-                    cache_data = json.load(f)
-                
-                # キャッシュが24時間以内なら使用
-                cache_time = datetime.fromisoformat(cache_data['timestamp'])
-                if datetime.now() - cache_time < timedelta(hours=24):
-                    self.logger.info(f"Using cached splits data for player {player_id}")
-                    return cache_data['data']
-            except Exception as e:
-                self.logger.warning(f"Cache read error: {e}")
-        
-        # APIから取得（リトライ機能付き）
-        max_retries = 3
-        retry_delay = 1
-        
-        for attempt in range(max_retries):
-            try:
-                response = self.session.get(
-                    f"{self.base_url}/api/v1/people/{player_id}/stats",
-                    params={
-                        'stats': 'statSplits',
-                        'season': season,
-                        'group': stat_group,
-                        'gameType': 'R',
-                        'sitCodes': 'vl,vr'
-                    },
-                    timeout=30
-                )
-                
-                if response.status_code == 500:
-                    if attempt < max_retries - 1:
-                        self.logger.warning(f"500 error for player {player_id}, retrying in {retry_delay}s...")
-                        time.sleep(retry_delay)
-                        retry_delay *= 2
-                        continue
-                    else:
-                        self.logger.error(f"Max retries reached for player {player_id}")
-                        return self._get_default_splits()
-                
-                response.raise_for_status()
-                data = response.json()
-                
-                # データを解析
-                result = self._parse_splits_data(data)
-                
-                # キャッシュに保存
-                try:
-                    cache_data = {
-                        'player_id': player_id,
-                        'season': season,
-                        'data': result,
-                        'timestamp': datetime.now().isoformat()
-                    }
-                    with open(cache_file, 'w', encoding='utf-8') as f:
-                        json.dump(cache_data, f, ensure_ascii=False, indent=2)
-                except Exception as e:
-                    self.logger.warning(f"Cache write error: {e}")
-                
-                return result
-                
-            except requests.exceptions.RequestException as e:
-                if attempt < max_retries - 1:
-                    self.logger.warning(f"Request error for player {player_id}: {e}, retrying...")
-                    time.sleep(retry_delay)
-                    retry_delay *= 2
-                else:
-                    self.logger.error(f"Failed to get splits for player {player_id}: {e}")
-                    return self._get_default_splits()
-        
-        return self._get_default_splits()
+        """選手の対左右成績を取得（改善版）
+        
+        500エラー等の再試行はHTTP層（src/rate_limiter.py）で行う
+        """
+        try:
+            response = self.session.get(
+                f"{self.base_url}/api/v1/people/{player_id}/stats",
+                params={
+                    'stats': 'statSplits',
+                    'season': season,
+                    'group': stat_group,
+                    'gameType': 'R',
+                    'sitCodes': 'vl,vr'
+                },
+                timeout=30
+            )
+            response.raise_for_status()
+            data = response.json()
+            
+            # データを解析
+            return self._parse_splits_data(data)
+            
+        except requests.exceptions.RequestException as e:
+            self.logger.error(f"Failed to get splits for player {player_id}: {e}")
+            return self._get_default_splits()
     
     def _parse_splits_data(self, data):
         """スプリットデータを解析"""
@@ -250,6 +403,28 @@ class MLBApiClient:
             self.logger.error(f"Error fetching team roster: {str(e)}")
             return []
     
+    def get_team_roster_with_stats(self, team_id, season=2025, stat_group="pitching"):
+        """チームのロースターを全選手のシーズン統計付きで1リクエストで取得
+        
+        Returns:
+            list: ロースターの各エントリに 'season_stats' を追加したもの
+                  （'person' は利き腕などを含む詳細情報）
+        """
+        data = self._make_request(
+            f"teams/{team_id}/roster",
+            params={
+                'rosterType': 'active',
+                'hydrate': f"person({self._season_stats_hydrate(season, stat_group)})"
+            }
+        )
+        
+        roster = (data or {}).get('roster', [])
+        for player in roster:
+            person = player.get('person', {})
+            player['season_stats'] = self._extract_season_stat(person.get('stats', []))
+        
+        return roster
+    
     def get_team_stats(self, team_id, season=2025):
         """チームの統計を取得"""
         try:
@@ -276,6 +451,21 @@ class MLBApiClient:
             self.logger.error(f"Error fetching team stats: {str(e)}")
             return {}
     
+    def get_league_team_stats(self, season=2025, group='hitting'):
+        """MLB全チームのシーズン統計（チームごとのstat辞書のリスト、1リクエスト）"""
+        data = self._make_request('teams/stats', params={
+            'stats': 'season',
+            'season': season,
+            'group': group,
+            'sportIds': 1,
+            'gameType': 'R'
+        })
+        if not data:
+            return []
+        return [split.get('stat', {})
+                for stat_group in data.get('stats', [])
+                for split in stat_group.get('splits', [])]
+
     def get_team_splits_vs_pitchers(self, team_id, season=2025):
         """チームの対左右投手成績を取得"""
         try:
@@ -329,10 +519,23 @@ class MLBApiClient:
     
     def calculate_team_recent_ops(self, team_id, games=5):
         """チームの過去N試合のOPSを計算"""
+        return self.calculate_team_recent_ops_windows(team_id, (games,))[games]
+    
+    def calculate_team_recent_ops_windows(self, team_id, windows=(5, 10)):
+        """チームの過去N試合のOPSを複数のNについて一度に計算
+        
+        終了済みの試合はboxscoreストアに一度だけ取り込み、
+        ストアの行の累積和（src/rolling_window.py）から各Nの集計を求める
+        
+        Returns:
+            dict: {N: OPS}
+        """
+        max_games = max(windows)
+        
         try:
             # 現在の日付から過去の日付範囲を計算
             end_date = datetime.now()
-            start_date = end_date - timedelta(days=games * 2)  # 余裕を持って2倍の期間を取得
+            start_date = end_date - timedelta(days=max_games * 2)  # 余裕を持って2倍の期間を取得
             
             # スケジュールAPIで過去の試合を取得
             params = {
@@ -363,114 +566,59 @@ class MLBApiClient:
                                 'date': game.get('gameDate')
                             })
             
-            # 最新のN試合を取得
+            # 最新のN試合のうち未取り込みのものだけボックススコアを取得
             completed_games.sort(key=lambda x: x['date'], reverse=True)
-            recent_games = completed_games[:games]
-            
-            if len(recent_games) < games:
-                self.logger.warning(f"Only {len(recent_games)} games found for team {team_id} in the last {games} games")
-            
-            # 各試合の打撃成績を取得
-            total_hits = 0
-            total_at_bats = 0
-            total_walks = 0
-            total_bases = 0
+            recent_games = completed_games[:max_games]
+            missing = self.boxscore_store.missing_games(g['gamePk'] for g in recent_games)
             
             for game_info in recent_games:
-                game_pk = game_info['gamePk']
-                
-                # ボックススコアから打撃成績を取得
-                boxscore_response = self.session.get(
-                    f"{self.base_url}/api/v1.1/game/{game_pk}/feed/live",
-                    timeout=30
-                )
-                boxscore_response.raise_for_status()
-                boxscore_data = boxscore_response.json()
-                
-                # チームの打撃成績を探す
-                teams_data = boxscore_data.get('liveData', {}).get('boxscore', {}).get('teams', {})
-                
-                for side in ['home', 'away']:
-                    team_data = teams_data.get(side, {})
-                    if team_data.get('team', {}).get('id') == team_id:
-                        batting_stats = team_data.get('teamStats', {}).get('batting', {})
-                        
-                        # 必要な統計を収集
-                        hits = batting_stats.get('hits', 0)
-                        at_bats = batting_stats.get('atBats', 0)
-                        walks = batting_stats.get('baseOnBalls', 0)
-                        doubles = batting_stats.get('doubles', 0)
-                        triples = batting_stats.get('triples', 0)
-                        home_runs = batting_stats.get('homeRuns', 0)
-                        
-                        # 塁打数を計算
-                        singles = hits - doubles - triples - home_runs
-                        total_bases_game = singles + (2 * doubles) + (3 * triples) + (4 * home_runs)
-                        
-                        total_hits += hits
-                        total_at_bats += at_bats
-                        total_walks += walks
-                        total_bases += total_bases_game
-                        break
+                if game_info['gamePk'] in missing:
+                    self._ingest_boxscore(game_info['gamePk'], game_info['date'])
             
-            # OPSを計算
-            if total_at_bats > 0:
-                # OBP (出塁率) = (安打 + 四球) / (打数 + 四球)
-                obp = (total_hits + total_walks) / (total_at_bats + total_walks) if (total_at_bats + total_walks) > 0 else 0
-                
-                # SLG (長打率) = 塁打数 / 打数
-                slg = total_bases / total_at_bats
-                
-                # OPS = OBP + SLG
-                ops = obp + slg
-                
-                self.logger.info(f"Team {team_id} last {games} games: OPS={ops:.3f} (OBP={obp:.3f}, SLG={slg:.3f})")
-                return round(ops, 3)
-            else:
-                self.logger.warning(f"No at-bats found for team {team_id} in recent games")
-                return 0.700
-                
+            lines = self.boxscore_store.recent_lines(team_id, max_games,
+                                                     since=start_date.strftime('%Y-%m-%d'))
         except Exception as e:
             self.logger.error(f"Error calculating recent OPS for team {team_id}: {str(e)}")
-            return 0.700
-    
-    def calculate_team_recent_ops_with_cache(self, team_id, games=5):
-        """キャッシュ機能付きの過去N試合OPS計算"""
-        cache_dir = "cache/recent_ops"
-        os.makedirs(cache_dir, exist_ok=True)
-        
-        cache_file = os.path.join(cache_dir, f"team_{team_id}_last_{games}_games.json")
+            return {n: 0.700 for n in windows}
         
-        # キャッシュチェック（6時間有効）
-        if os.path.exists(cache_file):
-            try:
-                with open(cache_file, 'r', encoding='utf-8') as f:
-                    cache_data = json.load(f)
-                
-                cache_time = datetime.fromisoformat(cache_data['timestamp'])
-                if datetime.now() - cache_time < timedelta(hours=6):
-                    self.logger.info(f"Using cached OPS for team {team_id} last {games} games")
-                    return cache_data['ops']
-            except Exception as e:
-                self.logger.warning(f"Cache read error: {e}")
-        
-        # 実際の計算
-        ops = self.calculate_team_recent_ops(team_id, games)
+        # 取得した試合の累積和を作り、各Nの合計を累積和の差で求める
+        window = RollingWindow.from_records(
+            'hitting', ({'team_id': team_id, **line} for line in reversed(lines)), 'team_id',
+            TEAM_WINDOW_COLUMNS, date_field='game_date')
+        result = {}
+        for n in sorted(set(windows)):
+            if len(lines) < n:
+                # 試合数が足りないNは取得できた全試合で計算
+                self.logger.warning(f"Only {len(lines)} games found for team {team_id} in the last {n} games")
+            result[n] = self._ops_from_totals(team_id, n, window.rate(team_id, n))
         
-        # キャッシュに保存
-        try:
-            cache_data = {
-                'team_id': team_id,
-                'games': games,
-                'ops': ops,
-                'timestamp': datetime.now().isoformat()
-            }
-            with open(cache_file, 'w', encoding='utf-8') as f:
-                json.dump(cache_data, f, ensure_ascii=False, indent=2)
-        except Exception as e:
-            self.logger.warning(f"Cache write error: {e}")
+        return result
+    
+    def _ops_from_totals(self, team_id, games, rates):
+        """直近N試合の合計から求めた率（src.sabermetrics.batting_rates）のOPS"""
+        if rates['games'] > 0 and rates['pa'] > 0:
+            self.logger.info(f"Team {team_id} last {games} games: OPS={rates['ops']:.3f} "
+                             f"(OBP={rates['obp']:.3f}, SLG={rates['slg']:.3f})")
+            return round(rates['ops'], 3)
         
-        return ops
+        self.logger.warning(f"No at-bats found for team {team_id} in recent games")
+        return 0.700
+    
+    def _ingest_boxscore(self, game_pk, game_date):
+        """終了した試合の両チーム打撃ラインをストアに取り込む"""
+        lines = self.get_game_batting_lines(game_pk)
+        if lines:
+            self.boxscore_store.add_game(game_pk, game_date, lines.values())
+        else:
+            self.logger.warning(f"Failed to fetch boxscore for game {game_pk}")
+    
+    def calculate_team_recent_ops_with_cache(self, team_id, games=5):
+        """キャッシュ機能付きの過去N試合OPS計算
+
+        スケジュール・試合データはHTTPキャッシュ層で保持されるため、
+        既存の呼び出し元との互換用にcalculate_team_recent_opsへ委譲する
+        """
+        return self.calculate_team_recent_ops(team_id, games)
     
     def get_team_batting_stats(self, team_id, season=2025):
         """チームの打撃統計を取得（過去の試合OPSも含む）"""
@@ -479,9 +627,10 @@ class MLBApiClient:
             stats = self.get_team_stats(team_id, season)
             
             if stats:
-                # 過去5試合と10試合のOPSを計算（キャッシュ機能付き）
-                ops_5_games = self.calculate_team_recent_ops_with_cache(team_id, games=5)
-                ops_10_games = self.calculate_team_recent_ops_with_cache(team_id, games=10)
+                # 過去5試合と10試合のOPSを1回の集計で計算
+                recent_ops = self.calculate_team_recent_ops_windows(team_id, (5, 10))
+                ops_5_games = recent_ops[5]
+                ops_10_games = recent_ops[10]
                 
                 # 統計に追加
                 stats['recent_ops_5'] = ops_5_games
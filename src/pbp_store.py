@@ -0,0 +1,206 @@
+"""
+打席結果ストア
+終了した試合のPlay-by-playを一度だけ打席単位に分解して保存し、
+投手・打者ごとの対左右成績をローカルの索引から集計するモジュール
+"""
+
+import logging
+import os
+import sqlite3
+import threading
+from dataclasses import dataclass
+from typing import Dict, Iterable, Optional, Set
+
+DEFAULT_STORE_PATH = "cache/pbp_store.sqlite3"
+
+# 安打として数えるイベント
+HIT_EVENTS = ('Single', 'Double', 'Triple', 'Home Run')
+
+# 打数に数える凡退イベント
+AT_BAT_OUT_EVENTS = ('Strikeout', 'Groundout', 'Flyout', 'Lineout',
+                     'Pop Out', 'Grounded Into DP', 'Forceout')
+
+
+@dataclass(frozen=True)
+class PlateAppearance:
+    """1打席分の結果"""
+    at_bat_index: int
+    pitcher_id: int
+    batter_id: int
+    bat_side: str
+    pitch_hand: str
+    event: str
+    event_type: str = ''
+
+    @classmethod
+    def from_play(cls, play) -> Optional['PlateAppearance']:
+        """playByPlayのallPlaysの要素から生成（結果のない打席はNone）"""
+        result = play.get('result', {})
+        if not result.get('event'):
+            return None
+
+        matchup = play.get('matchup', {})
+        return cls(
+            at_bat_index=play.get('about', {}).get('atBatIndex', 0),
+            pitcher_id=matchup.get('pitcher', {}).get('id'),
+            batter_id=matchup.get('batter', {}).get('id'),
+            bat_side=matchup.get('batSide', {}).get('code', ''),
+            pitch_hand=matchup.get('pitchHand', {}).get('code', ''),
+            event=result['event'],
+            event_type=result.get('eventType', '')
+        )
+
+
+class PlayByPlayStore:
+    """終了試合の打席結果を追記専用で保存するクラス
+
+    pitcher_id / batter_id に索引を張り、対左右成績を試合をダウンロードせずに集計する。
+    """
+
+    def __init__(self, path=DEFAULT_STORE_PATH):
+        self.path = path
+        self.logger = logging.getLogger(__name__)
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS pbp_games (
+                game_pk INTEGER PRIMARY KEY,
+                game_date TEXT NOT NULL
+            )
+        """)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS plate_appearances (
+                game_pk INTEGER NOT NULL,
+                at_bat_index INTEGER NOT NULL,
+                game_date TEXT NOT NULL,
+                pitcher_id INTEGER,
+                batter_id INTEGER,
+                bat_side TEXT NOT NULL DEFAULT '',
+                pitch_hand TEXT NOT NULL DEFAULT '',
+                event TEXT NOT NULL,
+                event_type TEXT NOT NULL DEFAULT '',
+                PRIMARY KEY (game_pk, at_bat_index)
+            )
+        """)
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_pa_pitcher "
+            "ON plate_appearances(pitcher_id, game_date DESC)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_pa_batter "
+            "ON plate_appearances(batter_id, game_date DESC)"
+        )
+        self._conn.commit()
+
+    def game_count(self) -> int:
+        """取り込み済みの試合数"""
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM pbp_games").fetchone()[0]
+
+    def missing_games(self, game_pks: Iterable[int]) -> Set[int]:
+        """まだ取り込んでいない試合IDを返す"""
+        game_pks = list(game_pks)
+        if not game_pks:
+            return set()
+
+        placeholders = ",".join("?" * len(game_pks))
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT game_pk FROM pbp_games WHERE game_pk IN ({placeholders})",
+                game_pks
+            ).fetchall()
+        return set(game_pks) - {row[0] for row in rows}
+
+    def add_game(self, game_pk, game_date, plate_appearances: Iterable[PlateAppearance]):
+        """1試合分の打席結果を追加（既存の行は変更しない）
+
+        Args:
+            game_pk: 試合ID
+            game_date: 試合日（ISO形式、期間指定に使用）
+            plate_appearances: 試合の全打席のPlateAppearance
+        """
+        rows = [
+            (game_pk, pa.at_bat_index, game_date, pa.pitcher_id, pa.batter_id,
+             pa.bat_side, pa.pitch_hand, pa.event, pa.event_type)
+            for pa in plate_appearances
+        ]
+
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO plate_appearances (game_pk, at_bat_index, game_date, "
+                "pitcher_id, batter_id, bat_side, pitch_hand, event, event_type) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                rows
+            )
+            self._conn.execute(
+                "INSERT OR IGNORE INTO pbp_games (game_pk, game_date) VALUES (?, ?)",
+                (game_pk, game_date)
+            )
+            self._conn.commit()
+
+    def platoon_counts(self, pitcher_id=None, batter_id=None, game_pks=None,
+                       since='') -> Dict[str, Dict[str, int]]:
+        """対左右の打席数・打数・安打数を集計
+
+        投手を指定した場合は打者の打席（batSide）で、打者を指定した場合は
+        投手の利き腕（pitchHand）で分ける。左以外（スイッチ含む）は右として数える。
+
+        Args:
+            pitcher_id: 投手ID（batter_idとどちらか一方を指定）
+            batter_id: 打者ID
+            game_pks: 集計対象の試合IDに限定する場合に指定
+            since: この日付以降の試合に限定（ISO形式）
+
+        Returns:
+            dict: {'vs_left': {'pa', 'ab', 'h'}, 'vs_right': {'pa', 'ab', 'h'}}
+        """
+        if (pitcher_id is None) == (batter_id is None):
+            raise ValueError("pitcher_id と batter_id のどちらか一方を指定してください")
+
+        if pitcher_id is not None:
+            player_column, side_column, player_id = 'pitcher_id', 'bat_side', pitcher_id
+        else:
+            player_column, side_column, player_id = 'batter_id', 'pitch_hand', batter_id
+
+        hit_marks = ",".join("?" * len(HIT_EVENTS))
+        out_marks = ",".join("?" * len(AT_BAT_OUT_EVENTS))
+        sql = (f"SELECT CASE WHEN {side_column} = 'L' THEN 'vs_left' ELSE 'vs_right' END AS side, "
+               f"COUNT(*), "
+               f"SUM(CASE WHEN event IN ({hit_marks}) OR event IN ({out_marks}) THEN 1 ELSE 0 END), "
+               f"SUM(CASE WHEN event IN ({hit_marks}) THEN 1 ELSE 0 END) "
+               f"FROM plate_appearances WHERE {player_column} = ? AND game_date >= ?")
+        params = list(HIT_EVENTS) + list(AT_BAT_OUT_EVENTS) + list(HIT_EVENTS) + [player_id, since]
+
+        if game_pks is not None:
+            game_pks = list(game_pks)
+            if not game_pks:
+                return {'vs_left': {'pa': 0, 'ab': 0, 'h': 0}, 'vs_right': {'pa': 0, 'ab': 0, 'h': 0}}
+            sql += f" AND game_pk IN ({','.join('?' * len(game_pks))})"
+            params += game_pks
+        sql += " GROUP BY side"
+
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+
+        counts = {'vs_left': {'pa': 0, 'ab': 0, 'h': 0}, 'vs_right': {'pa': 0, 'ab': 0, 'h': 0}}
+        for side, pa, ab, h in rows:
+            counts[side] = {'pa': pa, 'ab': ab or 0, 'h': h or 0}
+        return counts
+
+
+_default_store = None
+_default_store_lock = threading.Lock()
+
+
+def get_default_store():
+    """プロセス共通のストアを取得"""
+    global _default_store
+    with _default_store_lock:
+        if _default_store is None:
+            _default_store = PlayByPlayStore()
+        return _default_store
@@ -0,0 +1,94 @@
+"""
+PDF一括生成
+1スレート分のHTMLページをまとめてwkhtmltopdfでPDF化するモジュール
+- 試合ごとのPDFはスレッドプールで並行変換（変換自体は別プロセスなのでGILの影響を受けない）
+- 結合PDFは全ページを1回のwkhtmltopdf起動で描画（フォント・ロゴはプロセス内で1回だけ読み込まれる）
+"""
+
+import logging
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+import pdfkit
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_WORKERS = 4
+
+
+@dataclass
+class BatchResult:
+    """一括変換の結果"""
+    files: List[str] = field(default_factory=list)
+    merged: Optional[str] = None
+    errors: List[Tuple[str, str]] = field(default_factory=list)  # (ファイル名, エラーメッセージ)
+    seconds: float = 0.0
+
+
+class PDFBatchRenderer:
+    """HTMLページのリストをPDFへ一括変換する
+
+    pages は (出力ファイル名, HTML文字列) のリスト。HTMLは一時ディレクトリに1回だけ書き出し、
+    個別PDF・結合PDFのどちらも同じファイルから変換する。
+    """
+
+    def __init__(self, configuration=None, options=None, workers=DEFAULT_WORKERS):
+        self.configuration = configuration
+        self.options = dict(options or {})
+        self.workers = max(1, workers)
+
+    def render(self, pages, out_dir, merged_name=None, split=True):
+        """ページを変換
+
+        Args:
+            pages: (出力ファイル名, HTML) のリスト
+            out_dir: 出力ディレクトリ
+            merged_name: 指定時は全ページを1つのPDFに結合して出力
+            split: Falseなら試合ごとのPDFは作らない（結合PDFのみ）
+        """
+        out_dir = Path(out_dir)
+        out_dir.mkdir(parents=True, exist_ok=True)
+        result = BatchResult()
+        start = time.perf_counter()
+
+        with tempfile.TemporaryDirectory(prefix="mlb_pdf_") as tmp:
+            html_files = []
+            for i, (filename, html) in enumerate(pages):
+                html_path = Path(tmp) / f"{i:02d}_{Path(filename).stem}.html"
+                html_path.write_text(html, encoding="utf-8")
+                html_files.append((filename, html_path))
+
+            with ThreadPoolExecutor(max_workers=self.workers) as executor:
+                merged_future = None
+                if merged_name and html_files:
+                    merged_future = executor.submit(
+                        self._convert, [str(p) for _, p in html_files], out_dir / merged_name)
+                split_futures = []
+                if split:
+                    split_futures = [(filename, executor.submit(self._convert, str(p), out_dir / filename))
+                                     for filename, p in html_files]
+
+                for filename, future in split_futures:
+                    try:
+                        result.files.append(str(future.result()))
+                    except Exception as e:
+                        result.errors.append((filename, str(e)))
+                if merged_future is not None:
+                    try:
+                        result.merged = str(merged_future.result())
+                    except Exception as e:
+                        result.errors.append((merged_name, str(e)))
+
+        result.seconds = time.perf_counter() - start
+        logger.info("PDF batch: %d files%s in %.2fs (%d errors)", len(result.files),
+                    " + merged" if result.merged else "", result.seconds, len(result.errors))
+        return result
+
+    def _convert(self, source, pdf_path):
+        """wkhtmltopdfを1回起動して変換（sourceがリストなら複数ページを1つのPDFに結合）"""
+        pdfkit.from_file(source, str(pdf_path), configuration=self.configuration, options=self.options)
+        return pdf_path
@@ -0,0 +1,175 @@
+"""
+HTTPレート制限・リトライ制御
+ホストごとのトークンバケットで発行間隔を制御し、429/5xxはジッター付き指数バックオフで再試行するモジュール
+"""
+
+import email.utils
+import logging
+import random
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlparse
+
+import requests
+
+# ホストごとの予算（1秒あたりの発行数, バースト数）
+DEFAULT_HOST_BUDGETS: Dict[str, Tuple[float, int]] = {
+    'statsapi.mlb.com': (10.0, 20),
+    'baseballsavant.mlb.com': (2.0, 4),
+    'nf3.sakura.ne.jp': (1.0, 1),
+    # Webhookは1チャンネルあたり2秒で5件まで
+    'discord.com': (2.5, 5),
+    'discordapp.com': (2.5, 5),
+}
+DEFAULT_BUDGET = (5.0, 10)
+
+
+class TokenBucket:
+    """トークンバケット（スレッドセーフ）"""
+
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = max(1, capacity)
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """トークンを1つ確保し、発行可能になるまでの待ち時間を返す"""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+
+            wait = max(0.0, self._blocked_until - now)
+            if self._tokens < 0 and self.rate > 0:
+                wait = max(wait, -self._tokens / self.rate)
+            return wait
+
+    def block_for(self, seconds):
+        """サーバーから待機を指示された場合に、その間の発行を止める"""
+        with self._lock:
+            self._blocked_until = max(self._blocked_until, time.monotonic() + seconds)
+
+
+class HostRateLimiter:
+    """ホスト単位のトークンバケットを管理するレート制限"""
+
+    def __init__(self, budgets=None, default_budget=DEFAULT_BUDGET):
+        self.budgets = dict(DEFAULT_HOST_BUDGETS if budgets is None else budgets)
+        self.default_budget = default_budget
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    def _bucket(self, host) -> TokenBucket:
+        with self._lock:
+            bucket = self._buckets.get(host)
+            if bucket is None:
+                rate, capacity = self.budgets.get(host, self.default_budget)
+                bucket = self._buckets[host] = TokenBucket(rate, capacity)
+            return bucket
+
+    def acquire(self, host):
+        """ホストの予算内で発行できるまで待機する"""
+        wait = self._bucket(host).reserve()
+        if wait > 0:
+            time.sleep(wait)
+
+    def penalize(self, host, seconds):
+        """Retry-After等で指示された時間、ホストへの発行を止める"""
+        self._bucket(host).block_for(seconds)
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """429/5xx・接続エラー時の再試行ポリシー（フルジッター付き指数バックオフ）"""
+    max_retries: int = 3
+    base_delay: float = 0.5
+    max_delay: float = 30.0
+    retry_statuses: Tuple[int, ...] = (429, 500, 502, 503, 504)
+
+    def should_retry(self, method, status_code) -> bool:
+        """再試行対象か（GET以外は処理されていないことが明らかな429のみ）"""
+        if status_code not in self.retry_statuses:
+            return False
+        return method in ('GET', 'HEAD') or status_code == 429
+
+    def backoff(self, attempt, retry_after: Optional[float] = None) -> float:
+        """attempt回目（0始まり）の待機秒数"""
+        if retry_after is not None:
+            return min(self.max_delay, retry_after)
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+
+
+def parse_retry_after(response) -> Optional[float]:
+    """Retry-After / X-RateLimit-Reset-After ヘッダーを秒数に変換"""
+    for header in ('Retry-After', 'X-RateLimit-Reset-After'):
+        value = response.headers.get(header)
+        if not value:
+            continue
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            try:
+                parsed = email.utils.parsedate_to_datetime(value)
+            except (TypeError, ValueError):
+                continue
+            return max(0.0, parsed.timestamp() - time.time())
+    return None
+
+
+_default_limiter = None
+_default_limiter_lock = threading.Lock()
+
+
+def get_default_limiter():
+    """プロセス共通のレート制限を取得"""
+    global _default_limiter
+    with _default_limiter_lock:
+        if _default_limiter is None:
+            _default_limiter = HostRateLimiter()
+        return _default_limiter
+
+
+class RateLimitedSession(requests.Session):
+    """ホスト単位のレート制限と再試行をかけてネットワークへ送信するSession"""
+
+    def __init__(self, limiter=None, retry_policy=None):
+        super().__init__()
+        self.limiter = limiter if limiter is not None else get_default_limiter()
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.logger = logging.getLogger(__name__)
+
+    def send(self, request, **kwargs):
+        host = urlparse(request.url).hostname or ''
+        policy = self.retry_policy
+        attempt = 0
+
+        while True:
+            self.limiter.acquire(host)
+            try:
+                response = super().send(request, **kwargs)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                if attempt >= policy.max_retries or request.method not in ('GET', 'HEAD'):
+                    raise
+                delay = policy.backoff(attempt)
+                self.logger.warning(f"{type(e).__name__} for {host}, retrying in {delay:.1f}s")
+            else:
+                if attempt >= policy.max_retries or not policy.should_retry(request.method,
+                                                                            response.status_code):
+                    return response
+                retry_after = parse_retry_after(response)
+                delay = policy.backoff(attempt, retry_after)
+                if response.status_code == 429:
+                    # 他のスレッドも含めてホストへの発行を止める
+                    self.limiter.penalize(host, delay)
+                self.logger.warning(f"HTTP {response.status_code} from {host}, "
+                                    f"retrying in {delay:.1f}s ({attempt + 1}/{policy.max_retries})")
+                response.close()
+
+            time.sleep(delay)
+            attempt += 1
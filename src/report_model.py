@@ -0,0 +1,333 @@
+"""
+レポート中間モデル
+MLBCompleteReportが組み立てる1スレート分の構造化データと、そのシリアライズ・テキスト描画を行うモジュール
+各レンダラー（テキスト/HTML/JSON/Discord）はテキストを再パースせず、このモデルを直接受け取る
+"""
+
+import json
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional
+
+SCHEMA_VERSION = 1
+
+HAND_LABELS = {'R': '右', 'L': '左', 'S': '両'}
+
+
+@dataclass
+class PitcherLine:
+    """先発投手の成績（率系の値は%を除いた数値）"""
+    player_id: int
+    name: str
+    hand: str = ''  # 'R' / 'L' / 'S'（不明なら空文字）
+    wins: int = 0
+    losses: int = 0
+    era: float = 0.0
+    fip: float = 0.0
+    xfip: float = 0.0
+    whip: float = 0.0
+    k_bb_pct: float = 0.0
+    gb_pct: float = 0.0
+    fb_pct: float = 0.0
+    qs_rate: float = 0.0
+    swstr_pct: float = 0.0
+    babip: float = 0.0
+    vs_left_avg: float = 0.0
+    vs_left_ops: float = 0.0
+    vs_right_avg: float = 0.0
+    vs_right_ops: float = 0.0
+
+    @property
+    def hand_label(self):
+        return HAND_LABELS.get(self.hand, '')
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(**data)
+
+
+@dataclass
+class RelieverLine:
+    """主要リリーバー（CL/SU）"""
+    name: str
+    fip: float = 0.0
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(**data)
+
+
+@dataclass
+class BullpenLine:
+    """中継ぎ陣の集計（取得できなかった指標はNone、表示は 'N/A'）"""
+    count: int = 0
+    era: Optional[float] = None
+    fip: Optional[float] = None
+    xfip: Optional[float] = None
+    whip: Optional[float] = None
+    k_bb_pct: Optional[float] = None
+    closer: Optional[RelieverLine] = None
+    setup_men: List[RelieverLine] = field(default_factory=list)
+    fatigued_count: int = 0
+
+    @property
+    def fatigue_note(self):
+        return f"主力{self.fatigued_count}名が連投中" if self.fatigued_count > 0 else ''
+
+    @classmethod
+    def from_dict(cls, data):
+        data = dict(data)
+        if data.get('closer'):
+            data['closer'] = RelieverLine.from_dict(data['closer'])
+        data['setup_men'] = [RelieverLine.from_dict(p) for p in data.get('setup_men', [])]
+        return cls(**data)
+
+
+@dataclass
+class BattingLine:
+    """チーム打撃（シーズン統計が取れない場合はavg等がNone）"""
+    barrel_pct: float = 0.0
+    hard_hit_pct: float = 0.0
+    recent_ops_5: float = 0.0
+    recent_ops_10: float = 0.0
+    avg: Optional[float] = None
+    ops: Optional[float] = None
+    runs: Optional[int] = None
+    home_runs: Optional[int] = None
+    woba: Optional[float] = None
+    xwoba: Optional[float] = None
+    vs_left_avg: Optional[float] = None
+    vs_left_ops: Optional[float] = None
+    vs_right_avg: Optional[float] = None
+    vs_right_ops: Optional[float] = None
+
+    @property
+    def has_season(self):
+        return self.avg is not None
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(**data)
+
+
+@dataclass
+class TeamCard:
+    """1チーム分（先発・中継ぎ・打撃）。取得に失敗したセクションはerrorsにメッセージを残す"""
+    team_id: int
+    name: str
+    pitcher_id: Optional[int] = None
+    pitcher: Optional[PitcherLine] = None
+    bullpen: Optional[BullpenLine] = None
+    batting: Optional[BattingLine] = None
+    errors: Dict[str, str] = field(default_factory=dict)
+
+    @classmethod
+    def from_dict(cls, data):
+        data = dict(data)
+        if data.get('pitcher'):
+            data['pitcher'] = PitcherLine.from_dict(data['pitcher'])
+        if data.get('bullpen'):
+            data['bullpen'] = BullpenLine.from_dict(data['bullpen'])
+        if data.get('batting'):
+            data['batting'] = BattingLine.from_dict(data['batting'])
+        return cls(**data)
+
+
+@dataclass
+class GameCard:
+    """1試合分。start_time_jstは日本時間のISO形式"""
+    game_pk: Optional[int] = None
+    start_time_jst: str = ''
+    away: Optional[TeamCard] = None
+    home: Optional[TeamCard] = None
+    error: str = ''
+
+    @property
+    def start_label(self):
+        """'MM/DD HH:MM' 形式の開始時刻（日本時間）"""
+        if not self.start_time_jst:
+            return ''
+        return self.start_time_jst[5:10].replace('-', '/') + ' ' + self.start_time_jst[11:16]
+
+    def sides(self):
+        return (('away', self.away), ('home', self.home))
+
+    @classmethod
+    def from_dict(cls, data):
+        data = dict(data)
+        for side in ('away', 'home'):
+            if data.get(side):
+                data[side] = TeamCard.from_dict(data[side])
+        return cls(**data)
+
+
+@dataclass
+class SlateReport:
+    """1日分のレポート全体"""
+    target_date: str
+    japan_date: str
+    generated_at: str = ''
+    reliability: str = ''
+    message: str = ''  # スケジュール取得失敗・試合なしの場合の表示文
+    games: List[GameCard] = field(default_factory=list)
+    schema_version: int = SCHEMA_VERSION
+
+    def to_dict(self):
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data):
+        data = dict(data)
+        data['games'] = [GameCard.from_dict(g) for g in data.get('games', [])]
+        return cls(**data)
+
+    def to_json(self, indent=2):
+        return json.dumps(self.to_dict(), ensure_ascii=False, indent=indent)
+
+    @classmethod
+    def from_json(cls, text):
+        return cls.from_dict(json.loads(text))
+
+    def to_msgpack(self):
+        import msgpack  # 任意依存（msgpack形式で保存する場合のみ必要）
+        return msgpack.packb(self.to_dict(), use_bin_type=True)
+
+    @classmethod
+    def from_msgpack(cls, payload):
+        import msgpack
+        return cls.from_dict(msgpack.unpackb(payload, raw=False))
+
+    def save(self, path):
+        """拡張子(.json / .msgpack)に応じて保存"""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if path.suffix == '.msgpack':
+            path.write_bytes(self.to_msgpack())
+        else:
+            path.write_text(self.to_json(), encoding='utf-8')
+        return path
+
+    @classmethod
+    def load(cls, path):
+        path = Path(path)
+        if path.suffix == '.msgpack':
+            return cls.from_msgpack(path.read_bytes())
+        return cls.from_json(path.read_text(encoding='utf-8'))
+
+
+def format_stat(value, spec='.2f', missing='N/A'):
+    """数値を表示用に整形（Noneは missing）"""
+    return missing if value is None else format(value, spec)
+
+
+def render_text(slate):
+    """従来のテキストレポートと同じ形式で描画"""
+    lines = [
+        '',
+        '=' * 60,
+        f"MLB試合予想レポート - 日本時間 {slate.japan_date} の試合",
+        '=' * 60,
+    ]
+    if slate.reliability:
+        lines.append(slate.reliability)
+        lines.append('-' * 60)
+    if slate.message:
+        lines.append(slate.message)
+        return '\n'.join(lines) + '\n'
+
+    for game in slate.games:
+        lines.extend(_render_game(game))
+    return '\n'.join(lines) + '\n'
+
+
+def _render_game(game):
+    if game.away is None or game.home is None:
+        return [f"エラーが発生しました: {game.error}"]
+
+    lines = [
+        '=' * 60,
+        f"{game.away.name} @ {game.home.name}",
+        f"開始時刻: {game.start_label} (日本時間)",
+        '=' * 50,
+    ]
+    for _, team in game.sides():
+        lines.extend(render_team_lines(team))
+    lines.append("\n" + "=" * 60)
+    return lines
+
+
+def render_team_lines(team):
+    """1チーム分（見出し・先発・中継ぎ・打撃）をテキスト行のリストで返す"""
+    lines = [f"\n【{team.name}】"]
+    lines.extend(_render_pitcher(team))
+    lines.extend(_render_bullpen(team))
+    lines.extend(_render_batting(team))
+    return lines
+
+
+def _render_pitcher(team):
+    if not team.pitcher_id:
+        return ["先発: 未定"]
+    if 'pitcher' in team.errors:
+        return [team.errors['pitcher']]
+
+    p = team.pitcher
+    if p.hand_label:
+        head = f"先発: {p.name} ({p.hand_label}) ({p.wins}勝{p.losses}敗)"
+    else:
+        head = f"先発: {p.name} ({p.wins}勝{p.losses}敗)"
+    return [
+        head,
+        f"ERA: {p.era:.2f} | FIP: {p.fip:.2f} | "
+        f"xFIP: {p.xfip:.2f} | WHIP: {p.whip:.2f} | "
+        f"K-BB%: {p.k_bb_pct:.1f}% | "
+        f"GB%: {p.gb_pct:.1f}% | FB%: {p.fb_pct:.1f}% | "
+        f"QS率: {p.qs_rate:.1f}%",
+        f"SwStr%: {p.swstr_pct:.1f}% | BABIP: {p.babip:.3f}",
+        f"対左: {p.vs_left_avg:.3f} (OPS {p.vs_left_ops:.3f}) | "
+        f"対右: {p.vs_right_avg:.3f} (OPS {p.vs_right_ops:.3f})",
+    ]
+
+
+def _render_bullpen(team):
+    if 'bullpen' in team.errors:
+        return [team.errors['bullpen']]
+
+    bp = team.bullpen
+    lines = [
+        f"\n中継ぎ陣 ({bp.count}名):",
+        f"ERA: {format_stat(bp.era)} | FIP: {format_stat(bp.fip)} | "
+        f"xFIP: {format_stat(bp.xfip)} | WHIP: {format_stat(bp.whip)} | "
+        f"K-BB%: {format_stat(bp.k_bb_pct, '.1f')}%",
+    ]
+    if bp.closer:
+        lines.append(f"CL: {bp.closer.name} (FIP: {bp.closer.fip:.2f})")
+    if bp.setup_men:
+        lines.append("SU: " + ', '.join(f"{p.name} (FIP: {p.fip:.2f})" for p in bp.setup_men))
+    if bp.fatigue_note:
+        lines.append(f"疲労度: {bp.fatigue_note}")
+    return lines
+
+
+def _render_batting(team):
+    if 'batting' in team.errors:
+        return [team.errors['batting']]
+
+    b = team.batting
+    lines = ["\nチーム打撃:"]
+    quality = f"Barrel%: {b.barrel_pct:.1f}% | Hard-Hit%: {b.hard_hit_pct:.1f}%"
+    recent = f"過去5試合OPS: {b.recent_ops_5:.3f} | 過去10試合OPS: {b.recent_ops_10:.3f}"
+    if not b.has_season:
+        lines.extend(["シーズン統計: データなし", quality, recent])
+        return lines
+
+    lines.extend([
+        f"AVG: {b.avg:.3f} | OPS: {b.ops:.3f} | "
+        f"得点: {b.runs} | 本塁打: {b.home_runs}",
+        f"wOBA: {b.woba:.3f} | xwOBA: {b.xwoba:.3f}",
+        quality,
+        f"対左投手: {b.vs_left_avg:.3f} (OPS {b.vs_left_ops:.3f}) | "
+        f"対右投手: {b.vs_right_avg:.3f} (OPS {b.vs_right_ops:.3f})",
+        recent,
+    ])
+    return lines
@@ -0,0 +1,118 @@
+"""
+直近N試合の集計エンジン
+試合別成績（選手のゲームログ・チームのボックススコア）をエンティティ・日付順に並べた
+累積和の配列にしておき、任意のN・エンティティ・基準日の「直近N試合」の合計を
+累積和の差（prefix[end] - prefix[start]）で求めるモジュール
+- 累積和は最初に1回だけ作り、以後の問い合わせは件数によらず一定時間
+- 合計からの率（OPS・ERA・FIP・K%など）は src.sabermetrics で全エンティティまとめて計算する
+"""
+
+import threading
+from typing import Dict, Iterable, Mapping
+
+import numpy as np
+
+from src.sabermetrics import DEFAULT_WOBA_WEIGHTS, StatColumns, batting_rates, pitching_rates, scalar
+from src.stat_store import count_names, date_key, get_default_stat_store
+
+
+class RollingWindow:
+    """エンティティ（選手・チーム）ごとの試合別成績の累積和
+
+    行はエンティティID・日付順に並べ替えて持ち、prefix[name][i] は先頭からi行の合計。
+    エンティティの行範囲 [start, end) は辞書で引くので、直近N試合の合計は
+    辞書の参照と配列2要素の引き算で求まる（as_ofを指定した場合は日付の二分探索が加わる）。
+    """
+
+    __slots__ = ('group', 'dates', 'prefix', '_bounds')
+
+    def __init__(self, group, entity_ids, dates, columns: Mapping[str, np.ndarray]):
+        entity_ids = np.asarray(entity_ids, dtype=np.int64)
+        dates = np.asarray(dates, dtype=np.int64)
+        # 同じ日付の行（ダブルヘッダー）は渡された順のまま
+        order = np.lexsort((dates, entity_ids))
+        entity_ids = entity_ids[order]
+
+        self.group = group
+        self.dates = dates[order]
+        self.prefix = {name: np.concatenate(([0], np.cumsum(np.asarray(column)[order], dtype=np.int64)))
+                       for name, column in columns.items()}
+        ids, starts = np.unique(entity_ids, return_index=True)
+        ends = np.append(starts[1:], len(entity_ids))
+        self._bounds = dict(zip(ids.tolist(), zip(starts.tolist(), ends.tolist())))
+
+    @classmethod
+    def from_rows(cls, rows: np.ndarray, group, key='player_id') -> 'RollingWindow':
+        """列指向ストアのゲームログ行（src.stat_store）から作る"""
+        return cls(group, rows[key], rows['date'], {name: rows[name] for name in count_names(group)})
+
+    @classmethod
+    def from_records(cls, group, records: Iterable[Mapping], key, columns: Mapping[str, str],
+                     date_field='date') -> 'RollingWindow':
+        """辞書のリストから作る（columnsは 列名 -> 辞書のキー、日付は 'YYYY-MM-DD…'）"""
+        records = list(records)
+        n = len(records)
+        return cls(
+            group,
+            np.fromiter((r[key] for r in records), dtype=np.int64, count=n),
+            np.fromiter((date_key(r.get(date_field, '')) for r in records), dtype=np.int64, count=n),
+            {name: np.fromiter((r.get(field) or 0 for r in records), dtype=np.int64, count=n)
+             for name, field in columns.items()},
+        )
+
+    def __contains__(self, entity_id):
+        return entity_id in self._bounds
+
+    def games(self, entity_id, as_of=None) -> int:
+        """エンティティの試合数（as_ofより前の試合のみ）"""
+        start, end = self._range(entity_id, None, as_of)
+        return end - start
+
+    def _range(self, entity_id, n, as_of):
+        start, end = self._bounds.get(entity_id, (0, 0))
+        if as_of is not None:
+            end = start + int(np.searchsorted(self.dates[start:end], date_key(as_of), 'left'))
+        return (start if n is None else max(start, end - n)), end
+
+    def totals(self, entity_ids, n, as_of=None) -> StatColumns:
+        """各エンティティの直近n試合の合計（as_ofを渡すとその日より前の試合、'games' 列は実際の試合数）"""
+        entity_ids = list(entity_ids)
+        ranges = np.array([self._range(e, n, as_of) for e in entity_ids], dtype=np.int64).reshape(-1, 2)
+        start, end = ranges[:, 0], ranges[:, 1]
+        columns = {name: prefix[end] - prefix[start] for name, prefix in self.prefix.items()}
+        columns['games'] = end - start
+        return StatColumns(columns, entity_ids)
+
+    def rates(self, entity_ids, n, as_of=None, constants=None) -> Dict[str, np.ndarray]:
+        """直近n試合の派生指標（投手はERA・FIP・K%など、打者はOPS・wOBAなど。constantsはSeasonConstants）"""
+        cols = self.totals(entity_ids, n, as_of)
+        if self.group == 'pitching':
+            rates = pitching_rates(cols, **(constants.pitching_kwargs() if constants is not None else {}))
+        else:
+            rates = batting_rates(cols, constants.woba_weights if constants is not None else DEFAULT_WOBA_WEIGHTS)
+        rates['games'] = cols['games']
+        return rates
+
+    def rate(self, entity_id, n, as_of=None, constants=None) -> Dict[str, float]:
+        """1エンティティ分の直近n試合の派生指標"""
+        return scalar(self.rates([entity_id], n, as_of, constants))
+
+
+_windows: Dict[tuple, tuple] = {}
+_windows_lock = threading.Lock()
+
+
+def game_log_window(season, group, store=None) -> RollingWindow:
+    """列指向ストアのゲームログ全体の累積和（ストアのファイルが更新されるまで使い回す）
+
+    メモ化はファイルの版で判定し、メモリマップした配列は持ち続けない（ストアの置き換えを妨げない）。
+    """
+    store = store or get_default_stat_store()
+    key = (str(store.root), season, group)
+    with _windows_lock:
+        version = store.game_log_version(season, group)
+        cached = _windows.get(key)
+        if cached is None or cached[0] != version:
+            cached = (version, RollingWindow.from_rows(store.game_log_rows(season, group), group))
+            _windows[key] = cached
+        return cached[1]
@@ -0,0 +1,211 @@
+"""
+セイバーメトリクス計算エンジン
+MLB APIの統計（stat辞書）を列ごとのNumPy配列にまとめ、FIP・xFIP・wOBA・K-BB%などの
+派生指標を全選手分まとめて計算するモジュール
+- 投球回（'45.2'）はアウト数の整数に変換して扱う（src/stat_line.py）
+- 計算結果はfloatの配列のまま返し、文字列への整形は表示側で行う
+"""
+
+from typing import Dict, Iterable, Mapping, Optional
+
+import numpy as np
+
+from src.stat_line import PitchingLine, parse_outs
+
+# シーズン定数が取れない場合の既定値
+FIP_CONSTANT = 3.10
+LEAGUE_HR_FB = 0.11   # リーグ平均HR/FB（FanGraphsのフライ数基準。FB_SHAREで推定したフライ数と組み合わせる）
+FB_SHARE = 0.35       # フライ数を推定する場合に仮定する打球中のフライ割合
+DEFAULT_WOBA_WEIGHTS = {
+    'wBB': 0.694, 'wHBP': 0.725, 'w1B': 0.888,
+    'w2B': 1.263, 'w3B': 1.600, 'wHR': 2.064,
+}
+
+# 列名 -> MLB APIのキー
+PITCHING_FIELDS = PitchingLine.FIELDS
+BATTING_FIELDS = {
+    'g': 'gamesPlayed', 'pa': 'plateAppearances', 'ab': 'atBats', 'h': 'hits',
+    'doubles': 'doubles', 'triples': 'triples', 'hr': 'homeRuns', 'r': 'runs',
+    'bb': 'baseOnBalls', 'ibb': 'intentionalWalks', 'hbp': 'hitByPitch', 'k': 'strikeOuts',
+    'sf': 'sacFlies', 'go': 'groundOuts', 'ao': 'airOuts',
+}
+
+
+def _number(value):
+    if value is None or value == '':
+        return 0.0
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def ip_to_outs(values) -> np.ndarray:
+    """投球回（'45.2' / 45.2 / 45）の並びをアウト数の整数配列に変換"""
+    return np.fromiter((parse_outs(v) for v in values), dtype=np.int64)
+
+
+def _div(numerator, denominator):
+    """分母が0の要素は0にする割り算"""
+    numerator = np.asarray(numerator, dtype=float)
+    denominator = np.asarray(denominator, dtype=float)
+    return np.divide(numerator, denominator, out=np.zeros(np.broadcast(numerator, denominator).shape),
+                     where=denominator > 0)
+
+
+class StatColumns:
+    """選手ごとの統計を列（NumPy配列）で保持する
+
+    ids は行に対応する選手ID（チーム合計などでは省略可）。
+    """
+
+    __slots__ = ('columns', 'ids')
+
+    def __init__(self, columns: Dict[str, np.ndarray], ids=None):
+        self.columns = columns
+        self.ids = None if ids is None else np.asarray(ids)
+
+    @classmethod
+    def from_stats(cls, stat_lines: Iterable[Mapping], fields: Mapping[str, str], ids=None):
+        """stat辞書のリストから列を作る（'inningsPitched' があれば 'outs' 列も作る）"""
+        stat_lines = [s or {} for s in stat_lines]
+        n = len(stat_lines)
+        columns = {name: np.fromiter((_number(s.get(key)) for s in stat_lines), dtype=float, count=n)
+                   for name, key in fields.items()}
+        if any('inningsPitched' in s for s in stat_lines):
+            columns['outs'] = ip_to_outs([s.get('inningsPitched') for s in stat_lines])
+        return cls(columns, ids)
+
+    @classmethod
+    def from_lines(cls, lines: Iterable[PitchingLine], ids=None):
+        """PitchingLineのリストから列を作る（文字列の変換なし）"""
+        lines = list(lines)
+        n = len(lines)
+        columns = {name: np.fromiter((getattr(line, name) for line in lines), dtype=float, count=n)
+                   for name in PitchingLine.FIELDS}
+        columns['outs'] = np.fromiter((line.outs for line in lines), dtype=np.int64, count=n)
+        return cls(columns, ids)
+
+    @classmethod
+    def pitching(cls, stat_lines, ids=None):
+        return cls.from_stats(stat_lines, PITCHING_FIELDS, ids)
+
+    @classmethod
+    def batting(cls, stat_lines, ids=None):
+        return cls.from_stats(stat_lines, BATTING_FIELDS, ids)
+
+    def __len__(self):
+        return len(next(iter(self.columns.values()))) if self.columns else 0
+
+    def __getitem__(self, name) -> np.ndarray:
+        column = self.columns.get(name)
+        return np.zeros(len(self)) if column is None else column
+
+    def __contains__(self, name):
+        return name in self.columns
+
+    def select(self, mask) -> 'StatColumns':
+        """条件（ブール配列またはインデックス）に合う行だけの列"""
+        ids = None if self.ids is None else self.ids[mask]
+        return StatColumns({name: column[mask] for name, column in self.columns.items()}, ids)
+
+    def total(self, mask=None) -> 'StatColumns':
+        """（maskに合う行の）合計を1行の列として返す"""
+        source = self if mask is None else self.select(mask)
+        return StatColumns({name: np.array([column.sum()]) for name, column in source.columns.items()})
+
+    def to_frame(self, extra: Optional[Mapping[str, np.ndarray]] = None):
+        """pandas.DataFrameに変換（extraで計算済みの指標を列として追加）"""
+        import pandas as pd
+
+        frame = pd.DataFrame({**self.columns, **(extra or {})})
+        if self.ids is not None:
+            frame.index = pd.Index(self.ids, name='player_id')
+        return frame
+
+
+def estimated_fly_balls(cols: StatColumns, fb_share=FB_SHARE, air_outs=True):
+    """フライ数の推定
+
+    air_outs=True ならairOutsのある行はフライアウト+本塁打、それ以外は打球数×fb_share。
+    """
+    balls_in_play = np.maximum(cols['bf'] - cols['k'] - cols['bb'] - cols['hbp'], 0)
+    if not air_outs:
+        return balls_in_play * fb_share
+    return np.where(cols['ao'] > 0, cols['ao'] + cols['hr'], balls_in_play * fb_share)
+
+
+def pitching_rates(cols: StatColumns, fip_constant=FIP_CONSTANT, lg_hr_fb=None,
+                   fb_share=FB_SHARE) -> Dict[str, np.ndarray]:
+    """投手の派生指標を全行まとめて計算（K%等は%単位、イニングのない行は0）
+
+    lg_hr_fb はリーグ合計の HR/(フライアウト+本塁打)（SeasonConstants.lg_hr_fb）で、xFIPのフライ数も
+    同じ分母で数える。Noneの場合は既定の LEAGUE_HR_FB と打球数×fb_share の推定フライ数を使う。
+    """
+    ip = cols['outs'] / 3.0
+    bf = cols['bf']
+    k, bb, hbp, hr = cols['k'], cols['bb'], cols['hbp'], cols['hr']
+    batted = cols['go'] + cols['ao']
+    # リーグHR/FBと投手のフライ数は同じ基準のものを組み合わせる
+    fly_balls = estimated_fly_balls(cols, fb_share, air_outs=lg_hr_fb is not None)
+    lg_hr_fb = LEAGUE_HR_FB if lg_hr_fb is None else lg_hr_fb
+    has_ip = ip > 0
+
+    return {
+        'ip': ip,
+        'era': _div(cols['er'] * 9, ip),
+        'whip': _div(cols['h'] + bb, ip),
+        'k9': _div(k * 9, ip),
+        'bb9': _div(bb * 9, ip),
+        'hr9': _div(hr * 9, ip),
+        'k_pct': _div(k * 100, bf),
+        'bb_pct': _div(bb * 100, bf),
+        'k_bb_pct': _div((k - bb) * 100, bf),
+        'fip': np.where(has_ip, _div(13 * hr + 3 * (bb + hbp) - 2 * k, ip) + fip_constant, 0.0),
+        'xfip': np.where(has_ip, _div(13 * fly_balls * lg_hr_fb + 3 * (bb + hbp) - 2 * k, ip)
+                         + fip_constant, 0.0),
+        'gb_pct': _div(cols['go'] * 100, batted),
+        'fb_pct': _div(cols['ao'] * 100, batted),
+        'babip': _div(cols['h'] - hr, bf - k - bb - hbp - hr),
+    }
+
+
+def woba(cols: StatColumns, weights: Mapping[str, float] = DEFAULT_WOBA_WEIGHTS) -> np.ndarray:
+    """wOBA（故意四球を除いた四球で計算）"""
+    singles = cols['h'] - cols['doubles'] - cols['triples'] - cols['hr']
+    unintentional_bb = cols['bb'] - cols['ibb']
+    numerator = (weights['wBB'] * unintentional_bb + weights['wHBP'] * cols['hbp']
+                 + weights['w1B'] * singles + weights['w2B'] * cols['doubles']
+                 + weights['w3B'] * cols['triples'] + weights['wHR'] * cols['hr'])
+    return _div(numerator, cols['ab'] + unintentional_bb + cols['sf'] + cols['hbp'])
+
+
+def batting_rates(cols: StatColumns, weights: Mapping[str, float] = DEFAULT_WOBA_WEIGHTS) -> Dict[str, np.ndarray]:
+    """打者の派生指標を全行まとめて計算（K%等は%単位）"""
+    ab, h, hr, bb, hbp, sf, k = (cols[name] for name in ('ab', 'h', 'hr', 'bb', 'hbp', 'sf', 'k'))
+    pa = np.where(cols['pa'] > 0, cols['pa'], ab + bb + hbp + sf)
+    total_bases = h + cols['doubles'] + 2 * cols['triples'] + 3 * hr
+    avg = _div(h, ab)
+    obp = _div(h + bb + hbp, ab + bb + hbp + sf)
+    slg = _div(total_bases, ab)
+    batted = cols['go'] + cols['ao']
+
+    return {
+        'pa': pa,
+        'avg': avg,
+        'obp': obp,
+        'slg': slg,
+        'ops': obp + slg,
+        'iso': slg - avg,
+        'babip': _div(h - hr, ab - k - hr + sf),
+        'k_pct': _div(k * 100, pa),
+        'bb_pct': _div(bb * 100, pa),
+        'woba': woba(cols, weights),
+        'go_pct': _div(cols['go'] * 100, batted),
+        'ao_pct': _div(cols['ao'] * 100, batted),
+    }
+
+
+def scalar(rates: Mapping[str, np.ndarray], index=0) -> Dict[str, float]:
+    """1行分の指標をfloatの辞書で取り出す（合計行や単独の選手用）"""
+    return {name: float(values[index]) for name, values in rates.items()}
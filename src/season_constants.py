@@ -0,0 +1,239 @@
+"""
+シーズン定数テーブル
+リーグ全体の合計（全チームのシーズン打撃・投球統計）から、シーズンごとの
+FIP定数（cFIP）・wOBA係数・wOBAScale・リーグHR/FB を求めるモジュール
+- 結果はシーズンごとにメモ化し、cache/season_constants.json に保存する
+- 進行中のシーズンは一定時間ごとに合計を取り直し、消化試合数が増えていれば再計算する
+- 取得できない場合はFanGraphs Guts!の値（なければ既定値）を使う
+"""
+
+import json
+import logging
+import threading
+import time
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Optional
+
+import numpy as np
+
+from src.sabermetrics import BATTING_FIELDS, FIP_CONSTANT, PITCHING_FIELDS, StatColumns
+
+DEFAULT_PATH = "cache/season_constants.json"
+REFRESH_SECONDS = 6 * 60 * 60
+SEASON_TEAM_GAMES = 162 * 30
+
+# 取得できない場合の値（FanGraphs Guts!）
+FALLBACK = {
+    2025: {'wBB': 0.694, 'wHBP': 0.725, 'w1B': 0.888, 'w2B': 1.263, 'w3B': 1.600, 'wHR': 2.064,
+           'woba_scale': 1.250, 'cfip': 3.079},
+    2024: {'wBB': 0.689, 'wHBP': 0.720, 'w1B': 0.884, 'w2B': 1.257, 'w3B': 1.593, 'wHR': 2.058,
+           'woba_scale': 1.247, 'cfip': 3.134},
+}
+
+
+@dataclass(frozen=True)
+class SeasonConstants:
+    """1シーズン分の定数"""
+    season: int
+    cfip: float = FIP_CONSTANT
+    wBB: float = 0.690
+    wHBP: float = 0.720
+    w1B: float = 0.885
+    w2B: float = 1.260
+    w3B: float = 1.595
+    wHR: float = 2.060
+    woba_scale: float = 1.250
+    lg_woba: float = 0.315
+    lg_era: float = 0.0
+    lg_hr_fb: Optional[float] = None   # HR/(フライアウト+本塁打)。Noneは既定のHR/FBを使う
+    team_games: int = 0       # 合計に含まれるチーム試合数（30チーム×消化試合数）
+    source: str = 'default'   # 'league' / 'fanGraphs' / 'default'
+    computed_at: float = 0.0
+
+    @property
+    def woba_weights(self) -> Dict[str, float]:
+        """src.sabermetrics.woba に渡す係数"""
+        return {'wBB': self.wBB, 'wHBP': self.wHBP, 'w1B': self.w1B,
+                'w2B': self.w2B, 'w3B': self.w3B, 'wHR': self.wHR}
+
+    @property
+    def final(self):
+        """シーズン終了後の合計から求めた値か（以後は再計算しない）"""
+        return self.source == 'league' and self.team_games >= SEASON_TEAM_GAMES
+
+    def pitching_kwargs(self):
+        """src.sabermetrics.pitching_rates に渡す定数"""
+        return {'fip_constant': self.cfip, 'lg_hr_fb': self.lg_hr_fb}
+
+    @classmethod
+    def fallback(cls, season):
+        values = FALLBACK.get(season)
+        if values is None:
+            return cls(season=season)
+        return cls(season=season, source='fanGraphs', **values)
+
+
+def compute_constants(season, hitting: StatColumns, pitching: StatColumns) -> SeasonConstants:
+    """リーグ合計から定数を求める
+
+    wOBA係数はFanGraphsの手順（アウトあたり得点から各イベントの得点価値を近似し、
+    リーグwOBAがリーグOBPと一致するようスケールする）による。
+    """
+    h = hitting.total()
+    p = pitching.total()
+
+    def total(cols, name):
+        return float(cols[name][0])
+
+    ab, hits, bb, ibb, hbp, sf = (total(h, n) for n in ('ab', 'h', 'bb', 'ibb', 'hbp', 'sf'))
+    doubles, triples, hr, runs = (total(h, n) for n in ('doubles', 'triples', 'hr', 'r'))
+    singles = hits - doubles - triples - hr
+    ubb = bb - ibb
+    outs = total(p, 'outs')
+    if outs <= 0 or ab <= 0:
+        raise ValueError(f"no league totals for {season}")
+
+    # アウトあたり得点と各イベントの得点価値
+    runs_per_out = runs / outs
+    run_bb = runs_per_out + 0.14
+    run_hbp = run_bb + 0.025
+    run_1b = run_bb + 0.155
+    run_2b = run_1b + 0.3
+    run_3b = run_2b + 0.27
+    run_hr = 1.4
+    event_runs = run_bb * ubb + run_hbp * hbp + run_1b * singles + run_2b * doubles + run_3b * triples + run_hr * hr
+    run_plus = event_runs / (ubb + hbp + hits)
+    run_minus = event_runs / (ab - hits + sf)
+    lg_obp = (hits + ubb + hbp) / (ab + ubb + hbp + sf)
+    woba_scale = 1 / (run_plus + run_minus)
+
+    def weight(run_value):
+        return (run_value + run_minus) * woba_scale
+
+    # FIP定数: lgERA - (13HR + 3(BB+HBP) - 2K) / IP
+    ip = outs / 3
+    p_hr, p_bb, p_hbp, p_k, p_er = (total(p, n) for n in ('hr', 'bb', 'hbp', 'k', 'er'))
+    lg_era = p_er * 9 / ip
+    cfip = lg_era - (13 * p_hr + 3 * (p_bb + p_hbp) - 2 * p_k) / ip
+    # pitching_rates が投手のフライ数を数えるのと同じ分母（フライアウト+本塁打）
+    fly_balls = total(p, 'ao') + p_hr
+    lg_hr_fb = p_hr / fly_balls if fly_balls > 0 else None
+
+    return SeasonConstants(
+        season=season, cfip=cfip,
+        wBB=weight(run_bb), wHBP=weight(run_hbp), w1B=weight(run_1b),
+        w2B=weight(run_2b), w3B=weight(run_3b), wHR=weight(run_hr),
+        woba_scale=woba_scale, lg_woba=lg_obp, lg_era=lg_era, lg_hr_fb=lg_hr_fb,
+        team_games=int(np.sum(hitting['g'])), source='league', computed_at=time.time(),
+    )
+
+
+class SeasonConstantsTable:
+    """シーズン定数のメモ化テーブル
+
+    get(season) はメモリ上の値を返し、進行中のシーズンで refresh_seconds を過ぎていれば
+    リーグ合計を取り直す（合計はHTTPキャッシュ層を通る1リクエストずつ）。チーム試合数が
+    変わっていなければ以前の値をそのまま使う。
+    """
+
+    def __init__(self, client=None, path=DEFAULT_PATH, refresh_seconds=REFRESH_SECONDS):
+        self._client = client
+        self.path = Path(path)
+        self.refresh_seconds = refresh_seconds
+        self._constants: Dict[int, SeasonConstants] = {}
+        self._checked: Dict[int, float] = {}
+        self._lock = threading.Lock()
+        self.logger = logging.getLogger(__name__)
+        self._load()
+
+    @property
+    def client(self):
+        if self._client is None:
+            from src.mlb_api_client import MLBApiClient
+            self._client = MLBApiClient()
+        return self._client
+
+    def _load(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                for season, values in json.load(f).items():
+                    self._constants[int(season)] = SeasonConstants(**values)
+        except (FileNotFoundError, ValueError, TypeError):
+            pass
+
+    def _save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        data = {str(season): asdict(c) for season, c in sorted(self._constants.items())}
+        tmp = self.path.with_suffix('.tmp')
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2)
+        tmp.replace(self.path)
+
+    def _needs_refresh(self, season, current):
+        # シーズン終了後（翌年以降）に計算した値は確定値として扱う
+        if current is not None and (current.final or current.source == 'league'
+                                    and datetime.fromtimestamp(current.computed_at).year > season):
+            return False
+        return time.monotonic() - self._checked.get(season, -self.refresh_seconds) >= self.refresh_seconds
+
+    def get(self, season=None) -> SeasonConstants:
+        """シーズンの定数（Noneなら今年）"""
+        season = season or datetime.now().year
+        current = self._constants.get(season)
+        if not self._needs_refresh(season, current):
+            return current
+
+        with self._lock:
+            current = self._constants.get(season)
+            if not self._needs_refresh(season, current):
+                return current
+            self._checked[season] = time.monotonic()
+            updated = self._compute(season, current)
+            if updated is not current:
+                self._constants[season] = updated
+                if updated.source == 'league':
+                    self._save()
+            return updated
+
+    def _compute(self, season, current):
+        try:
+            hitting = StatColumns.from_stats(self.client.get_league_team_stats(season, 'hitting'), BATTING_FIELDS)
+            if current is not None and current.source == 'league' and int(np.sum(hitting['g'])) == current.team_games:
+                # 新たに終了した試合がなければ再計算しない
+                return current
+            pitching = StatColumns.from_stats(self.client.get_league_team_stats(season, 'pitching'), PITCHING_FIELDS)
+            constants = compute_constants(season, hitting, pitching)
+            self.logger.info(f"Season {season} constants: cFIP={constants.cfip:.3f} "
+                             f"wOBAScale={constants.woba_scale:.3f} HR/FB={constants.lg_hr_fb or 0:.3f}")
+            return constants
+        except Exception as e:
+            self.logger.warning(f"Season {season} constants unavailable: {e}")
+            return current or SeasonConstants.fallback(season)
+
+    def invalidate(self, season=None):
+        """次のget()で合計を取り直す（試合終了の通知などから呼ぶ）"""
+        with self._lock:
+            if season is None:
+                self._checked.clear()
+            else:
+                self._checked.pop(season, None)
+
+
+_default_table: Optional[SeasonConstantsTable] = None
+_default_table_lock = threading.Lock()
+
+
+def get_constants_table() -> SeasonConstantsTable:
+    """プロセス共通のテーブルを取得"""
+    global _default_table
+    with _default_table_lock:
+        if _default_table is None:
+            _default_table = SeasonConstantsTable()
+        return _default_table
+
+
+def season_constants(season=None) -> SeasonConstants:
+    """シーズン定数（プロセス共通のテーブルから）"""
+    return get_constants_table().get(season)
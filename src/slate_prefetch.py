@@ -0,0 +1,200 @@
+"""
+スレート単位の事前取得プランナー
+1日分のスケジュールから必要なチーム・投手データを重複なく洗い出し、
+並行して取得したうえでメモリ上のスナップショットとして全レンダラーに共有するモジュール
+"""
+
+import asyncio
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Tuple
+
+from src.async_mlb_api_client import AsyncMLBApiClient
+
+
+@dataclass(frozen=True)
+class SlatePlan:
+    """1スレートで必要になるエンティティの一覧（重複なし、スケジュール順）"""
+    game_pks: Tuple[int, ...] = ()
+    team_ids: Tuple[int, ...] = ()
+    pitcher_ids: Tuple[int, ...] = ()
+    season: int = 2025
+
+    @classmethod
+    def from_schedule(cls, schedule, season=2025):
+        """get_scheduleのレスポンスから生成（ダブルヘッダーの重複チームは1回にまとめる）"""
+        game_pks: Dict[int, None] = {}
+        team_ids: Dict[int, None] = {}
+        pitcher_ids: Dict[int, None] = {}
+
+        for date_info in (schedule or {}).get('dates', []):
+            for game in date_info.get('games', []):
+                if game.get('gamePk'):
+                    game_pks[game['gamePk']] = None
+                for side in ('away', 'home'):
+                    team_side = game.get('teams', {}).get(side, {})
+                    team_id = team_side.get('team', {}).get('id')
+                    pitcher_id = team_side.get('probablePitcher', {}).get('id')
+                    if team_id:
+                        team_ids[team_id] = None
+                    if pitcher_id:
+                        pitcher_ids[pitcher_id] = None
+
+        return cls(tuple(game_pks), tuple(team_ids), tuple(pitcher_ids), season)
+
+
+@dataclass
+class _Pending:
+    """取得中のキー（同じキーの同時呼び出しは完了を待って結果を共有する）"""
+    event: threading.Event = field(default_factory=threading.Event)
+    value: Any = None
+    error: BaseException = None
+
+
+class SlateSnapshot:
+    """スレート分の取得結果を保持するメモリ上のスナップショット（スレッドセーフ）
+
+    キーは (名前空間, メソッド名, 引数) のタプル。
+    取得に失敗した呼び出しは保存せず、次の呼び出しで再取得する。
+    """
+
+    def __init__(self):
+        self._values: Dict[Hashable, Any] = {}
+        self._pending: Dict[Hashable, _Pending] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._values
+
+    def __len__(self):
+        with self._lock:
+            return len(self._values)
+
+    def fetch(self, key, loader: Callable[[], Any]):
+        """キーの値を返す（未取得ならloaderで取得して保存）"""
+        with self._lock:
+            if key in self._values:
+                self.hits += 1
+                return self._values[key]
+            pending = self._pending.get(key)
+            owner = pending is None
+            if owner:
+                pending = self._pending[key] = _Pending()
+                self.misses += 1
+            else:
+                self.hits += 1
+
+        if not owner:
+            pending.event.wait()
+            if pending.error is not None:
+                raise pending.error
+            return pending.value
+
+        try:
+            pending.value = loader()
+        except BaseException as e:
+            pending.error = e
+            raise
+        else:
+            with self._lock:
+                self._values[key] = pending.value
+            return pending.value
+        finally:
+            with self._lock:
+                self._pending.pop(key, None)
+            pending.event.set()
+
+
+class SnapshotProxy:
+    """指定メソッドの呼び出し結果をスナップショットで共有するラッパー
+
+    対象外の属性・メソッドは元のオブジェクトへそのまま委譲する。
+    """
+
+    def __init__(self, target, snapshot: SlateSnapshot, namespace, methods: Iterable[str]):
+        self._target = target
+        self._snapshot = snapshot
+        self._namespace = namespace
+        self._methods = frozenset(methods)
+
+    def __getattr__(self, name):
+        attr = getattr(self._target, name)
+        if name not in self._methods:
+            return attr
+
+        def memoized(*args, **kwargs):
+            key = (self._namespace, name, args, tuple(sorted(kwargs.items())))
+            return self._snapshot.fetch(key, lambda: attr(*args, **kwargs))
+
+        return memoized
+
+
+# MLBApiClientのうちスナップショットで共有するメソッド
+CLIENT_SNAPSHOT_METHODS = (
+    'get_player_info',
+    'get_player_stats_by_season',
+    'get_player_splits',
+    'get_team_stats',
+    'get_team_splits_vs_pitchers',
+    'get_team_roster_with_stats',
+    'calculate_team_recent_ops_windows',
+)
+
+
+class SlatePrefetcher:
+    """SlatePlanの取得タスクを並行実行してスナップショットを埋めるクラス"""
+
+    def __init__(self, max_concurrency=8, requests_per_second=None):
+        self.max_concurrency = max_concurrency
+        self.requests_per_second = requests_per_second
+        self.logger = logging.getLogger(__name__)
+
+    def prefetch(self, client, tasks: List[Tuple[Callable, tuple]]):
+        """タスク（呼び出し先と引数の組）を並行実行する
+
+        同期的な呼び出し元用。実行中のイベントループがあるスレッド（非同期のホストから
+        呼ばれた場合）では、別スレッドの新しいイベントループで実行して完了を待つ。
+        非同期の呼び出し元は prefetch_async を await する。
+
+        Args:
+            client: ネットワーク層を共有するMLBApiClient（レート制限付きSessionに差し替える）
+            tasks: SnapshotProxy経由の呼び出し先と引数の組のリスト
+                   （同じキーの重複はスナップショット側で1回にまとめる）
+
+        Returns:
+            int: 失敗したタスク数
+        """
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(self.prefetch_async(client, tasks))
+        with ThreadPoolExecutor(max_workers=1, thread_name_prefix='slate-prefetch') as executor:
+            return executor.submit(asyncio.run, self.prefetch_async(client, tasks)).result()
+
+    async def prefetch_async(self, client, tasks: List[Tuple[Callable, tuple]]):
+        """prefetch の非同期版（実行中のイベントループ上で待つ）"""
+        if not tasks:
+            return 0
+
+        async_client = AsyncMLBApiClient(self.max_concurrency, self.requests_per_second, client)
+        try:
+            results = await asyncio.gather(
+                *(async_client.run(func, *args) for func, args in tasks),
+                return_exceptions=True
+            )
+        finally:
+            async_client.close()
+
+        failures = 0
+        for (func, args), result in zip(tasks, results):
+            if isinstance(result, Exception):
+                failures += 1
+                # 失敗したタスクは組み立て時に通常の呼び出しで取り直される
+                self.logger.warning(f"Prefetch failed: {getattr(func, '__name__', func)}{args}: {result!r}")
+        self.logger.info(f"Prefetched {len(tasks) - failures}/{len(tasks)} slate calls")
+        return failures
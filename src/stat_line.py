@@ -0,0 +1,121 @@
+"""
+投手の成績ライン
+投球回をアウト数の整数で持つ __slots__ の成績ラインと、投球回表記（'45.2'）の変換を提供するモジュール
+- '45.2' は 45イニングと2/3（= 137アウト）。float(…) や小数点以下×10/3 の丸めを使わない
+- 合算（+=）は整数・件数の足し算だけで行い、率の計算は src.sabermetrics に任せる
+"""
+
+from typing import Dict, Iterable, Optional
+
+OUTS_PER_INNING = 3
+
+
+def parse_outs(value) -> int:
+    """投球回（'45.2' / 45.2 / 45 / None）をアウト数に変換"""
+    if value is None or value == '':
+        return 0
+    if isinstance(value, int):
+        return value * OUTS_PER_INNING
+    text = str(value).strip()
+    whole, _, thirds = text.partition('.')
+    try:
+        # '45.2' の小数部は1/3イニング単位（floatの45.2も同じ文字列になる）
+        outs, extra = int(whole or 0) * OUTS_PER_INNING, (int(thirds[0]) if thirds else 0)
+    except ValueError:
+        return 0
+    # 小数部が0〜2以外（'45.5' など）は投球回表記ではない
+    return outs + extra if extra < OUTS_PER_INNING else 0
+
+
+def innings(outs) -> float:
+    """アウト数をイニング（float）に変換（率の計算用）"""
+    return outs / OUTS_PER_INNING
+
+
+def parse_innings(value) -> float:
+    """投球回表記をイニング（float）に変換（'45.2' -> 45.667）"""
+    return innings(parse_outs(value))
+
+
+def format_innings(outs) -> str:
+    """アウト数を投球回表記に変換（137 -> '45.2'）"""
+    return f"{outs // OUTS_PER_INNING}.{outs % OUTS_PER_INNING}"
+
+
+class PitchingLine:
+    """投手（または投手陣の合計）の成績ライン
+
+    各項目は整数で、投球回は outs（アウト数）で持つ。MLB APIのstat辞書から
+    from_stat() で1回だけ変換し、以後は文字列を扱わない。
+    """
+
+    # 属性名 -> MLB APIのキー（outs以外）
+    FIELDS = {
+        'g': 'gamesPlayed', 'gs': 'gamesStarted', 'sv': 'saves', 'hld': 'holds',
+        'bf': 'battersFaced', 'h': 'hits', 'er': 'earnedRuns', 'hr': 'homeRuns',
+        'bb': 'baseOnBalls', 'ibb': 'intentionalWalks', 'hbp': 'hitByPitch', 'k': 'strikeOuts',
+        'go': 'groundOuts', 'ao': 'airOuts',
+    }
+    __slots__ = ('outs',) + tuple(FIELDS)
+
+    def __init__(self, outs=0, **counts):
+        self.outs = outs
+        for name in self.FIELDS:
+            setattr(self, name, counts.get(name, 0))
+
+    @classmethod
+    def from_stat(cls, stat: Optional[Dict]) -> 'PitchingLine':
+        stat = stat or {}
+        line = cls(parse_outs(stat.get('inningsPitched')))
+        for name, key in cls.FIELDS.items():
+            value = stat.get(key)
+            if value:
+                try:
+                    setattr(line, name, int(value))
+                except (TypeError, ValueError):
+                    pass
+        return line
+
+    @classmethod
+    def total(cls, lines: Iterable['PitchingLine']) -> 'PitchingLine':
+        result = cls()
+        for line in lines:
+            result += line
+        return result
+
+    def __iadd__(self, other):
+        self.outs += other.outs
+        for name in self.FIELDS:
+            setattr(self, name, getattr(self, name) + getattr(other, name))
+        return self
+
+    def __add__(self, other):
+        result = PitchingLine(self.outs, **{name: getattr(self, name) for name in self.FIELDS})
+        result += other
+        return result
+
+    def __eq__(self, other):
+        return isinstance(other, PitchingLine) and all(
+            getattr(self, name) == getattr(other, name) for name in self.__slots__)
+
+    def __repr__(self):
+        return f"PitchingLine(ip={self.ip}, bf={self.bf}, k={self.k}, bb={self.bb}, hr={self.hr})"
+
+    @property
+    def innings(self) -> float:
+        return innings(self.outs)
+
+    @property
+    def ip(self) -> str:
+        """投球回表記（'45.2'）"""
+        return format_innings(self.outs)
+
+    def as_dict(self) -> Dict[str, int]:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def rates(self, constants=None) -> Dict[str, float]:
+        """派生指標（src.sabermetrics.pitching_rates と同じ計算、constantsはSeasonConstants）"""
+        from src.sabermetrics import StatColumns, pitching_rates, scalar
+
+        kwargs = constants.pitching_kwargs() if constants is not None else {}
+        return scalar(pitching_rates(StatColumns.from_lines([self]), **kwargs))
@@ -0,0 +1,254 @@
+"""
+列指向のシーズン成績ストア
+全選手のシーズン成績と試合別成績（ゲームログ）を、シーズン・グループ（pitching / hitting）ごとに
+1つのNumPy構造化配列（.npy）として保存するモジュール
+- 行は選手IDでソート済みで、選手IDの検索は np.searchsorted による二分探索（これが索引になる）
+- 読み込みは np.load(mmap_mode='r') のメモリマップなので、リーグ全体の読み込みもファイル1つを開くだけ
+- 書き込みは選手単位の置き換え（upsert）で、書き込み元ごとに別名の一時ファイルに書いてから置き換える
+"""
+
+import logging
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterable, Mapping, Optional
+
+import numpy as np
+
+from src.sabermetrics import BATTING_FIELDS, PITCHING_FIELDS, StatColumns
+from src.stat_line import parse_outs
+
+DEFAULT_STORE_DIR = "cache/stat_store"
+MAX_AGE = 6 * 60 * 60   # 進行中のシーズンの行を取り直すまでの秒数
+
+GROUPS = ('pitching', 'hitting')
+
+# 行のキー（成績以外の列）
+SEASON_KEYS = [('player_id', '<i8'), ('team_id', '<i8'), ('updated', '<f8')]
+GAME_KEYS = [('player_id', '<i8'), ('team_id', '<i8'), ('game_pk', '<i8'), ('date', '<i4'), ('updated', '<f8')]
+GAME_ORDER = ('player_id', 'date', 'game_pk')
+
+
+def stat_fields(group) -> Dict[str, str]:
+    """グループの成績列（列名 -> MLB APIのキー）"""
+    if group == 'pitching':
+        return PITCHING_FIELDS
+    if group == 'hitting':
+        return BATTING_FIELDS
+    raise ValueError(f"unknown stat group: {group}")
+
+
+def count_names(group):
+    """グループの成績列名（投手は先頭に outs）"""
+    names = list(stat_fields(group))
+    return ['outs'] + names if group == 'pitching' else names
+
+
+def row_dtype(group, kind='season') -> np.dtype:
+    """行の構造化dtype（kindは 'season' / 'games'）"""
+    keys = SEASON_KEYS if kind == 'season' else GAME_KEYS
+    return np.dtype(keys + [(name, '<i4') for name in count_names(group)])
+
+
+def date_key(date) -> int:
+    """'2025-04-01' を 20250401 に変換（ゲームログの日付列）"""
+    return int(str(date)[:10].replace('-', '') or 0)
+
+
+def _count(value) -> int:
+    try:
+        return int(float(value or 0))
+    except (TypeError, ValueError):
+        return 0
+
+
+def _fill_counts(row, group, stat):
+    """stat辞書の件数を行に書き込む"""
+    stat = stat or {}
+    for name, key in stat_fields(group).items():
+        row[name] = _count(stat.get(key))
+    if group == 'pitching':
+        row['outs'] = parse_outs(stat.get('inningsPitched'))
+
+
+def to_columns(rows: np.ndarray, group) -> StatColumns:
+    """行（構造化配列）を計算エンジン用の列に変換（メモリマップのままのビュー）"""
+    return StatColumns({name: rows[name] for name in count_names(group)}, rows['player_id'])
+
+
+class SeasonStatStore:
+    """シーズン成績・ゲームログの列指向ストア
+
+    ファイルは {root}/{season}_{group}_season.npy と {season}_{group}_games.npy。
+    読み込んだ配列はファイルの更新時刻が変わるまで使い回す。
+    """
+
+    def __init__(self, root=DEFAULT_STORE_DIR):
+        self.root = Path(root)
+        self._tables: Dict[Path, tuple] = {}
+        self._lock = threading.Lock()
+        self.logger = logging.getLogger(__name__)
+
+    def _path(self, season, group, kind):
+        stat_fields(group)
+        return self.root / f"{season}_{group}_{kind}.npy"
+
+    def _table(self, season, group, kind) -> np.ndarray:
+        path = self._path(season, group, kind)
+        try:
+            mtime = path.stat().st_mtime_ns
+        except FileNotFoundError:
+            return np.empty(0, dtype=row_dtype(group, kind))
+
+        cached = self._tables.get(path)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+        rows = np.load(path, mmap_mode='r')
+        if rows.dtype != row_dtype(group, kind):
+            # 列構成が変わった古いファイルは使わない（次の書き込みで作り直す）
+            self.logger.warning(f"Ignoring stat store file with old layout: {path}")
+            rows = np.empty(0, dtype=row_dtype(group, kind))
+        self._tables[path] = (mtime, rows)
+        return rows
+
+    def _write(self, season, group, kind, rows):
+        path = self._path(season, group, kind)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # 一時ファイルは書き込み元ごとに別名（同時に書く収集スクリプト同士で上書きしない）
+        with tempfile.NamedTemporaryFile(dir=path.parent, prefix=f"{path.stem}.", suffix='.tmp',
+                                         delete=False) as f:
+            np.save(f, rows)
+        # Windowsではメモリマップ中のファイルを置き換えられないので、先にマップを手放す
+        self._tables.pop(path, None)
+        try:
+            os.replace(f.name, path)
+        except BaseException:
+            os.unlink(f.name)
+            raise
+
+    def _upsert(self, season, group, kind, new_rows, player_ids, order):
+        """player_idsの選手の行をすべてnew_rowsで置き換えて保存（変化がなければ書き込まない）"""
+        with self._lock:
+            current = self._table(season, group, kind)
+            replaced = np.isin(current['player_id'], np.asarray(list(player_ids), dtype=np.int64))
+            if not len(new_rows) and not replaced.any():
+                return 0
+            # 残す行はメモリに写し、置き換え前にマップへの参照を手放す
+            keep = np.array(current[~replaced])
+            del current
+            rows = np.concatenate([keep, new_rows])
+            rows = rows[np.argsort(rows, order=order, kind='stable')]
+            self._write(season, group, kind, rows)
+        return len(new_rows)
+
+    # --- 書き込み（収集スクリプトから） ---
+
+    def write_season(self, season, group, stats: Mapping[int, Optional[Dict]],
+                     team_ids: Optional[Mapping[int, int]] = None) -> int:
+        """選手ごとのシーズン統計（{player_id: stat辞書}）を保存
+
+        統計が空の選手も0の行として保存する（取得済みであることの記録）。
+        """
+        team_ids = team_ids or {}
+        rows = np.zeros(len(stats), dtype=row_dtype(group, 'season'))
+        now = time.time()
+        for row, (player_id, stat) in zip(rows, stats.items()):
+            row['player_id'] = player_id
+            row['team_id'] = team_ids.get(player_id, 0)
+            row['updated'] = now
+            _fill_counts(row, group, stat)
+        return self._upsert(season, group, 'season', rows, stats, 'player_id')
+
+    def write_game_logs(self, season, group, logs: Mapping[int, Iterable[Dict]]) -> int:
+        """選手ごとのゲームログ（{player_id: gameLogのsplits}）を保存
+
+        渡した選手のゲームログはシーズン分すべて置き換える。
+        """
+        entries = [(player_id, split) for player_id, splits in logs.items() for split in splits or []]
+        rows = np.zeros(len(entries), dtype=row_dtype(group, 'games'))
+        rows['updated'] = time.time()
+        for row, (player_id, split) in zip(rows, entries):
+            row['player_id'] = player_id
+            row['team_id'] = split.get('team', {}).get('id') or 0
+            row['game_pk'] = split.get('game', {}).get('gamePk') or 0
+            row['date'] = date_key(split.get('date', ''))
+            _fill_counts(row, group, split.get('stat'))
+        return self._upsert(season, group, 'games', rows, logs, GAME_ORDER)
+
+    # --- 読み込み（計算側から） ---
+
+    def season_rows(self, season, group) -> np.ndarray:
+        """シーズン成績の全行（メモリマップ、選手ID順）"""
+        return self._table(season, group, 'season')
+
+    def game_log_rows(self, season, group, player_id=None) -> np.ndarray:
+        """ゲームログの行（選手ID・日付順）。player_idを渡すとその選手の範囲のビュー"""
+        rows = self._table(season, group, 'games')
+        if player_id is None:
+            return rows
+        ids = rows['player_id']
+        start, end = np.searchsorted(ids, player_id, 'left'), np.searchsorted(ids, player_id, 'right')
+        return rows[start:end]
+
+    def missing_game_logs(self, season, group, player_ids, max_age=None):
+        """ゲームログの行がない（またはmax_age秒より前に保存した）選手IDのリスト
+
+        試合のない選手は行がないので、常にこのリストに含まれる。
+        """
+        player_ids = list(player_ids)
+        rows = self.game_log_rows(season, group)
+        if max_age is not None:
+            rows = rows[rows['updated'] >= time.time() - max_age]
+        stored = np.isin(np.asarray(player_ids, dtype=np.int64), rows['player_id'])
+        return [pid for pid, ok in zip(player_ids, stored) if not ok]
+
+    def game_log_version(self, season, group) -> int:
+        """ゲームログのファイルの版（更新時刻、ファイルがなければ0）。配列を持たずに更新を検出する用"""
+        try:
+            return self._path(season, group, 'games').stat().st_mtime_ns
+        except FileNotFoundError:
+            return 0
+
+    def _find(self, season, group, player_ids):
+        """選手IDの行番号と、見つかったかどうかの配列"""
+        rows = self.season_rows(season, group)
+        player_ids = np.asarray(list(player_ids), dtype=np.int64)
+        index = np.searchsorted(rows['player_id'], player_ids)
+        index = np.minimum(index, max(len(rows) - 1, 0))
+        found = (rows['player_id'][index] == player_ids) if len(rows) else np.zeros(len(player_ids), bool)
+        return rows, index, found
+
+    def season_columns(self, season, group, player_ids=None) -> StatColumns:
+        """シーズン成績の列（player_idsを渡すとその順に並べ、ない選手は0の行）"""
+        if player_ids is None:
+            return to_columns(self.season_rows(season, group), group)
+        player_ids = list(player_ids)
+        rows, index, found = self._find(season, group, player_ids)
+        selected = np.zeros(len(index), dtype=rows.dtype)
+        if len(rows):
+            selected[found] = rows[index[found]]
+        selected['player_id'] = player_ids
+        return to_columns(selected, group)
+
+    def missing(self, season, group, player_ids, max_age=None):
+        """ストアにない（またはmax_age秒より古い）選手IDのリスト"""
+        player_ids = list(player_ids)
+        rows, index, found = self._find(season, group, player_ids)
+        if max_age is not None and len(rows):
+            found &= rows['updated'][index] >= time.time() - max_age
+        return [pid for pid, ok in zip(player_ids, found) if not ok]
+
+
+_default_store: Optional[SeasonStatStore] = None
+_default_store_lock = threading.Lock()
+
+
+def get_default_stat_store():
+    """プロセス共通のストアを取得"""
+    global _default_store
+    with _default_store_lock:
+        if _default_store is None:
+            _default_store = SeasonStatStore()
+        return _default_store
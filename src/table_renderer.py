@@ -0,0 +1,161 @@
+"""
+試合表画像レンダラー
+Discord投稿用の試合データ表（先発・中継ぎ・打撃）をPNGのバイト列として描画するモジュール
+- pyplotのグローバル状態を使わず、プロセスごとに1つのFigureとフォント設定を使い回す
+- 複数試合はプロセスプールで並行描画し、一時ファイルを経由せずメモリ上で返す
+"""
+
+import io
+import os
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta, timezone
+
+JST = timezone(timedelta(hours=9))
+
+HEADER_COLOR = '#2E5090'
+SECTION_COLOR = '#E8E8E8'
+SECTION_ROWS = (1, 7, 13)  # Starting Pitcher, Bullpen, Team Batting
+FIGSIZE = (14, 12)
+DPI = 150
+
+_figure = None  # プロセス内で使い回すFigure（_get_figureで初期化）
+
+
+def _value(stats, key, default='N/A'):
+    return str(stats.get(key, default)) if stats else default
+
+
+def table_rows(game_data):
+    """表のヘッダー行とデータ行を作成
+
+    Returns:
+        tuple: (headers, rows)
+    """
+    headers = ['', game_data['away_team'], game_data['home_team']]
+
+    # 先発投手データ
+    away_p = game_data.get('away_pitcher', {})
+    home_p = game_data.get('home_pitcher', {})
+
+    def starter(p):
+        return f"{p.get('name', 'TBD')} ({p.get('wins', 0)}-{p.get('losses', 0)})" if p else 'TBD'
+
+    pitcher_rows = [
+        ['Starting Pitcher', starter(away_p), starter(home_p)],
+        ['ERA', _value(away_p, 'era'), _value(home_p, 'era')],
+        ['FIP', _value(away_p, 'fip'), _value(home_p, 'fip')],
+        ['WHIP', _value(away_p, 'whip'), _value(home_p, 'whip')],
+        ['K-BB%', _value(away_p, 'k_bb'), _value(home_p, 'k_bb')],
+    ]
+
+    # 中継ぎ陣データ
+    away_bp = game_data.get('away_bullpen', {})
+    home_bp = game_data.get('home_bullpen', {})
+
+    def closer(bp):
+        return str(bp['closer']) if bp and bp.get('closer') else 'N/A'
+
+    bullpen_rows = [
+        ['Bullpen', '', ''],
+        ['ERA', _value(away_bp, 'era'), _value(home_bp, 'era')],
+        ['FIP', _value(away_bp, 'fip'), _value(home_bp, 'fip')],
+        ['WHIP', _value(away_bp, 'whip'), _value(home_bp, 'whip')],
+        ['Closer', closer(away_bp), closer(home_bp)],
+    ]
+
+    # チーム打撃データ
+    away_b = game_data.get('away_team_batting', {})
+    home_b = game_data.get('home_team_batting', {})
+
+    batting_rows = [
+        ['Team Batting', '', ''],
+        ['AVG', _value(away_b, 'avg'), _value(home_b, 'avg')],
+        ['OPS', _value(away_b, 'ops'), _value(home_b, 'ops')],
+        ['Runs', _value(away_b, 'runs', '0'), _value(home_b, 'runs', '0')],
+        ['HR', _value(away_b, 'hr', '0'), _value(home_b, 'hr', '0')],
+        ['Last 5 OPS', _value(away_b, 'recent_5_ops'), _value(home_b, 'recent_5_ops')],
+        ['Last 10 OPS', _value(away_b, 'recent_10_ops'), _value(home_b, 'recent_10_ops')],
+    ]
+
+    return headers, pitcher_rows + [[''] * 3] + bullpen_rows + [[''] * 3] + batting_rows
+
+
+def _init_worker():
+    """描画プロセスの初期化（バックエンドとフォントを1回だけ設定）"""
+    import matplotlib
+    matplotlib.use('Agg')  # GUIなし環境用
+    from src.asset_cache import japanese_font_families
+
+    matplotlib.rcParams['font.family'] = ['DejaVu Sans', *japanese_font_families()]
+
+
+def _get_figure():
+    global _figure
+    if _figure is None:
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        from matplotlib.figure import Figure
+
+        _init_worker()
+        _figure = Figure(figsize=FIGSIZE)
+        FigureCanvasAgg(_figure)
+    return _figure
+
+
+def render_table_png(game_data):
+    """1試合分の表をPNGのバイト列として描画"""
+    fig = _get_figure()
+    fig.clear()
+    ax = fig.add_subplot(111)
+    ax.axis('off')
+
+    # タイトル
+    game_time = datetime.fromisoformat(game_data['gameDate'].replace('Z', '+00:00'))
+    jst_time = game_time.astimezone(JST)
+    fig.text(0.5, 0.95, f"{game_data['away_team']} @ {game_data['home_team']}",
+             ha='center', fontsize=20, weight='bold')
+    fig.text(0.5, 0.91, f"{jst_time.strftime('%Y/%m/%d %H:%M')} JST", ha='center', fontsize=14)
+
+    headers, rows = table_rows(game_data)
+    table = ax.table(cellText=rows, colLabels=headers,
+                     cellLoc='center', loc='center',
+                     colWidths=[0.25, 0.375, 0.375])
+    table.auto_set_font_size(False)
+    table.set_fontsize(11)
+    table.scale(1, 2.2)
+
+    # スタイル設定
+    for i in range(len(headers)):
+        table[(0, i)].set_facecolor(HEADER_COLOR)
+        table[(0, i)].set_text_props(weight='bold', color='white')
+
+    # セクションヘッダーのスタイル
+    for row in SECTION_ROWS:
+        if row <= len(rows):
+            for col in range(3):
+                table[(row, col)].set_facecolor(SECTION_COLOR)
+                table[(row, col)].set_text_props(weight='bold')
+
+    # 枠線を太くする
+    for cell in table.get_celld().values():
+        cell.set_linewidth(1.5)
+
+    fig.tight_layout()
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format='png', dpi=DPI, bbox_inches='tight', facecolor='white', edgecolor='none')
+    return buffer.getvalue()
+
+
+def render_tables(games_data, workers=None):
+    """複数試合の表を描画（入力と同じ順番のPNGバイト列のリストを返す）
+
+    Args:
+        games_data: create_game_table形式の辞書のリスト
+        workers: プロセス数（1ならこのプロセスで順番に描画、Noneならコア数）
+    """
+    games_data = list(games_data)
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(games_data) <= 1:
+        return [render_table_png(game_data) for game_data in games_data]
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as executor:
+        return list(executor.map(render_table_png, games_data))
@@ -0,0 +1,63 @@
+"""
+テンプレート描画エンジン
+templates/ のJinja2テンプレートをプロセス内で1回だけコンパイルし（バイトコードはディスクにキャッシュ）、
+描画結果をファイルへストリーム出力するモジュール
+"""
+
+import os
+import threading
+from pathlib import Path
+
+from jinja2 import (Environment, FileSystemBytecodeCache, FileSystemLoader, StrictUndefined,
+                    Undefined, select_autoescape)
+
+TEMPLATE_DIR = Path(__file__).resolve().parent.parent / "templates"
+DEFAULT_BYTECODE_DIR = "cache/jinja2"
+
+_environments = {}
+_environments_lock = threading.Lock()
+
+
+def get_environment(template_dir=TEMPLATE_DIR, strict=False, bytecode_dir=DEFAULT_BYTECODE_DIR):
+    """テンプレートディレクトリごとの共有Environmentを取得
+
+    コンパイル済みテンプレートはEnvironment内に保持され、バイトコードは
+    bytecode_dirに保存されるため次回以降のプロセスでもパースを省略できる。
+    .htmlと.html.j2は自動エスケープする。
+    """
+    key = (str(Path(template_dir).resolve()), strict, bytecode_dir)
+    with _environments_lock:
+        env = _environments.get(key)
+        if env is None:
+            bytecode_cache = None
+            if bytecode_dir:
+                os.makedirs(bytecode_dir, exist_ok=True)
+                bytecode_cache = FileSystemBytecodeCache(bytecode_dir)
+            env = Environment(
+                loader=FileSystemLoader(key[0]),
+                bytecode_cache=bytecode_cache,
+                autoescape=select_autoescape(enabled_extensions=("html", "html.j2")),
+                undefined=StrictUndefined if strict else Undefined,
+            )
+            _environments[key] = env
+        return env
+
+
+def get_template(name, template_dir=TEMPLATE_DIR, strict=False):
+    """コンパイル済みテンプレートを取得"""
+    return get_environment(template_dir, strict).get_template(name)
+
+
+def render(name, template_dir=TEMPLATE_DIR, strict=False, **context):
+    """テンプレートを文字列に描画"""
+    return get_template(name, template_dir, strict).render(**context)
+
+
+def render_to_file(name, path, template_dir=TEMPLATE_DIR, strict=False, **context):
+    """テンプレートをファイルへストリーム出力（文書全体をメモリに保持しない）"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    stream = get_template(name, template_dir, strict).stream(**context)
+    stream.enable_buffering(64)
+    stream.dump(str(path), encoding="utf-8")
+    return path
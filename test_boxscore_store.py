@@ -0,0 +1,96 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+試合別チーム打撃成績ストア（src/boxscore_store.py）のテスト
+一時ディレクトリのSQLiteに書き込み、取り込み済み判定と直近N試合の並び順を確認する
+
+実行: python test_boxscore_store.py （pytestでも実行可）
+"""
+
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from src.boxscore_store import BoxscoreStore, TeamBattingLine
+
+BATTING = {
+    'runs': 5, 'atBats': 34, 'hits': 9, 'doubles': 2, 'triples': 0, 'homeRuns': 1,
+    'baseOnBalls': 4, 'hitByPitch': 1, 'sacFlies': 1, 'avg': '.265', 'obp': '.340', 'slg': '.412',
+}
+
+
+def make_store():
+    return BoxscoreStore(os.path.join(tempfile.mkdtemp(), 'boxscore_store.sqlite3'))
+
+
+def add(store, game_pk, game_date, hits=9):
+    store.add_game(game_pk, game_date, [
+        TeamBattingLine.from_batting(147, 'home', {**BATTING, 'hits': hits}),
+        TeamBattingLine.from_batting(111, 'away', BATTING),
+    ])
+
+
+def test_from_batting():
+    """boxscoreのキーをカラム名に変換し、欠けた項目・Noneは0にする"""
+    line = TeamBattingLine.from_batting(147, 'home', {**BATTING, 'sacFlies': None, 'triples': ''})
+    assert (line.at_bats, line.home_runs, line.base_on_balls, line.hit_by_pitch) == (34, 1, 4, 1)
+    assert line.sac_flies == 0 and line.triples == 0
+    assert line.obp == '.340'
+
+    empty = TeamBattingLine.from_batting(147, 'away', {})
+    assert empty.runs == 0 and empty.hits == 0 and empty.avg == '.000'
+
+
+def test_missing_games():
+    """取り込んだ試合はmissing_gamesから外れる"""
+    store = make_store()
+    assert store.missing_games([]) == set()
+    assert store.missing_games([1, 2, 3]) == {1, 2, 3}
+
+    add(store, 2, '2025-06-01T23:05:00Z')
+    assert store.missing_games([1, 2, 3]) == {1, 3}
+
+
+def test_add_game_does_not_overwrite():
+    """同じ試合を再度追加しても既存の行は変わらない"""
+    store = make_store()
+    add(store, 1, '2025-06-01T23:05:00Z', hits=9)
+    add(store, 1, '2025-06-01T23:05:00Z', hits=12)
+
+    lines = store.recent_lines(147, limit=5)
+    assert len(lines) == 1
+    assert lines[0]['hits'] == 9
+
+
+def test_recent_lines_newest_first():
+    """直近N試合を試合日時の新しい順に返し、sinceより前の試合は除外する"""
+    store = make_store()
+    add(store, 3, '2025-06-03T23:05:00Z', hits=3)
+    add(store, 1, '2025-06-01T23:05:00Z', hits=1)
+    add(store, 2, '2025-06-02T17:10:00Z', hits=2)
+
+    lines = store.recent_lines(147, limit=2)
+    assert [line['game_pk'] for line in lines] == [3, 2]
+    assert [line['hits'] for line in lines] == [3, 2]
+    assert lines[0]['at_bats'] == 34
+
+    assert [line['game_pk'] for line in store.recent_lines(147, limit=10, since='2025-06-02')] == [3, 2]
+    assert store.recent_lines(999, limit=10) == []
+
+
+def test_store_persists_across_connections():
+    """ストアを開き直しても取り込み済みの試合は残る"""
+    path = os.path.join(tempfile.mkdtemp(), 'nested', 'boxscore_store.sqlite3')
+    add(BoxscoreStore(path), 1, '2025-06-01T23:05:00Z')
+    reopened = BoxscoreStore(path)
+    assert reopened.missing_games([1, 2]) == {2}
+    assert len(reopened.recent_lines(111, limit=5)) == 1
+
+
+if __name__ == '__main__':
+    for name, func in list(globals().items()):
+        if name.startswith('test_') and callable(func):
+            func()
+            print(f"✓ {name}")
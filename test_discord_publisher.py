@@ -0,0 +1,65 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Discord Webhook一括配信（src/discord_publisher.py）のテスト
+pack_messagesが順番を保ったまま、本文・埋め込み・添付の上限を超えない範囲でまとめることを確認する
+
+実行: python test_discord_publisher.py （pytestでも実行可）
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from src.discord_publisher import DiscordMessage, WebhookLimits, pack_messages
+
+
+def test_pack_joins_content():
+    """上限内の本文は空行区切りで1件にまとめ、空の本文は区切りを入れない"""
+    packed = pack_messages([DiscordMessage('a'), DiscordMessage(''), DiscordMessage('b')])
+    assert [m.content for m in packed] == ['a\n\nb']
+    assert pack_messages([]) == []
+
+
+def test_pack_content_limit():
+    """まとめた本文が上限を超える場合は新しいリクエストに分ける"""
+    limits = WebhookLimits(content_chars=10)
+    packed = pack_messages([DiscordMessage('aaaa'), DiscordMessage('bbbb'), DiscordMessage('cc')], limits)
+    # 'aaaa\n\nbbbb' は10文字ちょうどで収まり、'cc' を足すと超える
+    assert [m.content for m in packed] == ['aaaa\n\nbbbb', 'cc']
+
+
+def test_pack_embed_limits():
+    """埋め込みの件数と合計文字数の上限を守る"""
+    embed = {'title': 'x' * 10, 'fields': [{'name': 'n', 'value': 'v' * 9}]}
+    packed = pack_messages([DiscordMessage(embeds=[embed])] * 5, WebhookLimits(embeds=2))
+    assert [len(m.embeds) for m in packed] == [2, 2, 1]
+
+    packed = pack_messages([DiscordMessage(embeds=[embed])] * 5, WebhookLimits(embed_chars=45))
+    assert [len(m.embeds) for m in packed] == [2, 2, 1]
+
+
+def test_pack_file_limits():
+    """添付の件数と合計バイト数の上限を守り、元のメッセージのリストは変更しない"""
+    files = [DiscordMessage(files=[(f"{i}.png", b'x' * 40)]) for i in range(5)]
+    packed = pack_messages(files, WebhookLimits(files=3))
+    assert [[name for name, _ in m.files] for m in packed] == [['0.png', '1.png', '2.png'], ['3.png', '4.png']]
+
+    packed = pack_messages(files, WebhookLimits(file_bytes=100))
+    assert [len(m.files) for m in packed] == [2, 2, 1]
+    assert all(len(m.files) == 1 for m in files)
+
+
+def test_pack_keeps_oversized_message():
+    """単独で上限を超えるメッセージもそのまま1件として送り、前後とはまとめない"""
+    limits = WebhookLimits(content_chars=5)
+    packed = pack_messages([DiscordMessage('ab'), DiscordMessage('x' * 8), DiscordMessage('cd')], limits)
+    assert [m.content for m in packed] == ['ab', 'x' * 8, 'cd']
+
+
+if __name__ == '__main__':
+    for name, func in list(globals().items()):
+        if name.startswith('test_') and callable(func):
+            func()
+            print(f"✓ {name}")
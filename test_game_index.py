@@ -0,0 +1,121 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+試合インデックス（src/game_index.py）のテスト
+GameIndexの game_id・team_id・pitcher_id での検索と、api_cache/ の日付別ファイルを
+CacheHistoryで検索できることを確認する
+
+実行: python test_game_index.py （pytestでも実行可）
+"""
+
+import json
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from src.game_index import CacheHistory, GameIndex
+
+
+def game(game_id, away, home, away_pitcher=None, home_pitcher=None):
+    return {
+        'game_id': game_id,
+        'away_team': {'id': away, 'pitcher': {'id': away_pitcher} if away_pitcher else None},
+        'home_team': {'id': home, 'pitcher': {'id': home_pitcher} if home_pitcher else {}},
+    }
+
+
+GAMES = [
+    game(1, 147, 111, away_pitcher=501, home_pitcher=502),
+    game(2, 121, 147, away_pitcher=503),
+    game(3, 119, 137, away_pitcher=504, home_pitcher=505),
+    {'away_team': {'id': 1}},
+]
+
+
+def write_slate(cache_dir, date, games):
+    with open(os.path.join(cache_dir, f"mlb_data_{date}.json"), 'w', encoding='utf-8') as f:
+        json.dump({'target_date': date, 'games': games}, f)
+
+
+def test_game_index_lookups():
+    """チーム・投手で引いた試合は元の試合順で、両方指定すると共通部分になる"""
+    index = GameIndex.from_games(GAMES)
+    assert len(index) == 3
+    assert index.game_ids() == [1, 2, 3]
+    assert index.game_ids(team_id=147) == [1, 2]
+    assert index.game_ids(pitcher_id=503) == [2]
+    assert index.game_ids(team_id=147, pitcher_id=502) == [1]
+    assert index.game_ids(team_id=119, pitcher_id=502) == []
+    assert index.game_ids(team_id=999) == []
+    # 予告先発のない側は投手インデックスに入らない
+    assert set(index.by_pitcher) == {501, 502, 503, 504, 505}
+    assert index.games(pitcher_id=505) == [GAMES[2]]
+
+
+def test_game_index_body_is_json():
+    """games_bodyはgames()をそのままシリアライズしたJSONと同じ内容になる"""
+    index = GameIndex.from_games(GAMES)
+    assert json.loads(index.games_body()) == GAMES[:3]
+    assert json.loads(index.games_body(team_id=147)) == GAMES[:2]
+    assert index.games_body(team_id=999) == b'[]'
+
+
+def test_cache_history_dates():
+    """ファイル名の日付を昇順に返し、start・endは両端を含む"""
+    cache_dir = tempfile.mkdtemp()
+    for date in ('2025-06-03', '2025-06-01', '2025-06-02'):
+        write_slate(cache_dir, date, [])
+    open(os.path.join(cache_dir, 'mlb_data_latest.json'), 'w').close()
+
+    history = CacheHistory(cache_dir)
+    assert history.dates() == ['2025-06-01', '2025-06-02', '2025-06-03']
+    assert history.dates('2025-06-02') == ['2025-06-02', '2025-06-03']
+    assert history.dates('2025-06-01', '2025-06-02') == ['2025-06-01', '2025-06-02']
+    assert history.dates('2025-07-01') == []
+
+    assert CacheHistory(os.path.join(cache_dir, 'missing')).dates() == []
+
+
+def test_cache_history_query_body():
+    """期間内の試合を日付ごとにまとめ、条件に合う試合のない日は含めない"""
+    cache_dir = tempfile.mkdtemp()
+    write_slate(cache_dir, '2025-06-01', GAMES[:2])
+    write_slate(cache_dir, '2025-06-02', GAMES[2:3])
+    history = CacheHistory(cache_dir)
+
+    body = json.loads(history.query_body('2025-06-01', '2025-06-02', team_id=147))
+    assert body['success'] is True
+    assert (body['from'], body['to'], body['games_count']) == ('2025-06-01', '2025-06-02', 2)
+    assert [d['date'] for d in body['dates']] == ['2025-06-01']
+    assert body['dates'][0]['games'] == GAMES[:2]
+
+    body = json.loads(history.query_body())
+    assert body['games_count'] == 3
+    assert [d['date'] for d in body['dates']] == ['2025-06-01', '2025-06-02']
+
+    assert history.index_for('2025-05-31') is None
+
+
+def test_cache_history_reloads_changed_file():
+    """ファイルの更新時刻が変わるとインデックスを読み直す"""
+    cache_dir = tempfile.mkdtemp()
+    write_slate(cache_dir, '2025-06-01', GAMES[:1])
+    history = CacheHistory(cache_dir)
+    assert history.dates() == ['2025-06-01']
+    assert history.index_for('2025-06-01').game_ids() == [1]
+    assert history.index_for('2025-06-01') is history.index_for('2025-06-01')
+
+    write_slate(cache_dir, '2025-06-01', GAMES[:3])
+    path = os.path.join(cache_dir, 'mlb_data_2025-06-01.json')
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    assert history.index_for('2025-06-01').game_ids() == [1, 2, 3]
+
+
+if __name__ == '__main__':
+    for name, func in list(globals().items()):
+        if name.startswith('test_') and callable(func):
+            func()
+            print(f"✓ {name}")
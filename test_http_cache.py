@@ -0,0 +1,177 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+HTTPキャッシュ層（src/http_cache.py）のテスト
+ネットワークには接続せず、固定のレスポンスを返すアダプターで CachedSession を確認する
+
+実行: python test_http_cache.py （pytestでも実行可）
+"""
+
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import requests
+from requests.adapters import BaseAdapter
+from requests.structures import CaseInsensitiveDict
+
+from src.http_cache import CachedSession, HTTPResponseCache, normalize_url
+from src.http_metrics import RequestMetrics
+from src.rate_limiter import HostRateLimiter
+
+BASE = "https://statsapi.mlb.com"
+
+
+class StubAdapter(BaseAdapter):
+    """登録した順にレスポンスを返し、受け取ったリクエストを記録するアダプター"""
+
+    def __init__(self, responses):
+        super().__init__()
+        self.responses = list(responses)
+        self.requests = []
+
+    def send(self, request, **kwargs):
+        self.requests.append(request)
+        status, body, headers = self.responses.pop(0)
+        response = requests.Response()
+        response.status_code = status
+        response._content = body if isinstance(body, bytes) else json.dumps(body).encode()
+        response.headers = CaseInsensitiveDict(headers or {})
+        response.url = request.url
+        response.request = request
+        return response
+
+    def close(self):
+        pass
+
+
+def make_session(responses):
+    """一時ディレクトリのキャッシュとスタブアダプターを使うSession"""
+    cache = HTTPResponseCache(os.path.join(tempfile.mkdtemp(), 'http_cache.sqlite3'))
+    limiter = HostRateLimiter(budgets={}, default_budget=(1000.0, 1000))
+    session = CachedSession(cache, limiter, metrics=RequestMetrics())
+    adapter = StubAdapter(responses)
+    session.mount('https://', adapter)
+    return session, adapter
+
+
+def expire(cache, url):
+    """エントリを期限切れにする"""
+    with cache._lock:
+        cache._conn.execute("UPDATE responses SET expires_at = ? WHERE url = ?", (time.time() - 1, url))
+        cache._conn.commit()
+
+
+def expires_at(cache, url):
+    with cache._lock:
+        return cache._conn.execute("SELECT expires_at FROM responses WHERE url = ?", (url,)).fetchone()[0]
+
+
+def test_policy_order():
+    """ポリシーは上から順に評価され、最初に一致したものが使われる"""
+    cache = HTTPResponseCache(os.path.join(tempfile.mkdtemp(), 'http_cache.sqlite3'))
+    cases = {
+        f"{BASE}/api/v1/schedule?date=2025-06-01&sportId=1": 'schedule',
+        f"{BASE}/api/v1.1/game/745123/feed/live": 'live_feed',
+        f"{BASE}/api/v1/game/745123/boxscore": 'game_feed',
+        f"{BASE}/api/v1/game/745123/playByPlay": 'game_feed',
+        # statSplitsは player_stats より先に評価される
+        f"{BASE}/api/v1/people/592450/stats?stats=statSplits&season=2025": 'splits',
+        f"{BASE}/api/v1/people/592450/stats?stats=season&season=2025": 'player_stats',
+        f"{BASE}/api/v1/people/592450": 'player_info',
+        f"{BASE}/api/v1/teams/147/roster?season=2025": 'roster',
+        f"{BASE}/api/v1/venues/3313": 'default',
+    }
+    for url, expected in cases.items():
+        assert cache.policy_for(normalize_url(url))[0] == expected, url
+
+
+def test_live_feed_ttl_depends_on_game_state():
+    """ライブフィードは試合中は短いTTL、終了後は game_feed のTTLで保存される"""
+    url = normalize_url(f"{BASE}/api/v1.1/game/745123/feed/live")
+    live = {'gameData': {'status': {'abstractGameState': 'Live'}}}
+    final = {'gameData': {'status': {'abstractGameState': 'Final'}}}
+    session, _ = make_session([(200, live, None), (200, final, None)])
+    cache = session.cache
+
+    session.get(url)
+    assert cache.policy_freshness().keys() == {'live_feed'}
+    assert expires_at(cache, url) - time.time() <= 60
+
+    expire(cache, url)
+    session.get(url)
+    assert cache.policy_freshness().keys() == {'game_feed'}
+    assert expires_at(cache, url) - time.time() > 3600
+
+
+def test_fresh_entry_served_from_cache():
+    """有効期限内のGETはネットワークに送らない"""
+    url = f"{BASE}/api/v1/teams/147/roster?season=2025"
+    session, adapter = make_session([(200, {'roster': [1]}, {'ETag': '"v1"'})])
+
+    first = session.get(url)
+    second = session.get(url)
+    assert first.from_cache is False
+    assert second.from_cache is True
+    assert second.json() == {'roster': [1]}
+    assert len(adapter.requests) == 1
+
+
+def test_304_revalidation_refreshes_expiry():
+    """期限切れのエントリは条件付きリクエストで再検証し、304なら有効期限を延長する"""
+    url = f"{BASE}/api/v1/teams/147/roster?season=2025"
+    session, adapter = make_session([
+        (200, {'roster': [1]}, {'ETag': '"v1"'}),
+        (304, b'', None),
+    ])
+    key = normalize_url(url)
+
+    session.get(url)
+    expire(session.cache, key)
+    assert not session.cache.get(key)['fresh']
+
+    response = session.get(url)
+    assert adapter.requests[1].headers['If-None-Match'] == '"v1"'
+    assert response.status_code == 200
+    assert response.from_cache is True
+    assert response.json() == {'roster': [1]}
+    assert session.cache.get(key)['fresh']
+    assert expires_at(session.cache, key) > time.time() + 3600
+
+
+def test_non_200_not_stored():
+    """200以外のレスポンスは保存しない"""
+    url = f"{BASE}/api/v1/people/1/stats?stats=season&season=2025"
+    session, adapter = make_session([
+        (404, {'message': 'not found'}, None),
+        (200, {'stats': []}, None),
+    ])
+
+    assert session.get(url).status_code == 404
+    assert session.cache.get(normalize_url(url)) is None
+
+    assert session.get(url).status_code == 200
+    assert len(adapter.requests) == 2
+    assert session.cache.get(normalize_url(url)) is not None
+
+
+def test_post_bypasses_cache():
+    """GET以外はキャッシュを参照も保存もしない"""
+    url = "https://discord.com/api/webhooks/1/token"
+    session, adapter = make_session([(200, {'id': 1}, None), (200, {'id': 2}, None)])
+
+    assert session.post(url, json={'content': 'a'}).json() == {'id': 1}
+    assert session.post(url, json={'content': 'a'}).json() == {'id': 2}
+    assert len(adapter.requests) == 2
+    assert session.cache.get(normalize_url(url)) is None
+
+
+if __name__ == '__main__':
+    for name, func in list(globals().items()):
+        if name.startswith('test_') and callable(func):
+            func()
+            print(f"✓ {name}")
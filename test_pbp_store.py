@@ -0,0 +1,136 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+打席結果ストア（src/pbp_store.py）のテスト
+一時ディレクトリのSQLiteに打席結果を取り込み、未取り込み試合の判定と対左右成績の集計を確認する
+
+実行: python test_pbp_store.py （pytestでも実行可）
+"""
+
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from src.mlb_api_client import MLBApiClient
+from src.pbp_store import PlateAppearance, PlayByPlayStore
+
+PITCHER = 100
+BATTER = 200
+
+
+def make_store():
+    return PlayByPlayStore(os.path.join(tempfile.mkdtemp(), 'pbp_store.sqlite3'))
+
+
+def pa(index, event, bat_side='R', pitch_hand='R', pitcher_id=PITCHER, batter_id=BATTER):
+    return PlateAppearance(index, pitcher_id, batter_id, bat_side, pitch_hand, event)
+
+
+def play(index, event, bat_side, pitcher_id=PITCHER):
+    return {'about': {'atBatIndex': index},
+            'matchup': {'pitcher': {'id': pitcher_id}, 'batter': {'id': BATTER},
+                        'batSide': {'code': bat_side}, 'pitchHand': {'code': 'R'}},
+            'result': {'event': event}}
+
+
+def test_from_play_skips_unfinished():
+    assert PlateAppearance.from_play(play(3, 'Walk', 'L')) == pa(3, 'Walk', bat_side='L')
+    assert PlateAppearance.from_play({'result': {}}) is None
+
+
+def test_add_and_missing_games():
+    store = make_store()
+    assert store.missing_games([]) == set()
+    assert store.missing_games([1, 2]) == {1, 2}
+
+    store.add_game(1, '2025-05-01', [pa(0, 'Single'), pa(1, 'Strikeout')])
+    # 打席のない試合も取り込み済みとして記録する
+    store.add_game(2, '2025-05-02', [])
+    assert store.missing_games([1, 2, 3]) == {3}
+    assert store.game_count() == 2
+
+    # 同じ試合を再度追加しても行は増えない
+    store.add_game(1, '2025-05-01', [pa(0, 'Single'), pa(1, 'Strikeout')])
+    assert store.platoon_counts(pitcher_id=PITCHER)['vs_right']['pa'] == 2
+
+
+def test_platoon_counts():
+    store = make_store()
+    store.add_game(1, '2025-05-01', [
+        pa(0, 'Single', bat_side='L'), pa(1, 'Walk', bat_side='L'), pa(2, 'Groundout', bat_side='L'),
+        pa(3, 'Home Run', bat_side='S', pitch_hand='L'), pa(4, 'Strikeout'),
+        pa(5, 'Double', pitcher_id=101),
+    ])
+    store.add_game(2, '2025-05-08', [pa(0, 'Flyout', bat_side='L'), pa(1, 'Triple')])
+
+    counts = store.platoon_counts(pitcher_id=PITCHER)
+    # 四球は打席に数えるが打数には数えない。スイッチヒッターは右として数える
+    assert counts == {'vs_left': {'pa': 4, 'ab': 3, 'h': 1}, 'vs_right': {'pa': 3, 'ab': 3, 'h': 2}}
+
+    assert store.platoon_counts(pitcher_id=PITCHER, game_pks=[2]) == {
+        'vs_left': {'pa': 1, 'ab': 1, 'h': 0}, 'vs_right': {'pa': 1, 'ab': 1, 'h': 1}}
+    assert store.platoon_counts(pitcher_id=PITCHER, since='2025-05-05')['vs_left']['pa'] == 1
+    assert store.platoon_counts(pitcher_id=PITCHER, game_pks=[])['vs_left']['pa'] == 0
+
+    # 打者は投手の利き腕で分ける
+    assert store.platoon_counts(batter_id=BATTER)['vs_left'] == {'pa': 1, 'ab': 1, 'h': 1}
+
+
+def test_platoon_counts_requires_one_player():
+    store = make_store()
+    for kwargs in ({}, {'pitcher_id': 1, 'batter_id': 2}):
+        try:
+            store.platoon_counts(**kwargs)
+        except ValueError:
+            continue
+        raise AssertionError(f"platoon_counts accepted {kwargs}")
+
+
+class StoreClient(MLBApiClient):
+    """一時ストアを使い、ゲームログとPlay-by-playを固定の内容で返すクライアント"""
+
+    def __init__(self, store, game_log):
+        super().__init__()
+        self._store = store
+        self.game_log = game_log
+        self.fetched_games = []
+
+    @property
+    def pbp_store(self):
+        return self._store
+
+    def _make_request(self, endpoint, params=None):
+        if 'gameLog' in endpoint:
+            return self.game_log
+        game_pk = int(endpoint.split('/')[1])
+        self.fetched_games.append(game_pk)
+        return {'allPlays': [play(0, 'Single', 'L'), play(1, 'Groundout', 'R')]}
+
+
+def test_platoon_splits_use_most_recent_games():
+    """ゲームログは古い順なので、新しい順に並べ直して直近N試合を集計する"""
+    splits = [{'date': f"2025-04-{day:02d}", 'game': {'gamePk': day}} for day in range(1, 13)]
+    client = StoreClient(make_store(), {'stats': [{'splits': splits}]})
+
+    counts = client.get_platoon_splits(pitcher_id=PITCHER, season=2025, games=3)
+    assert sorted(client.fetched_games) == [10, 11, 12]
+    assert counts == {'vs_left': {'pa': 3, 'ab': 3, 'h': 3}, 'vs_right': {'pa': 3, 'ab': 3, 'h': 0}}
+
+    # 取り込み済みの試合は取り直さない
+    client.get_platoon_splits(pitcher_id=PITCHER, season=2025, games=3)
+    assert len(client.fetched_games) == 3
+
+
+def test_platoon_splits_without_game_log():
+    """ゲームログを取得できない場合はNone（表示側で 'N/A'）"""
+    client = StoreClient(make_store(), None)
+    assert client.get_platoon_splits(pitcher_id=PITCHER) is None
+
+
+if __name__ == '__main__':
+    for name, func in list(globals().items()):
+        if name.startswith('test_') and callable(func):
+            func()
+            print(f"✓ {name}")
@@ -0,0 +1,211 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+レート制限・リトライ制御（src/rate_limiter.py）のテスト
+時計は差し替えた仮想時計、送信は固定のレスポンスを返すアダプターで行うため実際には待機しない
+
+実行: python test_rate_limiter.py （pytestでも実行可）
+"""
+
+import email.utils
+import os
+import sys
+from contextlib import contextmanager
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import requests
+from requests.adapters import BaseAdapter
+from requests.structures import CaseInsensitiveDict
+
+import src.rate_limiter as rate_limiter
+from src.rate_limiter import (HostRateLimiter, RateLimitedSession, RetryPolicy, TokenBucket,
+                              parse_retry_after)
+
+NOW = 1_750_000_000.0
+
+
+class FakeClock:
+    """time モジュールの代わりに使う仮想時計（sleepは時刻を進めて記録するだけ）"""
+
+    def __init__(self, now=NOW):
+        self.now = now
+        self.sleeps = []
+
+    def monotonic(self):
+        return self.now
+
+    def time(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@contextmanager
+def fake_clock():
+    clock = FakeClock()
+    original = rate_limiter.time
+    rate_limiter.time = clock
+    try:
+        yield clock
+    finally:
+        rate_limiter.time = original
+
+
+class StubAdapter(BaseAdapter):
+    """登録した順にステータスコード（とヘッダー）を返すアダプター"""
+
+    def __init__(self, responses):
+        super().__init__()
+        self.responses = list(responses)
+        self.calls = 0
+
+    def send(self, request, **kwargs):
+        self.calls += 1
+        status, headers = self.responses.pop(0)
+        response = requests.Response()
+        response.status_code = status
+        response._content = b'{}'
+        response.headers = CaseInsensitiveDict(headers or {})
+        response.url = request.url
+        response.request = request
+        return response
+
+    def close(self):
+        pass
+
+
+def make_session(responses, retry_policy=None):
+    limiter = HostRateLimiter(budgets={}, default_budget=(1000.0, 1000))
+    session = RateLimitedSession(limiter=limiter, retry_policy=retry_policy or RetryPolicy(base_delay=0.5))
+    adapter = StubAdapter(responses)
+    session.mount('https://', adapter)
+    return session, adapter
+
+
+def response_with(headers):
+    response = requests.Response()
+    response.headers = CaseInsensitiveDict(headers)
+    return response
+
+
+def test_token_bucket_wait():
+    """バースト分は待たずに発行し、超えた分は rate で割った時間だけ待つ"""
+    with fake_clock() as clock:
+        bucket = TokenBucket(rate=2.0, capacity=3)
+        assert [bucket.reserve() for _ in range(3)] == [0.0, 0.0, 0.0]
+        # 4件目はトークンが -1 → 0.5秒、5件目は -2 → 1.0秒
+        assert bucket.reserve() == 0.5
+        assert bucket.reserve() == 1.0
+
+        # 1秒経つと2トークン回復（-2 → 0）し、次は -1 → 0.5秒
+        clock.now += 1.0
+        assert bucket.reserve() == 0.5
+
+        # 十分に時間が経ってもトークンは capacity までしか貯まらない
+        clock.now += 100.0
+        assert [bucket.reserve() for _ in range(3)] == [0.0, 0.0, 0.0]
+        assert bucket.reserve() == 0.5
+
+
+def test_token_bucket_block_for():
+    """block_forの間はトークンが残っていても待たされる"""
+    with fake_clock() as clock:
+        bucket = TokenBucket(rate=10.0, capacity=10)
+        bucket.block_for(5.0)
+        assert bucket.reserve() == 5.0
+        clock.now += 2.0
+        assert bucket.reserve() == 3.0
+        clock.now += 3.0
+        assert bucket.reserve() == 0.0
+
+
+def test_host_limiter_budgets_per_host():
+    """ホストごとに別のバケットを持ち、acquireは必要な分だけsleepする"""
+    with fake_clock() as clock:
+        limiter = HostRateLimiter(budgets={'slow.example': (1.0, 1)}, default_budget=(100.0, 100))
+        limiter.acquire('slow.example')
+        limiter.acquire('fast.example')
+        limiter.acquire('slow.example')
+        assert clock.sleeps == [1.0]
+
+
+def test_parse_retry_after_seconds():
+    assert parse_retry_after(response_with({'Retry-After': '7'})) == 7.0
+    assert parse_retry_after(response_with({'Retry-After': '-3'})) == 0.0
+    # DiscordのX-RateLimit-Reset-Afterは小数秒
+    assert parse_retry_after(response_with({'X-RateLimit-Reset-After': '1.25'})) == 1.25
+    assert parse_retry_after(response_with({})) is None
+
+
+def test_parse_retry_after_http_date():
+    with fake_clock():
+        later = email.utils.formatdate(NOW + 30, usegmt=True)
+        assert parse_retry_after(response_with({'Retry-After': later})) == 30.0
+        earlier = email.utils.formatdate(NOW - 30, usegmt=True)
+        assert parse_retry_after(response_with({'Retry-After': earlier})) == 0.0
+        # 解釈できない値は次のヘッダーを見る
+        assert parse_retry_after(response_with({'Retry-After': 'soon',
+                                                'X-RateLimit-Reset-After': '2'})) == 2.0
+
+
+def test_should_retry_methods():
+    """GET/HEADは429・5xxを再試行し、それ以外のメソッドは429のみ"""
+    policy = RetryPolicy()
+    for status in (429, 500, 502, 503, 504):
+        assert policy.should_retry('GET', status)
+        assert policy.should_retry('HEAD', status)
+    assert policy.should_retry('POST', 429)
+    assert not policy.should_retry('POST', 503)
+    assert not policy.should_retry('GET', 404)
+
+
+def test_session_retries_get_with_retry_after():
+    """GETの503はRetry-Afterの秒数だけ待って再試行する"""
+    with fake_clock() as clock:
+        session, adapter = make_session([(503, {'Retry-After': '2'}), (200, None)])
+        response = session.get('https://statsapi.mlb.com/api/v1/teams')
+        assert response.status_code == 200
+        assert adapter.calls == 2
+        assert clock.sleeps == [2.0]
+
+
+def test_session_does_not_retry_post_on_5xx():
+    """POSTの5xxは処理済みの可能性があるので再試行しない"""
+    with fake_clock() as clock:
+        session, adapter = make_session([(503, {'Retry-After': '2'}), (200, None)])
+        response = session.post('https://discord.com/api/webhooks/1/token', json={})
+        assert response.status_code == 503
+        assert adapter.calls == 1
+        assert clock.sleeps == []
+
+
+def test_session_retries_post_on_429():
+    """POSTでも429は再試行し、ホストへの発行を止める"""
+    with fake_clock() as clock:
+        session, adapter = make_session([(429, {'Retry-After': '3'}), (200, None)])
+        response = session.post('https://discord.com/api/webhooks/1/token', json={})
+        assert response.status_code == 200
+        assert adapter.calls == 2
+        # 1回目は明示のsleep、2回目の発行はpenalizeしたバケットの残り時間（0秒）
+        assert clock.sleeps == [3.0]
+        assert session.limiter._bucket('discord.com')._blocked_until == NOW + 3.0
+
+
+def test_session_gives_up_after_max_retries():
+    with fake_clock() as clock:
+        session, adapter = make_session([(500, {'Retry-After': '1'})] * 3,
+                                        retry_policy=RetryPolicy(max_retries=2))
+        response = session.get('https://statsapi.mlb.com/api/v1/teams')
+        assert response.status_code == 500
+        assert adapter.calls == 3
+        assert clock.sleeps == [1.0, 1.0]
+
+
+if __name__ == '__main__':
+    for name, func in list(globals().items()):
+        if name.startswith('test_') and callable(func):
+            func()
+            print(f"✓ {name}")
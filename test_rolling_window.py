@@ -0,0 +1,149 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+直近N試合の集計エンジン（src/rolling_window.py）のテスト
+累積和の差による直近N試合の合計を、1試合ずつ足し合わせる素朴なループと比べる
+
+実行: python test_rolling_window.py （pytestでも実行可）
+"""
+
+import os
+import random
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+
+from src.mlb_api_client import MLBApiClient
+from src.rolling_window import RollingWindow, game_log_window
+from src.stat_store import SeasonStatStore, date_key
+
+COLUMNS = {'ab': 'atBats', 'h': 'hits', 'hr': 'homeRuns', 'bb': 'baseOnBalls'}
+
+
+def make_games(seed=7, players=(11, 22, 33), max_games=25):
+    """選手ごとに日付の異なる試合（22番はダブルヘッダーあり）をシャッフルして返す"""
+    rng = random.Random(seed)
+    games = []
+    for player_id in players:
+        for day in range(1, rng.randint(3, max_games) + 1):
+            for _ in range(2 if player_id == 22 and day % 5 == 0 else 1):
+                games.append({'player_id': player_id, 'date': f"2025-05-{day:02d}",
+                              **{key: rng.randint(0, 5) for key in COLUMNS.values()}})
+    rng.shuffle(games)
+    return games
+
+
+def brute_force(games, player_id, n, as_of=None):
+    """直近n試合の合計を1試合ずつ足して求める（as_ofの日付より前の試合のみ）"""
+    own = [g for g in games if g['player_id'] == player_id
+           and (as_of is None or date_key(g['date']) < date_key(as_of))]
+    # 同じ日付の試合は渡された順（安定ソート）
+    own.sort(key=lambda g: date_key(g['date']))
+    recent = own[-n:] if n else []
+    totals = {name: sum(g[key] for g in recent) for name, key in COLUMNS.items()}
+    totals['games'] = len(recent)
+    return totals
+
+
+def window_for(games):
+    return RollingWindow.from_records('hitting', games, key='player_id', columns=COLUMNS)
+
+
+def test_last_n_matches_loop():
+    games = make_games()
+    window = window_for(games)
+    for player_id in (11, 22, 33):
+        for n in (1, 3, 5, 10, 15, 100):
+            cols = window.totals([player_id], n)
+            expected = brute_force(games, player_id, n)
+            assert {name: int(cols[name][0]) for name in expected} == expected, (player_id, n)
+
+
+def test_as_of_excludes_that_day_and_later():
+    games = make_games()
+    window = window_for(games)
+    for as_of in ('2025-05-01', '2025-05-06', '2025-05-10', '2025-05-11', '2025-06-01'):
+        for n in (1, 5, 10):
+            cols = window.totals([11, 22, 33], n, as_of=as_of)
+            for i, player_id in enumerate((11, 22, 33)):
+                expected = brute_force(games, player_id, n, as_of)
+                assert {name: int(cols[name][i]) for name in expected} == expected, (player_id, n, as_of)
+    assert window.games(11, as_of='2025-05-01') == 0
+    assert window.games(11, as_of='2025-05-03') == 2
+
+
+def test_fewer_games_than_n():
+    games = [{'player_id': 5, 'date': '2025-04-01', 'atBats': 4, 'hits': 2},
+             {'player_id': 5, 'date': '2025-04-02', 'atBats': 3, 'hits': 1, 'homeRuns': 1}]
+    window = window_for(games)
+    cols = window.totals([5], 10)
+    assert (cols['games'][0], cols['ab'][0], cols['h'][0], cols['hr'][0]) == (2, 7, 3, 1)
+    assert window.games(5) == 2
+
+
+def test_unknown_entity_is_zero():
+    window = window_for(make_games())
+    cols = window.totals([999, 11], 5)
+    assert all(cols[name][0] == 0 for name in ('ab', 'h', 'hr', 'bb', 'games'))
+    assert cols['games'][1] == 5
+    assert 999 not in window and 11 in window
+
+    rates = window.rate(999, 5)
+    assert rates['games'] == 0 and rates['ops'] == 0.0
+
+    empty = window_for([])
+    assert empty.totals([1], 5)['games'].tolist() == [0]
+
+
+def test_rates_match_totals():
+    games = make_games()
+    window = window_for(games)
+    expected = brute_force(games, 22, 7)
+    rates = window.rate(22, 7)
+    assert np.isclose(rates['avg'], expected['h'] / expected['ab'])
+
+
+class LoggingClient(MLBApiClient):
+    """ゲームログのリクエストを記録し、固定のsplitsを返すクライアント"""
+
+    def __init__(self, store):
+        super().__init__()
+        self.stat_store = store
+        self.requested = []
+
+    def _make_request(self, endpoint, params=None):
+        self.requested.append(endpoint)
+        player_id = int(endpoint.split('/')[1])
+        splits = [{'date': f"2025-05-{day:02d}", 'game': {'gamePk': player_id * 100 + day},
+                   'stat': {'atBats': 4, 'hits': day % 3}} for day in range(1, 8)]
+        return {'stats': [{'splits': splits}]}
+
+
+def test_recent_form_fetches_only_missing_players():
+    """保存済みの選手は取り直さず、ストアも書き換えない（累積和も作り直さない）"""
+    store = SeasonStatStore(tempfile.mkdtemp())
+    client = LoggingClient(store)
+
+    window = client.get_recent_form([1, 2], 2025, 'hitting')
+    assert len(client.requested) == 2
+    assert window.games(1) == window.games(2) == 7
+
+    again = client.get_recent_form([2, 1], 2025, 'hitting')
+    assert len(client.requested) == 2
+    assert again is window
+
+    grown = client.get_recent_form([1, 3], 2025, 'hitting')
+    assert len(client.requested) == 3
+    assert grown is not window and grown.games(3) == 7
+    assert grown is game_log_window(2025, 'hitting', store)
+    assert store.game_log_rows(2025, 'hitting')['player_id'].tolist() == [1] * 7 + [2] * 7 + [3] * 7
+
+
+if __name__ == '__main__':
+    for name, func in list(globals().items()):
+        if name.startswith('test_') and callable(func):
+            func()
+            print(f"✓ {name}")
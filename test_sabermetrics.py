@@ -0,0 +1,73 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+セイバーメトリクス計算エンジン（src/sabermetrics.py）のテスト
+xFIPのリーグHR/FBと投手のフライ数が同じ基準で組み合わされることを確認する
+
+実行: python test_sabermetrics.py （pytestでも実行可）
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+
+from src.sabermetrics import (FB_SHARE, FIP_CONSTANT, LEAGUE_HR_FB, StatColumns, estimated_fly_balls,
+                              pitching_rates, scalar)
+from src.season_constants import SeasonConstants, compute_constants
+
+PITCHER = {
+    'inningsPitched': '60.0', 'battersFaced': 250, 'strikeOuts': 60, 'baseOnBalls': 20,
+    'hitByPitch': 2, 'homeRuns': 8, 'airOuts': 52, 'groundOuts': 60, 'earnedRuns': 25, 'hits': 55,
+}
+
+
+def test_fallback_uses_fb_share_estimate():
+    """リーグHR/FBが既定値のときはairOutsがあっても打球数×FB_SHAREでフライ数を推定する"""
+    cols = StatColumns.pitching([PITCHER])
+    balls_in_play = 250 - 60 - 20 - 2
+    assert np.isclose(estimated_fly_balls(cols, air_outs=False)[0], balls_in_play * FB_SHARE)
+    assert estimated_fly_balls(cols)[0] == 52 + 8
+
+    rates = scalar(pitching_rates(cols))
+    expected = (13 * balls_in_play * FB_SHARE * LEAGUE_HR_FB + 3 * 22 - 2 * 60) / 60 + FIP_CONSTANT
+    assert np.isclose(rates['xfip'], expected)
+
+
+def test_derived_hr_fb_uses_air_outs():
+    """リーグから求めたHR/FBを渡すとフライ数はフライアウト+本塁打で数える"""
+    cols = StatColumns.pitching([PITCHER])
+    rates = scalar(pitching_rates(cols, fip_constant=3.0, lg_hr_fb=0.12))
+    expected = (13 * (52 + 8) * 0.12 + 3 * 22 - 2 * 60) / 60 + 3.0
+    assert np.isclose(rates['xfip'], expected)
+
+
+def test_league_xfip_equals_league_fip():
+    """compute_constantsのHR/FBは同じ分母なので、リーグ合計のxFIPはFIP（= リーグERA）と一致する"""
+    pitchers = [PITCHER, {**PITCHER, 'homeRuns': 14, 'airOuts': 70, 'earnedRuns': 31},
+                {**PITCHER, 'inningsPitched': '45.1', 'homeRuns': 3, 'airOuts': 40, 'earnedRuns': 15}]
+    hitting = StatColumns.batting([{
+        'gamesPlayed': 10, 'atBats': 600, 'hits': 150, 'doubles': 30, 'triples': 3, 'homeRuns': 25,
+        'runs': 80, 'baseOnBalls': 60, 'intentionalWalks': 5, 'hitByPitch': 6, 'sacFlies': 5,
+    }])
+    pitching = StatColumns.pitching(pitchers)
+    constants = compute_constants(2025, hitting, pitching)
+
+    league = scalar(pitching_rates(pitching.total(), **constants.pitching_kwargs()))
+    assert np.isclose(league['xfip'], league['fip'])
+    assert np.isclose(league['fip'], constants.lg_era)
+
+
+def test_fallback_constants_have_no_hr_fb():
+    """FanGraphs・既定の定数はHR/FBを持たず、pitching_ratesは既定の推定に戻る"""
+    assert SeasonConstants.fallback(2025).lg_hr_fb is None
+    assert SeasonConstants(season=2030).pitching_kwargs()['lg_hr_fb'] is None
+
+
+if __name__ == '__main__':
+    for name, func in list(globals().items()):
+        if name.startswith('test_') and callable(func):
+            func()
+            print(f"✓ {name}")
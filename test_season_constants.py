@@ -0,0 +1,118 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+シーズン定数テーブル（src/season_constants.py）のテスト
+小さな架空リーグの合計から求めた定数が、FanGraphsの手順の性質を満たすことを確認する
+
+実行: python test_season_constants.py （pytestでも実行可）
+"""
+
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+
+from src.sabermetrics import StatColumns, pitching_rates, scalar, woba
+from src.season_constants import SeasonConstantsTable, compute_constants
+
+# 3チームの架空リーグ
+HITTING = [
+    {'gamesPlayed': 20, 'atBats': 680, 'hits': 170, 'doubles': 34, 'triples': 3, 'homeRuns': 22,
+     'runs': 90, 'baseOnBalls': 65, 'intentionalWalks': 4, 'hitByPitch': 8, 'sacFlies': 6},
+    {'gamesPlayed': 20, 'atBats': 665, 'hits': 160, 'doubles': 30, 'triples': 5, 'homeRuns': 18,
+     'runs': 78, 'baseOnBalls': 58, 'intentionalWalks': 2, 'hitByPitch': 5, 'sacFlies': 4},
+    {'gamesPlayed': 20, 'atBats': 700, 'hits': 185, 'doubles': 40, 'triples': 2, 'homeRuns': 27,
+     'runs': 101, 'baseOnBalls': 70, 'intentionalWalks': 6, 'hitByPitch': 9, 'sacFlies': 7},
+]
+PITCHING = [
+    {'inningsPitched': '178.1', 'battersFaced': 760, 'hits': 175, 'earnedRuns': 82, 'homeRuns': 23,
+     'baseOnBalls': 63, 'hitByPitch': 7, 'strikeOuts': 170, 'airOuts': 160, 'groundOuts': 190},
+    {'inningsPitched': '180.0', 'battersFaced': 770, 'hits': 168, 'earnedRuns': 76, 'homeRuns': 20,
+     'baseOnBalls': 60, 'hitByPitch': 8, 'strikeOuts': 182, 'airOuts': 170, 'groundOuts': 175},
+    {'inningsPitched': '179.2', 'battersFaced': 775, 'hits': 172, 'earnedRuns': 98, 'homeRuns': 24,
+     'baseOnBalls': 70, 'hitByPitch': 7, 'strikeOuts': 165, 'airOuts': 165, 'groundOuts': 185},
+]
+
+
+def league():
+    return StatColumns.batting(HITTING), StatColumns.pitching(PITCHING)
+
+
+def test_league_woba_equals_league_obp():
+    """wOBA係数はリーグwOBAがリーグOBP（故意四球を除く）と一致するようスケールされる"""
+    hitting, pitching = league()
+    constants = compute_constants(2025, hitting, pitching)
+    totals = hitting.total()
+
+    lg_woba = float(woba(totals, constants.woba_weights)[0])
+    h, bb, ibb, hbp, ab, sf = (float(totals[n][0]) for n in ('h', 'bb', 'ibb', 'hbp', 'ab', 'sf'))
+    lg_obp = (h + bb - ibb + hbp) / (ab + bb - ibb + hbp + sf)
+    assert np.isclose(lg_woba, lg_obp)
+    assert np.isclose(constants.lg_woba, lg_obp)
+
+
+def test_weights_are_ordered():
+    """得点価値の順（四球 < 死球 < 単打 < 二塁打 < 三塁打 < 本塁打）"""
+    hitting, pitching = league()
+    w = compute_constants(2025, hitting, pitching).woba_weights
+    assert w['wBB'] < w['wHBP'] < w['w1B'] < w['w2B'] < w['w3B'] < w['wHR']
+
+
+def test_league_fip_equals_league_era():
+    """cFIPはリーグ合計のFIPがリーグERAと一致する定数"""
+    hitting, pitching = league()
+    constants = compute_constants(2025, hitting, pitching)
+    rates = scalar(pitching_rates(pitching.total(), **constants.pitching_kwargs()))
+    assert np.isclose(rates['fip'], constants.lg_era)
+    assert np.isclose(rates['era'], constants.lg_era)
+    assert constants.source == 'league'
+    assert constants.team_games == 60
+
+
+def test_no_totals_raises():
+    empty = StatColumns.batting([{}]), StatColumns.pitching([{}])
+    try:
+        compute_constants(2025, *empty)
+    except ValueError:
+        return
+    raise AssertionError("compute_constants accepted empty totals")
+
+
+class FakeClient:
+    """get_league_team_stats だけを持つクライアント"""
+
+    def __init__(self, fail=False):
+        self.fail = fail
+        self.calls = 0
+
+    def get_league_team_stats(self, season, group):
+        self.calls += 1
+        if self.fail:
+            raise ConnectionError("offline")
+        return HITTING if group == 'hitting' else PITCHING
+
+
+def test_table_memoizes_and_falls_back():
+    path = os.path.join(tempfile.mkdtemp(), 'season_constants.json')
+    client = FakeClient()
+    table = SeasonConstantsTable(client=client, path=path)
+    first = table.get(2025)
+    assert first.source == 'league'
+    assert table.get(2025) is first
+    assert client.calls == 2
+    # 保存した値は次のプロセスでも使われる
+    assert SeasonConstantsTable(client=FakeClient(fail=True), path=path).get(2025).cfip == first.cfip
+
+    offline = SeasonConstantsTable(client=FakeClient(fail=True), path=os.path.join(tempfile.mkdtemp(), 'c.json'))
+    assert offline.get(2025).source == 'fanGraphs'
+    assert offline.get(2031).source == 'default'
+
+
+if __name__ == '__main__':
+    for name, func in list(globals().items()):
+        if name.startswith('test_') and callable(func):
+            func()
+            print(f"✓ {name}")
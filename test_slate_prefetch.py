@@ -0,0 +1,171 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+スレート単位の事前取得（src/slate_prefetch.py）のテスト
+スナップショットの重複取得のまとめ・エラーの伝播と、イベントループの有無による事前取得の動作を確認する
+
+実行: python test_slate_prefetch.py （pytestでも実行可）
+"""
+
+import asyncio
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from src.mlb_api_client import MLBApiClient
+from src.slate_prefetch import SlatePlan, SlatePrefetcher, SlateSnapshot, SnapshotProxy
+
+
+def test_fetch_memoizes():
+    snapshot = SlateSnapshot()
+    calls = []
+    assert snapshot.fetch('a', lambda: calls.append(1) or 'value') == 'value'
+    assert snapshot.fetch('a', lambda: calls.append(1) or 'other') == 'value'
+    assert calls == [1]
+    assert 'a' in snapshot and len(snapshot) == 1
+    assert (snapshot.hits, snapshot.misses) == (1, 1)
+
+
+def test_concurrent_fetch_loads_once():
+    """取得中のキーを同時に要求したスレッドは、1回の取得の完了を待って同じ結果を受け取る"""
+    snapshot = SlateSnapshot()
+    started = threading.Event()
+    calls = []
+
+    def loader():
+        calls.append(threading.current_thread().name)
+        started.set()
+        time.sleep(0.1)
+        return {'team': 147}
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        first = executor.submit(snapshot.fetch, 'team', loader)
+        started.wait()
+        others = [executor.submit(snapshot.fetch, 'team', loader) for _ in range(7)]
+        results = [first.result()] + [f.result() for f in others]
+
+    assert len(calls) == 1
+    assert all(result is results[0] for result in results)
+    assert (snapshot.hits, snapshot.misses) == (7, 1)
+
+
+def test_fetch_error_propagates_and_is_not_stored():
+    """取得の失敗は待っていた呼び出しにも伝わり、保存されないので次の呼び出しで取り直す"""
+    snapshot = SlateSnapshot()
+    started = threading.Event()
+    release = threading.Event()
+
+    def failing():
+        started.set()
+        release.wait()
+        raise ConnectionError("offline")
+
+    def fetch():
+        try:
+            snapshot.fetch('key', failing)
+        except ConnectionError as e:
+            return e
+        return None
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        owner = executor.submit(fetch)
+        started.wait()
+        waiter = executor.submit(fetch)
+        time.sleep(0.05)
+        release.set()
+        errors = [owner.result(), waiter.result()]
+
+    assert all(isinstance(e, ConnectionError) for e in errors)
+    assert 'key' not in snapshot
+    assert snapshot.fetch('key', lambda: 'ok') == 'ok'
+
+
+def test_proxy_memoizes_selected_methods():
+    class Target:
+        def __init__(self):
+            self.calls = 0
+            self.name = 'target'
+
+        def get(self, x, y=0):
+            self.calls += 1
+            return x + y
+
+        def other(self):
+            self.calls += 1
+
+    target = Target()
+    proxy = SnapshotProxy(target, SlateSnapshot(), 'ns', ['get'])
+    assert proxy.get(1, y=2) == proxy.get(1, y=2) == 3
+    assert proxy.get(2) == 2
+    proxy.other()
+    proxy.other()
+    assert target.calls == 4
+    assert proxy.name == 'target'
+
+
+def test_plan_from_schedule_dedupes():
+    def game(pk, away, home, away_pitcher=None):
+        teams = {'away': {'team': {'id': away}}, 'home': {'team': {'id': home}}}
+        if away_pitcher:
+            teams['away']['probablePitcher'] = {'id': away_pitcher}
+        return {'gamePk': pk, 'teams': teams}
+
+    schedule = {'dates': [{'games': [game(1, 147, 111, 50), game(2, 147, 111, 51), game(3, 110, 141, 50)]}]}
+    plan = SlatePlan.from_schedule(schedule)
+    assert plan.game_pks == (1, 2, 3)
+    assert plan.team_ids == (147, 111, 110, 141)
+    assert plan.pitcher_ids == (50, 51)
+
+
+def make_tasks(snapshot, calls):
+    def load(key):
+        calls.append(key)
+        if key == 'bad':
+            raise ValueError(key)
+        return key.upper()
+
+    def task(key):
+        return snapshot.fetch(key, lambda: load(key))
+
+    return [(task, ('a',)), (task, ('b',)), (task, ('a',)), (task, ('bad',))]
+
+
+def test_prefetch_without_event_loop():
+    snapshot, calls = SlateSnapshot(), []
+    failures = SlatePrefetcher(max_concurrency=4).prefetch(MLBApiClient(), make_tasks(snapshot, calls))
+    assert failures == 1
+    assert sorted(calls) == ['a', 'b', 'bad']
+    assert snapshot.fetch('a', lambda: None) == 'A'
+    assert SlatePrefetcher().prefetch(MLBApiClient(), []) == 0
+
+
+def test_prefetch_inside_running_loop():
+    """非同期のホストから同期的に呼んでも RuntimeError にならず、完了まで待つ"""
+    snapshot, calls = SlateSnapshot(), []
+
+    async def host():
+        return SlatePrefetcher(max_concurrency=4).prefetch(MLBApiClient(), make_tasks(snapshot, calls))
+
+    assert asyncio.run(host()) == 1
+    assert 'b' in snapshot
+
+
+def test_prefetch_async():
+    snapshot, calls = SlateSnapshot(), []
+
+    async def host():
+        return await SlatePrefetcher(max_concurrency=4).prefetch_async(MLBApiClient(), make_tasks(snapshot, calls))
+
+    assert asyncio.run(host()) == 1
+    assert 'a' in snapshot and 'b' in snapshot
+
+
+if __name__ == '__main__':
+    for name, func in list(globals().items()):
+        if name.startswith('test_') and callable(func):
+            func()
+            print(f"✓ {name}")
@@ -0,0 +1,60 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+投手の成績ライン（src/stat_line.py）のテスト
+投球回表記とアウト数の変換、PitchingLineの合算を確認する
+
+実行: python test_stat_line.py （pytestでも実行可）
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from src.stat_line import PitchingLine, format_innings, parse_innings, parse_outs
+
+
+def test_parse_outs():
+    assert parse_outs("45.2") == 137
+    assert parse_outs("45.1") == 136
+    assert parse_outs("45.0") == 135
+    assert parse_outs("45") == 135
+    assert parse_outs(" 0.2 ") == 2
+    assert parse_outs(".1") == 1
+    # floatの45.2も文字列と同じ（45.2 * 3 の丸めは使わない）
+    assert parse_outs(45.2) == 137
+    assert parse_outs(45) == 135
+
+
+def test_parse_outs_malformed():
+    """投球回として解釈できない値は0アウト"""
+    for value in (None, '', '-', '--', 'abc', '45.x', '4a.1', '45.5', '45.3', []):
+        assert parse_outs(value) == 0, value
+
+
+def test_format_round_trip():
+    for outs in range(0, 400):
+        assert parse_outs(format_innings(outs)) == outs
+    assert format_innings(137) == '45.2'
+    assert abs(parse_innings('45.2') - 45 - 2 / 3) < 1e-12
+
+
+def test_pitching_line_total():
+    """合算はアウト数・件数の整数の足し算"""
+    lines = [PitchingLine.from_stat({'inningsPitched': ip, 'strikeOuts': 1}) for ip in ('0.1',) * 10]
+    total = PitchingLine.total(lines)
+    assert total.outs == 10
+    assert total.ip == '3.1'
+    assert total.k == 10
+
+    line = PitchingLine.from_stat({'inningsPitched': '6.2', 'homeRuns': '2', 'baseOnBalls': 'x'})
+    assert (line.outs, line.hr, line.bb) == (20, 2, 0)
+    assert line + PitchingLine(outs=1) == PitchingLine(outs=21, hr=2)
+
+
+if __name__ == '__main__':
+    for name, func in list(globals().items()):
+        if name.startswith('test_') and callable(func):
+            func()
+            print(f"✓ {name}")
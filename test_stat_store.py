@@ -0,0 +1,122 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+列指向のシーズン成績ストア（src/stat_store.py）のテスト
+一時ディレクトリのストアに書き込み、選手単位の置き換えと並び順を確認する
+
+実行: python test_stat_store.py （pytestでも実行可）
+"""
+
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+
+from src.stat_store import SeasonStatStore
+
+
+def make_store():
+    return SeasonStatStore(tempfile.mkdtemp())
+
+
+def split(date, game_pk, **stat):
+    return {'date': date, 'game': {'gamePk': game_pk}, 'team': {'id': 147}, 'stat': stat}
+
+
+def test_write_season_upsert_replaces_only_given_players():
+    store = make_store()
+    store.write_season(2025, 'hitting', {30: {'hits': 3}, 10: {'hits': 1}, 20: {'hits': 2}})
+    store.write_season(2025, 'hitting', {20: {'hits': 22}, 5: {'hits': 5}}, team_ids={5: 147})
+
+    rows = store.season_rows(2025, 'hitting')
+    assert rows['player_id'].tolist() == [5, 10, 20, 30]
+    assert rows['h'].tolist() == [5, 1, 22, 3]
+    assert rows['team_id'].tolist() == [147, 0, 0, 0]
+
+
+def test_season_columns_order_and_missing():
+    store = make_store()
+    store.write_season(2025, 'pitching', {7: {'inningsPitched': '45.2', 'strikeOuts': 50}, 3: None})
+
+    cols = store.season_columns(2025, 'pitching', [7, 99, 3])
+    assert cols.ids.tolist() == [7, 99, 3]
+    assert cols['outs'].tolist() == [137, 0, 0]
+    assert cols['k'].tolist() == [50, 0, 0]
+    # 統計が空の選手も取得済みとして記録される
+    assert store.missing(2025, 'pitching', [3, 7, 99]) == [99]
+    assert store.missing(2025, 'pitching', [3, 7], max_age=-1) == [3, 7]
+
+
+def test_write_game_logs_replaces_players_and_keeps_order():
+    store = make_store()
+    store.write_game_logs(2025, 'hitting', {
+        2: [split('2025-04-03', 103, hits=1), split('2025-04-01', 101, hits=2)],
+        1: [split('2025-04-02', 102, hits=3)],
+    })
+    # 選手2のログを取り直す（ダブルヘッダーを含む）。選手1の行はそのまま
+    store.write_game_logs(2025, 'hitting', {
+        2: [split('2025-04-05', 106, hits=4), split('2025-04-05', 105, hits=0),
+            split('2025-04-03', 103, hits=1)],
+        3: [],
+    })
+
+    rows = store.game_log_rows(2025, 'hitting')
+    keys = list(zip(rows['player_id'].tolist(), rows['date'].tolist(), rows['game_pk'].tolist()))
+    assert keys == sorted(keys)
+    assert keys == [(1, 20250402, 102), (2, 20250403, 103), (2, 20250405, 105), (2, 20250405, 106)]
+    assert store.game_log_rows(2025, 'hitting', player_id=2)['h'].tolist() == [1, 0, 4]
+    assert len(store.game_log_rows(2025, 'hitting', player_id=3)) == 0
+
+
+def test_reads_are_memory_mapped_until_rewritten():
+    store = make_store()
+    store.write_season(2025, 'hitting', {1: {'hits': 1}})
+    first = store.season_rows(2025, 'hitting')
+    assert isinstance(first, np.memmap)
+    assert store.season_rows(2025, 'hitting') is first
+
+    store.write_season(2025, 'hitting', {2: {'hits': 2}})
+    assert store.season_rows(2025, 'hitting')['player_id'].tolist() == [1, 2]
+    # 他のシーズン・グループは空
+    assert len(store.season_rows(2024, 'hitting')) == 0
+    assert len(store.game_log_rows(2025, 'pitching')) == 0
+
+
+def test_upsert_while_mapped():
+    """メモリマップで読んでいるファイルに2回続けて書き込む（マップを手放してから置き換える）"""
+    store = make_store()
+    store.write_game_logs(2025, 'hitting', {1: [split('2025-04-01', 101, hits=1)]})
+    mapped = store.game_log_rows(2025, 'hitting')
+    assert isinstance(mapped, np.memmap)
+
+    store.write_game_logs(2025, 'hitting', {2: [split('2025-04-02', 102, hits=2)]})
+    store.write_game_logs(2025, 'hitting', {1: [split('2025-04-03', 103, hits=3)]})
+
+    rows = store.game_log_rows(2025, 'hitting')
+    assert list(zip(rows['player_id'].tolist(), rows['h'].tolist())) == [(1, 3), (2, 2)]
+    # 先に読んだビューは古い内容のまま読める
+    assert mapped['h'].tolist() == [1]
+    # 一時ファイルは残らない
+    assert sorted(p.name for p in store.root.iterdir()) == ['2025_hitting_games.npy']
+
+
+def test_concurrent_writers_use_separate_temp_files():
+    """同じディレクトリの別ストア（別プロセス相当）が交互に書いても互いの行を壊さない"""
+    root = tempfile.mkdtemp()
+    first, second = SeasonStatStore(root), SeasonStatStore(root)
+    for player_id in range(1, 7):
+        writer = first if player_id % 2 else second
+        writer.write_season(2025, 'hitting', {player_id: {'hits': player_id}})
+    for store in (first, second):
+        rows = store.season_rows(2025, 'hitting')
+        assert rows['h'].tolist() == [1, 2, 3, 4, 5, 6]
+
+
+if __name__ == '__main__':
+    for name, func in list(globals().items()):
+        if name.startswith('test_') and callable(func):
+            func()
+            print(f"✓ {name}")